@@ -1,24 +1,50 @@
 # backend/app/main.py
-from fastapi import FastAPI, Query, HTTPException, Response
+from fastapi import FastAPI, Header, Query, HTTPException, Response
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Optional, List, Dict, Any
-from collections import Counter
+from pydantic import TypeAdapter
+from typing import Optional, List, Dict, Any, Callable
+from collections import Counter, OrderedDict
+import base64
+import hashlib
 import logging
+import os
+import threading
+import time
 import duckdb
 import json
-import pandas as pd
 import requests
+from datetime import datetime
+from pathlib import Path
+from src.core.entity_timeline import fetch_entity_timeline, refresh_entity_timeline
 from src.core.insight_classification import (
     build_insight_extra_text,
-    classify_insight_record,
-    classify_probative_record,
+    classify_insight_frame,
+    classify_insight_records,
+    classify_probative_records,
     ensure_insight_classification_columns,
+    insight_search_text_exists,
+    mark_insight_classification_current,
+    refresh_insight_search_text,
+    stale_insight_classification_sql,
 )
+from src.core.ops_fingerprint import file_sha256
 from src.core.ops_registry import ensure_ops_registry, sync_ops_case_registry
+from src.core.ops_runtime import begin_pipeline_run, ensure_ops_runtime, finish_pipeline_run
+from src.core.ops_version import (
+    data_version_etag,
+    data_version_token,
+    etag_matches,
+    fetch_data_versions,
+    input_version_token,
+    mark_tables_written,
+    pipeline_is_current,
+)
 from .schemas import (
     InsightFacetsOut,
     InsightOut,
     SummaryOut,
+    DataVersionOut,
     EntityOut,
     EventOut,
     OpsCaseOut,
@@ -34,9 +60,19 @@ app.add_middleware(
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "Accept-Ranges", "Content-Range", "Content-Length"],
 )
 
 DB_PATH = "./data/sentinela_analytics.duckdb"
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DB_CONNECT_RETRIES = 40
+DB_CONNECT_RETRY_SECONDS = 0.05
+RESPONSE_CACHE_MAX_ENTRIES = 256
+RESPONSE_CACHE_TTL_SECONDS = 300
+RESPONSE_CACHE_CONTROL = "private, max-age=0, must-revalidate"
+# As versoes de dados sao lidas no maximo uma vez por janela; uma escrita leva
+# ate esse tempo para trocar a chave do cache e o ETag.
+DATA_VERSION_CHECK_TTL_SECONDS = 5
 CLASSIFICATION_FIELDS = [
     "esfera",
     "ente",
@@ -67,7 +103,21 @@ def proxy(url: str):
         return Response(content=f"Error: {str(e)}", status_code=500)
 
 def get_con():
-    return duckdb.connect(DB_PATH, read_only=True)
+    writer = _startup_writer
+    if writer is not None:
+        # Durante o startup em segundo plano o DuckDB nao abre o mesmo arquivo
+        # read-only no mesmo processo: as leituras usam conexoes proprias com a
+        # configuracao da conexao de escrita (mesma instancia), que seguem
+        # validas quando ela e fechada.
+        return duckdb.connect(DB_PATH)
+    for attempt in range(DB_CONNECT_RETRIES):
+        try:
+            return duckdb.connect(DB_PATH, read_only=True)
+        except duckdb.ConnectionException:
+            # Algum cursor do startup ainda aberto em outra requisicao.
+            if attempt == DB_CONNECT_RETRIES - 1:
+                raise
+            time.sleep(DB_CONNECT_RETRY_SECONDS)
 
 
 def get_rw_con():
@@ -126,42 +176,40 @@ def has_canonical_classification(row: Dict[str, Any]) -> bool:
 
 def hydrate_insight_records(
     con: duckdb.DuckDBPyConnection,
-    df: pd.DataFrame,
+    rows: list[dict[str, Any]],
 ) -> list[dict[str, Any]]:
-    if df.empty:
+    if not rows:
         return []
 
-    hydrated_df = df.copy()
-    for field in CLASSIFICATION_FIELDS:
-        if field not in hydrated_df.columns:
-            hydrated_df[field] = False if field == "sus" else None
-    for field in PROBATIVE_FIELDS:
-        if field not in hydrated_df.columns:
-            hydrated_df[field] = None
-
-    extra_text_by_id = build_insight_extra_text(con, hydrated_df["id"].astype(str).tolist())
-    records: list[dict[str, Any]] = []
-
-    for row in hydrated_df.to_dict("records"):
+    hydrated_rows = [dict(row) for row in rows]
+    if all("__search_text" in row for row in hydrated_rows):
+        extra_text_by_id = {row["id"]: row.pop("__search_text") or "" for row in hydrated_rows}
+    else:
+        extra_text_by_id = build_insight_extra_text(con, [str(row["id"]) for row in hydrated_rows])
+    for row in hydrated_rows:
+        for field in CLASSIFICATION_FIELDS:
+            row.setdefault(field, False if field == "sus" else None)
+        for field in PROBATIVE_FIELDS:
+            row.setdefault(field, None)
+
+    for row in hydrated_rows:
         row["sources"] = parse_json_field(row.get("sources")) or []
         row["tags"] = parse_json_field(row.get("tags")) or []
+
+    pending = []
+    for row in hydrated_rows:
         if has_canonical_classification(row):
             row["sus"] = bool(row.get("sus"))
         else:
-            computed = classify_insight_record(
-                row,
-                extra_text=extra_text_by_id.get(row["id"], ""),
-            )
-            row.update(merge_classification(row, computed))
-        row.update(
-            merge_probative(
-                row,
-                classify_probative_record(
-                    row,
-                    extra_text=extra_text_by_id.get(row["id"], ""),
-                ),
-            )
-        )
+            pending.append(row)
+    for row, computed in zip(pending, classify_insight_records(pending, extra_texts=extra_text_by_id)):
+        row.update(merge_classification(row, computed))
+    # A classificacao probatoria le o registro ja enriquecido acima.
+    probative = classify_probative_records(hydrated_rows, extra_texts=extra_text_by_id)
+
+    records: list[dict[str, Any]] = []
+    for row, computed in zip(hydrated_rows, probative):
+        row.update(merge_probative(row, computed))
         for key in ["title", "description_md", "ente", "orgao", "municipio", "uf", "area_tematica"]:
             row[key] = fix_mojibake(row.get(key))
         records.append(row)
@@ -210,14 +258,95 @@ def filter_insight_records(
     return filtered
 
 
-def query_insights_df(
+INSIGHT_SORT_KEYS = [
+    ("CASE severity WHEN 'CRITICO' THEN 3 WHEN 'ALTO' THEN 2 WHEN 'MEDIO' THEN 1 ELSE 0 END", "DESC"),
+    ("COALESCE(exposure_brl, '-infinity'::DOUBLE)", "DESC"),
+    ("id", "ASC"),
+]
+OPS_CASE_SORT_KEYS = [
+    ("COALESCE(prioridade, -2147483648)", "DESC"),
+    ("COALESCE(valor_referencia_brl, '-infinity'::DOUBLE)", "DESC"),
+    ("COALESCE(title, '')", "ASC"),
+    ("case_id", "ASC"),
+]
+EXPORT_BATCH_SIZE = 500
+# So caminhos registrados nas tabelas ops sao servidos por /ops/artifact.
+ARTIFACT_PATH_SOURCES = [
+    ("ops_case_artifact", "path"),
+    ("ops_case_inbox_document", "file_path"),
+    ("ops_artifact_text_index", "path"),
+    ("ops_source_cache", "body_path"),
+    ("ops_case_generated_export", "path"),
+]
+
+
+def encode_cursor(values: list[Any]) -> str:
+    payload = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Cursor invalido")
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Cursor invalido")
+    return values
+
+
+def keyset_clause(sort_keys: list[tuple[str, str]], after: Optional[list[Any]]) -> tuple[str, list[Any]]:
+    """Predicado "depois de" para paginacao por chave sobre ORDER BY com direcoes mistas."""
+    if not after:
+        return "", []
+    branches = []
+    params: list[Any] = []
+    for index, (expr, direction) in enumerate(sort_keys):
+        terms = [f"{prev_expr} = ?" for prev_expr, _ in sort_keys[:index]]
+        terms.append(f"{expr} {'<' if direction == 'DESC' else '>'} ?")
+        branches.append("(" + " AND ".join(terms) + ")")
+        params.extend(after[: index + 1])
+    return " AND (" + " OR ".join(branches) + ")", params
+
+
+def order_clause(sort_keys: list[tuple[str, str]]) -> str:
+    return " ORDER BY " + ", ".join(f"{expr} {direction}" for expr, direction in sort_keys)
+
+
+def cursor_columns(sort_keys: list[tuple[str, str]]) -> str:
+    return ", ".join(f"{expr} AS __cursor_{index}" for index, (expr, _) in enumerate(sort_keys))
+
+
+def fetch_records(cursor: duckdb.DuckDBPyConnection) -> list[dict[str, Any]]:
+    columns = [item[0] for item in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def pop_cursor_values(row: dict[str, Any], size: int) -> list[Any]:
+    return [row.pop(f"__cursor_{index}") for index in range(size)]
+
+
+def query_insight_rows(
     con: duckdb.DuckDBPyConnection,
     *,
     severity: Optional[str] = None,
     kind: Optional[str] = None,
     q: Optional[str] = None,
-) -> pd.DataFrame:
-    sql = "SELECT * FROM insight WHERE 1=1"
+    after: Optional[list[Any]] = None,
+    limit: Optional[int] = None,
+) -> list[dict[str, Any]]:
+    # Banco ainda sem insight_search_text: hydrate_insight_records monta o
+    # texto na hora.
+    if insight_search_text_exists(con):
+        sql = f"""
+            SELECT insight.*, search.search_text AS __search_text, {cursor_columns(INSIGHT_SORT_KEYS)}
+            FROM insight
+            LEFT JOIN insight_search_text search ON search.insight_id = insight.id
+            WHERE 1=1
+        """
+    else:
+        sql = f"SELECT *, {cursor_columns(INSIGHT_SORT_KEYS)} FROM insight WHERE 1=1"
     params = []
 
     if severity:
@@ -230,11 +359,41 @@ def query_insights_df(
         sql += " AND (title ILIKE ? OR description_md ILIKE ?)"
         params.extend([f"%{q}%", f"%{q}%"])
 
-    sql += (
-        " ORDER BY CASE severity WHEN 'CRITICO' THEN 3 WHEN 'ALTO' THEN 2 "
-        "WHEN 'MEDIO' THEN 1 ELSE 0 END DESC, exposure_brl DESC"
-    )
-    return con.execute(sql, params).df()
+    keyset_sql, keyset_params = keyset_clause(INSIGHT_SORT_KEYS, after)
+    sql += keyset_sql
+    params.extend(keyset_params)
+    sql += order_clause(INSIGHT_SORT_KEYS)
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+    return fetch_records(con.execute(sql, params))
+
+
+def iter_filtered_insight_records(
+    con: duckdb.DuckDBPyConnection,
+    *,
+    severity: Optional[str] = None,
+    kind: Optional[str] = None,
+    q: Optional[str] = None,
+    after: Optional[list[Any]] = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+    **filters: Any,
+):
+    """Percorre os insights em lotes por chave, aplicando os filtros derivados da classificacao.
+
+    Gera pares (registro, valores do cursor) na ordem canonica de severidade e exposicao.
+    """
+    while True:
+        rows = query_insight_rows(con, severity=severity, kind=kind, q=q, after=after, limit=batch_size)
+        if not rows:
+            return
+        keys = [pop_cursor_values(row, len(INSIGHT_SORT_KEYS)) for row in rows]
+        for record, values in zip(hydrate_insight_records(con, rows), keys):
+            after = values
+            if filter_insight_records([record], **filters):
+                yield record, values
+        if len(rows) < batch_size:
+            return
 
 
 def to_buckets(values: list[str]) -> list[dict[str, Any]]:
@@ -245,112 +404,369 @@ def to_buckets(values: list[str]) -> list[dict[str, Any]]:
     ]
 
 
-def sync_insight_classification() -> None:
-    con = get_rw_con()
+def _run_logged_startup_job(
+    con: duckdb.DuckDBPyConnection,
+    pipeline: str,
+    runner: Callable[[duckdb.DuckDBPyConnection], Any],
+    input_groups: tuple[str, ...],
+) -> dict[str, Any]:
+    ensure_ops_runtime(con)
+    run_id = begin_pipeline_run(con, pipeline, trigger_mode="startup", actor="api")
     try:
-        ensure_insight_classification_columns(con)
-        df = con.execute(
-            """
-            SELECT id, kind, title, description_md, pattern, sources, tags,
-                   esfera, ente, orgao, municipio, uf, area_tematica, sus,
-                   classe_achado, grau_probatorio, fonte_primaria,
-                   uso_externo, inferencia_permitida, limite_conclusao
-            FROM insight
-            """
-        ).df()
-        if df.empty:
-            return
+        stats = runner(con) or {}
+    except Exception as exc:
+        finish_pipeline_run(con, run_id, status="failed", error_text=str(exc), details={"pipeline": pipeline})
+        raise
+    finish_pipeline_run(
+        con,
+        run_id,
+        status="success",
+        rows_written=int(stats.get("rows_written", stats.get("cases", 0)) or 0),
+        artifacts_written=int(stats.get("artifacts", 0) or 0),
+        # Lido por pipeline_is_current no proximo startup.
+        details={**stats, "input_version": input_version_token(con, input_groups)},
+    )
+    return stats
+
+
+def _sync_insight_classification(con: duckdb.DuckDBPyConnection) -> dict[str, Any]:
+    ensure_insight_classification_columns(con)
+    search_stats = refresh_insight_search_text(con)
+    # Apenas insights com entradas alteradas desde o ultimo fingerprint.
+    stale_sql, stale_params = stale_insight_classification_sql()
+    df = con.execute(
+        f"""
+        SELECT i.id, i.kind, i.title, i.description_md, i.pattern, i.sources, i.tags,
+               i.esfera, i.ente, i.orgao, i.municipio, i.uf, i.area_tematica, i.sus,
+               i.classe_achado, i.grau_probatorio, i.fonte_primaria,
+               i.uso_externo, i.inferencia_permitida, i.limite_conclusao,
+               COALESCE(search.search_text, '') AS search_text
+        {stale_sql}
+        """,
+        stale_params,
+    ).df()
+    if df.empty:
+        mark_insight_classification_current(con, [])
+        return {"rows_written": 0, "search_text_rows_written": search_stats["rows_written"]}
 
-        extra_text_by_id = build_insight_extra_text(con, df["id"].astype(str).tolist())
-        updates = []
-        for row in df.to_dict("records"):
-            row["sources"] = parse_json_field(row.get("sources")) or []
-            row["tags"] = parse_json_field(row.get("tags")) or []
-            if has_canonical_classification(row):
-                classification = {
-                    "esfera": row.get("esfera"),
-                    "ente": row.get("ente"),
-                    "orgao": row.get("orgao"),
-                    "municipio": row.get("municipio"),
-                    "uf": row.get("uf"),
-                    "area_tematica": row.get("area_tematica"),
-                    "sus": bool(row.get("sus")),
-                }
-            else:
-                classification = merge_classification(
-                    row,
-                    classify_insight_record(
-                        row,
-                        extra_text=extra_text_by_id.get(row["id"], ""),
-                    ),
-                )
-            probative = merge_probative(
-                row,
-                classify_probative_record(
-                    row,
-                    extra_text=extra_text_by_id.get(row["id"], ""),
-                ),
-            )
-            updates.append(
-                [
-                    classification["esfera"],
-                    classification["ente"],
-                    classification["orgao"],
-                    classification["municipio"],
-                    classification["uf"],
-                    classification["area_tematica"],
-                    classification["sus"],
-                    probative["classe_achado"],
-                    probative["grau_probatorio"],
-                    probative["fonte_primaria"],
-                    probative["uso_externo"],
-                    probative["inferencia_permitida"],
-                    probative["limite_conclusao"],
-                    row["id"],
-                ]
-            )
-
-        con.executemany(
-            """
-            UPDATE insight
-            SET esfera = ?, ente = ?, orgao = ?, municipio = ?,
-                uf = ?, area_tematica = ?, sus = ?,
-                classe_achado = ?, grau_probatorio = ?, fonte_primaria = ?,
-                uso_externo = ?, inferencia_permitida = ?, limite_conclusao = ?
-            WHERE id = ?
-            """,
-            updates,
+    extra_text_by_id = dict(zip(df["id"], df.pop("search_text")))
+    df["sources"] = df["sources"].map(lambda value: parse_json_field(value) or [])
+    df["tags"] = df["tags"].map(lambda value: parse_json_field(value) or [])
+    computed = classify_insight_frame(df, extra_texts=extra_text_by_id)
+
+    updates = []
+    for row, computed_row in zip(df.to_dict("records"), computed.to_dict("records")):
+        if has_canonical_classification(row):
+            classification = {
+                "esfera": row.get("esfera"),
+                "ente": row.get("ente"),
+                "orgao": row.get("orgao"),
+                "municipio": row.get("municipio"),
+                "uf": row.get("uf"),
+                "area_tematica": row.get("area_tematica"),
+                "sus": bool(row.get("sus")),
+            }
+        else:
+            classification = merge_classification(row, computed_row)
+        probative = merge_probative(row, computed_row)
+        updates.append(
+            [
+                classification["esfera"],
+                classification["ente"],
+                classification["orgao"],
+                classification["municipio"],
+                classification["uf"],
+                classification["area_tematica"],
+                classification["sus"],
+                probative["classe_achado"],
+                probative["grau_probatorio"],
+                probative["fonte_primaria"],
+                probative["uso_externo"],
+                probative["inferencia_permitida"],
+                probative["limite_conclusao"],
+                row["id"],
+            ]
         )
-    finally:
-        con.close()
+
+    con.executemany(
+        """
+        UPDATE insight
+        SET esfera = ?, ente = ?, orgao = ?, municipio = ?,
+            uf = ?, area_tematica = ?, sus = ?,
+            classe_achado = ?, grau_probatorio = ?, fonte_primaria = ?,
+            uso_externo = ?, inferencia_permitida = ?, limite_conclusao = ?
+        WHERE id = ?
+        """,
+        updates,
+    )
+    mark_tables_written(con, "insight")
+    mark_insight_classification_current(con, [update[-1] for update in updates])
+    return {"rows_written": len(updates), "search_text_rows_written": search_stats["rows_written"]}
 
 
-def sync_operational_registry() -> None:
-    con = get_rw_con()
+def _insight_classification_current(con: duckdb.DuckDBPyConnection) -> bool:
+    # So leitura: sem as tabelas/colunas de estado o job precisa rodar.
+    stale_sql, stale_params = stale_insight_classification_sql()
     try:
-        ensure_ops_registry(con)
-        sync_ops_case_registry(con)
+        return con.execute(f"SELECT COUNT(*) {stale_sql}", stale_params).fetchone()[0] == 0
+    except (duckdb.CatalogException, duckdb.BinderException):
+        return False
+
+
+def _sync_operational_registry(con: duckdb.DuckDBPyConnection) -> dict[str, Any]:
+    ensure_ops_registry(con)
+    return sync_ops_case_registry(con)
+
+
+# Em ordem de dependencia: um job nunca alimenta os anteriores. O job e pulado
+# (nada escrito nem registrado em ops_pipeline_run) quando as tabelas dos grupos
+# de entrada nao mudaram desde o ultimo sucesso e a checagem extra, se houver,
+# tambem passa. As checagens so leem o banco.
+STARTUP_JOBS: list[
+    tuple[
+        str,
+        Callable[[duckdb.DuckDBPyConnection], Any],
+        tuple[str, ...],
+        Optional[Callable[[duckdb.DuckDBPyConnection], bool]],
+    ]
+] = [
+    ("sync_insight_classification", _sync_insight_classification, ("insight",), _insight_classification_current),
+    ("sync_ops_case_registry", _sync_operational_registry, ("insight", "ingest", "ops"), None),
+    ("ingest_entity_timeline", refresh_entity_timeline, ("ingest",), None),
+]
+STARTUP_LOCK_RETRY_SECONDS = (1, 2, 5, 10, 30, 60)
+STARTUP_FORCE = os.environ.get("SENTINELA_STARTUP_FORCE") == "1"
+
+_startup_lock = threading.Lock()
+_startup_state: dict[str, Any] = {"status": "pending", "started_at": None, "finished_at": None, "jobs": {}}
+_startup_writer: Optional[duckdb.DuckDBPyConnection] = None
+
+
+def _set_startup_state(**changes: Any) -> None:
+    with _startup_lock:
+        _startup_state.update(changes)
+
+
+def _set_startup_job(pipeline: str, **payload: Any) -> None:
+    with _startup_lock:
+        _startup_state["jobs"][pipeline] = payload
+
+
+def _connect_startup_writer() -> Optional[duckdb.DuckDBPyConnection]:
+    # Scripts de sync podem estar com o lock de escrita: espera em vez de falhar.
+    for delay in (*STARTUP_LOCK_RETRY_SECONDS, None):
+        try:
+            return get_rw_con()
+        except duckdb.IOException as exc:
+            if delay is None:
+                log.warning("Banco ocupado; startup adiado: %s", exc)
+                return None
+            time.sleep(delay)
+    return None
+
+
+def _run_startup_jobs() -> None:
+    global _startup_writer
+    _set_startup_state(status="running", started_at=datetime.now().isoformat())
+    con = _connect_startup_writer()
+    if con is None:
+        _set_startup_state(status="failed", finished_at=datetime.now().isoformat())
+        return
+    _startup_writer = con
+    failed = False
+    try:
+        for pipeline, runner, input_groups, is_current in STARTUP_JOBS:
+            started = time.perf_counter()
+            try:
+                if (
+                    not STARTUP_FORCE
+                    and pipeline_is_current(con, pipeline, input_groups)
+                    and (is_current is None or is_current(con))
+                ):
+                    _set_startup_job(pipeline, status="skipped", duration_ms=int((time.perf_counter() - started) * 1000))
+                    continue
+                stats = _run_logged_startup_job(con, pipeline, runner, input_groups)
+                _set_startup_job(
+                    pipeline,
+                    status="success",
+                    rows_written=int(stats.get("rows_written", 0) or 0),
+                    duration_ms=int((time.perf_counter() - started) * 1000),
+                )
+            except Exception as exc:
+                failed = True
+                log.warning("Falha no job de startup %s: %s", pipeline, exc)
+                _set_startup_job(pipeline, status="failed", error=str(exc))
     finally:
+        _startup_writer = None
         con.close()
+    _set_startup_state(status="degraded" if failed else "ready", finished_at=datetime.now().isoformat())
 
 
 @app.on_event("startup")
 def startup():
-    try:
-        sync_insight_classification()
-    except Exception as exc:
-        log.warning("Falha ao sincronizar classificacao de insights: %s", exc)
-    try:
-        sync_operational_registry()
-    except Exception as exc:
-        log.warning("Falha ao sincronizar registry operacional: %s", exc)
+    # O servidor atende imediatamente; a reclassificacao e o registry rodam em
+    # segundo plano e o progresso fica em /ready.
+    threading.Thread(target=_run_startup_jobs, name="sentinela-startup", daemon=True).start()
 
 @app.get("/health")
 def health():
     return {"ok": True}
 
-@app.get("/meta/summary", response_model=SummaryOut)
-def summary():
+
+@app.get("/ready")
+def ready():
+    with _startup_lock:
+        payload = {**_startup_state, "jobs": dict(_startup_state["jobs"])}
+    payload["ready"] = payload["status"] in {"ready", "degraded"}
+    return Response(
+        content=json.dumps(payload),
+        media_type="application/json",
+        status_code=200 if payload["ready"] else 503,
+    )
+
+
+_data_versions_lock = threading.Lock()
+_data_versions_memo: dict[str, tuple[float, dict[str, dict[str, Any]]]] = {}
+
+
+def load_data_versions() -> dict[str, dict[str, Any]]:
+    now = time.monotonic()
+    with _data_versions_lock:
+        memo = _data_versions_memo.get(DB_PATH)
+    if memo is not None and now - memo[0] < DATA_VERSION_CHECK_TTL_SECONDS:
+        return memo[1]
+    con = get_con()
+    try:
+        versions = fetch_data_versions(con)
+    finally:
+        con.close()
+    with _data_versions_lock:
+        _data_versions_memo[DB_PATH] = (now, versions)
+    return versions
+
+
+@app.get("/meta/version", response_model=DataVersionOut)
+def data_version(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+):
+    versions = load_data_versions()
+    etag = data_version_etag(versions)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return {"etag": etag, "groups": versions}
+
+class ResponseCache:
+    """LRU de respostas serializadas, chaveado por rota, parametros e versao de dados."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[tuple, tuple[float, bytes, str, Optional[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: tuple) -> Optional[tuple[bytes, str, Optional[str]]]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, body, etag, next_cursor = entry
+            if now - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body, etag, next_cursor
+
+    def put(self, key: tuple, body: bytes, etag: str, next_cursor: Optional[str] = None) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), body, etag, next_cursor)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+RESPONSE_CACHE = ResponseCache(RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTL_SECONDS)
+
+
+def normalize_cache_params(params: Dict[str, Any]) -> tuple:
+    normalized = []
+    for key, value in sorted(params.items()):
+        if value is None or value == "":
+            continue
+        if isinstance(value, str):
+            value = " ".join(value.split())
+        normalized.append((key, value))
+    return tuple(normalized)
+
+
+def cached_json_response(
+    route: str,
+    params: Dict[str, Any],
+    builder: Callable[[], Any],
+    *,
+    response_model: Any,
+    group: str,
+    if_none_match: Optional[str] = None,
+    paged: bool = False,
+) -> Response:
+    # A versao inclui o contador de escritas das tabelas do grupo: qualquer sync
+    # que grava nelas troca a chave, mesmo sem execucao em ops_pipeline_run.
+    version = data_version_token(load_data_versions(), group)
+    key = (route, normalize_cache_params(params), version)
+    cached = RESPONSE_CACHE.get(key)
+    if cached is None:
+        payload, next_cursor = builder() if paged else (builder(), None)
+        adapter = TypeAdapter(response_model)
+        body = adapter.dump_json(adapter.validate_python(payload))
+        etag = f'"{hashlib.sha256(body).hexdigest()[:20]}"'
+        RESPONSE_CACHE.put(key, body, etag, next_cursor)
+    else:
+        body, etag, next_cursor = cached
+
+    headers = {"ETag": etag, "Cache-Control": RESPONSE_CACHE_CONTROL}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@app.get("/meta/metrics")
+def metrics():
+    return {"response_cache": RESPONSE_CACHE.stats()}
+
+
+def _summary_payload() -> dict[str, Any]:
     con = get_con()
     res = con.execute("""
         SELECT
@@ -371,6 +787,49 @@ def summary():
         "last_updated": res[5]
     }
 
+
+@app.get("/meta/summary", response_model=SummaryOut)
+def summary(if_none_match: Optional[str] = Header(None)):
+    return cached_json_response(
+        "/meta/summary",
+        {},
+        _summary_payload,
+        response_model=SummaryOut,
+        group="all",
+        if_none_match=if_none_match,
+    )
+
+
+def _filtered_insight_records(**params: Any) -> list[dict[str, Any]]:
+    con = get_con()
+    try:
+        return [record for record, _ in iter_filtered_insight_records(con, **params)]
+    finally:
+        con.close()
+
+
+def _insight_page(
+    *,
+    limit: int,
+    cursor: Optional[str] = None,
+    **params: Any,
+) -> tuple[list[dict[str, Any]], Optional[str]]:
+    after = decode_cursor(cursor, len(INSIGHT_SORT_KEYS)) if cursor else None
+    page: list[dict[str, Any]] = []
+    last_values: Optional[list[Any]] = None
+    con = get_con()
+    try:
+        batch_size = max(limit * 2, 100)
+        for record, values in iter_filtered_insight_records(con, after=after, batch_size=batch_size, **params):
+            page.append(record)
+            last_values = values
+            if len(page) == limit:
+                return page, encode_cursor(last_values)
+    finally:
+        con.close()
+    return page, None
+
+
 @app.get("/insights", response_model=List[InsightOut])
 def list_insights(
     severity: Optional[str] = None,
@@ -385,32 +844,37 @@ def list_insights(
     sus: Optional[bool] = None,
     classe_achado: Optional[str] = None,
     uso_externo: Optional[str] = None,
-    limit: int = Query(50, ge=1, le=200)
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
 ):
-    con = get_con()
-    try:
-        df = query_insights_df(con, severity=severity, kind=kind, q=q)
-        records = hydrate_insight_records(con, df)
-    finally:
-        con.close()
-
-    filtered = filter_insight_records(
-        records,
-        esfera=esfera,
-        ente=ente,
-        orgao=orgao,
-        municipio=municipio,
-        uf=uf,
-        area_tematica=area_tematica,
-        sus=sus,
-        classe_achado=classe_achado,
-        uso_externo=uso_externo,
+    params = {
+        "severity": severity,
+        "kind": kind,
+        "q": q,
+        "esfera": esfera,
+        "ente": ente,
+        "orgao": orgao,
+        "municipio": municipio,
+        "uf": uf,
+        "area_tematica": area_tematica,
+        "sus": sus,
+        "classe_achado": classe_achado,
+        "uso_externo": uso_externo,
+    }
+    return cached_json_response(
+        "/insights",
+        {**params, "limit": limit, "cursor": cursor},
+        lambda: _insight_page(limit=limit, cursor=cursor, **params),
+        response_model=List[InsightOut],
+        group="insight",
+        if_none_match=if_none_match,
+        paged=True,
     )
-    return filtered[:limit]
 
 
-@app.get("/meta/facets", response_model=InsightFacetsOut)
-def insight_facets(
+@app.get("/insights.ndjson")
+def export_insights(
     severity: Optional[str] = None,
     kind: Optional[str] = None,
     q: Optional[str] = None,
@@ -424,25 +888,34 @@ def insight_facets(
     classe_achado: Optional[str] = None,
     uso_externo: Optional[str] = None,
 ):
-    con = get_con()
-    try:
-        df = query_insights_df(con, severity=severity, kind=kind, q=q)
-        records = hydrate_insight_records(con, df)
-    finally:
-        con.close()
+    params = {
+        "severity": severity,
+        "kind": kind,
+        "q": q,
+        "esfera": esfera,
+        "ente": ente,
+        "orgao": orgao,
+        "municipio": municipio,
+        "uf": uf,
+        "area_tematica": area_tematica,
+        "sus": sus,
+        "classe_achado": classe_achado,
+        "uso_externo": uso_externo,
+    }
 
-    filtered = filter_insight_records(
-        records,
-        esfera=esfera,
-        ente=ente,
-        orgao=orgao,
-        municipio=municipio,
-        uf=uf,
-        area_tematica=area_tematica,
-        sus=sus,
-        classe_achado=classe_achado,
-        uso_externo=uso_externo,
-    )
+    def lines():
+        con = get_con()
+        try:
+            for record, _ in iter_filtered_insight_records(con, **params):
+                yield InsightOut.model_validate(record).model_dump_json() + "\n"
+        finally:
+            con.close()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+def _insight_facets_payload(**params: Any) -> dict[str, Any]:
+    filtered = _filtered_insight_records(**params)
     return {
         "esferas": to_buckets([row.get("esfera") for row in filtered]),
         "entes": to_buckets([row.get("ente") for row in filtered]),
@@ -458,8 +931,47 @@ def insight_facets(
     }
 
 
-@app.get("/ops/summary", response_model=OpsSummaryOut)
-def ops_summary():
+@app.get("/meta/facets", response_model=InsightFacetsOut)
+def insight_facets(
+    severity: Optional[str] = None,
+    kind: Optional[str] = None,
+    q: Optional[str] = None,
+    esfera: Optional[str] = None,
+    ente: Optional[str] = None,
+    orgao: Optional[str] = None,
+    municipio: Optional[str] = None,
+    uf: Optional[str] = None,
+    area_tematica: Optional[str] = None,
+    sus: Optional[bool] = None,
+    classe_achado: Optional[str] = None,
+    uso_externo: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+):
+    params = {
+        "severity": severity,
+        "kind": kind,
+        "q": q,
+        "esfera": esfera,
+        "ente": ente,
+        "orgao": orgao,
+        "municipio": municipio,
+        "uf": uf,
+        "area_tematica": area_tematica,
+        "sus": sus,
+        "classe_achado": classe_achado,
+        "uso_externo": uso_externo,
+    }
+    return cached_json_response(
+        "/meta/facets",
+        params,
+        lambda: _insight_facets_payload(**params),
+        response_model=InsightFacetsOut,
+        group="insight",
+        if_none_match=if_none_match,
+    )
+
+
+def _ops_summary_payload() -> dict[str, Any]:
     con = get_con()
     try:
         total_cases = con.execute("SELECT COUNT(*) FROM ops_case_registry").fetchone()[0]
@@ -480,51 +992,152 @@ def ops_summary():
     }
 
 
-@app.get("/ops/cases", response_model=List[OpsCaseOut])
-def ops_cases(
+@app.get("/ops/summary", response_model=OpsSummaryOut)
+def ops_summary(if_none_match: Optional[str] = Header(None)):
+    return cached_json_response(
+        "/ops/summary",
+        {},
+        _ops_summary_payload,
+        response_model=OpsSummaryOut,
+        group="ops",
+        if_none_match=if_none_match,
+    )
+
+
+def _ops_cases_query(
+    *,
     family: Optional[str] = None,
     estagio_operacional: Optional[str] = None,
     uso_externo: Optional[str] = None,
     orgao: Optional[str] = None,
     q: Optional[str] = None,
-    limit: int = Query(100, ge=1, le=300),
-):
+    after: Optional[list[Any]] = None,
+) -> tuple[str, list[Any]]:
+    sql = f"SELECT *, {cursor_columns(OPS_CASE_SORT_KEYS)} FROM ops_case_registry WHERE 1=1"
+    params: list[Any] = []
+    if family:
+        sql += " AND family ILIKE ?"
+        params.append(f"%{family}%")
+    if estagio_operacional:
+        sql += " AND estagio_operacional ILIKE ?"
+        params.append(f"%{estagio_operacional}%")
+    if uso_externo:
+        sql += " AND uso_externo ILIKE ?"
+        params.append(f"%{uso_externo}%")
+    if orgao:
+        sql += " AND orgao ILIKE ?"
+        params.append(f"%{orgao}%")
+    if q:
+        sql += " AND (title ILIKE ? OR subject_name ILIKE ? OR resumo_curto ILIKE ?)"
+        params.extend([f"%{q}%", f"%{q}%", f"%{q}%"])
+    keyset_sql, keyset_params = keyset_clause(OPS_CASE_SORT_KEYS, after)
+    sql += keyset_sql + order_clause(OPS_CASE_SORT_KEYS)
+    params.extend(keyset_params)
+    return sql, params
+
+
+def _ops_cases_page(
+    *,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    **filters: Any,
+) -> tuple[list[dict[str, Any]], Optional[str]]:
+    after = decode_cursor(cursor, len(OPS_CASE_SORT_KEYS)) if cursor else None
+    sql, params = _ops_cases_query(after=after, **filters)
     con = get_con()
     try:
-        sql = "SELECT * FROM v_ops_case_registry WHERE 1=1"
-        params: list[Any] = []
-        if family:
-            sql += " AND family ILIKE ?"
-            params.append(f"%{family}%")
-        if estagio_operacional:
-            sql += " AND estagio_operacional ILIKE ?"
-            params.append(f"%{estagio_operacional}%")
-        if uso_externo:
-            sql += " AND uso_externo ILIKE ?"
-            params.append(f"%{uso_externo}%")
-        if orgao:
-            sql += " AND orgao ILIKE ?"
-            params.append(f"%{orgao}%")
-        if q:
-            sql += " AND (title ILIKE ? OR subject_name ILIKE ? OR resumo_curto ILIKE ?)"
-            params.extend([f"%{q}%", f"%{q}%", f"%{q}%"])
-        sql += " LIMIT ?"
-        params.append(limit)
-        return json.loads(con.execute(sql, params).fetchdf().to_json(orient="records", force_ascii=False))
+        rows = fetch_records(con.execute(sql + " LIMIT ?", [*params, limit + 1]))
     finally:
         con.close()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    keys = [pop_cursor_values(row, len(OPS_CASE_SORT_KEYS)) for row in rows]
+    return rows, encode_cursor(keys[-1]) if has_more else None
 
 
-@app.get("/ops/cases/{case_id}", response_model=OpsCaseOut)
-def ops_case_detail(case_id: str):
+@app.get("/ops/cases", response_model=List[OpsCaseOut])
+def ops_cases(
+    family: Optional[str] = None,
+    estagio_operacional: Optional[str] = None,
+    uso_externo: Optional[str] = None,
+    orgao: Optional[str] = None,
+    q: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=300),
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+):
+    params = {
+        "family": family,
+        "estagio_operacional": estagio_operacional,
+        "uso_externo": uso_externo,
+        "orgao": orgao,
+        "q": q,
+    }
+    return cached_json_response(
+        "/ops/cases",
+        {**params, "limit": limit, "cursor": cursor},
+        lambda: _ops_cases_page(limit=limit, cursor=cursor, **params),
+        response_model=List[OpsCaseOut],
+        group="ops",
+        if_none_match=if_none_match,
+        paged=True,
+    )
+
+
+@app.get("/ops/cases.ndjson")
+def export_ops_cases(
+    family: Optional[str] = None,
+    estagio_operacional: Optional[str] = None,
+    uso_externo: Optional[str] = None,
+    orgao: Optional[str] = None,
+    q: Optional[str] = None,
+):
+    sql, params = _ops_cases_query(
+        family=family,
+        estagio_operacional=estagio_operacional,
+        uso_externo=uso_externo,
+        orgao=orgao,
+        q=q,
+    )
+
+    def lines():
+        con = get_con()
+        try:
+            result = con.execute(sql, params)
+            columns = [item[0] for item in result.description]
+            while True:
+                batch = result.fetchmany(EXPORT_BATCH_SIZE)
+                if not batch:
+                    break
+                for values in batch:
+                    yield OpsCaseOut.model_validate(dict(zip(columns, values))).model_dump_json() + "\n"
+        finally:
+            con.close()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+def _ops_case_detail_payload(case_id: str) -> dict[str, Any]:
     con = get_con()
     try:
-        df = con.execute("SELECT * FROM ops_case_registry WHERE case_id = ?", [case_id]).fetchdf()
+        rows = fetch_records(con.execute("SELECT * FROM ops_case_registry WHERE case_id = ?", [case_id]))
     finally:
         con.close()
-    if df.empty:
+    if not rows:
         raise HTTPException(status_code=404, detail="Case not found")
-    return json.loads(df.to_json(orient="records", force_ascii=False))[0]
+    return rows[0]
+
+
+@app.get("/ops/cases/{case_id}", response_model=OpsCaseOut)
+def ops_case_detail(case_id: str, if_none_match: Optional[str] = Header(None)):
+    return cached_json_response(
+        "/ops/cases/{case_id}",
+        {"case_id": case_id},
+        lambda: _ops_case_detail_payload(case_id),
+        response_model=OpsCaseOut,
+        group="ops",
+        if_none_match=if_none_match,
+    )
 
 
 @app.get("/ops/cases/{case_id}/artifacts", response_model=List[OpsArtifactOut])
@@ -539,57 +1152,66 @@ def ops_case_artifacts(case_id: str):
         con.close()
     return json.loads(df.to_json(orient="records", force_ascii=False))
 
-@app.get("/timeline/{entity_id:path}")
-def get_timeline(entity_id: str):
+def _registered_artifact_path(path_value: str) -> Path:
     con = get_con()
-    
-    # Normaliza o ID: remove prefixo se houver
-    raw_id = entity_id.replace("rb_matricula:", "")
-    
-    # 1) Busca nome e valida existência
-    row = con.execute("""
-        SELECT split_part(servidor, '-', 2) AS nome
-        FROM rb_servidores_mass
-        WHERE split_part(servidor, '-', 1) = ?
-        LIMIT 1
-    """, [raw_id]).fetchone()
-
-    if not row:
+    try:
+        tables = {row[0] for row in con.execute("SHOW TABLES").fetchall()}
+        registered = any(
+            con.execute(f"SELECT 1 FROM {table} WHERE {column} = ? LIMIT 1", [path_value]).fetchone()
+            for table, column in ARTIFACT_PATH_SOURCES
+            if table in tables
+        )
+    finally:
         con.close()
-        raise HTTPException(status_code=404, detail=f"Entidade {raw_id} não localizada")
+    path = Path(path_value)
+    path = path if path.is_absolute() else PROJECT_ROOT / path
+    if not registered or not path.is_file():
+        raise HTTPException(status_code=404, detail="Artifact not found")
+    return path
+
+
+@app.api_route("/ops/artifact", methods=["GET", "HEAD"])
+def ops_artifact_file(path: str, if_none_match: Optional[str] = Header(None)):
+    # FileResponse transmite em blocos e atende Range/If-Range; o ETag e o hash
+    # do conteudo (cache de fingerprints), entao revalidacoes nao releem o arquivo.
+    file_path = _registered_artifact_path(path)
+    etag = f'"{file_sha256(file_path)}"'
+    headers = {"ETag": etag, "Cache-Control": RESPONSE_CACHE_CONTROL}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(file_path, headers=headers, filename=file_path.name, content_disposition_type="inline")
 
-    nome = row[0]
+@app.get("/timeline/{entity_id:path}")
+def get_timeline(
+    entity_id: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+):
+    # Normaliza o ID: remove prefixo se houver
+    raw_id = entity_id.replace("rb_matricula:", "")
 
-    # 2) Homônimo gate
-    n = con.execute("""
-        SELECT COUNT(DISTINCT split_part(servidor, '-', 1)) 
-        FROM rb_servidores_mass WHERE split_part(servidor, '-', 2) = ?
-    """, [nome]).fetchone()[0]
+    con = get_con()
+    try:
+        entity, events = fetch_entity_timeline(con, raw_id, start=start, end=end)
+    except duckdb.CatalogException:
+        raise HTTPException(status_code=503, detail="Timeline de entidades ainda nao materializada")
+    finally:
+        con.close()
 
-    include_diarias = (n == 1)
+    if entity is None:
+        raise HTTPException(status_code=404, detail=f"Entidade {raw_id} não localizada")
 
-    # 3) Build Timeline
-    sql = f"""
-        SELECT capturado_em AS occurred_at, 'salario' AS type, salario_liquido AS amount_brl, 
-               'Folha (snapshot)' AS title, struct_pack(cargo := cargo, bruto := salario_bruto) AS attributes
-        FROM rb_servidores_mass WHERE split_part(servidor, '-', 1) = ?
-        { "UNION ALL SELECT data_saida::TIMESTAMP, 'diaria', valor, 'Viagem: ' || destino, struct_pack(motivo := motivo) FROM diarias WHERE servidor_nome = ?" if include_diarias else "" }
-        ORDER BY occurred_at DESC
-    """
-    params = [raw_id, nome] if include_diarias else [raw_id]
-    df = con.execute(sql, params).df()
-    con.close()
+    for event in events:
+        occurred_at = event["occurred_at"]
+        event["occurred_at"] = occurred_at.isoformat() if occurred_at is not None else None
+        event["title"] = fix_mojibake(event["title"])
+        event["attributes"] = parse_json_field(event["attributes"]) or {}
 
-    # Post-process
-    df['title'] = df['title'].apply(fix_mojibake)
-    for col in ['occurred_at']:
-        df[col] = df[col].apply(lambda x: x.isoformat() if pd.notnull(x) else None)
-    
     return {
         "entity_id": entity_id,
-        "nome": fix_mojibake(nome),
-        "diarias_included": include_diarias,
-        "events": df.to_dict("records")
+        "nome": fix_mojibake(entity["nome"]),
+        "diarias_included": entity["homonym_count"] == 1,
+        "events": events,
     }
 
 @app.get("/entities/{entity_id:path}", response_model=EntityOut)
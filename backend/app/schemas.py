@@ -64,6 +64,18 @@ class SummaryOut(BaseModel):
     last_updated: Optional[datetime] = None
 
 
+class DataVersionGroupOut(BaseModel):
+    version: int = 0
+    watermark: Optional[datetime] = None
+    writes: int = 0
+    written_at: Optional[datetime] = None
+
+
+class DataVersionOut(BaseModel):
+    etag: str
+    groups: Dict[str, DataVersionGroupOut] = {}
+
+
 class FacetBucketOut(BaseModel):
     value: str
     count: int
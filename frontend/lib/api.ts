@@ -4,7 +4,7 @@ import type { Insight, InsightFacets, OpsArtifact, OpsCase, OpsSummary, Summary
 const API_BASE = process.env.NEXT_PUBLIC_API_BASE ?? "http://localhost:8000";
 
 export async function fetchSummary(): Promise<Summary> {
-  const r = await fetch(`${API_BASE}/meta/summary`, { cache: "no-store" });
+  const r = await fetch(`${API_BASE}/meta/summary`, { cache: "no-cache" });
   if (!r.ok) throw new Error("summary failed");
   return r.json();
 }
@@ -14,7 +14,7 @@ export async function fetchInsights(params: Record<string, string | number | und
   Object.entries(params).forEach(([k, v]) => {
     if (v !== undefined && v !== "") qs.set(k, String(v));
   });
-  const r = await fetch(`${API_BASE}/insights?${qs.toString()}`, { cache: "no-store" });
+  const r = await fetch(`${API_BASE}/insights?${qs.toString()}`, { cache: "no-cache" });
   if (!r.ok) throw new Error("insights failed");
   return (await r.json()) as Insight[];
 }
@@ -24,7 +24,7 @@ export async function fetchInsightFacets(params: Record<string, string | number
   Object.entries(params).forEach(([k, v]) => {
     if (v !== undefined && v !== "") qs.set(k, String(v));
   });
-  const r = await fetch(`${API_BASE}/meta/facets?${qs.toString()}`, { cache: "no-store" });
+  const r = await fetch(`${API_BASE}/meta/facets?${qs.toString()}`, { cache: "no-cache" });
   if (!r.ok) throw new Error("facets failed");
   return r.json();
 }
@@ -36,7 +36,7 @@ export async function fetchEntityTimeline(entityId: string) {
 }
 
 export async function fetchOpsSummary(): Promise<OpsSummary> {
-  const r = await fetch(`${API_BASE}/ops/summary`, { cache: "no-store" });
+  const r = await fetch(`${API_BASE}/ops/summary`, { cache: "no-cache" });
   if (!r.ok) throw new Error("ops summary failed");
   return r.json();
 }
@@ -46,13 +46,13 @@ export async function fetchOpsCases(params: Record<string, string | number | und
   Object.entries(params).forEach(([k, v]) => {
     if (v !== undefined && v !== "") qs.set(k, String(v));
   });
-  const r = await fetch(`${API_BASE}/ops/cases?${qs.toString()}`, { cache: "no-store" });
+  const r = await fetch(`${API_BASE}/ops/cases?${qs.toString()}`, { cache: "no-cache" });
   if (!r.ok) throw new Error("ops cases failed");
   return (await r.json()) as OpsCase[];
 }
 
 export async function fetchOpsCase(caseId: string): Promise<OpsCase> {
-  const r = await fetch(`${API_BASE}/ops/cases/${encodeURIComponent(caseId)}`, { cache: "no-store" });
+  const r = await fetch(`${API_BASE}/ops/cases/${encodeURIComponent(caseId)}`, { cache: "no-cache" });
   if (!r.ok) throw new Error("ops case failed");
   return (await r.json()) as OpsCase;
 }
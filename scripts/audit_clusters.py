@@ -1,8 +1,17 @@
 
+import sys
+from pathlib import Path
+
 import duckdb
 import pandas as pd
 import logging
 
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.core.corporate_network import CLUSTER_TABLE, EDGE_TABLE, NODE_TABLE, sync_corporate_network  # noqa: E402
+
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 log = logging.getLogger("Sentinel.ClusterAudit")
 
@@ -12,19 +21,31 @@ def run_cluster_audit():
     con = duckdb.connect(DB_PATH)
     try:
         log.info("Iniciando detecção de Clusters de Controle (Redes de Sócios)...")
-        
-        # Identifica nomes que aparecem como sócios em múltiplas empresas
-        query = """
-            SELECT 
-                socio_nome,
-                COUNT(DISTINCT cnpj) as qtd_empresas,
-                list(DISTINCT cnpj) as lista_cnpjs
-            FROM empresa_socios
-            GROUP BY 1
-            HAVING qtd_empresas > 1
-            ORDER BY qtd_empresas DESC
-        """
-        clusters = con.execute(query).fetchdf()
+        con.begin()
+        try:
+            sync = sync_corporate_network(con)
+            con.commit()
+        except Exception:
+            con.rollback()
+            raise
+        log.info(
+            f"Rede societária: +{sync['edges_added']} -{sync['edges_removed']} vínculos, "
+            f"{sync['clusters_rebuilt']} cluster(s) recalculado(s), {sync['clusters']} no total."
+        )
+
+        # Identifica sócios presentes em múltiplas empresas (grau no grafo QSA)
+        clusters = con.execute(f"""
+            SELECT
+                n.node_key,
+                n.nome AS socio_nome,
+                n.degree AS qtd_empresas,
+                n.cluster_id,
+                c.n_empresas AS empresas_no_cluster
+            FROM {NODE_TABLE} n
+            JOIN {CLUSTER_TABLE} c USING (cluster_id)
+            WHERE n.kind = 'socio' AND n.degree > 1
+            ORDER BY qtd_empresas DESC, n.node_key
+        """).fetchdf()
         
         if clusters.empty:
             log.info("Nenhum cluster de sócios detectado na amostra atual.")
@@ -33,24 +54,28 @@ def run_cluster_audit():
         log.info(f"Detectados {len(clusters)} operadores de rede (sócios em múltiplas empresas).")
         
         print("\n=== RANKING DE OPERADORES DE REDE (CLUSTERS) ===")
-        print(clusters[['socio_nome', 'qtd_empresas']].head(10).to_string(index=False))
+        print(clusters[['socio_nome', 'qtd_empresas', 'empresas_no_cluster']].head(10).to_string(index=False))
         
-        # Para cada CNPJ no cluster, vamos verificar se tem contratos públicos
-        for _, row in clusters.head(5).iterrows():
-            cnpjs = row['lista_cnpjs']
-            contratos = con.execute("""
-                SELECT 
-                    cnpj, 
-                    razao_social, 
-                    SUM(total_valor_brl) as valor_total
-                FROM trace_norte_rede_empresas
-                WHERE cnpj IN (SELECT unnest(?))
-                GROUP BY 1, 2
-            """, [cnpjs]).fetchdf()
-            
-            if not contratos.empty:
+        # Contratos públicos das empresas dos 5 maiores operadores, numa consulta
+        top = clusters.head(5)
+        contratos = con.execute(f"""
+            SELECT
+                e.socio_key,
+                t.cnpj,
+                t.razao_social,
+                SUM(t.total_valor_brl) as valor_total
+            FROM {EDGE_TABLE} e
+            JOIN trace_norte_rede_empresas t ON t.cnpj = e.cnpj
+            WHERE e.socio_key IN (SELECT unnest(?))
+            GROUP BY 1, 2, 3
+            ORDER BY 1, valor_total DESC
+        """, [top['node_key'].tolist()]).fetchdf()
+
+        for _, row in top.iterrows():
+            linhas = contratos[contratos['socio_key'] == row['node_key']]
+            if not linhas.empty:
                 print(f"\nOperador: {row['socio_nome']} (Controla {row['qtd_empresas']} empresas)")
-                print(contratos.to_string(index=False))
+                print(linhas[['cnpj', 'razao_social', 'valor_total']].to_string(index=False))
 
     finally:
         con.close()
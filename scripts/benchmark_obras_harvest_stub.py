@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import argparse
+import itertools
+import re
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.core.analytics_db import AnalyticsDB  # noqa: E402
+from src.ingest.riobranco_obras import (  # noqa: E402
+    RioBrancoObrasHarvester,
+    RioBrancoObrasParser,
+    _parse_valor,
+    extract_obra_detail,
+)
+
+OBRA_IDS = [str(256000 + idx) for idx in range(240)]
+
+
+def obra_page(obra_id: str, version: int = 0, view_state: str = "") -> str:
+    idx = int(obra_id) % 1000
+    empresa = (
+        f'<a href="/pessoa/ver/{7000 + idx % 31}/"> CONSTRUTORA <b>{idx % 31}</b> LTDA </a>'
+        if idx % 7
+        else "Sem empresa"
+    )
+    header = '<?xml version="1.0" encoding="UTF-8"?>\n' if idx % 5 == 0 else ""
+    filler = "".join(f"<tr><td>Campo {n}:</td><td>valor {n} <!-- c --></td></tr>" for n in range(40))
+    nome = f"<tr><td>Nome: </td><td> Obra {idx} &amp; reforma v{version}</td></tr>" if idx % 11 else ""
+    return (
+        f"{header}<html><head><title>Obra</title></head><body><table>{filler}{nome}"
+        f"<tr><td>Empresa licitada:</td><td>{empresa}</td></tr>"
+        f"<tr><td><span>Custo total:</span></td><td>R$ {idx * 1000 + 0.5:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+        + "</td></tr>"
+        f"<tr><td>Secretaria fiscalizadora:</td><td>SEINFRA</td></tr>"
+        "<tr><td>linha com uma celula</td></tr></table>"
+        # Como no portal, o ViewState muda a cada resposta sem mudar a obra.
+        f'<input type="hidden" name="javax.faces.ViewState" value="{view_state}"/></body></html>'
+    )
+
+
+class ObrasStub(BaseHTTPRequestHandler):
+    latency = 0.05
+    versions: dict[str, int] = {}
+    view_states = itertools.count()
+
+    def log_message(self, *args) -> None:
+        return
+
+    def do_GET(self) -> None:
+        time.sleep(self.latency)
+        match = re.search(r"/obra/ver/(\d+)/", self.path)
+        if not match or match.group(1) not in OBRA_IDS or int(match.group(1)) % 53 == 0:
+            self.send_response(404)
+            self.end_headers()
+            return
+        obra_id = match.group(1)
+        body = obra_page(obra_id, self.versions.get(obra_id, 0), f"vs{next(self.view_states)}").encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def reference_obra_detail(page_html: str, obra_id: str) -> dict:
+    """Extracao anterior, por BeautifulSoup sobre todos os <tr>."""
+    soup = BeautifulSoup(page_html, "html.parser")
+    data = {"id": str(obra_id)}
+    for row in soup.find_all("tr"):
+        cols = row.find_all("td")
+        if len(cols) < 2:
+            continue
+        label = cols[0].get_text(strip=True).lower()
+        value_td = cols[1]
+        value_text = value_td.get_text(strip=True)
+        if "nome:" in label:
+            data["nome"] = value_text
+        elif "empresa licitada" in label:
+            link = value_td.find("a")
+            if link:
+                match = re.search(r"/ver/(\d+)/", link["href"])
+                data["empresa_id"] = match.group(1) if match else None
+                data["empresa_nome"] = value_text
+        elif "custo total:" in label:
+            data["valor_total"] = _parse_valor(value_text)
+        elif "secretaria fiscalizadora:" in label:
+            data["secretaria"] = value_text
+    return data
+
+
+def obras_snapshot(db: AnalyticsDB) -> list[tuple]:
+    return db.conn.execute(
+        "SELECT id, nome, valor_total, empresa_id, empresa_nome, secretaria FROM obras ORDER BY id"
+    ).fetchall()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compara coleta serial e concorrente das obras de Rio Branco contra um stub local.")
+    parser.add_argument("--latency", type=float, default=0.05, help="Latencia simulada por requisicao (s)")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rps", type=float, default=200.0)
+    args = parser.parse_args()
+
+    ObrasStub.latency = args.latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ObrasStub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/obra/ver/"
+
+    failures = []
+    extractor_mismatches = [
+        obra_id
+        for obra_id in OBRA_IDS
+        for page in (obra_page(obra_id), obra_page(obra_id).replace("</td></tr>", "</td>"))
+        if extract_obra_detail(page, obra_id) != reference_obra_detail(page, obra_id)
+    ]
+    if extractor_mismatches:
+        failures.append(f"extractor_mismatches={len(extractor_mismatches)}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            serial_db = AnalyticsDB(str(Path(tmp) / "serial.duckdb"))
+            legacy = RioBrancoObrasParser(serial_db)
+            legacy.BASE_URL = base_url
+            started = time.perf_counter()
+            for obra_id in OBRA_IDS:
+                legacy.get_obra_detail(obra_id)
+            serial_s = time.perf_counter() - started
+
+            db = AnalyticsDB(str(Path(tmp) / "concurrent.duckdb"))
+            harvester = RioBrancoObrasHarvester(db, workers=args.workers, requests_per_second=args.rps, base_url=base_url)
+            started = time.perf_counter()
+            first = harvester.run(OBRA_IDS)
+            concurrent_s = time.perf_counter() - started
+            if obras_snapshot(db) != obras_snapshot(serial_db):
+                failures.append("concurrent_rows_differ")
+
+            second = harvester.run(OBRA_IDS)
+            if second["saved"] or second["unchanged"] != first["saved"]:
+                failures.append(f"rerun_not_skipped={second}")
+
+            ObrasStub.versions[OBRA_IDS[1]] = 1
+            third = harvester.run(OBRA_IDS)
+            if third["saved"] != 1:
+                failures.append(f"changed_page_count={third['saved']}")
+        finally:
+            server.shutdown()
+
+    print(f"obras={len(OBRA_IDS)}")
+    print(f"saved={first['saved']} empty={first['empty']} failed={first['failed']}")
+    print(f"serial_s={serial_s:.2f}")
+    print(f"concurrent_s={concurrent_s:.2f}")
+    print(f"speedup={serial_s / concurrent_s:.1f}x")
+    print(f"rerun={second}")
+    print(f"failures={len(failures)}")
+    for failure in failures:
+        print(f"failure={failure}")
+    return 2 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
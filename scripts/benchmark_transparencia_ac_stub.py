@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.ingest.transparencia_ac_connector import TransparenciaAcConnector  # noqa: E402
+
+CSRF_TOKEN = "stub-csrf"
+PORTAL_PAGES = {"despesas", "contratos", "licitacoes", "fornecedores"}
+LISTAR_TOTAL = 1200
+LEGACY_PAGAMENTOS_TOTAL = 1800
+ENTIDADES = [f"SECRETARIA DE ESTADO DE SAUDE - UNIDADE {idx:02d}" for idx in range(12)] + [
+    f"SECRETARIA DE ESTADO DA FAZENDA - UNIDADE {idx:02d}" for idx in range(4)
+]
+
+
+class PortalStub(BaseHTTPRequestHandler):
+    """Stub dos endpoints JSON do portal (listar, orgaos, dados-exportacao) e da API legada."""
+
+    latency = 0.05
+    counts: dict[str, int] = {}
+    lock = threading.Lock()
+
+    def log_message(self, *args) -> None:
+        return
+
+    def _count(self, key: str) -> None:
+        with self.lock:
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def _json(self, payload, status: int = 200) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        time.sleep(self.latency)
+        url = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        parts = [part for part in url.path.split("/") if part]
+        self._count("GET " + "/".join(parts[:2]))
+        if len(parts) == 1 and parts[0] in PORTAL_PAGES:
+            body = f'<html><head><meta name="csrf-token" content="{CSRF_TOKEN}"></head></html>'.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if parts[:2] == ["despesas", "orgaos"]:
+            page = int(query.get("page", "1"))
+            half = len(ENTIDADES) // 2
+            chunk = ENTIDADES[:half] if page == 1 else ENTIDADES[half:]
+            self._json({"data": [{"entidade": name} for name in chunk], "last_page": 2})
+            return
+        if parts[:3] == ["api", "v1", "json"]:
+            endpoint = parts[3:]
+            if endpoint[0] == "exercicios":
+                self._json([{"nome": "2023", "id": 23}, {"nome": "2024", "id": 24}])
+            elif endpoint[0] == "pagamentos" and endpoint[-1] == "count":
+                self._json({"totalDeRegistros": LEGACY_PAGAMENTOS_TOTAL})
+            elif endpoint[0] == "pagamentos":
+                page, size = int(query["page"]), int(query["pagesize"])
+                first = (page - 1) * size
+                self._json(
+                    [
+                        {
+                            "dataMovimento": "2024-01-01",
+                            "numeroEmpenho": f"{query['exer']}-{idx}",
+                            "credor": f"CREDOR {idx % 37}",
+                            "cnpjcpf": f"{idx:014d}",
+                            "unidadeGestora": ENTIDADES[idx % len(ENTIDADES)],
+                            "valor": f"{idx},50",
+                            "idEmpenho": idx,
+                        }
+                        for idx in range(first, min(first + size, LEGACY_PAGAMENTOS_TOTAL))
+                    ]
+                )
+            else:
+                self._json({"totalDeRegistros": 0})
+            return
+        self._json({}, status=404)
+
+    def do_POST(self) -> None:
+        time.sleep(self.latency)
+        length = int(self.headers.get("Content-Length") or 0)
+        form = {key: values[0] for key, values in parse_qs(self.rfile.read(length).decode("utf-8"), keep_blank_values=True).items()}
+        parts = [part for part in urlsplit(self.path).path.split("/") if part]
+        self._count("POST " + "/".join(parts))
+        if form.get("_token") != CSRF_TOKEN:
+            self._json({"message": "CSRF token mismatch."}, status=419)
+            return
+        page, endpoint = parts
+        seed = f"{page}:{form.get('ano')}:{form.get('orgao', '')}:{form.get('fornecedor', '')}"
+        if endpoint == "listar":
+            start, size = int(form["start"]), int(form["length"])
+            total = LISTAR_TOTAL if not form.get("orgao") else 60
+            self._json(
+                {
+                    "recordsTotal": total,
+                    "data": [
+                        {
+                            "entidade": form.get("orgao") or ENTIDADES[idx % len(ENTIDADES)],
+                            "razaosocial": f"FORNECEDOR {idx % 53} {seed}",
+                            "cpfcnpjcredor": f"{idx:014d}",
+                            "nome_licitante": f"FORNECEDOR {idx % 53}",
+                            "numero_contrato": f"{idx}/{form.get('ano')}",
+                            "numero_licitacao": str(idx),
+                            "pago": f"{idx}.25",
+                            "empenhado": f"{idx}.25",
+                        }
+                        for idx in range(start, min(start + size, total))
+                    ],
+                }
+            )
+            return
+        self._json(
+            [
+                {
+                    "entidade": form.get("orgao") or ENTIDADES[0],
+                    "razaosocial": form.get("fornecedor") or "FORNECEDOR 0",
+                    "cpfcnpjcredor": f"{idx:014d}",
+                    "numeroempenho": f"{seed}:{idx}",
+                    "totalempenho": "100,00",
+                }
+                for idx in range(5)
+            ]
+        )
+
+
+def harvest(base_url: str, *, workers: int, rps: float, checkpoint_dir: str | None = None) -> tuple[float, dict]:
+    connector = TransparenciaAcConnector(
+        data_dir=tempfile.mkdtemp(prefix="transparencia_ac_stub_"),
+        max_workers=workers,
+        requests_per_second=rps,
+        checkpoint_dir=checkpoint_dir,
+        base_url=base_url,
+    )
+    started = time.perf_counter()
+    result = connector.run(anos=[2023, 2024])
+    fornecedores = connector.get_fornecedores_por_orgao(2024, "SESACRE")
+    detalhes = connector.get_fornecedor_detalhes(2024, fornecedores=fornecedores[:40])
+    elapsed = time.perf_counter() - started
+    snapshot = {
+        "pagamentos": [row.__dict__ for row in result["pagamentos"]],
+        "contratos": [row.__dict__ for row in result["contratos"]],
+        "licitacoes": [row.__dict__ for row in result["licitacoes"]],
+        "fornecedores": [row.__dict__ for row in fornecedores],
+        "detalhes": [row.__dict__ for row in detalhes],
+    }
+    return elapsed, snapshot
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compara coleta serial e concorrente do portal do Acre contra um stub local.")
+    parser.add_argument("--latency", type=float, default=0.05, help="Latencia simulada por requisicao (s)")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rps", type=float, default=200.0)
+    args = parser.parse_args()
+
+    PortalStub.latency = args.latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PortalStub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    os.environ.update(
+        {
+            "TRANSPARENCIA_AC_VERSAO": "v1",
+            "TRANSPARENCIA_AC_CODIGO": "1",
+            "TRANSPARENCIA_AC_PREFIX": "/api",
+            "TRANSPARENCIA_AC_BASE_URL": base_url,
+        }
+    )
+
+    failures = []
+    try:
+        serial_s, serial = harvest(base_url, workers=1, rps=args.rps)
+        concurrent_s, concurrent = harvest(base_url, workers=args.workers, rps=args.rps)
+        if serial != concurrent:
+            failures.append("concurrent_output_differs")
+
+        with tempfile.TemporaryDirectory() as checkpoint_dir:
+            harvest(base_url, workers=args.workers, rps=args.rps, checkpoint_dir=checkpoint_dir)
+            PortalStub.counts.clear()
+            resumed_s, resumed = harvest(base_url, workers=args.workers, rps=args.rps, checkpoint_dir=checkpoint_dir)
+            resumed_posts = sum(count for key, count in PortalStub.counts.items() if key.startswith("POST"))
+            if resumed != serial:
+                failures.append("checkpoint_output_differs")
+            if resumed_posts:
+                failures.append(f"checkpoint_refetched_posts={resumed_posts}")
+    finally:
+        server.shutdown()
+
+    print(f"rows_pagamentos={len(serial['pagamentos'])}")
+    print(f"rows_detalhes={len(serial['detalhes'])}")
+    print(f"serial_s={serial_s:.2f}")
+    print(f"concurrent_s={concurrent_s:.2f}")
+    print(f"speedup={serial_s / concurrent_s:.1f}x")
+    print(f"resumed_s={resumed_s:.2f}")
+    print(f"failures={len(failures)}")
+    for failure in failures:
+        print(f"failure={failure}")
+    return 2 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
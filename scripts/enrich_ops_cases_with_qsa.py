@@ -1,17 +1,17 @@
 from __future__ import annotations
 
-import json
+from datetime import date
+
 import duckdb
-from pathlib import Path
-from src.core.legal_compliance import (
-    validate_cnpj,
-    validate_company_seniority,
-    validate_financial_capacity,
-    validate_cnae_compatibility,
-    calculate_risk_score
+from src.core.ops_version import mark_tables_written
+from src.core.risk_scoring import (
+    RISK_SCORE_TABLE,
+    company_features,
+    refresh_risk_scores,
 )
 
 DB_PATH = 'data/sentinela_analytics.duckdb'
+REFERENCE_DATE = date(2026, 3, 14)
 
 # Mapeamento de Família do Caso -> Setor Sentinel
 FAMILY_SECTOR_MAP = {
@@ -23,62 +23,49 @@ FAMILY_SECTOR_MAP = {
 def main():
     con = duckdb.connect(DB_PATH)
     try:
-        # 1. Puxar casos que possuem CNPJ
+        # 1. Casos com CNPJ e os dados da empresa no QSA/Receita, numa consulta
         cases = con.execute("""
-            SELECT case_id, subject_doc, valor_referencia_brl, family 
-            FROM ops_case_registry 
-            WHERE subject_doc IS NOT NULL AND subject_doc <> ''
+            SELECT
+                c.case_id,
+                c.subject_doc AS cnpj,
+                c.valor_referencia_brl AS valor,
+                c.family,
+                e.capital_social,
+                e.data_abertura,
+                e.cnae_principal
+            FROM ops_case_registry c
+            JOIN empresas_cnpj e ON e.cnpj = c.subject_doc
+            WHERE c.subject_doc IS NOT NULL AND c.subject_doc <> ''
+            QUALIFY ROW_NUMBER() OVER (PARTITION BY c.case_id) = 1
         """).fetchdf()
-        
-        for _, row in cases.iterrows():
-            case_id = row['case_id']
-            cnpj = row['subject_doc']
-            valor = row['valor_referencia_brl']
-            family = row['family']
-            
-            # 2. Buscar dados da empresa no QSA/Receita
-            qsa = con.execute("""
-                SELECT capital_social, data_abertura, cnae_principal
-                FROM empresas_cnpj
-                WHERE cnpj = ?
-                LIMIT 1
-            """, [cnpj]).fetchdf()
-            
-            if qsa.empty:
-                continue
-                
-            empresa = qsa.iloc[0]
-            capital = float(empresa['capital_social'] or 0)
-            data_abertura = str(empresa['data_abertura'] or "")
-            cnae_principal = str(empresa['cnae_principal'] or "")
-            
-            # 3. Recalcular métricas Sentinel
-            fin_res = validate_financial_capacity(valor, capital)
-            seniority = validate_company_seniority(data_abertura, "2026-03-14")
-            
-            # Validação de CNAE por Setor
-            target_sector = FAMILY_SECTOR_MAP.get(family)
-            cnae_res = validate_cnae_compatibility([cnae_principal], target_sector) if target_sector else {"compatible": True}
-            
-            metrics = {
-                "document_valid": validate_cnpj(cnpj),
-                "financial_ratio": fin_res["ratio"],
-                "front_company_risk": fin_res["is_front_company_risk"],
-                "days_old": seniority["days_old"],
-                "cnae_compatible": cnae_res["compatible"]
-            }
-            
-            risk = calculate_risk_score(metrics)
-            
-            # 4. Atualizar o registro do caso
-            con.execute("""
-                UPDATE ops_case_registry
-                SET risk_score = ?, risk_label = ?, risk_flags = ?
-                WHERE case_id = ?
-            """, [risk['score'], risk['risk_label'], risk['flags'], case_id])
-            
-            print(f"Enriched {case_id}: Score {risk['score']} ({risk['risk_label']}) - CNAE Compatible: {cnae_res['compatible']}")
-            
+        if cases.empty:
+            return
+
+        # 2. Métricas Sentinel e score em lote; só casos com entradas novas são repontuados
+        cases["target_sector"] = cases["family"].map(FAMILY_SECTOR_MAP)
+        features = company_features(cases, REFERENCE_DATE)
+        counts = refresh_risk_scores(con, cases["case_id"], features)
+
+        # 3. Atualizar o registro dos casos
+        con.execute(f"""
+            UPDATE ops_case_registry
+            SET risk_score = r.score, risk_label = r.risk_label, risk_flags = r.flags
+            FROM {RISK_SCORE_TABLE} r
+            WHERE r.entity_id = ops_case_registry.case_id
+              AND ops_case_registry.case_id IN (SELECT unnest(?))
+        """, [cases["case_id"].tolist()])
+        mark_tables_written(con, "ops_case_registry")
+
+        summary = con.execute(f"""
+            SELECT entity_id, score, risk_label, cnae_compatible
+            FROM {RISK_SCORE_TABLE}
+            WHERE entity_id IN (SELECT unnest(?))
+            ORDER BY entity_id
+        """, [cases["case_id"].tolist()]).fetchall()
+        for case_id, score, label, cnae_compatible in summary:
+            print(f"Enriched {case_id}: Score {score} ({label}) - CNAE Compatible: {cnae_compatible}")
+        print(f"Rescored {counts['scored']} case(s); {counts['unchanged']} unchanged.")
+
     finally:
         con.close()
 
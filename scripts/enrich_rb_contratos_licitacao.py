@@ -19,6 +19,7 @@ SCRIPTS_DIR = ROOT / "scripts"
 sys.path.insert(0, str(ROOT))
 sys.path.insert(0, str(SCRIPTS_DIR))
 
+from src.core.ops_version import mark_tables_written
 from src.ingest.riobranco_http import fetch_html
 import sync_rb_contratos as rb_contratos_sync
 
@@ -710,6 +711,7 @@ def main() -> None:
     if not args.dry_run:
         rb_contratos_sync.build_views(con)
         n_insights = rb_contratos_sync.build_insights(con)
+        mark_tables_written(con, "rb_contratos", "rb_contratos_licitacao_match", "insight")
         print(f"updated={updated}")
         print(f"insights={n_insights}")
     con.close()
@@ -18,6 +18,7 @@ SCRIPTS_DIR = ROOT / "scripts"
 sys.path.insert(0, str(ROOT))
 sys.path.insert(0, str(SCRIPTS_DIR))
 
+from src.core.ops_version import mark_tables_written
 from src.ingest.riobranco_http import fetch_html
 import sync_rb_contratos as rb_contratos_sync
 
@@ -535,6 +536,7 @@ def main() -> None:
     if not args.dry_run:
         rb_contratos_sync.build_views(con)
         n_insights = rb_contratos_sync.build_insights(con)
+        mark_tables_written(con, "rb_contratos", "rb_contratos_pdf_ocr", "insight")
         n_with_cnpj = con.execute(
             "SELECT COUNT(*) FROM rb_contratos WHERE cnpj <> ''"
         ).fetchone()[0]
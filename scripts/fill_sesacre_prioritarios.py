@@ -18,6 +18,7 @@ sys.path.insert(0, str(SCRIPTS_DIR))
 
 import sync_estado_ac
 import sync_sesacre_qsa
+from src.core.ops_version import mark_tables_written
 from src.ingest.cnpj_enricher import fetch_cnpj
 from src.ingest.transparencia_ac_connector import FornecedorDetalheRow, FornecedorResumoRow, TransparenciaAcConnector
 
@@ -311,6 +312,7 @@ def run(top_n: int, dry_run: bool) -> None:
             time.sleep(0.5)
 
     qsa_rows = upsert_targeted_qsa_rows(con, supplier_rows, empresas)
+    mark_tables_written(con, "empresas_cnpj", "empresa_socios", "estado_ac_fornecedor_qsa")
     refreshed_rows, qsa_insights = sync_sesacre_qsa.refresh_local(con, anos)
 
     existing_pairs = {
@@ -345,6 +347,8 @@ def run(top_n: int, dry_run: bool) -> None:
         time.sleep(0.4)
 
     detail_rows = upsert_targeted_detalhes(con, fetched_detail_rows)
+    if detail_rows:
+        mark_tables_written(con, "estado_ac_fornecedor_detalhes")
     con.close()
 
     log.info(
@@ -13,6 +13,8 @@ import duckdb
 ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT))
 
+from src.core.ops_version import mark_tables_written
+
 DUCKDB_PATH = ROOT / "data" / "sentinela_analytics.duckdb"
 SANCAO_KIND_PREFIX = "SESACRE_SANCAO_"
 
@@ -394,6 +396,7 @@ def main() -> None:
         n_cross = rebuild_cross(con)
         log.info("Total cruzamentos: %d", n_cross)
         n_ins = rebuild_insights(con)
+        mark_tables_written(con, "estado_ac_fornecedor_sancoes", "insight")
         log.info("Total insights: %d", n_ins)
 
         if n_cross > 0:
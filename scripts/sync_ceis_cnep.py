@@ -20,6 +20,13 @@ ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT))
 
 from src.core.insight_classification import ensure_insight_classification_columns
+from src.core.ops_version import mark_tables_written
+from src.core.sanction_intervals import (
+    ANTERIOR_A_SANCAO,
+    SANCAO_INTERVALO_TABLE,
+    interval_match_sql,
+    sync_sancao_intervalo,
+)
 
 log = logging.getLogger("sync_ceis_cnep")
 logging.basicConfig(
@@ -219,6 +226,8 @@ def ensure_tables(con: duckdb.DuckDBPyConnection) -> None:
         {
             "nome_sancionado": "VARCHAR",
             "n_pagamentos": "INTEGER",
+            "situacao_temporal": "VARCHAR",
+            "dias_sobreposicao": "INTEGER",
         },
     )
     ensure_insight_classification_columns(con)
@@ -497,54 +506,50 @@ def supplier_base_sql(con: duckdb.DuckDBPyConnection) -> str:
 def cross_with_estado(con: duckdb.DuckDBPyConnection, orgao_alvo: str) -> int:
     base_sql = supplier_base_sql(con)
     con.execute("DELETE FROM estado_ac_fornecedor_sancoes WHERE orgao = ?", [orgao_alvo])
+    # Ano de pagamento como intervalo [1/1, 1/1 do ano seguinte) contra os
+    # intervalos normalizados de sancao: a situacao temporal sai do proprio join.
+    intervals = sync_sancao_intervalo(con)
+    log.info(
+        "Intervalos de sancao: %d no snapshot | %d gravados/reabertos | %d fechados por remocao",
+        intervals["rows"],
+        intervals["upserted"],
+        intervals["removed"],
+    )
+    events_sql = f"""
+        SELECT
+            ano,
+            orgao,
+            fornecedor_nome,
+            fornecedor_cnpj,
+            fornecedor_cnpj AS cnpj,
+            total_pago,
+            n_pagamentos,
+            MAKE_DATE(CAST(ano AS INTEGER), 1, 1) AS evento_inicio,
+            MAKE_DATE(CAST(ano AS INTEGER) + 1, 1, 1) AS evento_fim
+        FROM ({base_sql})
+    """
     rows = con.execute(
         f"""
-        WITH fornecedores AS (
-            {base_sql}
-        ),
-        sancoes AS (
-            SELECT
-                'CEIS' AS fonte,
-                REGEXP_REPLACE(cnpj, '[^0-9]', '', 'g') AS cnpj,
-                nome AS nome_sancionado,
-                tipo_sancao,
-                data_inicio_sancao,
-                data_fim_sancao,
-                orgao_sancionador,
-                fundamentacao_legal,
-                NULL::DOUBLE AS multa
-            FROM federal_ceis
-            UNION ALL
-            SELECT
-                'CNEP' AS fonte,
-                REGEXP_REPLACE(cnpj, '[^0-9]', '', 'g') AS cnpj,
-                nome AS nome_sancionado,
-                tipo_sancao,
-                data_inicio_sancao,
-                data_fim_sancao,
-                orgao_sancionador,
-                fundamentacao_legal,
-                multa
-            FROM federal_cnep
-        )
         SELECT
-            f.ano,
-            f.orgao,
-            f.fornecedor_nome,
-            f.fornecedor_cnpj,
-            s.nome_sancionado,
-            f.total_pago,
-            f.n_pagamentos,
-            s.fonte,
-            s.tipo_sancao,
-            s.data_inicio_sancao,
-            s.data_fim_sancao,
-            s.orgao_sancionador,
-            s.fundamentacao_legal,
-            s.multa
-        FROM fornecedores f
-        JOIN sancoes s ON f.fornecedor_cnpj = s.cnpj
-        ORDER BY f.total_pago DESC, f.fornecedor_nome, s.fonte
+            ano,
+            orgao,
+            fornecedor_nome,
+            fornecedor_cnpj,
+            nome_sancionado,
+            total_pago,
+            n_pagamentos,
+            fonte,
+            tipo_sancao,
+            data_inicio_sancao,
+            data_fim_sancao,
+            orgao_sancionador,
+            fundamentacao_legal,
+            multa,
+            situacao_temporal,
+            dias_sobreposicao,
+            removed_at
+        FROM ({interval_match_sql(events_sql, f"SELECT * FROM {SANCAO_INTERVALO_TABLE}")})
+        ORDER BY total_pago DESC, fornecedor_nome, fonte
         """,
         [orgao_alvo],
     ).fetchall()
@@ -568,6 +573,9 @@ def cross_with_estado(con: duckdb.DuckDBPyConnection, orgao_alvo: str) -> int:
         orgao_sancionador,
         fundamentacao_legal,
         multa,
+        situacao_temporal,
+        dias_sobreposicao,
+        removed_at,
     ) in rows:
         payload.append(
             (
@@ -592,10 +600,13 @@ def cross_with_estado(con: duckdb.DuckDBPyConnection, orgao_alvo: str) -> int:
                 tipo_sancao,
                 data_inicio_sancao,
                 data_fim_sancao,
-                infer_status(data_fim_sancao),
+                # Fora do snapshot atual do CEIS/CNEP: intervalo ja fechado.
+                "REMOVIDA" if removed_at is not None else infer_status(data_fim_sancao),
                 orgao_sancionador,
                 fundamentacao_legal,
                 parse_float(multa),
+                situacao_temporal,
+                int(dias_sobreposicao or 0),
             )
         )
     con.executemany(
@@ -604,8 +615,8 @@ def cross_with_estado(con: duckdb.DuckDBPyConnection, orgao_alvo: str) -> int:
             row_id, ano, orgao, fornecedor_nome, fornecedor_cnpj, nome_sancionado,
             total_pago, n_pagamentos, fonte, tipo_sancao, data_inicio_sancao,
             data_fim_sancao, status_sancao, orgao_sancionador, fundamentacao_legal,
-            multa, capturado_em
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            multa, situacao_temporal, dias_sobreposicao, capturado_em
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
         """,
         payload,
     )
@@ -614,6 +625,7 @@ def cross_with_estado(con: duckdb.DuckDBPyConnection, orgao_alvo: str) -> int:
 
 def build_insights(con: duckdb.DuckDBPyConnection, orgao_alvo: str) -> int:
     con.execute("DELETE FROM insight WHERE kind LIKE ?", [f"{KIND_PREFIX}%"])
+    # Pagamentos de um ano anterior ao inicio da sancao nao sao cruzamento.
     rows = con.execute(
         """
         SELECT
@@ -634,10 +646,11 @@ def build_insights(con: duckdb.DuckDBPyConnection, orgao_alvo: str) -> int:
             multa
         FROM estado_ac_fornecedor_sancoes
         WHERE orgao = ?
+          AND situacao_temporal IS DISTINCT FROM ?
         ORDER BY total_pago DESC, fornecedor_nome, fonte
         LIMIT 500
         """,
-        [orgao_alvo],
+        [orgao_alvo, ANTERIOR_A_SANCAO],
     ).fetchall()
     if not rows:
         return 0
@@ -761,6 +774,7 @@ def run(data_str: str, local_ceis: Path | None, local_cnep: Path | None, downloa
         log.info("Cruzamentos %s x sancoes: %d", ORGAO_ALVO, n_cruz)
         n_ins = build_insights(con, ORGAO_ALVO)
         log.info("Insights gerados: %d", n_ins)
+        mark_tables_written(con, "federal_ceis", "federal_cnep", "estado_ac_fornecedor_sancoes", "insight")
         create_compat_views(con)
         log.info(
             "=== Concluido: CEIS=%d | CNEP=%d | cruzamentos=%d | insights=%d ===",
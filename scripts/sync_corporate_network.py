@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+import duckdb
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.core.corporate_network import CLUSTER_TABLE, sync_corporate_network  # noqa: E402
+
+DB_PATH = ROOT / "data" / "sentinela_analytics.duckdb"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Atualiza a rede societaria (clusters socio <-> CNPJ) a partir do QSA.")
+    parser.add_argument("--db-path", default=str(DB_PATH))
+    parser.add_argument("--full", action="store_true", help="Refaz o grafo inteiro em vez de aplicar so as mudancas")
+    args = parser.parse_args()
+
+    con = duckdb.connect(args.db_path)
+    try:
+        con.begin()
+        try:
+            result = sync_corporate_network(con, full=args.full)
+            con.commit()
+        except Exception:
+            con.rollback()
+            raise
+        top = con.execute(
+            f"""
+            SELECT cluster_id, n_empresas, n_socios, n_socios_compartilhados, max_empresas_por_socio
+            FROM {CLUSTER_TABLE}
+            ORDER BY n_empresas DESC, cluster_id
+            LIMIT 10
+            """
+        ).fetchall()
+    finally:
+        con.close()
+
+    for key, value in result.items():
+        print(f"{key}={value}")
+    for row in top:
+        print("cluster=" + " ".join(str(value) for value in row))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+import duckdb
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.core.entity_timeline import refresh_entity_timeline
+from src.core.ops_runtime import begin_pipeline_run, ensure_ops_runtime, finish_pipeline_run
+
+
+DB_PATH = ROOT / "data" / "sentinela_analytics.duckdb"
+
+
+def main() -> int:
+    con = duckdb.connect(str(DB_PATH))
+    ensure_ops_runtime(con)
+    run_id = begin_pipeline_run(
+        con,
+        "ingest_entity_timeline",
+        trigger_mode="manual",
+        actor="script",
+    )
+    try:
+        stats = refresh_entity_timeline(con)
+        finish_pipeline_run(
+            con,
+            run_id,
+            status="success",
+            rows_written=int(stats["rows_written"]),
+            details=stats,
+        )
+        print(f"rows_written={stats['rows_written']}")
+        print(f"entities={stats['entities']}")
+        return 0
+    except Exception as exc:
+        finish_pipeline_run(
+            con,
+            run_id,
+            status="failed",
+            error_text=str(exc),
+            details={"pipeline": "ingest_entity_timeline"},
+        )
+        raise
+    finally:
+        con.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -6,7 +6,8 @@ import json
 import logging
 import sys
 from collections import Counter
-from datetime import UTC, datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parent.parent
@@ -14,7 +15,23 @@ sys.path.insert(0, str(ROOT))
 
 import duckdb
 
+from src.core.fracionamento import refresh_fracionamento
 from src.core.insight_classification import ensure_insight_classification_columns
+from src.core.insight_rules import (
+    INSIGHT_RULE_COLUMNS,
+    InsightRule,
+    bind_named_params,
+    case_sql,
+    confidence_for_count_sql,
+    insight_rules_sql,
+    json_list_sql,
+    lookup_sql,
+    query_insight_rules,
+    severity_for_total_sql,
+    sql_literal,
+    template_sql,
+)
+from src.core.partition_cdc import PartitionChanges, apply_partition_cdc
 from src.ingest.transparencia_ac_connector import (
     ContratoRow,
     FornecedorDetalheRow,
@@ -32,6 +49,9 @@ logging.basicConfig(
 )
 
 DB_PATH = ROOT / "data" / "sentinela_analytics.duckdb"
+CHECKPOINT_DIR = ROOT / "data" / "transparencia_ac" / "checkpoints"
+DEFAULT_WORKERS = 4
+DEFAULT_YEAR_WORKERS = 2
 ESFERA = "estadual"
 ENTE = "Governo do Estado do Acre"
 UF = "AC"
@@ -180,6 +200,90 @@ CREATE TABLE IF NOT EXISTS estado_ac_fornecedores (
 )
 """
 
+# Colunas gravadas pelo sync (row_id e a chave natural de cada particao anual).
+PAGAMENTOS_COLUMNS = [
+    "row_id",
+    "ano",
+    "data_movimento",
+    "numero_empenho",
+    "credor",
+    "cnpjcpf",
+    "natureza_despesa",
+    "modalidade",
+    "valor",
+    "id_empenho",
+    "orgao",
+    "unidade_gestora",
+    "codigo_unidade",
+]
+CONTRATOS_COLUMNS = [
+    "row_id",
+    "ano",
+    "numero",
+    "tipo",
+    "data_inicio_vigencia",
+    "data_fim_vigencia",
+    "valor",
+    "credor",
+    "cnpjcpf",
+    "objeto",
+    "orgao",
+    "unidade_gestora",
+]
+LICITACOES_COLUMNS = [
+    "row_id",
+    "ano",
+    "numero_processo",
+    "modalidade",
+    "objeto",
+    "valor_estimado",
+    "valor_real",
+    "situacao",
+    "data_abertura",
+    "orgao",
+    "unidade_gestora",
+    "fornecedores_json",
+]
+FORNECEDOR_DETALHES_COLUMNS = [
+    "row_id",
+    "ano",
+    "entidade",
+    "orgao",
+    "razao_social",
+    "cnpjcpf",
+    "numero_empenho",
+    "ano_empenho",
+    "data_empenho",
+    "total_empenho",
+    "historico",
+    "despesa_orcamentaria",
+    "funcao",
+    "subfuncao",
+    "fonte_recurso",
+    "numero_liquidacao",
+    "data_liquidacao",
+    "valor_liquidacao",
+    "numero_pagamento",
+    "data_pagamento",
+    "valor_pagamento",
+]
+FORNECEDORES_COLUMNS = [
+    "row_id",
+    "ano",
+    "orgao",
+    "razao_social",
+    "cnpjcpf",
+    "total_empenhado",
+    "total_liquidado",
+    "total_pago",
+    "n_empenhos",
+    "n_liquidacoes",
+    "n_pagamentos",
+    "entidades_json",
+]
+YEAR_TABLES = ("pagamentos", "contratos", "licitacoes", "fornecedores", "fornecedor_detalhes", "insights")
+ESTADO_INSIGHT_PARTITION_SQL = "esfera = 'estadual' AND uf = 'AC' AND ano_referencia = ? AND kind LIKE ?"
+
 
 def ensure_extra_insight_columns(con: duckdb.DuckDBPyConnection) -> None:
     ensure_insight_classification_columns(con)
@@ -219,11 +323,7 @@ def ensure_tables(con: duckdb.DuckDBPyConnection) -> None:
     ensure_extra_insight_columns(con)
 
 
-def upsert_pagamentos(con: duckdb.DuckDBPyConnection, rows: list[PagamentoRow], ano: int) -> int:
-    con.execute("DELETE FROM estado_ac_pagamentos WHERE ano = ?", [ano])
-    if not rows:
-        return 0
-
+def upsert_pagamentos(con: duckdb.DuckDBPyConnection, rows: list[PagamentoRow], ano: int) -> PartitionChanges:
     payload = [
         (
             row_hash(ano, row.numero_empenho, row.id_empenho, row.cnpjcpf, row.valor, row.data_movimento),
@@ -242,25 +342,18 @@ def upsert_pagamentos(con: duckdb.DuckDBPyConnection, rows: list[PagamentoRow],
         )
         for row in rows
     ]
-    payload = dedupe_payload(payload)
-    con.executemany(
-        """
-        INSERT INTO estado_ac_pagamentos (
-            row_id, ano, data_movimento, numero_empenho, credor, cnpjcpf,
-            natureza_despesa, modalidade, valor, id_empenho,
-            orgao, unidade_gestora, codigo_unidade
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        payload,
+    return apply_partition_cdc(
+        con,
+        "estado_ac_pagamentos",
+        PAGAMENTOS_COLUMNS,
+        dedupe_payload(payload),
+        partition_sql="ano = ?",
+        partition_params=[ano],
+        touch_column="capturado_em",
     )
-    return len(payload)
-
 
-def upsert_contratos(con: duckdb.DuckDBPyConnection, rows: list[ContratoRow], ano: int) -> int:
-    con.execute("DELETE FROM estado_ac_contratos WHERE ano = ?", [ano])
-    if not rows:
-        return 0
 
+def upsert_contratos(con: duckdb.DuckDBPyConnection, rows: list[ContratoRow], ano: int) -> PartitionChanges:
     payload = [
         (
             row_hash(
@@ -287,24 +380,18 @@ def upsert_contratos(con: duckdb.DuckDBPyConnection, rows: list[ContratoRow], an
         )
         for row in rows
     ]
-    payload = dedupe_payload(payload)
-    con.executemany(
-        """
-        INSERT INTO estado_ac_contratos (
-            row_id, ano, numero, tipo, data_inicio_vigencia, data_fim_vigencia,
-            valor, credor, cnpjcpf, objeto, orgao, unidade_gestora
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        payload,
+    return apply_partition_cdc(
+        con,
+        "estado_ac_contratos",
+        CONTRATOS_COLUMNS,
+        dedupe_payload(payload),
+        partition_sql="ano = ?",
+        partition_params=[ano],
+        touch_column="capturado_em",
     )
-    return len(payload)
 
 
-def upsert_licitacoes(con: duckdb.DuckDBPyConnection, rows: list[LicitacaoRow], ano: int) -> int:
-    con.execute("DELETE FROM estado_ac_licitacoes WHERE ano = ?", [ano])
-    if not rows:
-        return 0
-
+def upsert_licitacoes(con: duckdb.DuckDBPyConnection, rows: list[LicitacaoRow], ano: int) -> PartitionChanges:
     payload = [
         (
             row_hash(
@@ -330,29 +417,22 @@ def upsert_licitacoes(con: duckdb.DuckDBPyConnection, rows: list[LicitacaoRow],
         )
         for row in rows
     ]
-    payload = dedupe_payload(payload)
-    con.executemany(
-        """
-        INSERT INTO estado_ac_licitacoes (
-            row_id, ano, numero_processo, modalidade, objeto,
-            valor_estimado, valor_real, situacao, data_abertura,
-            orgao, unidade_gestora, fornecedores_json
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        payload,
+    return apply_partition_cdc(
+        con,
+        "estado_ac_licitacoes",
+        LICITACOES_COLUMNS,
+        dedupe_payload(payload),
+        partition_sql="ano = ?",
+        partition_params=[ano],
+        touch_column="capturado_em",
     )
-    return len(payload)
 
 
 def upsert_fornecedor_detalhes(
     con: duckdb.DuckDBPyConnection,
     rows: list[FornecedorDetalheRow],
     ano: int,
-) -> int:
-    con.execute("DELETE FROM estado_ac_fornecedor_detalhes WHERE ano = ?", [ano])
-    if not rows:
-        return 0
-
+) -> PartitionChanges:
     payload = [
         (
             row_hash(
@@ -390,20 +470,15 @@ def upsert_fornecedor_detalhes(
         )
         for row in rows
     ]
-    payload = dedupe_payload(payload)
-    con.executemany(
-        """
-        INSERT INTO estado_ac_fornecedor_detalhes (
-            row_id, ano, entidade, orgao, razao_social, cnpjcpf,
-            numero_empenho, ano_empenho, data_empenho, total_empenho,
-            historico, despesa_orcamentaria, funcao, subfuncao, fonte_recurso,
-            numero_liquidacao, data_liquidacao, valor_liquidacao,
-            numero_pagamento, data_pagamento, valor_pagamento
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        payload,
+    return apply_partition_cdc(
+        con,
+        "estado_ac_fornecedor_detalhes",
+        FORNECEDOR_DETALHES_COLUMNS,
+        dedupe_payload(payload),
+        partition_sql="ano = ?",
+        partition_params=[ano],
+        touch_column="capturado_em",
     )
-    return len(payload)
 
 
 def _supplier_identity(razao_social: str, cnpjcpf: str) -> str:
@@ -622,11 +697,7 @@ def upsert_fornecedores(
     con: duckdb.DuckDBPyConnection,
     rows: list[dict],
     ano: int,
-) -> int:
-    con.execute("DELETE FROM estado_ac_fornecedores WHERE ano = ?", [ano])
-    if not rows:
-        return 0
-
+) -> PartitionChanges:
     payload = [
         (
             row_hash(
@@ -649,171 +720,159 @@ def upsert_fornecedores(
         )
         for row in rows
     ]
-    payload = dedupe_payload(payload)
-    con.executemany(
-        """
-        INSERT INTO estado_ac_fornecedores (
-            row_id, ano, orgao, razao_social, cnpjcpf,
-            total_empenhado, total_liquidado, total_pago,
-            n_empenhos, n_liquidacoes, n_pagamentos, entidades_json
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        payload,
+    return apply_partition_cdc(
+        con,
+        "estado_ac_fornecedores",
+        FORNECEDORES_COLUMNS,
+        dedupe_payload(payload),
+        partition_sql="ano = ?",
+        partition_params=[ano],
+        touch_column="capturado_em",
     )
-    return len(payload)
 
 
-def severity_for_total(total: float, *, high: float, critical: float) -> str:
-    if total >= critical:
-        return "CRITICO"
-    if total >= high:
-        return "ALTO"
-    return "MEDIO"
+def _estado_rule(kind: str, query: str, *, templates: dict, values: dict, derived: dict | None = None) -> InsightRule:
+    return InsightRule(
+        kind=f"{ESTADO_KIND_PREFIX}{kind}",
+        query=query,
+        templates=templates,
+        values=values,
+        derived={
+            "ano": "CAST($ano AS INTEGER)",
+            "area": lookup_sql("orgao", AREA_MAP, "gestao_estadual"),
+            **(derived or {}),
+        },
+    )
 
 
-def confidence_for_count(count: int, *, base: int = 65, step: int = 3, cap: int = 95) -> int:
-    return min(cap, base + count * step)
+def _estado_tags(axis: str, *extra: str, with_cnpj: bool = False) -> str:
+    return json_list_sql(
+        ["'estado_ac'", "orgao", template_sql("ano:{ano}"), sql_literal(axis), "area", *extra],
+        optional=[("COALESCE(cnpjcpf, '') <> ''", template_sql("cnpj:{cnpjcpf}"))] if with_cnpj else (),
+    )
 
 
-def build_insights(con: duckdb.DuckDBPyConnection, ano: int) -> list[dict]:
-    now = datetime.now(UTC)
-    insights: list[dict] = []
+# Identificacao do fornecedor: documento, ou hash de orgao|razao social.
+SUPPLIER_DERIVED = {
+    "supplier_id": "COALESCE(NULLIF(cnpjcpf, ''), left(sha1(concat(orgao, '|', razao_social)), 12))",
+    "doc_label": "CASE WHEN COALESCE(cnpjcpf, '') <> '' THEN concat(' (', cnpjcpf, ')') ELSE '' END",
+    "doc_code": "CASE WHEN COALESCE(cnpjcpf, '') <> '' THEN concat(' (`', cnpjcpf, '`)') ELSE '' END",
+}
+
+ESTADO_INSIGHT_DEFAULTS = {
+    "sources": json_list_sql([sql_literal(FONTE)]),
+    "esfera": sql_literal(ESFERA),
+    "ente": sql_literal(ENTE),
+    "orgao": "orgao",
+    "municipio": "''",
+    "uf": sql_literal(UF),
+    "area_tematica": "area",
+    "sus": f"orgao IN ({', '.join(sql_literal(orgao) for orgao in sorted(SUS_ORGAOS))})",
+    "ano_referencia": "ano",
+    "fonte": sql_literal(SOURCE_TAG),
+    "created_at": "CURRENT_TIMESTAMP",
+}
 
-    pagamentos = con.execute(
+ESTADO_INSIGHT_RULES = [
+    _estado_rule(
+        "PAGAMENTO_ORGAO_ANO",
         """
         SELECT orgao, COUNT(*) AS n_pag, SUM(valor) AS total_val, COUNT(DISTINCT cnpjcpf) AS n_cred
         FROM estado_ac_pagamentos
-        WHERE ano = ? AND orgao IS NOT NULL AND orgao <> ''
+        WHERE ano = $ano AND orgao IS NOT NULL AND orgao <> ''
         GROUP BY orgao
-        ORDER BY total_val DESC
         """,
-        [ano],
-    ).fetchall()
-    for orgao, n_pag, total_val, n_cred in pagamentos:
-        area = AREA_MAP.get(orgao, "gestao_estadual")
-        insights.append(
-            {
-                "id": f"ESTADO_AC:pagamentos:{ano}:{orgao}",
-                "kind": f"{ESTADO_KIND_PREFIX}PAGAMENTO_ORGAO_ANO",
-                "severity": severity_for_total(total_val or 0.0, high=10_000_000, critical=50_000_000),
-                "confidence": confidence_for_count(int(n_pag), base=68),
-                "exposure_brl": float(total_val or 0.0),
-                "title": f"{orgao} — Pagamentos {ano}",
-                "description_md": (
-                    f"O órgão **{orgao}** realizou **{int(n_pag):,} pagamentos** em **{ano}**, "
-                    f"totalizando **R$ {float(total_val or 0.0):,.2f}** para **{int(n_cred):,} credores distintos**."
-                ),
-                "pattern": "ORGAO_ESTADUAL -> PAGAMENTOS_AGREGADOS_POR_ANO",
-                "sources": [FONTE],
-                "tags": ["estado_ac", orgao, f"ano:{ano}", "pagamentos", area],
-                "sample_n": int(n_pag),
-                "unit_total": float(total_val or 0.0),
-                "esfera": ESFERA,
-                "ente": ENTE,
-                "orgao": orgao,
-                "municipio": "",
-                "uf": UF,
-                "area_tematica": area,
-                "sus": orgao in SUS_ORGAOS,
-                "valor_referencia": float(total_val or 0.0),
-                "ano_referencia": ano,
-                "fonte": SOURCE_TAG,
-                "created_at": now,
-            }
-        )
-
-    contratos = con.execute(
+        derived={"total": "COALESCE(total_val, 0.0)"},
+        templates={
+            "id": "ESTADO_AC:pagamentos:{ano}:{orgao}",
+            "title": "{orgao} — Pagamentos {ano}",
+            "description_md": (
+                "O órgão **{orgao}** realizou **{n_pag:,} pagamentos** em **{ano}**, "
+                "totalizando **R$ {total:,.2f}** para **{n_cred:,} credores distintos**."
+            ),
+        },
+        values={
+            "severity": severity_for_total_sql("total", high=10_000_000, critical=50_000_000),
+            "confidence": confidence_for_count_sql("n_pag", base=68),
+            "exposure_brl": "total",
+            "pattern": "'ORGAO_ESTADUAL -> PAGAMENTOS_AGREGADOS_POR_ANO'",
+            "tags": _estado_tags("pagamentos"),
+            "sample_n": "n_pag",
+            "unit_total": "total",
+            "valor_referencia": "total",
+        },
+    ),
+    _estado_rule(
+        "CONTRATO_ORGAO_ANO",
         """
         SELECT orgao, COUNT(*) AS n_contratos, SUM(valor) AS total_val
         FROM estado_ac_contratos
-        WHERE ano = ? AND orgao IS NOT NULL AND orgao <> ''
+        WHERE ano = $ano AND orgao IS NOT NULL AND orgao <> ''
         GROUP BY orgao
-        ORDER BY total_val DESC
         """,
-        [ano],
-    ).fetchall()
-    for orgao, n_contratos, total_val in contratos:
-        area = AREA_MAP.get(orgao, "gestao_estadual")
-        insights.append(
-            {
-                "id": f"ESTADO_AC:contratos:{ano}:{orgao}",
-                "kind": f"{ESTADO_KIND_PREFIX}CONTRATO_ORGAO_ANO",
-                "severity": severity_for_total(total_val or 0.0, high=5_000_000, critical=20_000_000),
-                "confidence": confidence_for_count(int(n_contratos), base=66),
-                "exposure_brl": float(total_val or 0.0),
-                "title": f"{orgao} — Contratos {ano}",
-                "description_md": (
-                    f"O órgão **{orgao}** firmou **{int(n_contratos):,} contratos** em **{ano}**, "
-                    f"com valor acumulado de **R$ {float(total_val or 0.0):,.2f}**."
-                ),
-                "pattern": "ORGAO_ESTADUAL -> CONTRATOS_AGREGADOS_POR_ANO",
-                "sources": [FONTE],
-                "tags": ["estado_ac", orgao, f"ano:{ano}", "contratos", area],
-                "sample_n": int(n_contratos),
-                "unit_total": float(total_val or 0.0),
-                "esfera": ESFERA,
-                "ente": ENTE,
-                "orgao": orgao,
-                "municipio": "",
-                "uf": UF,
-                "area_tematica": area,
-                "sus": orgao in SUS_ORGAOS,
-                "valor_referencia": float(total_val or 0.0),
-                "ano_referencia": ano,
-                "fonte": SOURCE_TAG,
-                "created_at": now,
-            }
-        )
-
-    licitacoes = con.execute(
+        derived={"total": "COALESCE(total_val, 0.0)"},
+        templates={
+            "id": "ESTADO_AC:contratos:{ano}:{orgao}",
+            "title": "{orgao} — Contratos {ano}",
+            "description_md": (
+                "O órgão **{orgao}** firmou **{n_contratos:,} contratos** em **{ano}**, "
+                "com valor acumulado de **R$ {total:,.2f}**."
+            ),
+        },
+        values={
+            "severity": severity_for_total_sql("total", high=5_000_000, critical=20_000_000),
+            "confidence": confidence_for_count_sql("n_contratos", base=66),
+            "exposure_brl": "total",
+            "pattern": "'ORGAO_ESTADUAL -> CONTRATOS_AGREGADOS_POR_ANO'",
+            "tags": _estado_tags("contratos"),
+            "sample_n": "n_contratos",
+            "unit_total": "total",
+            "valor_referencia": "total",
+        },
+    ),
+    _estado_rule(
+        "LICITACAO_ORGAO_MODALIDADE_ANO",
         """
         SELECT orgao, modalidade, COUNT(*) AS n_licitacoes, SUM(COALESCE(valor_real, valor_estimado, 0)) AS total_val
         FROM estado_ac_licitacoes
-        WHERE ano = ? AND orgao IS NOT NULL AND orgao <> ''
+        WHERE ano = $ano AND orgao IS NOT NULL AND orgao <> ''
         GROUP BY orgao, modalidade
         HAVING COUNT(*) > 0
         ORDER BY total_val DESC
         LIMIT 100
         """,
-        [ano],
-    ).fetchall()
-    for orgao, modalidade, n_licitacoes, total_val in licitacoes:
-        area = AREA_MAP.get(orgao, "gestao_estadual")
-        modalidade_norm = (modalidade or "").upper()
-        severity = "ALTO" if any(flag in modalidade_norm for flag in ("DISPENSA", "INEXIGIBILIDADE")) else "MEDIO"
-        insights.append(
-            {
-                "id": f"ESTADO_AC:licitacoes:{ano}:{orgao}:{modalidade_norm or 'NI'}",
-                "kind": f"{ESTADO_KIND_PREFIX}LICITACAO_ORGAO_MODALIDADE_ANO",
-                "severity": severity,
-                "confidence": confidence_for_count(int(n_licitacoes), base=62),
-                "exposure_brl": float(total_val or 0.0),
-                "title": f"{orgao} — Licitações {modalidade or 'Geral'} {ano}",
-                "description_md": (
-                    f"O órgão **{orgao}** abriu **{int(n_licitacoes):,} licitação(ões)** "
-                    f"na modalidade **{modalidade or 'N/I'}** em **{ano}**, "
-                    f"somando **R$ {float(total_val or 0.0):,.2f}**."
-                ),
-                "pattern": "ORGAO_ESTADUAL -> LICITACOES_MODALIDADE_AGREGADAS_POR_ANO",
-                "sources": [FONTE],
-                "tags": ["estado_ac", orgao, f"ano:{ano}", "licitacoes", area, modalidade or "N/I"],
-                "sample_n": int(n_licitacoes),
-                "unit_total": float(total_val or 0.0),
-                "esfera": ESFERA,
-                "ente": ENTE,
-                "orgao": orgao,
-                "municipio": "",
-                "uf": UF,
-                "area_tematica": area,
-                "sus": orgao in SUS_ORGAOS,
-                "valor_referencia": float(total_val or 0.0),
-                "ano_referencia": ano,
-                "fonte": SOURCE_TAG,
-                "created_at": now,
-            }
-        )
-
-    fornecedores = con.execute(
+        derived={
+            "total": "COALESCE(total_val, 0.0)",
+            "modalidade_norm": "upper(COALESCE(modalidade, ''))",
+            "modalidade_id": "COALESCE(NULLIF(upper(COALESCE(modalidade, '')), ''), 'NI')",
+            "modalidade_titulo": "COALESCE(NULLIF(modalidade, ''), 'Geral')",
+            "modalidade_label": "COALESCE(NULLIF(modalidade, ''), 'N/I')",
+        },
+        templates={
+            "id": "ESTADO_AC:licitacoes:{ano}:{orgao}:{modalidade_id}",
+            "title": "{orgao} — Licitações {modalidade_titulo} {ano}",
+            "description_md": (
+                "O órgão **{orgao}** abriu **{n_licitacoes:,} licitação(ões)** "
+                "na modalidade **{modalidade_label}** em **{ano}**, "
+                "somando **R$ {total:,.2f}**."
+            ),
+        },
+        values={
+            "severity": case_sql(
+                [("contains(modalidade_norm, 'DISPENSA') OR contains(modalidade_norm, 'INEXIGIBILIDADE')", "'ALTO'")],
+                "'MEDIO'",
+            ),
+            "confidence": confidence_for_count_sql("n_licitacoes", base=62),
+            "exposure_brl": "total",
+            "pattern": "'ORGAO_ESTADUAL -> LICITACOES_MODALIDADE_AGREGADAS_POR_ANO'",
+            "tags": _estado_tags("licitacoes", "modalidade_label"),
+            "sample_n": "n_licitacoes",
+            "unit_total": "total",
+            "valor_referencia": "total",
+        },
+    ),
+    _estado_rule(
+        "FORNECEDOR_ORGAO_ANO",
         """
         WITH ranked AS (
             SELECT
@@ -831,90 +890,60 @@ def build_insights(con: duckdb.DuckDBPyConnection, ano: int) -> list[dict]:
                     ORDER BY total_pago DESC, total_liquidado DESC, total_empenhado DESC, razao_social
                 ) AS rn
             FROM estado_ac_fornecedores
-            WHERE ano = ? AND orgao IS NOT NULL AND orgao <> '' AND COALESCE(total_pago, 0) > 0
+            WHERE ano = $ano AND orgao IS NOT NULL AND orgao <> '' AND COALESCE(total_pago, 0) > 0
         )
         SELECT
             orgao, razao_social, cnpjcpf, total_pago, total_liquidado, total_empenhado,
             n_empenhos, n_liquidacoes, n_pagamentos
         FROM ranked
         WHERE rn <= 5
-        ORDER BY orgao, total_pago DESC, razao_social
         """,
-        [ano],
-    ).fetchall()
-    for (
-        orgao,
-        razao_social,
-        cnpjcpf,
-        total_pago,
-        total_liquidado,
-        total_empenhado,
-        n_empenhos,
-        n_liquidacoes,
-        n_pagamentos,
-    ) in fornecedores:
-        area = AREA_MAP.get(orgao, "gestao_estadual")
-        doc_label = f" ({cnpjcpf})" if cnpjcpf else ""
-        supplier_id = cnpjcpf or row_hash(orgao, razao_social)[:12]
-        n_pag = int(n_pagamentos or 0)
-        n_liq = int(n_liquidacoes or 0)
-        n_emp = int(n_empenhos or 0)
-        if n_pag or n_liq or n_emp:
-            description_md = (
-                f"O fornecedor **{razao_social}**"
-                f"{f' (`{cnpjcpf}`)' if cnpjcpf else ''} recebeu **R$ {float(total_pago or 0.0):,.2f}** "
-                f"do órgão **{orgao}** em **{ano}**, com **{n_pag:,} pagamentos**, "
-                f"**{n_liq:,} liquidações** e **{n_emp:,} empenhos** "
-                f"identificados no portal estadual."
-            )
-        else:
-            description_md = (
-                f"O fornecedor **{razao_social}**"
-                f"{f' (`{cnpjcpf}`)' if cnpjcpf else ''} aparece no recorte oficial do órgão **{orgao}** "
-                f"em **{ano}**, com total pago de **R$ {float(total_pago or 0.0):,.2f}**, "
-                f"total liquidado de **R$ {float(total_liquidado or 0.0):,.2f}** "
-                f"e total empenhado de **R$ {float(total_empenhado or 0.0):,.2f}**."
-            )
-        insights.append(
-            {
-                "id": f"ESTADO_AC:fornecedor:{ano}:{orgao}:{supplier_id}",
-                "kind": f"{ESTADO_KIND_PREFIX}FORNECEDOR_ORGAO_ANO",
-                "severity": severity_for_total(total_pago or 0.0, high=1_000_000, critical=10_000_000),
-                "confidence": confidence_for_count(
-                    max(n_pag, n_emp, 1),
-                    base=72,
-                    step=2,
-                ),
-                "exposure_brl": float(total_pago or 0.0),
-                "title": f"{orgao} — {razao_social}{doc_label} em {ano}",
-                "description_md": description_md,
-                "pattern": "ORGAO_ESTADUAL -> FORNECEDOR_CNPJ -> PAGAMENTOS_AGREGADOS_POR_ANO",
-                "sources": [FONTE],
-                "tags": [
-                    "estado_ac",
-                    orgao,
-                    f"ano:{ano}",
-                    "fornecedores",
-                    area,
-                    *( [f"cnpj:{cnpjcpf}"] if cnpjcpf else [] ),
+        derived={
+            **SUPPLIER_DERIVED,
+            "pago": "COALESCE(total_pago, 0.0)",
+            "liquidado": "COALESCE(total_liquidado, 0.0)",
+            "empenhado": "COALESCE(total_empenhado, 0.0)",
+            "n_pag": "COALESCE(n_pagamentos, 0)",
+            "n_liq": "COALESCE(n_liquidacoes, 0)",
+            "n_emp": "COALESCE(n_empenhos, 0)",
+            "amostra": "GREATEST(COALESCE(n_pagamentos, 0), COALESCE(n_empenhos, 0), 1)",
+        },
+        templates={
+            "id": "ESTADO_AC:fornecedor:{ano}:{orgao}:{supplier_id}",
+            "title": "{orgao} — {razao_social}{doc_label} em {ano}",
+        },
+        values={
+            "severity": severity_for_total_sql("pago", high=1_000_000, critical=10_000_000),
+            "confidence": confidence_for_count_sql("amostra", base=72, step=2),
+            "exposure_brl": "pago",
+            "description_md": case_sql(
+                [
+                    (
+                        "n_pag <> 0 OR n_liq <> 0 OR n_emp <> 0",
+                        template_sql(
+                            "O fornecedor **{razao_social}**{doc_code} recebeu **R$ {pago:,.2f}** "
+                            "do órgão **{orgao}** em **{ano}**, com **{n_pag:,} pagamentos**, "
+                            "**{n_liq:,} liquidações** e **{n_emp:,} empenhos** "
+                            "identificados no portal estadual."
+                        ),
+                    )
                 ],
-                "sample_n": max(n_pag, n_emp, 1),
-                "unit_total": float(total_pago or 0.0),
-                "esfera": ESFERA,
-                "ente": ENTE,
-                "orgao": orgao,
-                "municipio": "",
-                "uf": UF,
-                "area_tematica": area,
-                "sus": orgao in SUS_ORGAOS,
-                "valor_referencia": float(total_pago or 0.0),
-                "ano_referencia": ano,
-                "fonte": SOURCE_TAG,
-                "created_at": now,
-            }
-        )
-
-    concentracao = con.execute(
+                template_sql(
+                    "O fornecedor **{razao_social}**{doc_code} aparece no recorte oficial do órgão **{orgao}** "
+                    "em **{ano}**, com total pago de **R$ {pago:,.2f}**, "
+                    "total liquidado de **R$ {liquidado:,.2f}** "
+                    "e total empenhado de **R$ {empenhado:,.2f}**."
+                ),
+            ),
+            "pattern": "'ORGAO_ESTADUAL -> FORNECEDOR_CNPJ -> PAGAMENTOS_AGREGADOS_POR_ANO'",
+            "tags": _estado_tags("fornecedores", with_cnpj=True),
+            "sample_n": "amostra",
+            "unit_total": "pago",
+            "valor_referencia": "pago",
+        },
+    ),
+    _estado_rule(
+        "CONCENTRACAO_FORNECEDOR_ORGAO_ANO",
         """
         WITH ranked AS (
             SELECT
@@ -928,7 +957,7 @@ def build_insights(con: duckdb.DuckDBPyConnection, ano: int) -> list[dict]:
                     ORDER BY total_pago DESC, razao_social
                 ) AS rn
             FROM estado_ac_fornecedores
-            WHERE ano = ? AND orgao IS NOT NULL AND orgao <> '' AND COALESCE(total_pago, 0) > 0
+            WHERE ano = $ano AND orgao IS NOT NULL AND orgao <> '' AND COALESCE(total_pago, 0) > 0
         )
         SELECT
             orgao,
@@ -942,116 +971,70 @@ def build_insights(con: duckdb.DuckDBPyConnection, ano: int) -> list[dict]:
             END AS share_pago
         FROM ranked
         WHERE rn = 1 AND total_orgao_pago >= 1000000 AND total_pago / NULLIF(total_orgao_pago, 0) >= 0.20
-        ORDER BY share_pago DESC, total_pago DESC
         """,
-        [ano],
-    ).fetchall()
-    for orgao, razao_social, cnpjcpf, total_pago, total_orgao_pago, share_pago in concentracao:
-        area = AREA_MAP.get(orgao, "gestao_estadual")
-        share = float(share_pago or 0.0)
-        if share >= 0.5 and float(total_pago or 0.0) >= 5_000_000:
-            severity = "CRITICO"
-        elif share >= 0.3 or float(total_pago or 0.0) >= 5_000_000:
-            severity = "ALTO"
-        else:
-            severity = "MEDIO"
-        supplier_id = cnpjcpf or row_hash(orgao, razao_social)[:12]
-        insights.append(
-            {
-                "id": f"ESTADO_AC:concentracao-fornecedor:{ano}:{orgao}:{supplier_id}",
-                "kind": f"{ESTADO_KIND_PREFIX}CONCENTRACAO_FORNECEDOR_ORGAO_ANO",
-                "severity": severity,
-                "confidence": 78,
-                "exposure_brl": float(total_pago or 0.0),
-                "title": f"{orgao} — concentração em fornecedor líder {ano}",
-                "description_md": (
-                    f"O principal fornecedor de **{orgao}** em **{ano}** foi **{razao_social}**"
-                    f"{f' (`{cnpjcpf}`)' if cnpjcpf else ''}, responsável por **{share:.1%}** "
-                    f"do valor pago pelo órgão no ano, equivalente a **R$ {float(total_pago or 0.0):,.2f}** "
-                    f"de um total de **R$ {float(total_orgao_pago or 0.0):,.2f}**."
-                ),
-                "pattern": "ORGAO_ESTADUAL -> CONCENTRACAO_FORNECEDOR_LIDER_POR_ANO",
-                "sources": [FONTE],
-                "tags": [
-                    "estado_ac",
-                    orgao,
-                    f"ano:{ano}",
-                    "concentracao_fornecedor",
-                    area,
-                    *( [f"cnpj:{cnpjcpf}"] if cnpjcpf else [] ),
+        derived={
+            **SUPPLIER_DERIVED,
+            "pago": "COALESCE(total_pago, 0.0)",
+            "total_orgao": "COALESCE(total_orgao_pago, 0.0)",
+            "share": "COALESCE(share_pago, 0.0)",
+        },
+        templates={
+            "id": "ESTADO_AC:concentracao-fornecedor:{ano}:{orgao}:{supplier_id}",
+            "title": "{orgao} — concentração em fornecedor líder {ano}",
+            "description_md": (
+                "O principal fornecedor de **{orgao}** em **{ano}** foi **{razao_social}**"
+                "{doc_code}, responsável por **{share:.1%}** "
+                "do valor pago pelo órgão no ano, equivalente a **R$ {pago:,.2f}** "
+                "de um total de **R$ {total_orgao:,.2f}**."
+            ),
+        },
+        values={
+            "severity": case_sql(
+                [
+                    ("share >= 0.5 AND pago >= 5000000", "'CRITICO'"),
+                    ("share >= 0.3 OR pago >= 5000000", "'ALTO'"),
                 ],
-                "sample_n": 1,
-                "unit_total": float(total_orgao_pago or 0.0),
-                "esfera": ESFERA,
-                "ente": ENTE,
-                "orgao": orgao,
-                "municipio": "",
-                "uf": UF,
-                "area_tematica": area,
-                "sus": orgao in SUS_ORGAOS,
-                "valor_referencia": float(total_pago or 0.0),
-                "ano_referencia": ano,
-                "fonte": SOURCE_TAG,
-                "created_at": now,
-            }
-        )
-
-    return insights
+                "'MEDIO'",
+            ),
+            "confidence": "78",
+            "exposure_brl": "pago",
+            "pattern": "'ORGAO_ESTADUAL -> CONCENTRACAO_FORNECEDOR_LIDER_POR_ANO'",
+            "tags": _estado_tags("concentracao_fornecedor", with_cnpj=True),
+            "sample_n": "1",
+            "unit_total": "total_orgao",
+            "valor_referencia": "pago",
+        },
+    ),
+]
 
 
-def upsert_insights(con: duckdb.DuckDBPyConnection, insights: list[dict], ano: int) -> int:
-    con.execute(
-        """
-        DELETE FROM insight
-        WHERE esfera = 'estadual' AND uf = 'AC' AND ano_referencia = ?
-          AND kind LIKE ?
-        """,
-        [ano, f"{ESTADO_KIND_PREFIX}%"],
+def build_insights(con: duckdb.DuckDBPyConnection, ano: int) -> list[dict]:
+    return query_insight_rules(con, ESTADO_INSIGHT_RULES, params={"ano": ano}, defaults=ESTADO_INSIGHT_DEFAULTS)
+
+
+def upsert_insights(con: duckdb.DuckDBPyConnection, ano: int) -> PartitionChanges:
+    # created_at muda a cada build: nao conta como alteracao e preserva o valor
+    # gravado, assim como as colunas de classificacao preenchidas depois.
+    select_sql = insight_rules_sql(ESTADO_INSIGHT_RULES, ESTADO_INSIGHT_DEFAULTS)
+    return apply_partition_cdc(
+        con,
+        "insight",
+        INSIGHT_RULE_COLUMNS,
+        select_sql=select_sql,
+        select_params=bind_named_params(select_sql, {"ano": ano}),
+        partition_sql=ESTADO_INSIGHT_PARTITION_SQL,
+        partition_params=[ano, f"{ESTADO_KIND_PREFIX}%"],
+        key="id",
+        compare_exclude=["created_at"],
     )
-    if not insights:
-        return 0
 
-    payload = [
-        (
-            insight["id"],
-            insight["kind"],
-            insight["severity"],
-            insight["confidence"],
-            insight["exposure_brl"],
-            insight["title"],
-            insight["description_md"],
-            insight["pattern"],
-            json.dumps(insight["sources"], ensure_ascii=False),
-            json.dumps(insight["tags"], ensure_ascii=False),
-            insight["sample_n"],
-            insight["unit_total"],
-            insight["esfera"],
-            insight["ente"],
-            insight["orgao"],
-            insight["municipio"],
-            insight["uf"],
-            insight["area_tematica"],
-            insight["sus"],
-            insight["valor_referencia"],
-            insight["ano_referencia"],
-            insight["fonte"],
-            insight["created_at"],
-        )
-        for insight in insights
-    ]
-    con.executemany(
-        """
-        INSERT INTO insight (
-            id, kind, severity, confidence, exposure_brl,
-            title, description_md, pattern, sources, tags,
-            sample_n, unit_total,
-            esfera, ente, orgao, municipio, uf, area_tematica, sus,
-            valor_referencia, ano_referencia, fonte, created_at
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        payload,
-    )
-    return len(payload)
+
+def has_year_insights(con: duckdb.DuckDBPyConnection, ano: int) -> bool:
+    row = con.execute(
+        f"SELECT COUNT(*) FROM insight WHERE {ESTADO_INSIGHT_PARTITION_SQL}",
+        [ano, f"{ESTADO_KIND_PREFIX}%"],
+    ).fetchone()
+    return bool(row and row[0])
 
 
 def log_orgao_preview(rows: list[PagamentoRow], label: str) -> None:
@@ -1061,122 +1044,195 @@ def log_orgao_preview(rows: list[PagamentoRow], label: str) -> None:
         log.info("  %-20s %d", orgao, count)
 
 
+def collect_year(
+    connector: TransparenciaAcConnector,
+    ano: int,
+    max_fornecedores_detalhe: int | None = None,
+) -> dict:
+    log.info("=== Coletando Governo do Acre %d ===", ano)
+    result = connector.run(anos=[ano])
+    pagamentos = result["pagamentos"]
+    contratos = result["contratos"]
+    licitacoes = result["licitacoes"]
+    log.info(
+        "Base %d concluída: %d pagamentos | %d contratos | %d licitacoes",
+        ano,
+        len(pagamentos),
+        len(contratos),
+        len(licitacoes),
+    )
+    fornecedores_resumo: list[FornecedorResumoRow] = []
+    fornecedor_detalhes: list[FornecedorDetalheRow] = []
+    fornecedores_ok = False
+    fornecedores_agg: list[dict] = []
+
+    try:
+        for orgao_alvo in sorted(FORNECEDOR_ORGAOS_ALVO):
+            fornecedores_resumo.extend(connector.get_fornecedores_por_orgao(ano, orgao_alvo))
+        fornecedores_resumo.sort(key=lambda row: row.pago, reverse=True)
+        fornecedores_agg = aggregate_fornecedor_resumos(fornecedores_resumo)
+        log.info(
+            "Fornecedores %d agregados por órgão-alvo (%s): %d",
+            ano,
+            ", ".join(sorted(FORNECEDOR_ORGAOS_ALVO)),
+            len(fornecedores_agg),
+        )
+        fornecedores_ok = bool(fornecedores_resumo)
+        if fornecedores_ok:
+            detalhe_targets = select_fornecedor_detail_targets(
+                fornecedores_resumo,
+                limit=max_fornecedores_detalhe,
+            )
+            log.info(
+                "Fornecedores %d selecionados para detalhamento probatório: %d",
+                ano,
+                len(detalhe_targets),
+            )
+            if detalhe_targets:
+                fornecedor_detalhes = connector.get_fornecedor_detalhes(
+                    ano,
+                    fornecedores=detalhe_targets,
+                    max_fornecedores=len(detalhe_targets),
+                )
+                fornecedores_agg = merge_fornecedor_aggregates(
+                    fornecedores_agg,
+                    aggregate_fornecedores(fornecedor_detalhes),
+                )
+        if not fornecedores_ok:
+            log.warning(
+                "Fornecedores %d sem linhas úteis no recorte por órgão; preservando dados já gravados para esse eixo",
+                ano,
+            )
+    except Exception as exc:
+        log.warning(
+            "Coleta de fornecedores do Acre falhou em %d: %s. Pagamentos/contratos/licitações seguem normalmente.",
+            ano,
+            exc,
+        )
+
+    log.info(
+        "Coletado %d: %d pagamentos | %d contratos | %d licitacoes | %d fornecedores_filtrados | %d detalhes",
+        ano,
+        len(pagamentos),
+        len(contratos),
+        len(licitacoes),
+        len(fornecedores_agg),
+        len(fornecedor_detalhes),
+    )
+    log_orgao_preview(pagamentos, f"Pagamentos {ano}")
+    return {
+        "ano": ano,
+        "pagamentos": pagamentos,
+        "contratos": contratos,
+        "licitacoes": licitacoes,
+        "fornecedores_ok": fornecedores_ok,
+        "fornecedores_agg": fornecedores_agg,
+        "fornecedor_detalhes": fornecedor_detalhes,
+    }
+
+
+def log_year_changes(ano: int, changes: dict[str, PartitionChanges]) -> None:
+    log.info(
+        "Ano %d (+inseridas ~atualizadas -removidas =iguais): %s",
+        ano,
+        " | ".join(f"{name} {change.describe()}" for name, change in changes.items()),
+    )
+
+
+def write_year(
+    con: duckdb.DuckDBPyConnection,
+    year: dict,
+    *,
+    rebuild_insights: bool = False,
+) -> dict[str, PartitionChanges]:
+    """Aplica um ano coletado numa unica transacao e devolve as mudancas por tabela."""
+    ano = year["ano"]
+    changes: dict[str, PartitionChanges] = {}
+    con.begin()
+    try:
+        changes["pagamentos"] = upsert_pagamentos(con, year["pagamentos"], ano)
+        changes["contratos"] = upsert_contratos(con, year["contratos"], ano)
+        changes["licitacoes"] = upsert_licitacoes(con, year["licitacoes"], ano)
+        if year["fornecedores_ok"]:
+            changes["fornecedores"] = upsert_fornecedores(con, year["fornecedores_agg"], ano)
+            if year["fornecedor_detalhes"]:
+                changes["fornecedor_detalhes"] = upsert_fornecedor_detalhes(con, year["fornecedor_detalhes"], ano)
+        # As janelas de fracionamento leem contratos e pagamentos: refeitas na
+        # mesma transacao, desde o inicio do ano gravado.
+        if changes["pagamentos"].changed or changes["contratos"].changed:
+            refresh_fracionamento(con, since=date(ano, 1, 1))
+
+        # Os insights estaduais so leem as tabelas do proprio ano: sem mudanca
+        # nelas, o build daria o mesmo resultado.
+        if rebuild_insights or any(change.changed for change in changes.values()) or not has_year_insights(con, ano):
+            changes["insights"] = upsert_insights(con, ano)
+        con.commit()
+    except Exception:
+        con.rollback()
+        raise
+    return changes
+
+
 def run_sync(
     anos: list[int],
     force_rediscover: bool = False,
     dry_run: bool = False,
     max_fornecedores_detalhe: int | None = None,
-) -> None:
+    workers: int = DEFAULT_WORKERS,
+    year_workers: int = DEFAULT_YEAR_WORKERS,
+    requests_per_second: float | None = None,
+    fresh: bool = False,
+    rebuild_insights: bool = False,
+) -> dict[int, dict[str, PartitionChanges]]:
     connector = TransparenciaAcConnector(
         data_dir=str(ROOT / "data" / "transparencia_ac"),
         force=force_rediscover,
+        max_workers=workers,
+        requests_per_second=requests_per_second,
+        checkpoint_dir=str(CHECKPOINT_DIR),
     )
+    if fresh:
+        connector.clear_checkpoints()
     con = duckdb.connect(str(DB_PATH))
     ensure_tables(con)
 
-    total_pag = total_cont = total_lic = total_ins = 0
-    total_forn = total_forn_det = 0
+    changes_by_year: dict[int, dict[str, PartitionChanges]] = {}
     try:
-        for ano in anos:
-            log.info("=== Coletando Governo do Acre %d ===", ano)
-            result = connector.run(anos=[ano])
-            pagamentos = result["pagamentos"]
-            contratos = result["contratos"]
-            licitacoes = result["licitacoes"]
-            log.info(
-                "Base %d concluída: %d pagamentos | %d contratos | %d licitacoes",
-                ano,
-                len(pagamentos),
-                len(contratos),
-                len(licitacoes),
-            )
-            fornecedores_resumo: list[FornecedorResumoRow] = []
-            fornecedor_detalhes: list[FornecedorDetalheRow] = []
-            fornecedores_ok = False
-            fornecedores_agg: list[dict] = []
-
-            try:
-                for orgao_alvo in sorted(FORNECEDOR_ORGAOS_ALVO):
-                    fornecedores_resumo.extend(connector.get_fornecedores_por_orgao(ano, orgao_alvo))
-                fornecedores_resumo.sort(key=lambda row: row.pago, reverse=True)
-                fornecedores_agg = aggregate_fornecedor_resumos(fornecedores_resumo)
-                log.info(
-                    "Fornecedores %d agregados por órgão-alvo (%s): %d",
-                    ano,
-                    ", ".join(sorted(FORNECEDOR_ORGAOS_ALVO)),
-                    len(fornecedores_agg),
-                )
-                fornecedores_ok = bool(fornecedores_resumo)
-                if fornecedores_ok:
-                    detalhe_targets = select_fornecedor_detail_targets(
-                        fornecedores_resumo,
-                        limit=max_fornecedores_detalhe,
-                    )
-                    log.info(
-                        "Fornecedores %d selecionados para detalhamento probatório: %d",
-                        ano,
-                        len(detalhe_targets),
-                    )
-                    if detalhe_targets:
-                        fornecedor_detalhes = connector.get_fornecedor_detalhes(
-                            ano,
-                            fornecedores=detalhe_targets,
-                            max_fornecedores=len(detalhe_targets),
-                        )
-                        fornecedores_agg = merge_fornecedor_aggregates(
-                            fornecedores_agg,
-                            aggregate_fornecedores(fornecedor_detalhes),
-                        )
-                if not fornecedores_ok:
-                    log.warning(
-                        "Fornecedores %d sem linhas úteis no recorte por órgão; preservando dados já gravados para esse eixo",
-                        ano,
-                    )
-            except Exception as exc:
-                log.warning(
-                    "Coleta de fornecedores do Acre falhou em %d: %s. Pagamentos/contratos/licitações seguem normalmente.",
-                    ano,
-                    exc,
-                )
-
-            log.info(
-                "Coletado %d: %d pagamentos | %d contratos | %d licitacoes | %d fornecedores_filtrados | %d detalhes",
-                ano,
-                len(pagamentos),
-                len(contratos),
-                len(licitacoes),
-                len(fornecedores_agg),
-                len(fornecedor_detalhes),
-            )
-            log_orgao_preview(pagamentos, f"Pagamentos {ano}")
-
-            if dry_run:
-                continue
-
-            total_pag += upsert_pagamentos(con, pagamentos, ano)
-            total_cont += upsert_contratos(con, contratos, ano)
-            total_lic += upsert_licitacoes(con, licitacoes, ano)
-            if fornecedores_ok:
-                total_forn += upsert_fornecedores(con, fornecedores_agg, ano)
-                if fornecedor_detalhes:
-                    total_forn_det += upsert_fornecedor_detalhes(con, fornecedor_detalhes, ano)
-
-            insights = build_insights(con, ano)
-            total_ins += upsert_insights(con, insights, ano)
-            log.info("Ano %d gravado com %d insights estaduais", ano, len(insights))
+        # Anos coletados em paralelo; a gravacao segue a ordem de --anos, uma
+        # thread so, conforme cada ano termina.
+        with ThreadPoolExecutor(max_workers=max(1, min(year_workers, len(anos)))) as pool:
+            collected = pool.map(lambda ano: collect_year(connector, ano, max_fornecedores_detalhe), anos)
+            for year in collected:
+                ano = year["ano"]
+                if dry_run:
+                    connector.clear_checkpoints(ano)
+                    continue
+
+                changes = write_year(con, year, rebuild_insights=rebuild_insights)
+                changes_by_year[ano] = changes
+                log_year_changes(ano, changes)
+                if "insights" not in changes:
+                    log.info("Ano %d sem mudancas nas tabelas estaduais; insights mantidos", ano)
+                # Ano gravado: checkpoints de (ano, endpoint, pagina) nao servem mais.
+                connector.clear_checkpoints(ano)
     finally:
         con.close()
 
     if not dry_run:
+        totals: dict[str, PartitionChanges] = {}
+        for changes in changes_by_year.values():
+            for name, change in changes.items():
+                totals[name] = totals.get(name, PartitionChanges()) + change
         log.info(
-            "Concluído: %d pagamentos | %d contratos | %d licitacoes | %d fornecedores | %d fornecedor_detalhes | %d insights",
-            total_pag,
-            total_cont,
-            total_lic,
-            total_forn,
-            total_forn_det,
-            total_ins,
+            "Concluído: %s",
+            " | ".join(f"{totals.get(name, PartitionChanges()).rows} {name}" for name in YEAR_TABLES),
         )
+        log.info(
+            "Anos alterados: %s",
+            ", ".join(str(ano) for ano, changes in changes_by_year.items() if any(c.changed for c in changes.values()))
+            or "nenhum",
+        )
+    return changes_by_year
 
 
 def main() -> None:
@@ -1190,6 +1246,15 @@ def main() -> None:
         default=None,
         help="Limita entidades detalhadas do órgão-alvo; permitido apenas com --dry-run para validação controlada",
     )
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Requisicoes simultaneas por fan-out (paginas/entidades)")
+    parser.add_argument("--year-workers", type=int, default=DEFAULT_YEAR_WORKERS, help="Anos coletados em paralelo")
+    parser.add_argument("--rps", type=float, default=None, help="Teto de requisicoes por segundo no host do portal")
+    parser.add_argument("--fresh", action="store_true", help="Descarta checkpoints de coletas interrompidas")
+    parser.add_argument(
+        "--rebuild-insights",
+        action="store_true",
+        help="Reconstroi os insights estaduais mesmo nos anos sem mudanca nas tabelas",
+    )
     args = parser.parse_args()
     if args.max_fornecedores_detalhe is not None and not args.dry_run:
         parser.error("--max-fornecedores-detalhe só pode ser usado com --dry-run")
@@ -1198,6 +1263,11 @@ def main() -> None:
         force_rediscover=args.force_rediscover,
         dry_run=args.dry_run,
         max_fornecedores_detalhe=args.max_fornecedores_detalhe,
+        workers=args.workers,
+        year_workers=args.year_workers,
+        requests_per_second=args.rps,
+        fresh=args.fresh,
+        rebuild_insights=args.rebuild_insights,
     )
 
 
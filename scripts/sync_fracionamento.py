@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+import duckdb
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.core.fracionamento import FRACIONAMENTO_TABLE, LATE_DAYS, refresh_fracionamento  # noqa: E402
+
+DB_PATH = ROOT / "data" / "sentinela_analytics.duckdb"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Atualiza as janelas moveis de fracionamento (90/180/365 dias).")
+    parser.add_argument("--db-path", default=str(DB_PATH))
+    parser.add_argument("--full", action="store_true", help="Refaz todo o historico em vez de partir da marca d'agua")
+    parser.add_argument("--late-days", type=int, default=LATE_DAYS, help="Folga para lancamentos com data atrasada")
+    args = parser.parse_args()
+
+    con = duckdb.connect(args.db_path)
+    try:
+        con.begin()
+        try:
+            result = refresh_fracionamento(con, full=args.full, late_days=args.late_days)
+            con.commit()
+        except Exception:
+            con.rollback()
+            raise
+        top = con.execute(
+            f"""
+            SELECT fonte, orgao, fornecedor_nome, janela_dias, janela_inicio, janela_fim, n_compras, total_brl
+            FROM {FRACIONAMENTO_TABLE}
+            ORDER BY excesso_brl DESC
+            LIMIT 10
+            """
+        ).fetchall()
+    finally:
+        con.close()
+
+    for fonte, info in result.items():
+        print(
+            f"fonte={fonte} desde={info['emit_from']} removidas={info['deleted']} "
+            f"gravadas={info['inserted']} marca={info['data_max']}"
+        )
+    for row in top:
+        print("janela=" + " | ".join(str(value) for value in row))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
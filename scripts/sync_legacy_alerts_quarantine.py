@@ -6,6 +6,10 @@ from pathlib import Path
 import duckdb
 
 ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.core.ops_version import mark_tables_written
+
 DB_PATH = ROOT / "data" / "sentinela_analytics.duckdb"
 
 DETECTOR_STATUS_BY_ID = {
@@ -42,6 +46,7 @@ def main() -> int:
                 )
             """
         )
+        mark_tables_written(con, "alerts")
 
         status_case = "CASE detector_id " + " ".join(
             f"WHEN '{detector_id}' THEN '{status}'"
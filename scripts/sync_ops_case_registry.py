@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import argparse
 from pathlib import Path
 import sys
 
@@ -17,6 +18,10 @@ DB_PATH = ROOT / "data" / "sentinela_analytics.duckdb"
 
 
 def main() -> int:
+    parser = argparse.ArgumentParser(description="Materializa o registry operacional e a camada ops derivada.")
+    parser.add_argument("--case-id", action="append", dest="case_ids", help="Recorta a atualizacao a um caso (repetivel).")
+    args = parser.parse_args()
+
     con = duckdb.connect(str(DB_PATH))
     ensure_ops_runtime(con)
     run_id = begin_pipeline_run(
@@ -24,9 +29,10 @@ def main() -> int:
         "sync_ops_case_registry",
         trigger_mode="manual",
         actor="script",
+        details={"case_ids": args.case_ids} if args.case_ids else None,
     )
     try:
-        stats = sync_ops_case_registry(con)
+        stats = sync_ops_case_registry(con, case_ids=args.case_ids)
         finish_pipeline_run(
             con,
             run_id,
@@ -59,6 +65,9 @@ def main() -> int:
         print(f"sentinel_fail_rows={stats.get('sentinel_fail_rows', 0)}")
         print(f"sentinel_warn_rows={stats.get('sentinel_warn_rows', 0)}")
         print(f"indexed_docs={stats.get('indexed_docs', 0)}")
+        print(f"fingerprint_hits={stats.get('fingerprint_hits', 0)}")
+        print(f"fingerprint_misses={stats.get('fingerprint_misses', 0)}")
+        print(f"fingerprint_hit_rate={stats.get('fingerprint_hit_rate')}")
         return 0
     except Exception as exc:
         finish_pipeline_run(
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import argparse
 from pathlib import Path
 import sys
 
@@ -10,6 +11,7 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from src.core.ops_runtime import (
+    DEFAULT_PROBE_WORKERS,
     begin_pipeline_run,
     ensure_ops_runtime,
     finish_pipeline_run,
@@ -21,6 +23,11 @@ DB_PATH = ROOT / "data" / "sentinela_analytics.duckdb"
 
 
 def main() -> int:
+    parser = argparse.ArgumentParser(description="Sonda as fontes monitoradas e registra o cache de frescor.")
+    parser.add_argument("--force", action="store_true", help="Sonda tambem as fontes cujo expires_at ainda nao passou.")
+    parser.add_argument("--workers", type=int, default=DEFAULT_PROBE_WORKERS, help="Sondagens simultaneas.")
+    args = parser.parse_args()
+
     con = duckdb.connect(str(DB_PATH))
     ensure_ops_runtime(con)
     run_id = begin_pipeline_run(
@@ -30,7 +37,7 @@ def main() -> int:
         actor="script",
     )
     try:
-        stats = refresh_source_cache(con)
+        stats = refresh_source_cache(con, workers=args.workers, force=args.force)
         finish_pipeline_run(
             con,
             run_id,
@@ -41,6 +48,8 @@ def main() -> int:
         )
         print(f"sources={stats['sources']}")
         print(f"ok={stats['ok']}")
+        print(f"not_modified={stats['not_modified']}")
+        print(f"skipped_fresh={stats['skipped_fresh']}")
         return 0
     except Exception as exc:
         finish_pipeline_run(
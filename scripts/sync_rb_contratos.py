@@ -8,7 +8,7 @@ import re
 import sys
 import time
 import unicodedata
-from datetime import datetime
+from datetime import date, datetime
 from pathlib import Path
 
 import duckdb
@@ -18,7 +18,9 @@ from bs4 import BeautifulSoup
 ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT))
 
+from src.core.fracionamento import refresh_fracionamento
 from src.core.insight_classification import ensure_insight_classification_columns
+from src.core.ops_version import mark_tables_written
 from src.ingest.riobranco_http import fetch_html
 
 log = logging.getLogger("sync_rb_contratos")
@@ -1185,8 +1187,12 @@ def main() -> None:
         con.execute("CHECKPOINT")
 
     if con is not None:
+        # As janelas de fracionamento leem rb_contratos; detect_fracionamento so
+        # le a tabela gravada aqui.
+        refresh_fracionamento(con, since=date(min(args.anos), 1, 1))
         n_sus = build_views(con)
         n_insights = build_insights(con)
+        mark_tables_written(con, "rb_contratos", "insight")
         log.info(
             "Resumo final: rb_contratos=%d | v_rb_contratos_sus=%d | insights=%d",
             con.execute("SELECT COUNT(*) FROM rb_contratos").fetchone()[0],
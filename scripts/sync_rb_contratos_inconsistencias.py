@@ -19,6 +19,7 @@ sys.path.insert(0, str(SCRIPTS_DIR))
 
 import enrich_rb_contratos_licitacao as bridge
 import sync_rb_contratos as rb_contratos_sync
+from src.core.ops_version import mark_tables_written
 
 DB_PATH = ROOT / "data" / "sentinela_analytics.duckdb"
 CACHE_DIR = ROOT / "data" / "cache" / "rb_licitacao_audit"
@@ -627,6 +628,7 @@ def main() -> None:
     audited = run_audit(con)
     n_views = build_views(con)
     n_insights = build_insights(con)
+    mark_tables_written(con, "rb_contratos_item_audit", "insight")
     print(
         f"audited_rows={audited} | inconsistencias={n_views} | insights={n_insights}"
     )
@@ -22,6 +22,8 @@ ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT))
 
 from src.core.insight_classification import ensure_insight_classification_columns
+from src.core.insight_rules import InsightRule, insert_insight_rules, json_list_sql, sql_literal
+from src.core.ops_version import mark_tables_written
 from src.ingest.riobranco_http import fetch_html
 from src.ingest.riobranco_jsf import extract_viewstate, parse_partial_xml_updates
 
@@ -496,82 +498,68 @@ def build_views(con: duckdb.DuckDBPyConnection) -> int:
     return con.execute("SELECT COUNT(*) FROM v_rb_despesas_sus").fetchone()[0]
 
 
+RB_DESPESAS_INSIGHT_RULE = InsightRule(
+    kind=f"{KIND_PREFIX}_UNIDADE_ANO",
+    query="""
+    SELECT
+        ano,
+        unidade_relatorio,
+        MAX(pago_brl) AS pago_brl,
+        MAX(empenhado_brl) AS empenhado_brl,
+        MAX(liquidado_brl) AS liquidado_brl
+    FROM rb_despesas_unidade
+    WHERE sus = TRUE
+    GROUP BY 1, 2
+    ORDER BY pago_brl DESC NULLS LAST, unidade_relatorio
+    LIMIT 200
+    """,
+    derived={
+        "exposure": "COALESCE(pago_brl, 0.0)",
+        "empenhado": "COALESCE(empenhado_brl, 0.0)",
+        "liquidado": "COALESCE(liquidado_brl, 0.0)",
+    },
+    templates={
+        "title": "SUS Rio Branco: {unidade_relatorio} executou R$ {exposure:,.2f} em {ano}",
+        "description_md": (
+            "A unidade **{unidade_relatorio}** apareceu no portal de despesas como recorte SUS em **{ano}**, "
+            "com **R$ {empenhado:,.2f} empenhados**, "
+            "**R$ {liquidado:,.2f} liquidados** e "
+            "**R$ {exposure:,.2f} pagos**."
+        ),
+    },
+    values={
+        "id": f"concat('INS_', left(sha1(concat({sql_literal(KIND_PREFIX + '|')}, ano, '|', unidade_relatorio)), 16))",
+        "severity": "'INFO'",
+        "confidence": "84",
+        "exposure_brl": "exposure",
+        "pattern": "'despesa_sus_por_unidade'",
+        "sources": json_list_sql(
+            [sql_literal("rb_despesas_unidade"), sql_literal("transparencia.riobranco.ac.gov.br/despesa")]
+        ),
+        "tags": json_list_sql([sql_literal(tag) for tag in ("SUS", "SEMSA", "RIO_BRANCO", "despesas", "unidade")]),
+        "sample_n": "1",
+        "unit_total": "exposure",
+        "esfera": "'municipal'",
+        "ente": "'Prefeitura de Rio Branco'",
+        "orgao": "'SEMSA'",
+        "municipio": "'Rio Branco'",
+        "uf": "'AC'",
+        "area_tematica": "'saude'",
+        "sus": "TRUE",
+        "valor_referencia": "exposure",
+        "ano_referencia": "CAST(ano AS INTEGER)",
+        "fonte": "'transparencia.riobranco.ac.gov.br/despesa'",
+        "created_at": "CURRENT_TIMESTAMP",
+    },
+)
+
+
 def build_insights(con: duckdb.DuckDBPyConnection) -> int:
     if not ensure_insight_columns(con):
         return 0
 
     con.execute("DELETE FROM insight WHERE kind LIKE ?", [f"{KIND_PREFIX}%"])
-    rows = con.execute(
-        """
-        SELECT
-            ano,
-            unidade_relatorio,
-            MAX(pago_brl) AS pago_brl,
-            MAX(empenhado_brl) AS empenhado_brl,
-            MAX(liquidado_brl) AS liquidado_brl
-        FROM rb_despesas_unidade
-        WHERE sus = TRUE
-        GROUP BY 1, 2
-        ORDER BY pago_brl DESC NULLS LAST, unidade_relatorio
-        LIMIT 200
-        """
-    ).fetchall()
-
-    payload = []
-    for ano, unidade_relatorio, pago_brl, empenhado_brl, liquidado_brl in rows:
-        exposure = float(pago_brl or 0)
-        insight_id = "INS_" + hashlib.sha1(
-            f"{KIND_PREFIX}|{ano}|{unidade_relatorio}".encode("utf-8")
-        ).hexdigest()[:16]
-        payload.append(
-            (
-                insight_id,
-                f"{KIND_PREFIX}_UNIDADE_ANO",
-                "INFO",
-                84,
-                exposure,
-                f"SUS Rio Branco: {unidade_relatorio} executou R$ {exposure:,.2f} em {ano}",
-                (
-                    f"A unidade **{unidade_relatorio}** apareceu no portal de despesas como recorte SUS em **{ano}**, "
-                    f"com **R$ {float(empenhado_brl or 0):,.2f} empenhados**, "
-                    f"**R$ {float(liquidado_brl or 0):,.2f} liquidados** e "
-                    f"**R$ {exposure:,.2f} pagos**."
-                ),
-                "despesa_sus_por_unidade",
-                json.dumps(
-                    ["rb_despesas_unidade", "transparencia.riobranco.ac.gov.br/despesa"],
-                    ensure_ascii=False,
-                ),
-                json.dumps(
-                    ["SUS", "SEMSA", "RIO_BRANCO", "despesas", "unidade"],
-                    ensure_ascii=False,
-                ),
-                1,
-                exposure,
-                "municipal",
-                "Prefeitura de Rio Branco",
-                "SEMSA",
-                "Rio Branco",
-                "AC",
-                "saude",
-                True,
-                exposure,
-                int(ano),
-                "transparencia.riobranco.ac.gov.br/despesa",
-            )
-        )
-    if payload:
-        con.executemany(
-            """
-            INSERT INTO insight (
-                id, kind, severity, confidence, exposure_brl, title, description_md, pattern,
-                sources, tags, sample_n, unit_total, created_at, esfera, ente, orgao,
-                municipio, uf, area_tematica, sus, valor_referencia, ano_referencia, fonte
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            [row[:12] + (datetime.now(),) + row[12:] for row in payload],
-        )
-    return len(payload)
+    return insert_insight_rules(con, [RB_DESPESAS_INSIGHT_RULE])
 
 
 def collect_year(
@@ -679,6 +667,7 @@ def main() -> None:
 
     n_sus = build_views(con)
     n_insights = build_insights(con)
+    mark_tables_written(con, "rb_despesas_unidade", "insight")
     log.info(
         "Resumo final: rb_despesas_unidade=%d | v_rb_despesas_sus=%d | insights=%d",
         con.execute("SELECT COUNT(*) FROM rb_despesas_unidade").fetchone()[0],
@@ -1,8 +1,6 @@
 from __future__ import annotations
 
 import argparse
-import hashlib
-import json
 import logging
 import re
 import sys
@@ -20,6 +18,8 @@ ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT))
 
 from src.core.insight_classification import ensure_insight_classification_columns
+from src.core.insight_rules import InsightRule, insert_insight_rules, json_list_sql, sql_literal
+from src.core.ops_version import mark_tables_written
 from src.ingest.riobranco_servidor_detail import RioBrancoServidorDetail
 from src.ingest.riobranco_servidor_list import RioBrancoServidorList
 
@@ -374,85 +374,65 @@ def build_sus_view(con: duckdb.DuckDBPyConnection) -> int:
     return con.execute("SELECT COUNT(DISTINCT servidor_id) FROM v_rb_sus").fetchone()[0]
 
 
+RB_LOTACAO_INSIGHT_RULE = InsightRule(
+    kind=f"{KIND_PREFIX}_UNIDADE",
+    query="""
+    SELECT
+        COALESCE(NULLIF(unidade, ''), NULLIF(lotacao, ''), NULLIF(secretaria, ''), 'N/I') AS unidade_real,
+        COUNT(DISTINCT servidor_id) AS n_servidores,
+        AVG(salario_bruto) AS media_bruta_referencia,
+        SUM(salario_bruto) AS total_bruto_referencia
+    FROM v_rb_sus
+    GROUP BY 1
+    HAVING COUNT(DISTINCT servidor_id) > 0
+    ORDER BY total_bruto_referencia DESC NULLS LAST, n_servidores DESC, unidade_real
+    LIMIT 200
+    """,
+    derived={
+        "exposure": "COALESCE(total_bruto_referencia, 0.0)",
+        "media_bruta": "COALESCE(media_bruta_referencia, 0.0)",
+        "unidade_label": "COALESCE(NULLIF(unidade_real, ''), 'N/I')",
+    },
+    templates={
+        "title": "SUS Rio Branco: {n_servidores} servidores vinculados a {unidade_label}",
+        "description_md": (
+            "A unidade **{unidade_label}** concentrou **{n_servidores} servidor(es)** "
+            "classificados como SUS por lotação real, com folha bruta de referência de "
+            "**R$ {exposure:,.2f}** e média individual de **R$ {media_bruta:,.2f}**."
+        ),
+    },
+    values={
+        "id": f"concat('INS_', left(sha1(concat({sql_literal(KIND_PREFIX + '|')}, unidade_label)), 16))",
+        "severity": "'INFO'",
+        "confidence": "82",
+        "exposure_brl": "exposure",
+        "pattern": "'lotacao_sus_por_unidade'",
+        "sources": json_list_sql(
+            [sql_literal("rb_servidores_lotacao"), sql_literal("transparencia.riobranco.ac.gov.br/servidor")]
+        ),
+        "tags": json_list_sql([sql_literal(tag) for tag in ("SUS", "SEMSA", "RIO_BRANCO", "lotacao", "servidores")]),
+        "sample_n": "n_servidores",
+        "unit_total": "exposure",
+        "esfera": "'municipal'",
+        "ente": "'Prefeitura de Rio Branco'",
+        "orgao": "'SEMSA'",
+        "municipio": "'Rio Branco'",
+        "uf": "'AC'",
+        "area_tematica": "'saude'",
+        "sus": "TRUE",
+        "valor_referencia": "exposure",
+        "fonte": "'transparencia.riobranco.ac.gov.br'",
+        "created_at": "CURRENT_TIMESTAMP",
+    },
+)
+
+
 def build_insights(con: duckdb.DuckDBPyConnection) -> int:
     if not ensure_insight_columns(con):
         return 0
 
     con.execute("DELETE FROM insight WHERE kind LIKE ?", [f"{KIND_PREFIX}%"])
-    rows = con.execute(
-        """
-        SELECT
-            COALESCE(NULLIF(unidade, ''), NULLIF(lotacao, ''), NULLIF(secretaria, ''), 'N/I') AS unidade_real,
-            COUNT(DISTINCT servidor_id) AS n_servidores,
-            AVG(salario_bruto) AS media_bruta_referencia,
-            SUM(salario_bruto) AS total_bruto_referencia
-        FROM v_rb_sus
-        GROUP BY 1
-        HAVING COUNT(DISTINCT servidor_id) > 0
-        ORDER BY total_bruto_referencia DESC NULLS LAST, n_servidores DESC, unidade_real
-        LIMIT 200
-        """
-    ).fetchall()
-
-    payload = []
-    for unidade_real, n_servidores, media_bruta, total_bruto in rows:
-        exposure = float(total_bruto or 0)
-        unidade_label = unidade_real or "N/I"
-        insight_id = "INS_" + hashlib.sha1(
-            f"{KIND_PREFIX}|{unidade_label}".encode("utf-8")
-        ).hexdigest()[:16]
-        payload.append(
-            (
-                insight_id,
-                f"{KIND_PREFIX}_UNIDADE",
-                "INFO",
-                82,
-                exposure,
-                f"SUS Rio Branco: {n_servidores} servidores vinculados a {unidade_label}",
-                (
-                    f"A unidade **{unidade_label}** concentrou **{n_servidores} servidor(es)** "
-                    f"classificados como SUS por lotação real, com folha bruta de referência de "
-                    f"**R$ {exposure:,.2f}** e média individual de **R$ {float(media_bruta or 0):,.2f}**."
-                ),
-                "lotacao_sus_por_unidade",
-                json.dumps(
-                    [
-                        "rb_servidores_lotacao",
-                        "transparencia.riobranco.ac.gov.br/servidor",
-                    ],
-                    ensure_ascii=False,
-                ),
-                json.dumps(
-                    ["SUS", "SEMSA", "RIO_BRANCO", "lotacao", "servidores"],
-                    ensure_ascii=False,
-                ),
-                int(n_servidores),
-                exposure,
-                "municipal",
-                "Prefeitura de Rio Branco",
-                "SEMSA",
-                "Rio Branco",
-                "AC",
-                "saude",
-                True,
-                exposure,
-                None,
-                "transparencia.riobranco.ac.gov.br",
-            )
-        )
-
-    if payload:
-        con.executemany(
-            """
-            INSERT INTO insight (
-                id, kind, severity, confidence, exposure_brl, title, description_md, pattern,
-                sources, tags, sample_n, unit_total, created_at, esfera, ente, orgao,
-                municipio, uf, area_tematica, sus, valor_referencia, ano_referencia, fonte
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            payload,
-        )
-    return len(payload)
+    return insert_insight_rules(con, [RB_LOTACAO_INSIGHT_RULE])
 
 
 def parse_args() -> argparse.Namespace:
@@ -492,6 +472,7 @@ def main() -> None:
     n_sus = reclassify_existing_rows(con)
     n_view = build_sus_view(con)
     n_insights = build_insights(con)
+    mark_tables_written(con, "rb_servidores_lotacao", "insight")
 
     log.info("Servidores SUS classificados: %d", n_sus)
     log.info("v_rb_sus: %d servidores", n_view)
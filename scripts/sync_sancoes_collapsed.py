@@ -5,7 +5,7 @@ import hashlib
 import json
 import logging
 import sys
-from datetime import date, datetime
+from datetime import datetime
 from pathlib import Path
 
 import duckdb
@@ -13,6 +13,9 @@ import duckdb
 ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT))
 
+from src.core.ops_version import mark_tables_written
+from src.core.sanction_intervals import INICIO_INDEFINIDO, sancao_intervals_sql
+
 log = logging.getLogger("sync_sancoes_collapsed")
 logging.basicConfig(
     level=logging.INFO,
@@ -42,24 +45,22 @@ CREATE TABLE IF NOT EXISTS sancoes_collapsed (
 )
 """
 
-
-def sancao_ativa(status_sancao: object, data_fim: object) -> bool:
-    status = str(status_sancao or "").strip().upper()
-    if status in {"VIGENTE", "INDEFINIDA"}:
-        return True
-    if status == "EXPIRADA":
-        return False
-
-    text = str(data_fim or "").strip()
-    if not text or text in {"N/A", "SEM PRAZO"}:
-        return True
-
-    for fmt in ("%d/%m/%Y", "%Y-%m-%d", "%Y%m%d", "%d-%m-%Y"):
-        try:
-            return datetime.strptime(text[:10], fmt).date() >= date.today()
-        except ValueError:
-            continue
-    return True
+SANCOES_SOURCE_SQL = """
+SELECT
+    fonte,
+    fornecedor_cnpj AS cnpj,
+    fornecedor_cnpj,
+    COALESCE(nome_sancionado, fornecedor_nome) AS nome_sancionado,
+    orgao,
+    tipo_sancao,
+    data_inicio_sancao,
+    data_fim_sancao,
+    total_pago,
+    n_pagamentos,
+    status_sancao,
+    row_id
+FROM estado_ac_fornecedor_sancoes
+"""
 
 
 def short_id(prefix: str, *parts: object) -> str:
@@ -71,11 +72,12 @@ def build_collapsed(con: duckdb.DuckDBPyConnection) -> tuple[int, int]:
     con.execute(DDL_COLLAPSED)
     con.execute("DELETE FROM sancoes_collapsed")
 
+    # Ativa pelo status gravado ou, sem ele, pelo intervalo [inicio, fim) cobrindo hoje.
     rows = con.execute(
-        """
+        f"""
         SELECT
             fornecedor_cnpj,
-            COALESCE(nome_sancionado, fornecedor_nome) AS nome_sancionado,
+            nome_sancionado,
             fonte,
             orgao,
             tipo_sancao,
@@ -83,8 +85,14 @@ def build_collapsed(con: duckdb.DuckDBPyConnection) -> tuple[int, int]:
             data_fim_sancao,
             total_pago,
             n_pagamentos,
-            status_sancao
-        FROM estado_ac_fornecedor_sancoes
+            CASE
+                WHEN upper(trim(coalesce(status_sancao, ''))) IN ('VIGENTE', 'INDEFINIDA') THEN TRUE
+                WHEN upper(trim(coalesce(status_sancao, ''))) IN ('EXPIRADA', 'REMOVIDA') THEN FALSE
+                ELSE sancao_fim > CURRENT_DATE
+            END AS ativa,
+            sancao_inicio,
+            sancao_fim
+        FROM ({sancao_intervals_sql(SANCOES_SOURCE_SQL)})
         ORDER BY fornecedor_cnpj, orgao, fonte
         """
     ).fetchall()
@@ -100,7 +108,9 @@ def build_collapsed(con: duckdb.DuckDBPyConnection) -> tuple[int, int]:
         dt_fim,
         valor,
         n_pagamentos,
-        status_sancao,
+        ativa,
+        sancao_inicio,
+        sancao_fim,
     ) in rows:
         key = (str(cnpj or ""), str(orgao or ""), str(fonte or ""))
         groups.setdefault(key, []).append(
@@ -111,7 +121,9 @@ def build_collapsed(con: duckdb.DuckDBPyConnection) -> tuple[int, int]:
                 "dt_fim": str(dt_fim or ""),
                 "valor": float(valor or 0.0),
                 "n_pagamentos": int(n_pagamentos or 0),
-                "ativa": sancao_ativa(status_sancao, dt_fim),
+                "ativa": bool(ativa),
+                "inicio": sancao_inicio,
+                "fim": sancao_fim,
             }
         )
 
@@ -120,11 +132,17 @@ def build_collapsed(con: duckdb.DuckDBPyConnection) -> tuple[int, int]:
     for (cnpj, orgao, fonte), items in groups.items():
         ativas = [item for item in items if item["ativa"]]
         tipos = sorted({item["tipo"] for item in items if item["tipo"]})
-        datas_ini = sorted(item["dt_ini"] for item in items if item["dt_ini"])
-        datas_fim = sorted(
-            (item["dt_fim"] for item in items if item["dt_fim"] and item["dt_fim"].strip()),
-            reverse=True,
-        )
+        # Ordena pela data normalizada, nao pelo texto (dd/mm/aaaa nao ordena como data).
+        datas_ini = [
+            item["dt_ini"]
+            for item in sorted(items, key=lambda item: (item["inicio"] == INICIO_INDEFINIDO, item["inicio"]))
+            if item["dt_ini"]
+        ]
+        datas_fim = [
+            item["dt_fim"]
+            for item in sorted(items, key=lambda item: item["fim"], reverse=True)
+            if item["dt_fim"] and item["dt_fim"].strip()
+        ]
         nome = max((item["nome"] for item in items), key=len, default="")
         valor_total = max((item["valor"] for item in items), default=0.0)
         n_contratos = max((item["n_pagamentos"] for item in items), default=0)
@@ -355,6 +373,7 @@ def main() -> None:
         build_collapsed(con)
         build_view(con)
         n_ins = build_insights(con)
+        mark_tables_written(con, "sancoes_collapsed", "insight")
         log.info("Insights %s gerados: %d", KIND_ATIVA, n_ins)
         print_summary(con)
     finally:
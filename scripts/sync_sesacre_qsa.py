@@ -15,6 +15,7 @@ import duckdb
 import httpx
 
 from src.core.insight_classification import ensure_insight_classification_columns
+from src.core.ops_version import mark_tables_written
 from src.ingest.cnpj_enricher import build_socios_df, fetch_cnpj
 
 log = logging.getLogger("sync_sesacre_qsa")
@@ -504,6 +505,7 @@ def refresh_local(con: duckdb.DuckDBPyConnection, anos: list[int]) -> tuple[int,
     rows = recompute_qsa_flags(con, anos)
     insights = build_qsa_insights(rows)
     inserted = upsert_qsa_insights(con, insights, anos)
+    mark_tables_written(con, "estado_ac_fornecedor_qsa", "insight")
     return len(rows), inserted
 
 
@@ -558,6 +560,7 @@ def run_sync(
                 time.sleep(0.5)
 
         inserted = upsert_supplier_qsa_rows(con, supplier_rows, empresas)
+        mark_tables_written(con, "empresas_cnpj", "empresa_socios", "estado_ac_fornecedor_qsa")
         refreshed_rows, insight_count = refresh_local(con, anos)
         log.info(
             "Concluído: %d fornecedores priorizados | %d empresas QSA resolvidas | %d linhas materializadas | %d linhas recalculadas | %d insights QSA",
@@ -21,6 +21,7 @@ import httpx
 import pandas as pd
 
 from src.core.insight_classification import ensure_insight_classification_columns
+from src.core.ops_version import mark_tables_written
 
 log = logging.getLogger("sync_sesacre_sancoes")
 logging.basicConfig(
@@ -753,6 +754,7 @@ def run_sync(*, anos: list[int], force_refresh: bool, refresh_local: bool) -> No
         cross_count = upsert_cross_rows(con, matched_rows, anos)
         insights = build_insights(matched_rows)
         insight_count = upsert_insights(con, insights, anos)
+        mark_tables_written(con, "federal_ceis", "federal_cnep", "estado_ac_fornecedor_sancoes", "insight")
 
         log.info(
             "Concluido: fonte=%s | CEIS=%d | CNEP=%d | cruzamentos=%d | insights=%d",
@@ -3,6 +3,7 @@ from __future__ import annotations
 import hashlib
 import json
 import re
+import sys
 import unicodedata
 from collections import defaultdict
 from pathlib import Path
@@ -11,6 +12,11 @@ import duckdb
 import requests
 
 ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.core.ops_version import mark_tables_written
+
 DB_PATH = ROOT / "data" / "sentinela_analytics.duckdb"
 TARGET_CNPJ = "04582979000104"
 DOC_FILES = [
@@ -1527,6 +1533,14 @@ def main() -> int:
             ],
         )
 
+    mark_tables_written(
+        con,
+        "trace_agro_unidades_audit",
+        "trace_agro_unidades_docs",
+        "trace_agro_unidades_followup",
+        "trace_agro_unidades_resumo",
+        "insight",
+    )
     con.close()
     print(f"contratos={len(contrato_rows)}")
     print(f"blocos={len(resumo_rows)}")
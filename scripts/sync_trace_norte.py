@@ -17,6 +17,7 @@ ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT))
 
 from src.core.insight_classification import ensure_insight_classification_columns
+from src.core.ops_version import mark_tables_written
 from src.ingest.cnpj_enricher import fetch_cnpj
 
 log = logging.getLogger("sync_trace_norte")
@@ -912,6 +913,16 @@ def main() -> int:
     n_insights = refresh_insights(con, enabled=insight_enabled)
 
     resumo = con.execute("SELECT * FROM v_trace_norte_resumo").fetchone()
+    mark_tables_written(
+        con,
+        "empresas_cnpj",
+        "empresa_socios",
+        "trace_norte_contratos",
+        "trace_norte_leads",
+        "trace_norte_sancoes",
+        "trace_norte_socios",
+        "insight",
+    )
     con.close()
 
     log.info(
@@ -16,6 +16,7 @@ import httpx
 ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT))
 
+from src.core.ops_version import mark_tables_written
 from src.ingest.cnpj_enricher import fetch_cnpj
 
 log = logging.getLogger("sync_trace_norte_rede")
@@ -556,6 +557,14 @@ def main() -> int:
     n_empresas, n_socios, n_contratos = refresh_network(con, refresh=args.refresh_cnpj)
     build_views(con)
     resumo = con.execute("SELECT * FROM v_trace_norte_rede_resumo").fetchdf()
+    mark_tables_written(
+        con,
+        "empresas_cnpj",
+        "empresa_socios",
+        "trace_norte_rede_contratos",
+        "trace_norte_rede_empresas",
+        "trace_norte_rede_socios",
+    )
     con.close()
 
     log.info(
@@ -12,6 +12,11 @@ from pathlib import Path
 import duckdb
 
 ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.core.ops_version import mark_tables_written
+
 DB_PATH = ROOT / "data" / "sentinela_analytics.duckdb"
 TOP_LEADS = {"21813150000194", "36990588000115"}
 
@@ -331,6 +336,7 @@ def main() -> int:
     )
     total = con.execute("SELECT COUNT(*) FROM trace_norte_rede_match").fetchone()[0]
     best = con.execute("SELECT COUNT(*) FROM v_trace_norte_rede_match_best").fetchone()[0]
+    mark_tables_written(con, "trace_norte_rede_match")
     con.close()
     print(f"matches={total}")
     print(f"best_matches={best}")
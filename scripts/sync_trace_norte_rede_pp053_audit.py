@@ -16,6 +16,7 @@ DB_PATH = ROOT / "data" / "sentinela_analytics.duckdb"
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+from src.core.ops_version import mark_tables_written
 from src.ingest.transparencia_ac_connector import TransparenciaAcConnector
 
 DOE_URL = "https://contilnetnoticias.com.br/wp-content/uploads/2023/12/DO17032527167318.pdf"
@@ -343,6 +344,7 @@ def main() -> int:
         ],
     )
 
+    mark_tables_written(con, "trace_norte_rede_pp", "insight")
     con.close()
     print("audit_rows=1")
     print(f"status={status}")
@@ -2,11 +2,17 @@ from __future__ import annotations
 
 import hashlib
 import json
+import sys
 from pathlib import Path
 
 import duckdb
 
 ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.core.ops_version import mark_tables_written
+
 DB_PATH = ROOT / "data" / "sentinela_analytics.duckdb"
 
 DDL = """
@@ -177,6 +183,7 @@ def main() -> int:
 
     total_blocks = len(rows)
     total_insights = len(insights)
+    mark_tables_written(con, "trace_norte_rede_sem_licitacao", "insight")
     con.close()
     print(f"blocks={total_blocks}")
     print(f"insights={total_insights}")
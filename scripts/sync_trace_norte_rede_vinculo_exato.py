@@ -15,6 +15,7 @@ DB_PATH = ROOT / "data" / "sentinela_analytics.duckdb"
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+from src.core.ops_version import mark_tables_written
 from src.ingest.transparencia_ac_connector import TransparenciaAcConnector
 
 DDL_LINK = """
@@ -606,6 +607,7 @@ def main() -> int:
     n_insights = upsert_insight(con)
     resolved = con.execute("SELECT COUNT(*) FROM trace_norte_rede_vinculo_exato").fetchone()[0]
     diverg = con.execute("SELECT COUNT(*) FROM v_trace_norte_rede_vinculo_divergencias").fetchone()[0]
+    mark_tables_written(con, "trace_norte_rede_vinculo_audit", "trace_norte_rede_vinculo_exato", "insight")
     con.close()
 
     print(f"links={n_links}")
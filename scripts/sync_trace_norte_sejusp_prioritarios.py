@@ -3,11 +3,17 @@ from __future__ import annotations
 import hashlib
 import json
 import re
+import sys
 from pathlib import Path
 
 import duckdb
 
 ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.core.ops_version import mark_tables_written
+
 DB_PATH = ROOT / "data" / "sentinela_analytics.duckdb"
 TMP_DIR = ROOT / "data" / "tmp" / "sejusp_ctx"
 FORMAL_DIR = ROOT / "data" / "tmp" / "sejusp_formal"
@@ -1316,6 +1322,13 @@ def main() -> int:
             ],
         )
 
+    mark_tables_written(
+        con,
+        "trace_norte_sejusp_audit",
+        "trace_norte_sejusp_blocos",
+        "trace_norte_sejusp_docs",
+        "insight",
+    )
     con.close()
     print(f"blocos={len(bloco_rows)}")
     print(f"docs={len(doc_rows)}")
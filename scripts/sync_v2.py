@@ -7,7 +7,9 @@ from src.core.insight_classification import (
     classify_insight_record,
     classify_probative_record,
     ensure_insight_classification_columns,
+    refresh_insight_search_text,
 )
+from src.core.ops_version import mark_tables_written
 
 DB = "./data/sentinela_analytics.duckdb"
 
@@ -265,6 +267,10 @@ def sync_all():
                 link_insight(con, ins["id"], entity_id=ent_id, event_id=event_id)
                 link_evidence(con, evid_id, "supports", insight_id=ins["id"], entity_id=ent_id, event_id=event_id)
 
+    mark_tables_written(con, "entity", "event", "insight", "insight_link", "evidence", "evidence_link")
+    search_stats = refresh_insight_search_text(con)
+    print(f"Texto de busca atualizado para {search_stats['rows_written']} insights.")
+
     con.close()
     print("Sincronização concluída.")
 
@@ -19,6 +19,7 @@ from src.core.insight_classification import (
     classify_probative_record,
     ensure_insight_classification_columns,
 )
+from src.core.ops_version import mark_tables_written
 
 
 DB_PATH = ROOT / "data" / "sentinela_analytics.duckdb"
@@ -199,25 +200,26 @@ def build_targets(con: duckdb.DuckDBPyConnection) -> list[dict]:
     return targets
 
 
-def load_socios(con: duckdb.DuckDBPyConnection, cnpj: str) -> list[dict]:
+def load_socios_by_cnpj(con: duckdb.DuckDBPyConnection) -> dict[str, list[dict]]:
+    # QSA inteiro numa passada, agrupado por CNPJ normalizado (antes: uma consulta por alvo).
     rows = con.execute(
         """
-        SELECT socio_nome, socio_cpf_cnpj, qualificacao, data_entrada
+        SELECT regexp_replace(coalesce(cnpj,''), '\\D', '', 'g') AS cnpj, socio_nome, socio_cpf_cnpj, qualificacao, data_entrada
         FROM empresa_socios
-        WHERE regexp_replace(coalesce(cnpj,''), '\\D', '', 'g') = ?
-        ORDER BY socio_nome
-        """,
-        [cnpj],
+        ORDER BY 1, socio_nome
+        """
     ).fetchall()
-    return [
-        {
-            "nome": fix_text(row[0]),
-            "doc": clean_doc(row[1]),
-            "qualificacao": fix_text(row[2]),
-            "data_entrada": fix_text(row[3]),
-        }
-        for row in rows
-    ]
+    socios: dict[str, list[dict]] = {}
+    for row in rows:
+        socios.setdefault(row[0], []).append(
+            {
+                "nome": fix_text(row[1]),
+                "doc": clean_doc(row[2]),
+                "qualificacao": fix_text(row[3]),
+                "data_entrada": fix_text(row[4]),
+            }
+        )
+    return socios
 
 
 def build_indexes(con: duckdb.DuckDBPyConnection) -> dict[str, dict[str, list[dict]]]:
@@ -341,6 +343,7 @@ def build_matches(
     con: duckdb.DuckDBPyConnection, targets: list[dict]
 ) -> tuple[list[tuple], list[tuple], list[tuple], int]:
     indexes = build_indexes(con)
+    socios_by_cnpj = load_socios_by_cnpj(con)
     target_rows: list[tuple] = []
     match_rows: list[tuple] = []
     resumo_rows: list[tuple] = []
@@ -360,7 +363,7 @@ def build_matches(
     for target in targets:
         cnpj = target["cnpj"]
         razao = target["razao_social"]
-        socios = load_socios(con, cnpj)
+        socios = socios_by_cnpj.get(cnpj, [])
         target_rows.append(
             (
                 row_hash("vps_target", cnpj),
@@ -832,6 +835,13 @@ def main() -> int:
         ORDER BY n_socios_com_match DESC, n_pessoas_distintas DESC, exposure_brl DESC, razao_social
         """
     )
+    mark_tables_written(
+        con,
+        "vinculo_politico_societario_matches",
+        "vinculo_politico_societario_resumo",
+        "vinculo_politico_societario_targets",
+        "insight",
+    )
     con.close()
 
     print(f"targets={len(target_rows)}")
@@ -22,6 +22,7 @@ from src.core.insight_classification import (  # noqa: E402
     classify_probative_record,
     ensure_insight_classification_columns,
 )
+from src.core.ops_version import mark_tables_written  # noqa: E402
 
 
 DB_PATH = ROOT / "data" / "sentinela_analytics.duckdb"
@@ -1448,6 +1449,7 @@ def main() -> int:
         ORDER BY contrato_valor_brl DESC, razao_social
         """
     )
+    mark_tables_written(con, "vinculo_societario_saude_followup", "insight")
     con.close()
 
     print(f"cases={inserted}")
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import sys
 from datetime import datetime
 from pathlib import Path
 
@@ -8,6 +9,11 @@ import duckdb
 
 
 ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.core.ops_version import mark_tables_written
+
 DB_PATH = ROOT / "data" / "sentinela_analytics.duckdb"
 
 DDL = """
@@ -199,6 +205,7 @@ def main() -> int:
             SELECT * FROM vinculo_societario_saude_gate
             """
         )
+        mark_tables_written(con, "vinculo_societario_saude_gate")
         con.close()
         print("rows=0")
         return 0
@@ -244,6 +251,7 @@ def main() -> int:
         ORDER BY score_triagem DESC, contrato_valor_brl DESC, razao_social
         """
     )
+    mark_tables_written(con, "vinculo_societario_saude_gate")
     con.close()
     print("rows=1")
     print(f"stage={row['estagio_operacional']}")
@@ -1,12 +1,18 @@
 from __future__ import annotations
 
 import json
+import sys
 from pathlib import Path
 
 import duckdb
 
 
 ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.core.ops_version import mark_tables_written
+
 DB_PATH = ROOT / "data" / "sentinela_analytics.duckdb"
 
 RIO_BRANCO_STATUTE_URL = (
@@ -310,6 +316,7 @@ def main() -> int:
         ORDER BY contrato_valor_brl DESC, razao_social
         """
     )
+    mark_tables_written(con, "vinculo_societario_saude_juridico")
     con.close()
     print(f"cases={inserted}")
     return 0
@@ -3,6 +3,7 @@ from __future__ import annotations
 import csv
 import hashlib
 import json
+import sys
 from datetime import datetime
 from pathlib import Path
 
@@ -10,6 +11,11 @@ import duckdb
 
 
 ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.core.ops_version import mark_tables_written
+
 DB_PATH = ROOT / "data" / "sentinela_analytics.duckdb"
 OUT_DIR = (
     ROOT
@@ -449,6 +455,7 @@ def main() -> int:
     missing = con.execute(
         "SELECT COUNT(*) FROM vinculo_societario_saude_respostas WHERE status_documento = 'ARQUIVO_NAO_LOCALIZADO'"
     ).fetchone()[0]
+    mark_tables_written(con, "vinculo_societario_saude_respostas")
     con.close()
     print(f"rows={inserted}")
     print(f"missing_files={missing}")
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.core.analytics_db import AnalyticsDB  # noqa: E402
+from src.ingest.riobranco_diarias import (  # noqa: E402
+    FETCH_CHANGED,
+    FETCH_UNCHANGED,
+    RioBrancoDiariasCrawler,
+    diarias_rows,
+    normalize_diarias_export,
+)
+
+HEADER = ["Número", "Data", "Tipo", "Pessoa", "Itinerário", "Motivo", "Meio de Transporte", "Valor", "Saída", "Retorno", "Empenho"]
+COMPARED = "id, servidor_nome, destino, data_saida, data_retorno, valor, motivo, secretaria"
+
+
+def synthetic_export(rows: int, seed: int) -> bytes:
+    rng = random.Random(seed)
+    pessoas = [f"SERVIDOR {idx:03d}" for idx in range(rows // 8 + 1)] + ["JOSÉ DA CONCEIÇÃO"]
+    records = []
+    for idx in range(rows):
+        saida = date(2025, 1, 1) + timedelta(days=rng.randint(0, 400))
+        records.append(
+            {
+                "Número": idx,
+                "Data": saida.strftime("%d/%m/%Y"),
+                "Tipo": rng.choice(["Nacional", "Estadual"]),
+                "Pessoa": rng.choice(pessoas) if rng.random() > 0.01 else None,
+                "Itinerário": rng.choice(["Rio Branco/Brasília", "Rio Branco/Xapuri", None]),
+                "Motivo": rng.choice(["Capacitação", "Reunião técnica", None]),
+                "Meio de Transporte": "Aéreo",
+                "Valor": rng.choice([f"R$ {rng.randint(50, 9999):,},{rng.randint(0, 99):02d}".replace(",", "."), "R$ 150,00", ""]),
+                "Saída": saida.strftime("%d/%m/%Y") if rng.random() > 0.02 else "99/99/9999",
+                "Retorno": (saida + timedelta(days=rng.randint(0, 5))).strftime("%d/%m/%Y") if rng.random() > 0.05 else "",
+                "Empenho": f"{idx}/2025",
+            }
+        )
+    # Repete algumas linhas: ids iguais dentro da mesma exportacao.
+    records += rng.sample(records, max(1, rows // 50))
+    return pd.DataFrame(records, columns=HEADER).to_csv(index=False).encode("iso-8859-1")
+
+
+def reference_load(db: AnalyticsDB, content: bytes) -> None:
+    """Carga linha a linha de antes (iterrows + INSERT OR REPLACE por linha)."""
+    df = normalize_diarias_export(content)
+    for _, row in df.iterrows():
+        s_nome = str(row.get('pessoa', 'Desconhecido'))
+        d_saida = str(row.get('saida'))
+        v_val = str(row.get('valor_limpo', 0.0))
+        row_id = hashlib.md5(f"{s_nome}{d_saida}{v_val}".encode()).hexdigest()
+        one = pd.DataFrame([{
+            "id": row_id,
+            "servidor_nome": s_nome,
+            "destino": str(row.get('itinerario', '')),
+            "data_saida": row.get('saida'),
+            "data_retorno": row.get('retorno'),
+            "valor": float(row.get('valor_limpo', 0.0)),
+            "motivo": str(row.get('motivo', '')),
+            "secretaria": "Prefeitura de Rio Branco",
+            "capturado_em": datetime.now(),
+        }])
+        db.conn.execute("""
+            INSERT OR REPLACE INTO diarias (id, servidor_nome, destino, data_saida, data_retorno, valor, motivo, secretaria, capturado_em)
+            SELECT id, servidor_nome, destino, data_saida, data_retorno, valor, motivo, secretaria, capturado_em FROM one
+        """)
+
+
+class CachedExportCrawler(RioBrancoDiariasCrawler):
+    """Crawler com a exportacao servida da memoria (sem portal)."""
+
+    def __init__(self, db, data_dir, exports):
+        super().__init__(db=db, data_dir=data_dir)
+        self.exports = exports
+        self.downloads = 0
+
+    def _download_export(self, year_id):
+        self.downloads += 1
+        return self.exports[year_id]
+
+
+def snapshot(db: AnalyticsDB) -> list[tuple]:
+    return db.conn.execute(f"SELECT {COMPARED} FROM diarias ORDER BY id").fetchall()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compara a carga vetorizada de diarias com a carga linha a linha.")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    content = synthetic_export(args.rows, args.seed)
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        reference_db = AnalyticsDB(str(Path(tmp) / "reference.duckdb"))
+        started = time.perf_counter()
+        reference_load(reference_db, content)
+        reference_s = time.perf_counter() - started
+
+        batch_db = AnalyticsDB(str(Path(tmp) / "batch.duckdb"))
+        started = time.perf_counter()
+        written = batch_db.upsert_diarias(diarias_rows(normalize_diarias_export(content)))
+        batch_s = time.perf_counter() - started
+
+        expected = snapshot(reference_db)
+        if snapshot(batch_db) != expected:
+            failures.append("batch_rows_differ")
+        if written != len(expected):
+            failures.append(f"written={written} expected={len(expected)}")
+        rewritten = batch_db.upsert_diarias(diarias_rows(normalize_diarias_export(content)))
+        if rewritten:
+            failures.append(f"rerun_rewrote={rewritten}")
+
+        exports = {"2025": content, "2026": synthetic_export(args.rows // 5, args.seed + 1)}
+        crawler_db = AnalyticsDB(str(Path(tmp) / "crawler.duckdb"))
+        crawler = CachedExportCrawler(crawler_db, Path(tmp) / "cache", exports)
+        first = crawler.refresh_years(["2025", "2026"])
+        second = crawler.refresh_years(["2025", "2026"])
+        cached = crawler.refresh_years(["2025", "2026"], max_age_hours=1)
+        if any(item["status"] != FETCH_UNCHANGED for result in (second, cached) for item in result.values()):
+            failures.append(f"incremental_not_noop second={second} cached={cached}")
+        crawler_db.conn.execute("DELETE FROM diarias")
+        reloaded = crawler.refresh_years(["2025", "2026"], max_age_hours=1)
+        if any(item["status"] != FETCH_CHANGED for item in reloaded.values()):
+            failures.append(f"emptied_db_not_reloaded={reloaded}")
+        if crawler.downloads != 4:
+            failures.append(f"downloads={crawler.downloads} expected=4")
+        if crawler_db.conn.execute("SELECT COUNT(*) FROM diarias").fetchone()[0] < len(expected):
+            failures.append("crawler_rows_missing")
+        for db in (reference_db, batch_db, crawler_db):
+            db.close()
+
+    print(f"rows_exported={args.rows}")
+    print(f"rows_table={len(expected)}")
+    print(f"reference_s={reference_s:.2f}")
+    print(f"batch_s={batch_s:.3f}")
+    print(f"speedup={reference_s / batch_s:.1f}x")
+    print(f"first_refresh={first}")
+    print(f"failures={len(failures)}")
+    for failure in failures:
+        print(f"failure={failure}")
+    return 2 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
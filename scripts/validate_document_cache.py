@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import duckdb
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.core.ops_document import (  # noqa: E402
+    HTML_SUFFIXES,
+    _label_table,
+    _parse_html_lxml,
+    _parse_html_soup,
+    lxml,
+)
+
+DB_PATH = ROOT / "data" / "sentinela_analytics.duckdb"
+
+
+def artifact_paths(con: duckdb.DuckDBPyConnection) -> list[Path]:
+    tables = set(con.execute("SHOW TABLES").df()["name"].tolist())
+    values: set[str] = set()
+    if "ops_case_artifact" in tables:
+        values.update(row[0] for row in con.execute("SELECT path FROM ops_case_artifact WHERE exists AND path IS NOT NULL").fetchall())
+    if "ops_case_inbox_document" in tables:
+        values.update(
+            row[0]
+            for row in con.execute("SELECT file_path FROM ops_case_inbox_document WHERE file_exists AND file_path IS NOT NULL").fetchall()
+        )
+    paths = [Path(value) if Path(value).is_absolute() else ROOT / value for value in values]
+    if not paths:
+        # Base sem registro de casos: usa os HTML congelados em investigations/.
+        paths = list((ROOT / "investigations").rglob("*.htm*"))
+    return sorted(path for path in paths if path.suffix.lower() in HTML_SUFFIXES and path.exists())
+
+
+def main() -> int:
+    if lxml is None:
+        print("lxml_missing")
+        return 1
+    con = duckdb.connect(str(DB_PATH), read_only=True)
+    try:
+        paths = artifact_paths(con)
+    finally:
+        con.close()
+
+    mismatches = []
+    for path in paths:
+        content = path.read_text(encoding="utf-8", errors="replace")
+        fast_text, fast_rows, fast_sections = _parse_html_lxml(content)
+        ref_text, ref_rows, ref_sections = _parse_html_soup(content)
+        if fast_text != ref_text or _label_table(fast_rows) != _label_table(ref_rows) or fast_sections != ref_sections:
+            mismatches.append(path)
+
+    print(f"html_documents={len(paths)}")
+    print(f"lxml_mismatches={len(mismatches)}")
+    for path in mismatches[:10]:
+        print(f"mismatch={path.relative_to(ROOT) if path.is_relative_to(ROOT) else path}")
+    return 2 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
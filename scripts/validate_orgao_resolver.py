@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import duckdb
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.ingest.transparencia_ac_connector import (  # noqa: E402
+    ORGAO_KEYWORDS,
+    _resolve_orgao_reference,
+    resolve_orgao,
+    resolve_orgao_many,
+)
+
+DB_PATH = ROOT / "data" / "sentinela_analytics.duckdb"
+FILLERS = ["", "UNIDADE 01", "FUNDO", "SECRETARIA", "ltda", "Saúde", "X", "9", "-", "/"]
+
+
+def synthetic_texts() -> list[str]:
+    texts = list(FILLERS)
+    for _, keywords in ORGAO_KEYWORDS:
+        for keyword in keywords:
+            core = keyword.strip()
+            texts += [
+                keyword,
+                core.lower(),
+                f"{core}X",
+                f"X{core}",
+                f"1{core}",
+                f"{core}/AC",
+                f"({core})",
+                f"  {core}   - unidade  ",
+                f"{core[:-1]}",
+                f"SECRETARIA {core} DO ACRE",
+                core.replace("A", "Á", 1).replace("E", "É", 1),
+            ]
+    return texts
+
+
+def db_triples() -> list[tuple[str, str, str]]:
+    if not DB_PATH.exists():
+        return []
+    con = duckdb.connect(str(DB_PATH), read_only=True)
+    try:
+        tables = set(con.execute("SHOW TABLES").df()["name"].tolist())
+        if "estado_ac_pagamentos" not in tables:
+            return []
+        rows = con.execute(
+            """
+            SELECT DISTINCT
+                COALESCE(unidade_gestora, ''),
+                COALESCE(credor, ''),
+                COALESCE(natureza_despesa, '')
+            FROM estado_ac_pagamentos
+            """
+        ).fetchall()
+    finally:
+        con.close()
+    return [tuple(row) for row in rows]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compara o resolvedor de orgaos compilado com o laco original.")
+    parser.add_argument("--samples", type=int, default=50000, help="Triplas sinteticas aleatorias")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    texts = synthetic_texts()
+    rng = random.Random(args.seed)
+    triples = [(text, "", "") for text in texts]
+    triples += [("", text, "") for text in texts]
+    triples += [("", "", text) for text in texts]
+    triples += [
+        tuple(" ".join(rng.sample(texts, rng.randint(0, 2))) for _ in range(3))
+        for _ in range(args.samples)
+    ]
+    triples += db_triples()
+
+    started = time.perf_counter()
+    expected = [
+        _resolve_orgao_reference(unidade_gestora=u, credor=c, natureza_despesa=n)
+        for u, c, n in triples
+    ]
+    reference_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    single = [resolve_orgao(unidade_gestora=u, credor=c, natureza_despesa=n) for u, c, n in triples]
+    single_s = time.perf_counter() - started
+
+    unidades, credores, naturezas = (list(column) for column in zip(*triples))
+    started = time.perf_counter()
+    many = resolve_orgao_many(unidades, credores, naturezas)
+    many_s = time.perf_counter() - started
+
+    mismatches = [
+        (triple, want, got_single, got_many)
+        for triple, want, got_single, got_many in zip(triples, expected, single, many)
+        if not (want == got_single == got_many)
+    ]
+    print(f"triples={len(triples)}")
+    print(f"resolved_non_default={sum(orgao != 'GOVERNO_ACRE' for orgao in expected)}")
+    print(f"reference_s={reference_s:.3f}")
+    print(f"compiled_s={single_s:.3f}")
+    print(f"many_s={many_s:.3f}")
+    print(f"mismatches={len(mismatches)}")
+    for triple, want, got_single, got_many in mismatches[:10]:
+        print(f"mismatch={triple!r} expected={want} single={got_single} many={got_many}")
+    return 2 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
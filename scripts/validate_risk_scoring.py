@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import duckdb
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.core.legal_compliance import calculate_risk_score  # noqa: E402
+from src.core.risk_scoring import refresh_risk_scores, score_risk_frame  # noqa: E402
+
+
+def synthetic_metrics(rows: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    metrics = []
+    for _ in range(rows):
+        item = {}
+        # Chaves ausentes exercitam os defaults da funcao escalar.
+        if rng.random() > 0.1:
+            item["days_old"] = rng.choice([rng.randint(-30, 400), 29, 30, 179, 180, 999])
+        if rng.random() > 0.1:
+            item["front_company_risk"] = rng.random() < 0.2
+        if rng.random() > 0.1:
+            item["financial_ratio"] = rng.choice([rng.uniform(0, 20), 5.0, float("inf")])
+        if rng.random() > 0.1:
+            item["cnae_compatible"] = rng.random() > 0.15
+        if rng.random() > 0.1:
+            item["document_valid"] = rng.random() > 0.05
+        metrics.append(item)
+    return metrics
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compara o score de risco em lote com calculate_risk_score.")
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    metrics = synthetic_metrics(args.rows, args.seed)
+
+    started = time.perf_counter()
+    expected = [calculate_risk_score(item) for item in metrics]
+    scalar_s = time.perf_counter() - started
+
+    frame = pd.DataFrame(metrics)
+    started = time.perf_counter()
+    scored = score_risk_frame(frame)
+    batch_s = time.perf_counter() - started
+
+    failures = []
+    for idx, (row, ref) in enumerate(zip(scored.itertuples(index=False), expected)):
+        if (row.score, row.risk_label, row.flags) != (ref["score"], ref["risk_label"], ref["flags"]):
+            failures.append(f"row={idx} metrics={metrics[idx]} batch={row} scalar={ref}")
+
+    con = duckdb.connect()
+    ids = pd.Series([f"entity:{idx}" for idx in range(len(frame))])
+    started = time.perf_counter()
+    first = refresh_risk_scores(con, ids, frame)
+    first_s = time.perf_counter() - started
+    started = time.perf_counter()
+    second = refresh_risk_scores(con, ids, frame)
+    second_s = time.perf_counter() - started
+    if first["scored"] != len(frame) or second["scored"]:
+        failures.append(f"incremental first={first} second={second}")
+    stored = con.execute("SELECT entity_id, score FROM risk_score").fetchall()
+    by_id = dict(stored)
+    if any(by_id.get(f"entity:{idx}") != ref["score"] for idx, ref in enumerate(expected)):
+        failures.append("stored_scores_differ")
+    con.close()
+
+    print(f"rows={len(frame)}")
+    print(f"scalar_s={scalar_s:.3f}")
+    print(f"batch_s={batch_s:.3f}")
+    print(f"speedup={scalar_s / batch_s:.1f}x")
+    print(f"persist_first_s={first_s:.3f}")
+    print(f"persist_noop_s={second_s:.3f}")
+    print(f"failures={len(failures)}")
+    for failure in failures[:10]:
+        print(f"failure={failure}")
+    return 2 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -7,6 +7,15 @@ from pathlib import Path
 import duckdb
 
 ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.core.sanction_intervals import (  # noqa: E402
+    ANTERIOR_A_SANCAO,
+    DURANTE_SANCAO,
+    interval_match_sql,
+    sancao_intervals_sql,
+)
 
 
 def _date_expr_rb() -> str:
@@ -24,15 +33,6 @@ def _date_expr_rb() -> str:
     """
 
 
-def _date_expr_sc(column_expr: str) -> str:
-    return f"""
-    COALESCE(
-        TRY_STRPTIME(CAST({column_expr} AS VARCHAR), '%d/%m/%Y')::DATE,
-        TRY_CAST(CAST({column_expr} AS VARCHAR) AS DATE)
-    )
-    """
-
-
 def run_validation(db_path: str) -> dict[str, object]:
     con = duckdb.connect(db_path, read_only=True)
     try:
@@ -59,48 +59,48 @@ def run_validation(db_path: str) -> dict[str, object]:
             print("[ERRO] Nenhuma coluna de CNPJ encontrada em sancoes_collapsed.")
             return {"error": "cnpj_col_missing"}
 
-        filtro_ativa = f"AND s.{ativa_col} = TRUE" if ativa_col else ""
-        contract_date_expr = _date_expr_rb()
-        start_date_expr = _date_expr_sc(f"s.{di_col}") if di_col else "NULL"
-        end_date_expr = _date_expr_sc(f"s.{df_col}") if df_col else "NULL"
-
-        total_bruto = con.execute(
-            f"""
-            SELECT COUNT(*)
+        events_sql = f"""
+            SELECT
+                c.numero_contrato,
+                c.numero_processo,
+                c.fornecedor,
+                c.cnpj,
+                c.ano,
+                c.data_lancamento,
+                c.sus,
+                {_date_expr_rb()} AS evento_inicio,
+                NULL::DATE AS evento_fim
             FROM rb_contratos c
-            JOIN sancoes_collapsed s
-              ON REGEXP_REPLACE(c.cnpj, '[^0-9]', '', 'g')
-               = REGEXP_REPLACE(CAST(s.{cnpj_col} AS VARCHAR), '[^0-9]', '', 'g')
-            WHERE c.cnpj <> ''
-              AND c.sus = TRUE
-              {filtro_ativa}
+        """
+        sanctions_sql = sancao_intervals_sql(
+            f"""
+            SELECT
+                s.fonte,
+                CAST(s.{cnpj_col} AS VARCHAR) AS cnpj,
+                s.orgao_ac,
+                {f"s.{ativa_col}" if ativa_col else "TRUE"} AS ativa,
+                {f"CAST(s.{abrang_col} AS VARCHAR)" if abrang_col else "NULL::VARCHAR"} AS abrangencia,
+                {f"s.{di_col}" if di_col else "NULL::VARCHAR"} AS data_inicio_sancao,
+                {f"s.{df_col}" if df_col else "NULL::VARCHAR"} AS data_fim_sancao
+            FROM sancoes_collapsed s
             """
-        ).fetchone()[0]
+        )
+        # Um unico join por CNPJ canonico classifica todos os pares; os recortes abaixo sao filtros do resultado.
+        matches = con.execute(
+            f"""
+            SELECT *
+            FROM ({interval_match_sql(events_sql, sanctions_sql)})
+            ORDER BY evento_inicio DESC, numero_contrato, orgao_ac
+            """
+        ).fetchdf()
+        base = matches[matches["sus"].fillna(False).astype(bool) & matches["ativa"].fillna(False).astype(bool)]
+
+        total_bruto = len(base)
         print(f"[ATUAL] Cruzamentos brutos CEIS x contratos SUS: {total_bruto}")
 
         posterior = 0
         if di_col:
-            posterior_df = con.execute(
-                f"""
-                SELECT
-                    c.numero_contrato,
-                    c.numero_processo,
-                    c.fornecedor,
-                    c.cnpj,
-                    {contract_date_expr} AS data_contrato_ref,
-                    {start_date_expr} AS sancao_inicio
-                FROM rb_contratos c
-                JOIN sancoes_collapsed s
-                  ON REGEXP_REPLACE(c.cnpj, '[^0-9]', '', 'g')
-                   = REGEXP_REPLACE(CAST(s.{cnpj_col} AS VARCHAR), '[^0-9]', '', 'g')
-                WHERE c.cnpj <> ''
-                  AND c.sus = TRUE
-                  {filtro_ativa}
-                  AND {start_date_expr} IS NOT NULL
-                  AND {start_date_expr} > {contract_date_expr}
-                ORDER BY data_contrato_ref DESC, numero_contrato
-                """
-            ).fetchdf()
+            posterior_df = base[base["situacao_temporal"] == ANTERIOR_A_SANCAO]
             posterior = len(posterior_df)
             print(f"[PROBLEMA] Sanções posteriores ao contrato: {posterior}")
             if posterior:
@@ -108,7 +108,7 @@ def run_validation(db_path: str) -> dict[str, object]:
                 for _, row in posterior_df.head(10).iterrows():
                     print(
                         f"    contrato={row['numero_contrato']} processo={row['numero_processo']} "
-                        f"cnpj={row['cnpj']} data_contrato={row['data_contrato_ref']} sancao_inicio={row['sancao_inicio']}"
+                        f"cnpj={row['cnpj']} data_contrato={row['evento_inicio']} sancao_inicio={row['sancao_inicio']}"
                     )
                 if posterior > 10:
                     print(f"    ... e mais {posterior - 10} caso(s)")
@@ -117,81 +117,51 @@ def run_validation(db_path: str) -> dict[str, object]:
 
         abrang_restrita = 0
         if abrang_col:
-            abrang_df = con.execute(
-                f"""
-                SELECT
-                    c.numero_contrato,
-                    c.cnpj,
-                    c.fornecedor,
-                    s.{abrang_col} AS abrangencia
-                FROM rb_contratos c
-                JOIN sancoes_collapsed s
-                  ON REGEXP_REPLACE(c.cnpj, '[^0-9]', '', 'g')
-                   = REGEXP_REPLACE(CAST(s.{cnpj_col} AS VARCHAR), '[^0-9]', '', 'g')
-                WHERE c.cnpj <> ''
-                  AND c.sus = TRUE
-                  {filtro_ativa}
-                  AND s.{abrang_col} IS NOT NULL
-                  AND LOWER(CAST(s.{abrang_col} AS VARCHAR)) NOT LIKE '%todas as esferas%'
-                  AND LOWER(CAST(s.{abrang_col} AS VARCHAR)) NOT LIKE '%todos os poderes%'
-                  AND LOWER(CAST(s.{abrang_col} AS VARCHAR)) NOT LIKE '%nacional%'
-                """
-            ).fetchdf()
-            abrang_restrita = len(abrang_df)
+            abrangencia = base["abrangencia"].dropna().str.lower()
+            abrang_restrita = int(
+                (
+                    ~abrangencia.str.contains("todas as esferas", regex=False)
+                    & ~abrangencia.str.contains("todos os poderes", regex=False)
+                    & ~abrangencia.str.contains("nacional", regex=False)
+                ).sum()
+            )
             print(f"[REVISÃO] Abrangência não verificada automaticamente: {abrang_restrita}")
         else:
             print("[REVISÃO] Abrangência ausente em sancoes_collapsed: todos os matches temporais exigem revisão humana de escopo.")
 
-        temporal_ok = 0
-        if di_col:
-            temporal_ok = con.execute(
-                f"""
-                SELECT COUNT(*)
-                FROM rb_contratos c
-                JOIN sancoes_collapsed s
-                  ON REGEXP_REPLACE(c.cnpj, '[^0-9]', '', 'g')
-                   = REGEXP_REPLACE(CAST(s.{cnpj_col} AS VARCHAR), '[^0-9]', '', 'g')
-                WHERE c.cnpj <> ''
-                  AND c.sus = TRUE
-                  {filtro_ativa}
-                  AND ({start_date_expr} IS NULL OR {start_date_expr} <= {contract_date_expr})
-                  AND ({end_date_expr} IS NULL OR {end_date_expr} >= {contract_date_expr})
-                """
-            ).fetchone()[0]
+        temporal_ok = int((base["situacao_temporal"] == DURANTE_SANCAO).sum()) if di_col else 0
         print(f"[PATCH 01] Matches temporalmente válidos: {temporal_ok}")
         print(f"[PATCH 01] Redução potencial imediata: {int(total_bruto or 0) - int(temporal_ok or 0)}")
 
         print("\n" + "-" * 70)
         print("DIAGNÓSTICO: contrato 3895 / processo 3044")
         print("-" * 70)
-        caso_3895 = con.execute(
-            f"""
-            SELECT
-                c.numero_contrato,
-                c.numero_processo,
-                c.fornecedor,
-                c.cnpj,
-                c.ano,
-                c.data_lancamento,
-                {contract_date_expr} AS data_contrato_ref,
-                {start_date_expr if di_col else 'NULL'} AS sancao_inicio,
-                {end_date_expr if df_col else 'NULL'} AS sancao_fim,
-                {f"s.{abrang_col}" if abrang_col else "NULL"} AS abrangencia,
-                {f"s.{ativa_col}" if ativa_col else "NULL"} AS ativa,
-                s.orgao_ac
-            FROM rb_contratos c
-            JOIN sancoes_collapsed s
-              ON REGEXP_REPLACE(c.cnpj, '[^0-9]', '', 'g')
-               = REGEXP_REPLACE(CAST(s.{cnpj_col} AS VARCHAR), '[^0-9]', '', 'g')
-            WHERE c.numero_contrato = '3895'
-               OR c.numero_processo = '3044'
-            ORDER BY s.orgao_ac
-            """
-        ).fetchdf()
+        caso_3895 = matches[
+            (matches["numero_contrato"].astype(str) == "3895") | (matches["numero_processo"].astype(str) == "3044")
+        ].sort_values("orgao_ac")
         if caso_3895.empty:
             print("  contrato 3895 não encontrado.")
         else:
-            print(caso_3895.to_string(index=False))
+            print(
+                caso_3895[
+                    [
+                        "numero_contrato",
+                        "numero_processo",
+                        "fornecedor",
+                        "cnpj",
+                        "ano",
+                        "data_lancamento",
+                        "evento_inicio",
+                        "sancao_inicio",
+                        "sancao_fim",
+                        "abrangencia",
+                        "ativa",
+                        "orgao_ac",
+                        "dias_sobreposicao",
+                        "situacao_temporal",
+                    ]
+                ].to_string(index=False)
+            )
 
         return {
             "total_bruto": int(total_bruto or 0),
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import duckdb
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.core import ops_runtime  # noqa: E402
+from src.core.ops_runtime import refresh_source_cache  # noqa: E402
+
+STUB_DELAY_SECONDS = 0.3
+STUB_BODY = b"<html><body>fonte estavel</body></html>"
+STUB_ETAG = '"stub-v1"'
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    # /head: aceita HEAD; /get: so GET (HEAD 405), como varios portais.
+    conditional_hits = 0
+
+    def log_message(self, *args) -> None:
+        return
+
+    def _not_modified(self) -> bool:
+        if self.headers.get("If-None-Match") == STUB_ETAG:
+            StubHandler.conditional_hits += 1
+            self.send_response(304)
+            self.send_header("ETag", STUB_ETAG)
+            self.end_headers()
+            return True
+        return False
+
+    def do_HEAD(self) -> None:
+        time.sleep(STUB_DELAY_SECONDS)
+        if self.path.startswith("/get"):
+            self.send_response(405)
+            self.end_headers()
+            return
+        if self._not_modified():
+            return
+        self.send_response(200)
+        self.send_header("ETag", STUB_ETAG)
+        self.send_header("Content-Type", "text/html")
+        self.end_headers()
+
+    def do_GET(self) -> None:
+        time.sleep(STUB_DELAY_SECONDS)
+        if self._not_modified():
+            return
+        self.send_response(200)
+        self.send_header("ETag", STUB_ETAG)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(STUB_BODY)))
+        self.end_headers()
+        self.wfile.write(STUB_BODY)
+
+
+def main() -> int:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    sources = [
+        {
+            "cache_key": f"stub_{mode}_{index}",
+            "source_name": f"Stub {mode} {index}",
+            "resource_url": f"{base}/{mode}/{index}",
+            "ttl_seconds": 3600,
+        }
+        for mode in ("head", "get")
+        for index in range(4)
+    ]
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        ops_runtime.SOURCE_OBJECT_DIR = Path(tmp) / "objects"
+        ops_runtime.ROOT = Path(tmp)
+        con = duckdb.connect(str(Path(tmp) / "probe.duckdb"))
+        try:
+            started = time.perf_counter()
+            first = refresh_source_cache(con, timeout=5, workers=8, sources=sources)
+            elapsed = time.perf_counter() - started
+            # 4 fontes so-GET fazem HEAD + GET: serial levaria ~12 x delay.
+            if elapsed > 6 * STUB_DELAY_SECONDS:
+                failures.append(f"probe_not_concurrent elapsed={elapsed:.2f}s")
+            if first["sources"] != len(sources) or first["ok"] != len(sources):
+                failures.append(f"first_run={first}")
+            objects = list(ops_runtime.SOURCE_OBJECT_DIR.rglob("*.html"))
+            if len(objects) != 1:
+                failures.append(f"content_store_objects={len(objects)}")
+
+            fresh = refresh_source_cache(con, timeout=5, workers=8, sources=sources)
+            if fresh["sources"] != 0 or fresh["skipped_fresh"] != len(sources):
+                failures.append(f"fresh_run={fresh}")
+
+            forced = refresh_source_cache(con, timeout=5, workers=8, sources=sources, force=True)
+            if forced["not_modified"] != len(sources) or StubHandler.conditional_hits < len(sources):
+                failures.append(f"forced_run={forced} conditional_hits={StubHandler.conditional_hits}")
+            carried = con.execute(
+                """
+                SELECT COUNT(*) FROM v_ops_source_cache_latest
+                WHERE cache_key LIKE 'stub_get_%' AND status_code = 304 AND body_path IS NOT NULL
+                """
+            ).fetchone()[0]
+            if carried != 4:
+                failures.append(f"not_modified_body_carried={carried}")
+        finally:
+            con.close()
+            server.shutdown()
+
+    print(f"probe_elapsed_s={elapsed:.2f}")
+    print(f"conditional_hits={StubHandler.conditional_hits}")
+    print(f"failures={len(failures)}")
+    for failure in failures:
+        print(f"failure={failure}")
+    return 2 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
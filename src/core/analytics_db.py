@@ -3,8 +3,13 @@ import pandas as pd
 from pathlib import Path
 import logging
 
+from src.core.ops_version import mark_tables_written
+
 log = logging.getLogger("Sentinela.DB")
 
+OBRA_COLUMNS = ["id", "nome", "valor_total", "empresa_id", "empresa_nome", "secretaria", "capturado_em", "page_sha256"]
+DIARIA_COLUMNS = ["id", "servidor_nome", "destino", "data_saida", "data_retorno", "valor", "motivo", "secretaria", "capturado_em"]
+
 class AnalyticsDB:
     def __init__(self, db_path="./data/sentinela_analytics.duckdb"):
         self.db_path = db_path
@@ -44,6 +49,9 @@ class AnalyticsDB:
         if "empresa_nome" not in col_names:
             log.info("Migrando banco: adicionando coluna 'empresa_nome'...")
             self.conn.execute("ALTER TABLE obras ADD COLUMN empresa_nome TEXT DEFAULT 'Empresa Desconhecida'")
+        if "page_sha256" not in col_names:
+            # Hash da pagina de detalhe: coletas seguintes pulam obras sem mudanca.
+            self.conn.execute("ALTER TABLE obras ADD COLUMN page_sha256 VARCHAR")
 
         self.conn.execute("""
             CREATE TABLE IF NOT EXISTS entidades (
@@ -65,18 +73,58 @@ class AnalyticsDB:
         log.info("Esquema DuckDB verificado e atualizado.")
 
     def upsert_obra(self, data: dict):
-        df = pd.DataFrame([data])
-        self.conn.execute("""
-            INSERT OR REPLACE INTO obras (id, nome, valor_total, empresa_id, empresa_nome, secretaria, capturado_em)
-            SELECT id, nome, valor_total, empresa_id, empresa_nome, secretaria, capturado_em FROM df
+        self.upsert_obras([data])
+
+    def upsert_obras(self, rows: list[dict]) -> int:
+        """Grava um lote de obras num unico INSERT OR REPLACE."""
+        if not rows:
+            return 0
+        df = pd.DataFrame.from_records(rows, columns=OBRA_COLUMNS)
+        df["page_sha256"] = df["page_sha256"].astype(object).where(df["page_sha256"].notna(), None)
+        self.conn.execute(f"""
+            INSERT OR REPLACE INTO obras ({", ".join(OBRA_COLUMNS)})
+            SELECT {", ".join(OBRA_COLUMNS)} FROM df
         """)
+        mark_tables_written(self.conn, "obras")
+        return len(df)
+
+    def obra_page_hashes(self) -> dict:
+        rows = self.conn.execute("SELECT id, page_sha256 FROM obras WHERE page_sha256 IS NOT NULL").fetchall()
+        return dict(rows)
 
     def upsert_diaria(self, data: dict):
-        df = pd.DataFrame([data])
-        self.conn.execute("""
-            INSERT OR REPLACE INTO diarias (id, servidor_nome, destino, data_saida, data_retorno, valor, motivo, secretaria, capturado_em)
-            SELECT id, servidor_nome, destino, data_saida, data_retorno, valor, motivo, secretaria, capturado_em FROM df
-        """)
+        self.upsert_diarias(pd.DataFrame([data], columns=DIARIA_COLUMNS))
+
+    def upsert_diarias(self, df: pd.DataFrame) -> int:
+        """
+        Grava o lote num unico INSERT ... ON CONFLICT a partir do DataFrame
+        registrado. Linhas sem mudanca de conteudo nao sao reescritas (mantem
+        capturado_em); devolve quantas foram inseridas ou atualizadas.
+        """
+        if df.empty:
+            return 0
+        # ON CONFLICT nao atualiza a mesma chave duas vezes no mesmo comando:
+        # como nos upserts linha a linha, vale a ultima ocorrencia.
+        batch = df[DIARIA_COLUMNS].drop_duplicates("id", keep="last")
+        compared = DIARIA_COLUMNS[1:-1]
+        assignments = ", ".join(f"{col} = excluded.{col}" for col in DIARIA_COLUMNS[1:])
+        differs = " OR ".join(f"diarias.{col} IS DISTINCT FROM excluded.{col}" for col in compared)
+        self.conn.register("diarias_batch", batch)
+        try:
+            row = self.conn.execute(f"""
+                INSERT INTO diarias ({", ".join(DIARIA_COLUMNS)})
+                SELECT id, servidor_nome, destino, CAST(data_saida AS DATE), CAST(data_retorno AS DATE),
+                       valor, motivo, secretaria, capturado_em
+                FROM diarias_batch
+                ON CONFLICT (id) DO UPDATE SET {assignments}
+                WHERE {differs}
+            """).fetchone()
+        finally:
+            self.conn.unregister("diarias_batch")
+        written = int(row[0]) if row else 0
+        if written:
+            mark_tables_written(self.conn, "diarias")
+        return written
 
     def close(self):
         self.conn.close()
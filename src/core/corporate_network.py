@@ -0,0 +1,368 @@
+from __future__ import annotations
+
+from typing import Any
+
+import duckdb
+
+from src.core.entity_timeline import NAME_KEY_SQL
+
+
+# Rede societaria: grafo bipartido socio <-> CNPJ montado do QSA
+# (empresa_socios) numa passada. Componentes conexos saem de union-find e ficam
+# gravados por no (cluster_id) e por cluster (tamanho e metricas de controle
+# compartilhado). A sincronizacao e incremental: so os clusters tocados por
+# vinculos novos ou removidos sao recalculados. Transacao fica a cargo de quem
+# chama: uma sincronizacao interrompida no meio deixaria clusters sem nos.
+
+EDGE_TABLE = "corporate_network_edge"
+NODE_TABLE = "corporate_network_node"
+CLUSTER_TABLE = "corporate_network_cluster"
+
+DDL_EDGE = f"""
+CREATE TABLE IF NOT EXISTS {EDGE_TABLE} (
+    cnpj VARCHAR,
+    socio_key VARCHAR,
+    socio_nome VARCHAR,
+    socio_doc VARCHAR,
+    qualificacao VARCHAR,
+    PRIMARY KEY (cnpj, socio_key)
+)
+"""
+
+DDL_NODE = f"""
+CREATE TABLE IF NOT EXISTS {NODE_TABLE} (
+    node_key VARCHAR PRIMARY KEY,
+    kind VARCHAR,
+    nome VARCHAR,
+    cluster_id VARCHAR,
+    degree INTEGER,
+    linked_cnpjs VARCHAR[],
+    updated_at TIMESTAMP
+)
+"""
+
+DDL_CLUSTER = f"""
+CREATE TABLE IF NOT EXISTS {CLUSTER_TABLE} (
+    cluster_id VARCHAR PRIMARY KEY,
+    n_empresas INTEGER,
+    n_socios INTEGER,
+    n_vinculos INTEGER,
+    n_socios_compartilhados INTEGER,
+    max_empresas_por_socio INTEGER,
+    updated_at TIMESTAMP
+)
+"""
+
+NODE_CLUSTER_INDEX = f"CREATE INDEX IF NOT EXISTS idx_{NODE_TABLE}_cluster ON {NODE_TABLE}(cluster_id)"
+
+_DOC_DIGITS = "regexp_replace(coalesce({expr}, ''), '\\D', '', 'g')"
+_EMPRESA_KEY = "regexp_full_match({expr}, '[0-9]{{14}}')"
+
+# Socio PJ (documento com 14 digitos) vira o proprio no da empresa, ligando
+# holdings e investidas. Socio PF e o nome normalizado mais os digitos visiveis
+# do CPF mascarado (***123456**), o que separa homonimos quando ha documento.
+SOCIO_KEY_SQL = f"""
+CASE
+    WHEN length({_DOC_DIGITS.format(expr='socio_cpf_cnpj')}) = 14 THEN {_DOC_DIGITS.format(expr='socio_cpf_cnpj')}
+    WHEN {_DOC_DIGITS.format(expr='socio_cpf_cnpj')} = '' THEN 'PF:' || {NAME_KEY_SQL.format(expr='socio_nome')}
+    ELSE 'PF:' || {NAME_KEY_SQL.format(expr='socio_nome')} || '|' || {_DOC_DIGITS.format(expr='socio_cpf_cnpj')}
+END
+"""
+
+QSA_EDGES_SQL = f"""
+SELECT
+    {_DOC_DIGITS.format(expr='cnpj')} AS cnpj,
+    {SOCIO_KEY_SQL} AS socio_key,
+    any_value(socio_nome) AS socio_nome,
+    any_value(socio_cpf_cnpj) AS socio_doc,
+    any_value(qualificacao) AS qualificacao
+FROM empresa_socios
+WHERE length({_DOC_DIGITS.format(expr='cnpj')}) = 14
+  AND nullif(trim(coalesce(socio_nome, '')), '') IS NOT NULL
+GROUP BY 1, 2
+HAVING {_DOC_DIGITS.format(expr='cnpj')} <> socio_key
+"""
+
+
+def ensure_corporate_network(con: duckdb.DuckDBPyConnection) -> None:
+    con.execute(DDL_EDGE)
+    con.execute(DDL_NODE)
+    con.execute(DDL_CLUSTER)
+    con.execute(NODE_CLUSTER_INDEX)
+
+
+def _table_exists(con: duckdb.DuckDBPyConnection, table: str) -> bool:
+    row = con.execute(
+        "SELECT COUNT(*) FROM information_schema.tables WHERE table_name = ?", [table]
+    ).fetchone()
+    return bool(row and row[0])
+
+
+def connected_components(edges: list[tuple[str, str]], nodes: set[str] = frozenset()) -> dict[str, str]:
+    """
+    Union-find sobre as arestas; devolve no -> rotulo do componente. O rotulo
+    e a menor chave de empresa (14 digitos) do componente, ou a menor chave.
+    """
+    parent: dict[str, str] = {node: node for node in nodes}
+
+    def find(node: str) -> str:
+        root = parent.setdefault(node, node)
+        while parent[root] != root:
+            root = parent[root]
+        while parent[node] != root:
+            parent[node], node = root, parent[node]
+        return root
+
+    for left, right in edges:
+        a, b = find(left), find(right)
+        if a != b:
+            parent[max(a, b)] = min(a, b)
+
+    labels: dict[str, str] = {}
+    for node in parent:
+        root = find(node)
+        if _is_empresa(node) and (root not in labels or node < labels[root]):
+            labels[root] = node
+    return {node: labels.get(find(node), find(node)) for node in parent}
+
+
+def _is_empresa(node_key: str) -> bool:
+    return len(node_key) == 14 and node_key.isdigit()
+
+
+def sync_corporate_network(con: duckdb.DuckDBPyConnection, *, full: bool = False) -> dict[str, int]:
+    """
+    Aplica ao grafo gravado as mudancas do QSA. Com `full`, refaz tudo.
+    Devolve contagens de vinculos novos/removidos e clusters recalculados.
+    """
+    ensure_corporate_network(con)
+    if not _table_exists(con, "empresa_socios"):
+        return {"edges_added": 0, "edges_removed": 0, "clusters_rebuilt": 0, "clusters": 0}
+    if full:
+        for table in (EDGE_TABLE, NODE_TABLE, CLUSTER_TABLE):
+            con.execute(f"DELETE FROM {table}")
+
+    con.execute(f"CREATE OR REPLACE TEMP TABLE _cn_qsa AS {QSA_EDGES_SQL}")
+    con.execute(
+        f"""
+        CREATE OR REPLACE TEMP TABLE _cn_added AS
+        SELECT q.* FROM _cn_qsa q
+        ANTI JOIN {EDGE_TABLE} e ON e.cnpj = q.cnpj AND e.socio_key = q.socio_key
+        """
+    )
+    con.execute(
+        f"""
+        CREATE OR REPLACE TEMP TABLE _cn_removed AS
+        SELECT e.cnpj, e.socio_key FROM {EDGE_TABLE} e
+        ANTI JOIN _cn_qsa q ON q.cnpj = e.cnpj AND q.socio_key = e.socio_key
+        """
+    )
+    added = con.execute("SELECT COUNT(*) FROM _cn_added").fetchone()[0]
+    removed = con.execute("SELECT COUNT(*) FROM _cn_removed").fetchone()[0]
+    # Nome/qualificacao mudaram sem mudar a chave: atualiza no lugar.
+    con.execute(
+        f"""
+        UPDATE {EDGE_TABLE} SET socio_nome = q.socio_nome, socio_doc = q.socio_doc, qualificacao = q.qualificacao
+        FROM _cn_qsa q
+        WHERE {EDGE_TABLE}.cnpj = q.cnpj AND {EDGE_TABLE}.socio_key = q.socio_key
+          AND ({EDGE_TABLE}.socio_nome IS DISTINCT FROM q.socio_nome
+               OR {EDGE_TABLE}.socio_doc IS DISTINCT FROM q.socio_doc
+               OR {EDGE_TABLE}.qualificacao IS DISTINCT FROM q.qualificacao)
+        """
+    )
+    if not added and not removed:
+        clusters = con.execute(f"SELECT COUNT(*) FROM {CLUSTER_TABLE}").fetchone()[0]
+        _drop_temp(con)
+        return {"edges_added": 0, "edges_removed": 0, "clusters_rebuilt": 0, "clusters": clusters}
+
+    # Nos afetados: pontas das arestas alteradas mais todo o cluster antigo delas.
+    con.execute(
+        f"""
+        CREATE OR REPLACE TEMP TABLE _cn_touched AS
+        SELECT cnpj AS node_key FROM _cn_added UNION SELECT socio_key FROM _cn_added
+        UNION SELECT cnpj FROM _cn_removed UNION SELECT socio_key FROM _cn_removed
+        """
+    )
+    con.execute(
+        f"""
+        CREATE OR REPLACE TEMP TABLE _cn_old_clusters AS
+        SELECT DISTINCT n.cluster_id FROM {NODE_TABLE} n JOIN _cn_touched t USING (node_key)
+        """
+    )
+    con.execute(
+        f"""
+        CREATE OR REPLACE TEMP TABLE _cn_affected AS
+        SELECT node_key FROM _cn_touched
+        UNION
+        SELECT n.node_key FROM {NODE_TABLE} n JOIN _cn_old_clusters c USING (cluster_id)
+        """
+    )
+
+    con.execute(
+        f"""
+        DELETE FROM {EDGE_TABLE} USING _cn_removed r
+        WHERE {EDGE_TABLE}.cnpj = r.cnpj AND {EDGE_TABLE}.socio_key = r.socio_key
+        """
+    )
+    con.execute(
+        f"""
+        INSERT INTO {EDGE_TABLE} (cnpj, socio_key, socio_nome, socio_doc, qualificacao)
+        SELECT cnpj, socio_key, socio_nome, socio_doc, qualificacao FROM _cn_added
+        """
+    )
+
+    # Toda aresta que toca um no afetado tem as duas pontas afetadas.
+    edges = con.execute(
+        f"""
+        SELECT e.cnpj, e.socio_key FROM {EDGE_TABLE} e
+        WHERE e.cnpj IN (SELECT node_key FROM _cn_affected)
+           OR e.socio_key IN (SELECT node_key FROM _cn_affected)
+        """
+    ).fetchall()
+    labels = connected_components(edges)
+    con.execute(f"DELETE FROM {NODE_TABLE} WHERE node_key IN (SELECT node_key FROM _cn_affected)")
+    con.execute(f"DELETE FROM {CLUSTER_TABLE} WHERE cluster_id IN (SELECT cluster_id FROM _cn_old_clusters)")
+    con.execute("CREATE OR REPLACE TEMP TABLE _cn_labels (node_key VARCHAR, cluster_id VARCHAR)")
+    if labels:
+        con.executemany("INSERT INTO _cn_labels VALUES (?, ?)", list(labels.items()))
+    _write_nodes(con)
+    _write_clusters(con)
+
+    rebuilt = con.execute("SELECT COUNT(DISTINCT cluster_id) FROM _cn_labels").fetchone()[0]
+    clusters = con.execute(f"SELECT COUNT(*) FROM {CLUSTER_TABLE}").fetchone()[0]
+    _drop_temp(con)
+    return {"edges_added": added, "edges_removed": removed, "clusters_rebuilt": rebuilt, "clusters": clusters}
+
+
+def _write_nodes(con: duckdb.DuckDBPyConnection) -> None:
+    # degree: socios da empresa ou empresas do socio. linked_cnpjs (so empresas):
+    # empresas que dividem um socio com ela ou ligadas diretamente como socia PJ.
+    con.execute(
+        f"""
+        INSERT INTO {NODE_TABLE} (node_key, kind, nome, cluster_id, degree, linked_cnpjs, updated_at)
+        WITH incident AS (
+            SELECT cnpj AS node_key, socio_key AS other FROM {EDGE_TABLE}
+            WHERE cnpj IN (SELECT node_key FROM _cn_labels)
+            UNION ALL
+            SELECT socio_key, cnpj FROM {EDGE_TABLE}
+            WHERE socio_key IN (SELECT node_key FROM _cn_labels)
+        ),
+        degree AS (
+            SELECT node_key, COUNT(DISTINCT other) AS degree FROM incident GROUP BY 1
+        ),
+        linked AS (
+            SELECT node_key, list(DISTINCT other ORDER BY other) AS linked_cnpjs
+            FROM (
+                SELECT a.cnpj AS node_key, b.cnpj AS other
+                FROM {EDGE_TABLE} a JOIN {EDGE_TABLE} b ON a.socio_key = b.socio_key AND a.cnpj <> b.cnpj
+                WHERE a.cnpj IN (SELECT node_key FROM _cn_labels)
+                UNION
+                SELECT node_key, other FROM incident WHERE {_EMPRESA_KEY.format(expr='other')}
+            )
+            GROUP BY 1
+        ),
+        nomes AS (
+            SELECT socio_key AS node_key, min(socio_nome) AS nome FROM {EDGE_TABLE}
+            WHERE socio_key IN (SELECT node_key FROM _cn_labels)
+            GROUP BY 1
+        )
+        SELECT
+            l.node_key,
+            CASE WHEN {_EMPRESA_KEY.format(expr='l.node_key')} THEN 'empresa' ELSE 'socio' END,
+            nm.nome,
+            l.cluster_id,
+            coalesce(d.degree, 0),
+            CASE WHEN {_EMPRESA_KEY.format(expr='l.node_key')} THEN coalesce(k.linked_cnpjs, []::VARCHAR[]) END,
+            CURRENT_TIMESTAMP
+        FROM _cn_labels l
+        LEFT JOIN degree d USING (node_key)
+        LEFT JOIN linked k USING (node_key)
+        LEFT JOIN nomes nm USING (node_key)
+        """
+    )
+
+
+def _write_clusters(con: duckdb.DuckDBPyConnection) -> None:
+    con.execute(
+        f"""
+        INSERT INTO {CLUSTER_TABLE} (
+            cluster_id, n_empresas, n_socios, n_vinculos, n_socios_compartilhados,
+            max_empresas_por_socio, updated_at
+        )
+        WITH clusters AS (SELECT DISTINCT cluster_id FROM _cn_labels),
+        empresas AS (
+            SELECT cluster_id, COUNT(*) AS n_empresas FROM {NODE_TABLE}
+            WHERE kind = 'empresa' AND cluster_id IN (SELECT cluster_id FROM clusters)
+            GROUP BY 1
+        ),
+        socio_degree AS (
+            SELECT n.cluster_id, e.socio_key, COUNT(*) AS n_empresas
+            FROM {EDGE_TABLE} e JOIN {NODE_TABLE} n ON n.node_key = e.cnpj
+            WHERE n.cluster_id IN (SELECT cluster_id FROM clusters)
+            GROUP BY 1, 2
+        )
+        SELECT
+            s.cluster_id,
+            any_value(em.n_empresas),
+            COUNT(*),
+            SUM(s.n_empresas),
+            COUNT(*) FILTER (WHERE s.n_empresas >= 2),
+            MAX(s.n_empresas),
+            CURRENT_TIMESTAMP
+        FROM socio_degree s
+        JOIN empresas em USING (cluster_id)
+        GROUP BY s.cluster_id
+        """
+    )
+
+
+def fetch_shared_control(con: duckdb.DuckDBPyConnection, cnpjs: list[str]) -> dict[str, dict[str, Any]]:
+    """Cluster e vinculos diretos de cada CNPJ do lote, numa consulta so (CNPJ fora da rede fica de fora)."""
+    keys = sorted({"".join(ch for ch in str(cnpj or "") if ch.isdigit()) for cnpj in cnpjs})
+    if not keys or not _table_exists(con, NODE_TABLE):
+        return {}
+    cursor = con.execute(
+        f"""
+        SELECT
+            n.node_key AS cnpj, n.cluster_id, n.degree AS n_socios, n.linked_cnpjs,
+            c.n_empresas AS cluster_size, c.n_socios_compartilhados, c.max_empresas_por_socio
+        FROM {NODE_TABLE} n
+        JOIN {CLUSTER_TABLE} c USING (cluster_id)
+        WHERE n.node_key IN (SELECT unnest(?)) AND n.kind = 'empresa'
+        """,
+        [keys],
+    )
+    names = [column[0] for column in cursor.description]
+    return {row[0]: dict(zip(names, row)) for row in cursor.fetchall()}
+
+
+def fetch_partner_links(con: duckdb.DuckDBPyConnection, cnpj: str, partners: list[str]) -> list[str]:
+    """
+    Empresas ligadas a `cnpj` so pelos socios informados (por nome normalizado):
+    as que dividem um desses socios e, se algum e PJ, a propria socia.
+    """
+    key = "".join(ch for ch in str(cnpj or "") if ch.isdigit())
+    if not key or not partners or not _table_exists(con, EDGE_TABLE):
+        return []
+    rows = con.execute(
+        f"""
+        WITH socios AS (
+            SELECT socio_key FROM {EDGE_TABLE}
+            WHERE cnpj = ?
+              AND {NAME_KEY_SQL.format(expr='socio_nome')} IN (
+                  SELECT {NAME_KEY_SQL.format(expr='p')} FROM unnest(?::VARCHAR[]) AS t(p)
+              )
+        )
+        SELECT e.cnpj FROM {EDGE_TABLE} e JOIN socios USING (socio_key) WHERE e.cnpj <> ?
+        UNION
+        SELECT socio_key FROM socios WHERE {_EMPRESA_KEY.format(expr='socio_key')}
+        ORDER BY 1
+        """,
+        [key, list(partners), key],
+    ).fetchall()
+    return [row[0] for row in rows]
+
+
+def _drop_temp(con: duckdb.DuckDBPyConnection) -> None:
+    for table in ("_cn_qsa", "_cn_added", "_cn_removed", "_cn_touched", "_cn_old_clusters", "_cn_affected", "_cn_labels"):
+        con.execute(f"DROP TABLE IF EXISTS {table}")
@@ -30,6 +30,9 @@ import pandas as pd
 from rich.console import Console
 from rich.table import Table
 
+from src.core.fracionamento import FRACIONAMENTO_TABLE
+from src.core.ops_version import mark_tables_written
+
 console = Console()
 log = logging.getLogger("sentinela.cross")
 DB_PATH = "data/sentinela_analytics.duckdb"
@@ -100,9 +103,6 @@ COMMON_ACRE_SURNAMES = frozenset(
     }
 )
 MIN_SOBRENOME_LEN = 6
-LIMITE_DISPENSA_BENS_SERVICOS = 50_000.00
-FRACIONAMENTO_MIN_COUNT = 4
-FRACIONAMENTO_MAX_WINDOW_DAYS = 90
 OUTLIER_MIN_GROUP_N = 30
 OUTLIER_Z_THRESHOLD = 4.0
 OUTLIER_MIN_DELTA_BRL = 5_000.0
@@ -206,89 +206,42 @@ def _table_exists(conn: duckdb.DuckDBPyConnection, table_name: str) -> bool:
     return table_name in tables
 
 
-def _build_contract_union(conn: duckdb.DuckDBPyConnection) -> str | None:
-    sources: list[str] = []
-    if _table_exists(conn, "obras"):
-        sources.append(
-            """
-            SELECT
-                empresa_nome,
-                secretaria,
-                CAST(valor_total AS DOUBLE) AS valor_total,
-                CAST(capturado_em AS DATE) AS data_ref,
-                empresa_id AS empresa_doc,
-                'obras' AS fonte
-            FROM obras
-            """
-        )
-    if _table_exists(conn, "licitacoes"):
-        sources.append(
-            """
-            SELECT
-                empresa_nome,
-                secretaria,
-                CAST(valor_total AS DOUBLE) AS valor_total,
-                CAST(capturado_em AS DATE) AS data_ref,
-                empresa_id AS empresa_doc,
-                'licitacoes' AS fonte
-            FROM licitacoes
-            """
-        )
-    if not sources:
-        return None
-    return "\nUNION ALL\n".join(sources)
-
-
 def detect_fracionamento(conn: duckdb.DuckDBPyConnection) -> list[Alert]:
-    contract_union = _build_contract_union(conn)
-    if not contract_union:
+    # Janelas moveis de 90/180/365 dias, gravadas pelas cargas de contratos e
+    # pagamentos (src.core.fracionamento); aqui so leitura do pior pico por
+    # fornecedor e orgao.
+    if not _table_exists(conn, FRACIONAMENTO_TABLE):
         return []
 
     df = conn.execute(
         f"""
-        WITH contratos AS (
-            {contract_union}
-        )
-        SELECT
-            empresa_nome,
-            secretaria,
-            COUNT(*) AS num_contratos,
-            SUM(valor_total) AS valor_agregado,
-            MAX(valor_total) AS maior_contrato,
-            MIN(data_ref) AS primeiro,
-            MAX(data_ref) AS ultimo,
-            DATE_DIFF('day', MIN(data_ref), MAX(data_ref)) AS janela_dias
-        FROM contratos
-        WHERE valor_total > 0
-          AND valor_total < {LIMITE_DISPENSA_BENS_SERVICOS}
-          AND empresa_nome IS NOT NULL
-          AND secretaria IS NOT NULL
-          AND data_ref IS NOT NULL
-        GROUP BY 1, 2
-        HAVING COUNT(*) >= {FRACIONAMENTO_MIN_COUNT}
-           AND SUM(valor_total) > {LIMITE_DISPENSA_BENS_SERVICOS}
-           AND DATE_DIFF('day', MIN(data_ref), MAX(data_ref)) BETWEEN 0 AND {FRACIONAMENTO_MAX_WINDOW_DAYS}
-        ORDER BY valor_agregado DESC
+        SELECT *
+        FROM {FRACIONAMENTO_TABLE}
+        QUALIFY ROW_NUMBER() OVER (
+            PARTITION BY fonte, orgao, fornecedor_key
+            ORDER BY excesso_brl DESC, janela_dias, janela_fim
+        ) = 1
+        ORDER BY total_brl DESC
         LIMIT 100
         """
     ).fetchdf()
 
     alerts: list[Alert] = []
     for _, row in df.iterrows():
-        n = int(row["num_contratos"] or 0)
+        n = int(row["n_compras"] or 0)
         alerts.append(
             Alert(
                 detector_id="FRAC",
                 severity="ALTO" if n >= 5 else "MÉDIO",
                 entity_type="empresa",
-                entity_name=row["empresa_nome"],
+                entity_name=row["fornecedor_nome"],
                 description=(
-                    f"{n} contratações abaixo de R$ {LIMITE_DISPENSA_BENS_SERVICOS:,.2f} "
-                    f"para {row['empresa_nome']} em {row['secretaria']}, totalizando "
-                    f"R$ {float(row['valor_agregado'] or 0):,.2f} entre {row['primeiro']} e {row['ultimo']} "
-                    f"(janela de {int(row['janela_dias'] or 0)} dias)."
+                    f"{n} contratações abaixo de R$ {float(row['limite_brl']):,.2f} "
+                    f"para {row['fornecedor_nome']} em {row['orgao']}, totalizando "
+                    f"R$ {float(row['total_brl'] or 0):,.2f} entre {row['janela_inicio'].date()} e {row['janela_fim'].date()} "
+                    f"(janela móvel de {int(row['janela_dias'])} dias, fonte {row['fonte']})."
                 ),
-                exposure_brl=float(row["valor_agregado"] or 0),
+                exposure_brl=float(row["total_brl"] or 0),
                 base_legal=LEGAL["fracionamento"],
                 classe_achado="RASTRO_CONTRATUAL",
                 grau_probatorio="INDICIARIO",
@@ -831,6 +784,7 @@ def save_alerts(conn: duckdb.DuckDBPyConnection, alerts: list[Alert]) -> int:
         """
     )
     conn.unregister("new_alerts_df")
+    mark_tables_written(conn, "alerts")
     return len(new)
 
 
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from typing import Any
+
+import duckdb
+
+
+TIMELINE_TABLE = "entity_timeline_event"
+
+# Nome normalizado: sem acento, caixa alta e espacos colapsados. E a chave do
+# portao de homonimos e do cruzamento com diarias (que so trazem o nome).
+NAME_KEY_SQL = "upper(trim(regexp_replace(strip_accents({expr}), '\\s+', ' ', 'g')))"
+
+ENTITY_TIMELINE_INDEX = f"""
+CREATE INDEX IF NOT EXISTS idx_{TIMELINE_TABLE}_matricula ON {TIMELINE_TABLE}(matricula)
+"""
+
+
+def _table_columns(con: duckdb.DuckDBPyConnection, table: str) -> set[str]:
+    rows = con.execute(
+        "SELECT column_name FROM information_schema.columns WHERE table_name = ?",
+        [table],
+    ).fetchall()
+    return {row[0] for row in rows}
+
+
+def _refresh_sql(folha_columns: set[str], with_diarias: bool) -> str:
+    capturado_em = "capturado_em::TIMESTAMP" if "capturado_em" in folha_columns else "NULL::TIMESTAMP"
+    cargo = "cargo" if "cargo" in folha_columns else "NULL::VARCHAR"
+    bruto = "salario_bruto" if "salario_bruto" in folha_columns else "NULL::DOUBLE"
+    diarias_union = ""
+    if with_diarias:
+        diarias_union = f"""
+        UNION ALL
+        SELECT
+            p.matricula,
+            p.nome,
+            p.nome_key,
+            p.homonym_count,
+            d.data_saida::TIMESTAMP AS occurred_at,
+            'diaria' AS type,
+            d.valor AS amount_brl,
+            'Viagem: ' || d.destino AS title,
+            json_object('motivo', d.motivo) AS attributes
+        FROM diarias d
+        JOIN pessoas p ON p.nome_key = {NAME_KEY_SQL.format(expr="d.servidor_nome")}
+        WHERE p.homonym_count = 1
+        """
+    return f"""
+    CREATE OR REPLACE TABLE {TIMELINE_TABLE} AS
+    WITH folha AS (
+        SELECT
+            split_part(servidor, '-', 1) AS matricula,
+            split_part(servidor, '-', 2) AS nome,
+            {NAME_KEY_SQL.format(expr="split_part(servidor, '-', 2)")} AS nome_key,
+            {capturado_em} AS capturado_em,
+            salario_liquido,
+            {cargo} AS cargo,
+            {bruto} AS salario_bruto
+        FROM rb_servidores_mass
+        WHERE servidor IS NOT NULL AND servidor <> ''
+    ),
+    homonimos AS (
+        SELECT nome_key, COUNT(DISTINCT matricula) AS homonym_count
+        FROM folha
+        GROUP BY nome_key
+    ),
+    pessoas AS (
+        SELECT f.matricula, any_value(f.nome) AS nome, any_value(f.nome_key) AS nome_key, any_value(h.homonym_count) AS homonym_count
+        FROM folha f
+        JOIN homonimos h ON h.nome_key = f.nome_key
+        GROUP BY f.matricula
+    ),
+    eventos AS (
+        SELECT
+            p.matricula,
+            p.nome,
+            p.nome_key,
+            p.homonym_count,
+            f.capturado_em AS occurred_at,
+            'salario' AS type,
+            f.salario_liquido AS amount_brl,
+            'Folha (snapshot)' AS title,
+            json_object('cargo', f.cargo, 'bruto', f.salario_bruto) AS attributes
+        FROM folha f
+        JOIN pessoas p ON p.matricula = f.matricula
+        {diarias_union}
+    )
+    SELECT *
+    FROM eventos
+    ORDER BY matricula, occurred_at DESC
+    """
+
+
+def refresh_entity_timeline(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
+    folha_columns = _table_columns(con, "rb_servidores_mass")
+    if "servidor" not in folha_columns:
+        return {"rows_written": 0, "entities": 0}
+    with_diarias = {"servidor_nome", "data_saida"} <= _table_columns(con, "diarias")
+    con.execute(_refresh_sql(folha_columns, with_diarias))
+    con.execute(ENTITY_TIMELINE_INDEX)
+    rows, entities = con.execute(
+        f"SELECT COUNT(*), COUNT(DISTINCT matricula) FROM {TIMELINE_TABLE}"
+    ).fetchone()
+    return {"rows_written": int(rows or 0), "entities": int(entities or 0)}
+
+
+def fetch_entity_timeline(
+    con: duckdb.DuckDBPyConnection,
+    matricula: str,
+    *,
+    start: Any = None,
+    end: Any = None,
+) -> tuple[dict[str, Any] | None, list[dict[str, Any]]]:
+    sql = f"""
+        SELECT nome, homonym_count, occurred_at, type, amount_brl, title, attributes
+        FROM {TIMELINE_TABLE}
+        WHERE matricula = ?
+    """
+    params: list[Any] = [matricula]
+    if start is not None:
+        sql += " AND occurred_at >= ?"
+        params.append(start)
+    if end is not None:
+        sql += " AND occurred_at < ?"
+        params.append(end)
+    sql += " ORDER BY occurred_at DESC NULLS LAST"
+    rows = con.execute(sql, params).fetchall()
+    if not rows:
+        if start is None and end is None:
+            return None, []
+        head = con.execute(
+            f"SELECT nome, homonym_count FROM {TIMELINE_TABLE} WHERE matricula = ? LIMIT 1",
+            [matricula],
+        ).fetchone()
+        if head is None:
+            return None, []
+        return {"nome": head[0], "homonym_count": head[1]}, []
+
+    entity = {"nome": rows[0][0], "homonym_count": rows[0][1]}
+    events = [
+        {
+            "occurred_at": occurred_at,
+            "type": event_type,
+            "amount_brl": amount_brl,
+            "title": title,
+            "attributes": attributes,
+        }
+        for _, _, occurred_at, event_type, amount_brl, title, attributes in rows
+    ]
+    return entity, events
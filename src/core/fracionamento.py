@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any
+
+import duckdb
+
+from src.core.entity_timeline import NAME_KEY_SQL
+from src.core.insight_rules import bind_named_params, case_sql, sql_literal
+from src.core.legal_compliance import (
+    DISPENSA_LIMITS_BY_YEAR,
+    THRESHOLD_DISPENSA_BENS_SERVICOS,
+    THRESHOLD_DISPENSA_OBRAS_ENGENHARIA,
+)
+
+
+# Fracionamento por janela movel: compras do mesmo fornecedor no mesmo orgao,
+# cada uma dentro do limite de dispensa (art. 75, I/II), cuja soma em 90/180/365
+# dias passa do limite. As somas saem de janelas RANGE BETWEEN INTERVAL do
+# DuckDB numa passada por fonte; fica gravado o pico de cada janela por mes.
+# A carga e incremental por marca d'agua de data: so os meses a partir da
+# ultima data vista (menos uma folga para lancamentos atrasados) sao refeitos,
+# lendo apenas a janela mais longa para tras.
+
+FRACIONAMENTO_TABLE = "fracionamento_janela"
+WATERMARK_TABLE = "fracionamento_watermark"
+JANELAS_DIAS = (90, 180, 365)
+MIN_COMPRAS = 3
+LATE_DAYS = 30
+
+DDL_FRACIONAMENTO = f"""
+CREATE TABLE IF NOT EXISTS {FRACIONAMENTO_TABLE} (
+    row_id VARCHAR PRIMARY KEY,
+    fonte VARCHAR,
+    orgao VARCHAR,
+    fornecedor_key VARCHAR,
+    fornecedor_nome VARCHAR,
+    categoria VARCHAR,
+    janela_dias INTEGER,
+    mes_ref DATE,
+    janela_inicio DATE,
+    janela_fim DATE,
+    n_compras INTEGER,
+    total_brl DOUBLE,
+    maior_compra_brl DOUBLE,
+    limite_brl DOUBLE,
+    excesso_brl DOUBLE,
+    updated_at TIMESTAMP
+)
+"""
+
+DDL_WATERMARK = f"""
+CREATE TABLE IF NOT EXISTS {WATERMARK_TABLE} (
+    fonte VARCHAR PRIMARY KEY,
+    data_max DATE,
+    updated_at TIMESTAMP
+)
+"""
+
+DATE_SQL = "coalesce(try_strptime(trim({expr}), '%d/%m/%Y'), try_strptime(left(trim({expr}), 10), '%Y-%m-%d'))::DATE"
+_DOC_DIGITS = "regexp_replace(coalesce({expr}, ''), '\\D', '', 'g')"
+_TEXT_KEY = "upper(strip_accents(coalesce({expr}, '')))"
+
+OBRAS_PATTERN = "OBRA|ENGENHARIA|REFORMA|PAVIMENTA|CONSTRU"
+# Modalidades competitivas: a compra ja passou por licitacao.
+LICITADA_PATTERN = "PREGAO|CONCORRENCIA|TOMADA DE PRECO|LEILAO|CONCURSO|RDC"
+
+
+@dataclass(frozen=True)
+class FracionamentoSource:
+    """`query` devolve data_ref, orgao, fornecedor_doc, fornecedor_nome, valor e categoria por compra."""
+
+    fonte: str
+    table: str
+    query: str
+
+
+def _categoria_sql(text_expr: str) -> str:
+    return f"CASE WHEN regexp_matches({_TEXT_KEY.format(expr=text_expr)}, '{OBRAS_PATTERN}') THEN 'obras' ELSE 'bens_servicos' END"
+
+
+SOURCES = (
+    FracionamentoSource(
+        fonte="rb_contratos",
+        table="rb_contratos",
+        query=f"""
+        SELECT
+            {DATE_SQL.format(expr='data_lancamento')} AS data_ref,
+            secretaria AS orgao,
+            cnpj AS fornecedor_doc,
+            fornecedor AS fornecedor_nome,
+            valor_brl AS valor,
+            {_categoria_sql('objeto')} AS categoria
+        FROM rb_contratos
+        """,
+    ),
+    FracionamentoSource(
+        fonte="estado_ac_contratos",
+        table="estado_ac_contratos",
+        query=f"""
+        SELECT
+            {DATE_SQL.format(expr='data_inicio_vigencia')} AS data_ref,
+            coalesce(unidade_gestora, orgao) AS orgao,
+            cnpjcpf AS fornecedor_doc,
+            credor AS fornecedor_nome,
+            valor,
+            {_categoria_sql('objeto')} AS categoria
+        FROM estado_ac_contratos
+        """,
+    ),
+    FracionamentoSource(
+        fonte="estado_ac_pagamentos",
+        table="estado_ac_pagamentos",
+        query=f"""
+        SELECT
+            {DATE_SQL.format(expr='data_movimento')} AS data_ref,
+            coalesce(unidade_gestora, orgao) AS orgao,
+            cnpjcpf AS fornecedor_doc,
+            credor AS fornecedor_nome,
+            valor,
+            CASE
+                WHEN {_DOC_DIGITS.format(expr='natureza_despesa')} LIKE '449051%' THEN 'obras'
+                ELSE {_categoria_sql('natureza_despesa')}
+            END AS categoria
+        FROM estado_ac_pagamentos
+        WHERE NOT regexp_matches({_TEXT_KEY.format(expr='modalidade')}, '{LICITADA_PATTERN}')
+        """,
+    ),
+)
+
+
+def limite_sql(data_expr: str, categoria_expr: str) -> str:
+    """Limite de dispensa vigente na data, por categoria (mesma tabela de dispensa_limit)."""
+    branches = [
+        (f"year({data_expr}) >= {year} AND {categoria_expr} = {sql_literal(categoria)}", repr(limite))
+        for year in sorted(DISPENSA_LIMITS_BY_YEAR, reverse=True)
+        for categoria, limite in DISPENSA_LIMITS_BY_YEAR[year].items()
+    ]
+    base = f"CASE WHEN {categoria_expr} = 'obras' THEN {THRESHOLD_DISPENSA_OBRAS_ENGENHARIA!r} ELSE {THRESHOLD_DISPENSA_BENS_SERVICOS!r} END"
+    return case_sql(branches, base)
+
+
+def _window_sql(source: FracionamentoSource) -> str:
+    doc = _DOC_DIGITS.format(expr="fornecedor_doc")
+    windows = ",\n        ".join(
+        f"w{dias} AS (PARTITION BY orgao, fornecedor_key, categoria ORDER BY data_ref "
+        f"RANGE BETWEEN INTERVAL {dias - 1} DAYS PRECEDING AND CURRENT ROW)"
+        for dias in JANELAS_DIAS
+    )
+    rolling = ",\n            ".join(
+        f"SUM(valor) OVER w{dias} AS total_{dias}, COUNT(*) OVER w{dias} AS n_{dias}, "
+        f"MIN(data_ref) OVER w{dias} AS inicio_{dias}, MAX(valor) OVER w{dias} AS maior_{dias}"
+        for dias in JANELAS_DIAS
+    )
+    unpivot = ", ".join(
+        f"({dias}, total_{dias}, n_{dias}, inicio_{dias}, maior_{dias})" for dias in JANELAS_DIAS
+    )
+    return f"""
+    WITH compras AS (
+        SELECT
+            data_ref,
+            trim(orgao) AS orgao,
+            CASE
+                WHEN length({doc}) IN (11, 14) THEN {doc}
+                ELSE 'NOME:' || {NAME_KEY_SQL.format(expr='fornecedor_nome')}
+            END AS fornecedor_key,
+            fornecedor_nome,
+            CAST(valor AS DOUBLE) AS valor,
+            categoria
+        FROM ({source.query})
+        WHERE data_ref >= $scan_from
+    ),
+    eventos AS (
+        SELECT *, {limite_sql('data_ref', 'categoria')} AS limite
+        FROM compras
+        WHERE valor > 0
+          AND nullif(orgao, '') IS NOT NULL
+          AND fornecedor_key NOT IN ('', 'NOME:')
+    ),
+    rolling AS (
+        SELECT
+            *,
+            {rolling}
+        FROM eventos
+        WHERE valor <= limite
+        WINDOW
+        {windows}
+    )
+    SELECT
+        sha1(concat_ws('|', {sql_literal(source.fonte)}, r.orgao, r.fornecedor_key, r.categoria, j.janela_dias, date_trunc('month', r.data_ref))) AS row_id,
+        {sql_literal(source.fonte)} AS fonte,
+        r.orgao,
+        r.fornecedor_key,
+        r.fornecedor_nome,
+        r.categoria,
+        j.janela_dias,
+        CAST(date_trunc('month', r.data_ref) AS DATE) AS mes_ref,
+        j.inicio AS janela_inicio,
+        r.data_ref AS janela_fim,
+        j.n AS n_compras,
+        j.total AS total_brl,
+        j.maior AS maior_compra_brl,
+        r.limite AS limite_brl,
+        j.total - r.limite AS excesso_brl,
+        CURRENT_TIMESTAMP AS updated_at
+    FROM rolling r
+    CROSS JOIN LATERAL (VALUES {unpivot}) AS j(janela_dias, total, n, inicio, maior)
+    WHERE r.data_ref >= $emit_from
+      AND j.total > r.limite
+      AND j.n >= {MIN_COMPRAS}
+    QUALIFY ROW_NUMBER() OVER (
+        PARTITION BY r.orgao, r.fornecedor_key, r.categoria, j.janela_dias, date_trunc('month', r.data_ref)
+        ORDER BY j.total DESC, r.data_ref, r.fornecedor_nome
+    ) = 1
+    """
+
+
+def ensure_fracionamento(con: duckdb.DuckDBPyConnection) -> None:
+    con.execute(DDL_FRACIONAMENTO)
+    con.execute(DDL_WATERMARK)
+
+
+def _table_exists(con: duckdb.DuckDBPyConnection, table: str) -> bool:
+    row = con.execute(
+        "SELECT COUNT(*) FROM information_schema.tables WHERE table_name = ?", [table]
+    ).fetchone()
+    return bool(row and row[0])
+
+
+def _emit_from(watermark: date | None, late_days: int) -> date:
+    if watermark is None:
+        return date(1900, 1, 1)
+    return (watermark - timedelta(days=late_days)).replace(day=1)
+
+
+def refresh_fracionamento(
+    con: duckdb.DuckDBPyConnection,
+    *,
+    full: bool = False,
+    late_days: int = LATE_DAYS,
+    since: date | None = None,
+) -> dict[str, dict[str, Any]]:
+    """
+    Recalcula as janelas de cada fonte presente a partir da marca d'agua
+    (tudo, com `full`; tambem desde `since`, quando uma carga reescreve datas
+    antigas). Devolve por fonte o intervalo refeito e as contagens.
+    """
+    ensure_fracionamento(con)
+    stored = dict(con.execute(f"SELECT fonte, data_max FROM {WATERMARK_TABLE}").fetchall())
+    result: dict[str, dict[str, Any]] = {}
+    for source in SOURCES:
+        if not _table_exists(con, source.table):
+            continue
+        watermark = None if full else stored.get(source.fonte)
+        emit_from = _emit_from(watermark, late_days)
+        if since is not None:
+            emit_from = min(emit_from, since.replace(day=1))
+        scan_from = emit_from - timedelta(days=max(JANELAS_DIAS) - 1)
+        params = {"scan_from": scan_from, "emit_from": emit_from}
+
+        deleted = con.execute(
+            f"DELETE FROM {FRACIONAMENTO_TABLE} WHERE fonte = ? AND mes_ref >= ?",
+            [source.fonte, emit_from],
+        ).fetchone()[0]
+        sql = f"INSERT INTO {FRACIONAMENTO_TABLE}\n{_window_sql(source)}"
+        inserted = con.execute(sql, bind_named_params(sql, params)).fetchone()[0]
+
+        max_sql = f"SELECT max(data_ref) FROM ({source.query}) WHERE data_ref >= $scan_from"
+        scanned_max = con.execute(max_sql, bind_named_params(max_sql, params)).fetchone()[0]
+        data_max = max(d for d in (watermark, scanned_max) if d is not None) if (watermark or scanned_max) else None
+        con.execute(
+            f"""
+            INSERT INTO {WATERMARK_TABLE} (fonte, data_max, updated_at) VALUES (?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT (fonte) DO UPDATE SET data_max = excluded.data_max, updated_at = excluded.updated_at
+            """,
+            [source.fonte, data_max],
+        )
+        result[source.fonte] = {
+            "emit_from": emit_from,
+            "deleted": int(deleted),
+            "inserted": int(inserted),
+            "data_max": data_max,
+        }
+    return result
@@ -3,9 +3,10 @@ from __future__ import annotations
 import json
 import re
 import unicodedata
-from typing import Any, Mapping
+from typing import Any, Callable, Iterable, Mapping
 
 import duckdb
+import pandas as pd
 
 
 CLASSIFICATION_COLUMNS = [
@@ -33,6 +34,38 @@ FEDERAL_ENTE = "Uniao"
 RIO_BRANCO = "Rio Branco"
 ACRE = "AC"
 
+MUNICIPAL_KEYWORDS = (
+    "PREFEITURA DE RIO BRANCO",
+    "RIO BRANCO",
+    "PORTAL DA TRANSPARENCIA RIO BRANCO",
+    "PORTAL DA TRANSPARENCIA DIARIAS",
+    "PORTAL DA TRANSPARENCIA OBRAS",
+    "SEMSA",
+    "SEOP",
+    "SEINFRA",
+    "SEMEL",
+)
+
+STATE_KEYWORDS = (
+    "TRANSPARENCIA AC",
+    "GOVERNO DO ESTADO",
+    "ERARIO ESTADUAL",
+    "ESTADO DO ACRE",
+    "GOVERNO_ESTADO_ACRE",
+    "SESACRE",
+)
+
+FEDERAL_KEYWORDS = (
+    "CEIS",
+    "CNEP",
+    "CGU",
+    "PORTAL DA TRANSPARENCIA FEDERAL",
+    "SERVIDORES FEDERAIS",
+    "TCU",
+    "CNJ",
+    "UNIAO",
+)
+
 SUS_KEYWORDS = (
     "SUS",
     "SAUDE",
@@ -65,6 +98,219 @@ ORGAO_PATTERNS = (
     ("SEMEL", ("SEMEL", "ESPORTE E LAZER")),
 )
 
+# Regras probatorias na ordem em que sao avaliadas: palavras do kind e, quando
+# houver, palavras do texto que tambem disparam a regra.
+PROBATIVE_RULE_KEYWORDS = (
+    ("DIVERGENCIA_DOCUMENTAL", ("INCONSIST", "DIVERG", "VENCEDOR DIVERGENTE", "OBJETO DIVERGENTE"), ()),
+    (
+        "CRUZAMENTO_SANCIONATORIO",
+        ("SANCAO", "CEIS", "CNEP", "CEPIM", "CEAF"),
+        (" CEIS ", " CNEP ", " CEPIM ", " CEAF ", " SANCAO "),
+    ),
+    (
+        "FATO_DOCUMENTAL",
+        ("CONTRATO EXATO", "ORIGEM ADESAO", "ORIGEM FORMAL", "VINCULO EXATO"),
+        (" CONTRATO EXATO ", " TERMO DE ADESAO ", " EXTRATO DO CONTRATO ", " ORIGEM FORMAL ", " HOMOLOGACAO ", " PORTARIA "),
+    ),
+    ("RASTRO_CONTRATUAL", ("CADEIA", "RASTRO", "SEM ID LICITACAO", "COMPATIVEL", "PORTAL CIAP"), ()),
+    ("HIPOTESE_INVESTIGATIVA", ("QSA", "REDE", "LEAD", "MATCH", "EXPOSICAO", "PENDENCIA"), ()),
+)
+
+PRIMARY_DOCUMENT_KEYWORDS = (
+    " DIARIO OFICIAL ",
+    " DOE ",
+    " DJE ",
+    " TJAC ",
+    " EXTRATO DO CONTRATO ",
+    " TERMO DE ADESAO ",
+    " PORTARIA ",
+    " HOMOLOGACAO ",
+    " EDITAL ",
+    " RETIFICACAO ",
+    " PNCP ",
+    " CEIS ",
+    " CNEP ",
+)
+
+PRIMARY_SOURCE_PRIORITY = (
+    "DJE_TJAC",
+    "DOE_AC",
+    "CGU",
+    "PNCP",
+    "TSE",
+    "PORTAL_RIO_BRANCO",
+    "PORTAL_ACRE",
+    "CNPJ_QSA",
+    "DATASUS_CNES",
+)
+
+# Fallback quando nenhum grupo de fonte foi detectado, em ordem de prioridade.
+PRIMARY_SOURCE_FALLBACK = (
+    ("DJE_TJAC", (" TJAC ", " DJE ")),
+    ("DOE_AC", (" DIARIO OFICIAL ", " DOE ", " DIARIO.AC.GOV.BR ")),
+    ("CGU", (" CEIS ", " CNEP ", " CGU ")),
+    ("PNCP", (" PNCP ",)),
+    ("PORTAL_RIO_BRANCO", (" RIO BRANCO ", " CPL ")),
+    ("PORTAL_ACRE", (" ESTADO DO ACRE ", " TRANSPARENCIA AC ")),
+)
+
+SOURCE_GROUP_PATTERNS = (
+    ("DJE_TJAC", (" TJAC ", " DJE ", " TJAC JUS BR ")),
+    ("DOE_AC", (" DIARIO OFICIAL ", " DOE ", " DIARIO AC GOV BR ", " CPL_PUBLICACAO ", " PUBLICACAO CPL ")),
+    ("PORTAL_RIO_BRANCO", (" PORTAL TRANSPARENCIA RIO BRANCO ", " RIO BRANCO ", " CPL ", " RB_CONTRATO ", " RB_SUS ")),
+    ("PORTAL_ACRE", (" PORTAL TRANSPARENCIA ACRE ", " PORTAL_TRANSPARENCIA_ACRE ", " ESTADO_AC_", " GOVERNO DO ESTADO DO ACRE ", " TRANSPARENCIA AC ")),
+    ("CGU", (" CEIS ", " CNEP ", " CEPIM ", " CEAF ", " CGU ")),
+    ("PNCP", (" PNCP ", " COMPRASNET ")),
+    ("CNPJ_QSA", (" QSA ", " CNPJ ", " BRASILAPI ", " RECEITA ")),
+    ("TSE", (" TSE ", " CANDIDATURA ", " DOACAO ELEITORAL ")),
+    ("DATASUS_CNES", (" CNES ", " DATASUS ", " SIH ", " SIM ", " SINAN ")),
+)
+
+KEYWORD_GROUPS: dict[str, tuple[str, ...]] = {
+    "esfera:municipal": MUNICIPAL_KEYWORDS,
+    "esfera:estadual": STATE_KEYWORDS,
+    "esfera:federal": FEDERAL_KEYWORDS,
+    "sus": SUS_KEYWORDS,
+    **{f"orgao:{orgao}": patterns for orgao, patterns in ORGAO_PATTERNS},
+    **{f"kind:{classe}": kind_patterns for classe, kind_patterns, _ in PROBATIVE_RULE_KEYWORDS},
+    **{f"text:{classe}": text_patterns for classe, _, text_patterns in PROBATIVE_RULE_KEYWORDS if text_patterns},
+    "documento_primario": PRIMARY_DOCUMENT_KEYWORDS,
+    **{f"fallback:{fonte}": patterns for fonte, patterns in PRIMARY_SOURCE_FALLBACK},
+    **{f"fonte:{group}": patterns for group, patterns in SOURCE_GROUP_PATTERNS},
+}
+
+
+# Casa todos os grupos de palavras-chave em uma unica passada pelo texto. As
+# palavras (sem o espaco inicial, que so ancora o inicio de um termo) viram uma
+# trie compilada numa regex; cada busca devolve o nucleo mais longo que comeca
+# na proxima posicao com casamento, e a busca seguinte recomeca um caractere
+# adiante para nao perder sobreposicoes. Toda palavra presente no texto e
+# substring de algum nucleo capturado, entao o fecho pre-calculado de cada
+# nucleo (considerando se ele vem precedido de espaco) devolve exatamente o que
+# `pattern in text` devolveria.
+class KeywordClassifier:
+    def __init__(self, groups: Mapping[str, tuple[str, ...]]):
+        groups_by_pattern: dict[str, set[str]] = {}
+        for group, patterns in groups.items():
+            for pattern in patterns:
+                groups_by_pattern.setdefault(pattern, set()).add(group)
+        cores = sorted({pattern.removeprefix(" ") for pattern in groups_by_pattern})
+        self._closure = {
+            (core, preceded): self._core_closure(core, preceded, groups_by_pattern)
+            for core in cores
+            for preceded in (False, True)
+        }
+        self._regex = re.compile(_trie_regex(cores))
+
+    @staticmethod
+    def _core_closure(
+        core: str,
+        preceded: bool,
+        groups_by_pattern: Mapping[str, set[str]],
+    ) -> frozenset[str]:
+        window = f" {core}" if preceded else core
+        return frozenset(
+            group
+            for pattern, groups in groups_by_pattern.items()
+            if pattern in window
+            for group in groups
+        )
+
+    def scan(self, text: str) -> frozenset[str]:
+        found: set[tuple[str, bool]] = set()
+        search = self._regex.search
+        match = search(text)
+        while match is not None:
+            start = match.start()
+            found.add((match.group(), start > 0 and text[start - 1] == " "))
+            match = search(text, start + 1)
+        return frozenset().union(*(self._closure[key] for key in found))
+
+
+def _trie_regex(patterns: list[str]) -> str:
+    trie: dict[str, Any] = {}
+    for pattern in patterns:
+        node = trie
+        for char in pattern:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return _trie_node_regex(trie)
+
+
+def _trie_node_regex(node: dict[str, Any]) -> str:
+    branches = [re.escape(char) + _trie_node_regex(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+    # Quantificador guloso: tenta a palavra mais longa antes de aceitar o fim.
+    return f"(?:{body})?" if "" in node else body
+
+
+KEYWORD_CLASSIFIER = KeywordClassifier(KEYWORD_GROUPS)
+
+INSIGHT_SEARCH_TEXT_DDL = """
+CREATE TABLE IF NOT EXISTS insight_search_text (
+    insight_id VARCHAR PRIMARY KEY,
+    search_text VARCHAR,
+    link_fingerprint VARCHAR,
+    refreshed_at TIMESTAMP
+)
+"""
+
+INSIGHT_CLASSIFICATION_STATE_DDL = """
+CREATE TABLE IF NOT EXISTS insight_classification_state (
+    insight_id VARCHAR PRIMARY KEY,
+    input_fingerprint VARCHAR NOT NULL,
+    engine_version INTEGER NOT NULL,
+    classified_at TIMESTAMP
+)
+"""
+
+# Incrementar quando as regras de classificacao mudarem: todos os insights
+# voltam a ser classificados no proximo sync.
+CLASSIFICATION_ENGINE_VERSION = 1
+
+# Entradas de um insight para a classificacao, incluindo as colunas ja gravadas
+# (a classificacao canonica existente e preservada pelo merge).
+CLASSIFICATION_INPUT_COLUMNS = [
+    "kind",
+    "title",
+    "description_md",
+    "pattern",
+    "sources",
+    "tags",
+    *(column for column, _ in CLASSIFICATION_COLUMNS + PROBATIVE_COLUMNS),
+]
+
+# Trechos de evidencia e de eventos vinculados a cada insight, na ordem em que
+# compoem o texto extra: fonte e excerpt das evidencias, depois tipo, titulo e
+# atributos dos eventos.
+INSIGHT_SEARCH_PARTS_CTE = """
+parts AS (
+    SELECT el.insight_id, 0 AS part_order, el.evidence_id AS part_key, pos.part_pos,
+           CASE pos.part_pos WHEN 0 THEN e.source ELSE CAST(e.excerpt AS VARCHAR) END AS raw_value
+    FROM evidence_link el
+    JOIN evidence e ON e.id = el.evidence_id
+    CROSS JOIN (VALUES (0), (1)) AS pos(part_pos)
+    WHERE el.insight_id IS NOT NULL
+    UNION ALL
+    SELECT il.insight_id, 1 AS part_order, il.event_id AS part_key, pos.part_pos,
+           CASE pos.part_pos WHEN 0 THEN ev.type WHEN 1 THEN ev.title ELSE CAST(ev.attributes AS VARCHAR) END AS raw_value
+    FROM insight_link il
+    JOIN event ev ON ev.id = il.event_id
+    CROSS JOIN (VALUES (0), (1), (2)) AS pos(part_pos)
+    WHERE il.insight_id IS NOT NULL
+)
+"""
+# Mesma concatenacao de insight_search_text.search_text (aliases p e parts).
+INSIGHT_SEARCH_TEXT_AGG_SQL = """
+trim(COALESCE(string_agg(
+    NULLIF(insight_json_to_text(p.raw_value), ''),
+    ' ' ORDER BY p.part_order, p.part_key, p.part_pos
+), ''))
+"""
+_NON_ALNUM_RE = re.compile(r"[^A-Z0-9]+")
+
 
 def ensure_insight_classification_columns(con: duckdb.DuckDBPyConnection) -> None:
     try:
@@ -108,47 +354,79 @@ def classify_insight_record(
     *,
     extra_text: str = "",
 ) -> dict[str, Any]:
-    text = _compose_text(record, extra_text=extra_text)
+    text = f" {_compose_text(record, extra_text=extra_text)} "
+    return _classify_from_hits(KEYWORD_CLASSIFIER.scan(text))
+
+
+def classify_probative_record(
+    record: Mapping[str, Any],
+    *,
+    extra_text: str = "",
+) -> dict[str, Any]:
+    scan = KEYWORD_CLASSIFIER.scan
+    text = f" {_compose_text(record, extra_text=extra_text)} "
+    return _classify_probative(record, scan(text), scan)
+
+
+def classify_insight_records(
+    records: Iterable[Mapping[str, Any]],
+    *,
+    extra_texts: Mapping[str, str] | None = None,
+) -> list[dict[str, Any]]:
+    scan = _cached_scan()
+    return [_classify_from_hits(scan(_padded_text(record, extra_texts))) for record in records]
+
+
+def classify_probative_records(
+    records: Iterable[Mapping[str, Any]],
+    *,
+    extra_texts: Mapping[str, str] | None = None,
+) -> list[dict[str, Any]]:
+    scan = _cached_scan()
+    return [
+        _classify_probative(record, scan(_padded_text(record, extra_texts)), scan)
+        for record in records
+    ]
+
+
+def classify_insight_frame(
+    df: pd.DataFrame,
+    *,
+    extra_texts: Mapping[str, str] | None = None,
+) -> pd.DataFrame:
+    scan = _cached_scan()
+    rows = []
+    for record in df.to_dict("records"):
+        text_hits = scan(_padded_text(record, extra_texts))
+        rows.append({**_classify_from_hits(text_hits), **_classify_probative(record, text_hits, scan)})
+    columns = [column for column, _ in CLASSIFICATION_COLUMNS + PROBATIVE_COLUMNS]
+    return pd.DataFrame(rows, index=df.index, columns=columns, dtype=object)
+
+
+def _padded_text(record: Mapping[str, Any], extra_texts: Mapping[str, str] | None) -> str:
+    extra_text = extra_texts.get(record.get("id"), "") if extra_texts else ""
+    return f" {_compose_text(record, extra_text=extra_text)} "
+
+
+def _cached_scan() -> Callable[[str], frozenset[str]]:
+    # Em lote, kinds e textos repetidos sao varridos uma unica vez.
+    cache: dict[str, frozenset[str]] = {}
+
+    def scan(text: str) -> frozenset[str]:
+        hits = cache.get(text)
+        if hits is None:
+            hits = cache[text] = KEYWORD_CLASSIFIER.scan(text)
+        return hits
+
+    return scan
+
+
+def _classify_from_hits(hits: frozenset[str]) -> dict[str, Any]:
     result = classification_defaults()
 
-    municipal_hit = _contains_any(
-        text,
-        (
-            "PREFEITURA DE RIO BRANCO",
-            "RIO BRANCO",
-            "PORTAL DA TRANSPARENCIA RIO BRANCO",
-            "PORTAL DA TRANSPARENCIA DIARIAS",
-            "PORTAL DA TRANSPARENCIA OBRAS",
-            "SEMSA",
-            "SEOP",
-            "SEINFRA",
-            "SEMEL",
-        ),
-    )
-    state_hit = _contains_any(
-        text,
-        (
-            "TRANSPARENCIA AC",
-            "GOVERNO DO ESTADO",
-            "ERARIO ESTADUAL",
-            "ESTADO DO ACRE",
-            "GOVERNO_ESTADO_ACRE",
-            "SESACRE",
-        ),
-    )
-    federal_hit = _contains_any(
-        text,
-        (
-            "CEIS",
-            "CNEP",
-            "CGU",
-            "PORTAL DA TRANSPARENCIA FEDERAL",
-            "SERVIDORES FEDERAIS",
-            "TCU",
-            "CNJ",
-            "UNIAO",
-        ),
-    )
+    municipal_hit = "esfera:municipal" in hits
+    state_hit = "esfera:estadual" in hits
+    federal_hit = "esfera:federal" in hits
 
     if municipal_hit:
         result["esfera"] = "municipal"
@@ -166,12 +444,12 @@ def classify_insight_record(
         result["ente"] = FEDERAL_ENTE
         result["uf"] = "BR"
 
-    for orgao, patterns in ORGAO_PATTERNS:
-        if _contains_any(text, patterns):
+    for orgao, _ in ORGAO_PATTERNS:
+        if f"orgao:{orgao}" in hits:
             result["orgao"] = orgao
             break
 
-    sus = _contains_any(text, SUS_KEYWORDS)
+    sus = "sus" in hits
     if result["orgao"] in {"SEMSA", "SESACRE"}:
         sus = True
     result["sus"] = sus
@@ -205,43 +483,42 @@ def classify_insight_record(
     return result
 
 
-def classify_probative_record(
+def _classify_probative(
     record: Mapping[str, Any],
-    *,
-    extra_text: str = "",
+    text_hits: frozenset[str],
+    scan: Callable[[str], frozenset[str]],
 ) -> dict[str, Any]:
-    text = f" {_compose_text(record, extra_text=extra_text)} "
-    kind = f" {_normalize(_json_to_text(record.get('kind')))} "
-    source_groups = _detect_source_groups(record, text)
-    fonte_primaria = _detect_primary_source(text, source_groups)
-    primary_doc_hit = _has_primary_document_hit(text, fonte_primaria)
+    kind_hits = scan(f" {_normalize(_json_to_text(record.get('kind')))} ")
+    source_groups = _detect_source_groups(record, text_hits, scan)
+    fonte_primaria = _detect_primary_source(text_hits, source_groups)
+    primary_doc_hit = _has_primary_document_hit(text_hits, fonte_primaria)
     corroborated_hit = len(source_groups) >= 2
 
-    if _contains_any(kind, ("INCONSIST", "DIVERG", "VENCEDOR DIVERGENTE", "OBJETO DIVERGENTE")):
+    if "kind:DIVERGENCIA_DOCUMENTAL" in kind_hits:
         classe = "DIVERGENCIA_DOCUMENTAL"
         grau = "DOCUMENTAL_CORROBORADO" if primary_doc_hit and corroborated_hit else "DOCUMENTAL_PRIMARIO" if primary_doc_hit else "INDICIARIO"
         uso = "APTO_A_NOTICIA_DE_FATO" if grau == "DOCUMENTAL_CORROBORADO" else "APTO_APURACAO"
         inferencia = "Ha divergencia documental objetiva entre ato formal, portal publico ou publicacoes oficiais."
         limite = "Nao prova dolo, fraude penal ou direcionamento por si so; exige analise juridica e contexto administrativo."
-    elif _contains_any(kind, ("SANCAO", "CEIS", "CNEP", "CEPIM", "CEAF")) or _contains_any(text, (" CEIS ", " CNEP ", " CEPIM ", " CEAF ", " SANCAO ")):
+    elif "kind:CRUZAMENTO_SANCIONATORIO" in kind_hits or "text:CRUZAMENTO_SANCIONATORIO" in text_hits:
         classe = "CRUZAMENTO_SANCIONATORIO"
         grau = "DOCUMENTAL_CORROBORADO" if corroborated_hit else "DOCUMENTAL_PRIMARIO"
         uso = "APTO_APURACAO"
         inferencia = "Ha fornecedor, entidade ou CNPJ com registro sancionatorio ou impeditivo a ser confrontado com a contratacao."
         limite = "Nao basta para afirmar irregularidade sem verificar vigencia, alcance juridico, fundamento da sancao e aderencia ao caso concreto."
-    elif _contains_any(kind, ("CONTRATO EXATO", "ORIGEM ADESAO", "ORIGEM FORMAL", "VINCULO EXATO")) or _contains_any(text, (" CONTRATO EXATO ", " TERMO DE ADESAO ", " EXTRATO DO CONTRATO ", " ORIGEM FORMAL ", " HOMOLOGACAO ", " PORTARIA ")):
+    elif "kind:FATO_DOCUMENTAL" in kind_hits or "text:FATO_DOCUMENTAL" in text_hits:
         classe = "FATO_DOCUMENTAL"
         grau = "DOCUMENTAL_CORROBORADO" if corroborated_hit else "DOCUMENTAL_PRIMARIO"
         uso = "APTO_APURACAO"
         inferencia = "Ha vinculo formal documentado entre contrato, processo, licitacao, adesao ou publicacao oficial."
         limite = "O achado nao comprova favorecimento, superfaturamento, nepotismo ou fraude por si so."
-    elif _contains_any(kind, ("CADEIA", "RASTRO", "SEM ID LICITACAO", "COMPATIVEL", "PORTAL CIAP")):
+    elif "kind:RASTRO_CONTRATUAL" in kind_hits:
         classe = "RASTRO_CONTRATUAL"
         grau = "INDICIARIO" if primary_doc_hit or corroborated_hit else "EXPLORATORIO"
         uso = "APTO_APURACAO" if grau == "INDICIARIO" else "REVISAO_INTERNA"
         inferencia = "Ha rastro contratual ou compatibilidade material relevante que orienta apuracao dirigida."
         limite = "O rastro nao fecha sozinho a origem juridica nem prova ilicitude; ainda pode haver explicacao administrativa valida."
-    elif _contains_any(kind, ("QSA", "REDE", "LEAD", "MATCH", "EXPOSICAO", "PENDENCIA")):
+    elif "kind:HIPOTESE_INVESTIGATIVA" in kind_hits:
         classe = "HIPOTESE_INVESTIGATIVA"
         grau = "INDICIARIO" if corroborated_hit else "EXPLORATORIO"
         uso = "REVISAO_INTERNA"
@@ -264,47 +541,175 @@ def classify_probative_record(
     }
 
 
-def build_insight_extra_text(
-    con: duckdb.DuckDBPyConnection,
-    insight_ids: list[str],
-) -> dict[str, str]:
-    if not insight_ids:
-        return {}
+def ensure_insight_search_text(con: duckdb.DuckDBPyConnection) -> None:
+    con.execute(INSIGHT_SEARCH_TEXT_DDL)
+
 
-    placeholders = ",".join(["?"] * len(insight_ids))
-    extra: dict[str, list[str]] = {insight_id: [] for insight_id in insight_ids}
+def refresh_insight_search_text(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
+    ensure_insight_search_text(con)
+    try:
+        con.execute(
+            f"""
+            CREATE OR REPLACE TEMP TABLE _insight_search_fingerprint AS
+            WITH {INSIGHT_SEARCH_PARTS_CTE}
+            SELECT
+                insight_id,
+                md5(string_agg(
+                    concat_ws(chr(31), part_order, part_key, part_pos, COALESCE(raw_value, chr(0))),
+                    chr(30) ORDER BY part_order, part_key, part_pos
+                )) AS link_fingerprint
+            FROM parts
+            GROUP BY insight_id
+            """
+        )
+    except duckdb.CatalogException:
+        return {"rows_written": 0, "rows_deleted": 0, "rows": 0}
+
+    try:
+        rows_deleted = con.execute(
+            """
+            DELETE FROM insight_search_text
+            WHERE insight_id NOT IN (SELECT insight_id FROM _insight_search_fingerprint)
+            """
+        ).fetchone()[0]
+        con.execute(
+            """
+            CREATE OR REPLACE TEMP TABLE _insight_search_stale AS
+            SELECT f.insight_id, f.link_fingerprint
+            FROM _insight_search_fingerprint f
+            LEFT JOIN insight_search_text s ON s.insight_id = f.insight_id
+            WHERE s.link_fingerprint IS DISTINCT FROM f.link_fingerprint
+            """
+        )
+        rows_written = con.execute("SELECT COUNT(*) FROM _insight_search_stale").fetchone()[0]
+        if rows_written:
+            _register_json_to_text(con)
+            # Apenas insights com vinculos alterados passam pela UDF.
+            con.execute(
+                f"""
+                INSERT OR REPLACE INTO insight_search_text
+                WITH {INSIGHT_SEARCH_PARTS_CTE}
+                SELECT
+                    p.insight_id,
+                    {INSIGHT_SEARCH_TEXT_AGG_SQL} AS search_text,
+                    st.link_fingerprint,
+                    now() AS refreshed_at
+                FROM parts p
+                JOIN _insight_search_stale st ON st.insight_id = p.insight_id
+                GROUP BY p.insight_id, st.link_fingerprint
+                """
+            )
+        rows = con.execute("SELECT COUNT(*) FROM insight_search_text").fetchone()[0]
+    finally:
+        con.execute("DROP TABLE IF EXISTS _insight_search_stale")
+        con.execute("DROP TABLE IF EXISTS _insight_search_fingerprint")
+    return {
+        "rows_written": int(rows_written or 0),
+        "rows_deleted": int(rows_deleted or 0),
+        "rows": int(rows or 0),
+    }
+
+
+def ensure_insight_classification_state(con: duckdb.DuckDBPyConnection) -> None:
+    con.execute(INSIGHT_CLASSIFICATION_STATE_DDL)
 
-    evidence_rows = con.execute(
+
+def _classification_fingerprint_sql() -> str:
+    parts = [f"COALESCE(CAST(i.{column} AS VARCHAR), chr(0))" for column in CLASSIFICATION_INPUT_COLUMNS]
+    parts.append("COALESCE(search.search_text, chr(0))")
+    return f"md5(concat_ws(chr(31), {', '.join(parts)}))"
+
+
+def stale_insight_classification_sql() -> tuple[str, list[Any]]:
+    """FROM/WHERE dos insights cujas entradas mudaram desde o ultimo sync
+    (aliases i, search e state)."""
+    return (
         f"""
-        SELECT el.insight_id, e.source, e.excerpt
-        FROM evidence_link el
-        JOIN evidence e ON e.id = el.evidence_id
-        WHERE el.insight_id IN ({placeholders})
+        FROM insight i
+        LEFT JOIN insight_search_text search ON search.insight_id = i.id
+        LEFT JOIN insight_classification_state state ON state.insight_id = i.id
+        WHERE state.insight_id IS NULL
+           OR state.engine_version <> ?
+           OR state.input_fingerprint <> {_classification_fingerprint_sql()}
         """,
-        insight_ids,
-    ).fetchall()
-    for insight_id, source, excerpt in evidence_rows:
-        extra.setdefault(insight_id, []).append(_json_to_text(source))
-        extra[insight_id].append(_json_to_text(excerpt))
+        [CLASSIFICATION_ENGINE_VERSION],
+    )
+
+
+def count_stale_insight_classification(con: duckdb.DuckDBPyConnection) -> int:
+    ensure_insight_classification_state(con)
+    from_sql, params = stale_insight_classification_sql()
+    try:
+        return int(con.execute(f"SELECT COUNT(*) {from_sql}", params).fetchone()[0] or 0)
+    except duckdb.CatalogException:
+        return 0
 
-    event_rows = con.execute(
+
+def mark_insight_classification_current(con: duckdb.DuckDBPyConnection, insight_ids: list[str]) -> None:
+    """Grava o fingerprint das entradas ja classificadas (apos o UPDATE)."""
+    ensure_insight_classification_state(con)
+    con.execute("DELETE FROM insight_classification_state WHERE insight_id NOT IN (SELECT id FROM insight)")
+    if not insight_ids:
+        return
+    con.execute(
         f"""
-        SELECT il.insight_id, ev.type, ev.title, ev.attributes
-        FROM insight_link il
-        JOIN event ev ON ev.id = il.event_id
-        WHERE il.insight_id IN ({placeholders})
+        INSERT OR REPLACE INTO insight_classification_state
+        SELECT i.id, {_classification_fingerprint_sql()}, ?, now()
+        FROM insight i
+        LEFT JOIN insight_search_text search ON search.insight_id = i.id
+        WHERE i.id IN (SELECT unnest(?::VARCHAR[]))
         """,
-        insight_ids,
-    ).fetchall()
-    for insight_id, event_type, title, attributes in event_rows:
-        extra.setdefault(insight_id, []).append(_json_to_text(event_type))
-        extra[insight_id].append(_json_to_text(title))
-        extra[insight_id].append(_json_to_text(attributes))
+        [CLASSIFICATION_ENGINE_VERSION, list(insight_ids)],
+    )
 
-    return {
-        insight_id: " ".join(part for part in parts if part).strip()
-        for insight_id, parts in extra.items()
-    }
+
+def insight_search_text_exists(con: duckdb.DuckDBPyConnection) -> bool:
+    return bool(
+        con.execute(
+            """
+            SELECT COUNT(*)
+            FROM information_schema.tables
+            WHERE table_schema = 'main' AND table_name = 'insight_search_text'
+            """
+        ).fetchone()[0]
+    )
+
+
+def build_insight_extra_text(
+    con: duckdb.DuckDBPyConnection,
+    insight_ids: list[str],
+) -> dict[str, str]:
+    """Texto de evidencias e eventos por insight. Sem a tabela materializada
+    (banco ainda nao sincronizado) o texto e montado na hora, so leitura."""
+    if not insight_ids:
+        return {}
+    if insight_search_text_exists(con):
+        sql = """
+            SELECT insight_id, search_text
+            FROM insight_search_text
+            WHERE insight_id IN (SELECT unnest(?::VARCHAR[]))
+        """
+    else:
+        _register_json_to_text(con)
+        sql = f"""
+            WITH {INSIGHT_SEARCH_PARTS_CTE}
+            SELECT p.insight_id, {INSIGHT_SEARCH_TEXT_AGG_SQL}
+            FROM parts p
+            WHERE p.insight_id IN (SELECT unnest(?::VARCHAR[]))
+            GROUP BY p.insight_id
+        """
+    try:
+        rows = con.execute(sql, [list(insight_ids)]).fetchall()
+    except duckdb.CatalogException:
+        return {}
+    return {insight_id: search_text or "" for insight_id, search_text in rows}
+
+
+def _register_json_to_text(con: duckdb.DuckDBPyConnection) -> None:
+    try:
+        con.create_function("insight_json_to_text", _json_to_text, ["VARCHAR"], "VARCHAR")
+    except duckdb.NotImplementedException:
+        pass
 
 
 def has_probative_classification(record: Mapping[str, Any]) -> bool:
@@ -346,97 +751,45 @@ def _json_to_text(value: Any) -> str:
     return str(value)
 
 
-def _contains_any(text: str, patterns: tuple[str, ...]) -> bool:
-    return any(pattern in text for pattern in patterns)
-
-
-def _has_primary_document_hit(text: str, fonte_primaria: str | None) -> bool:
+def _has_primary_document_hit(text_hits: frozenset[str], fonte_primaria: str | None) -> bool:
     if fonte_primaria in {"DOE_AC", "DJE_TJAC", "PNCP", "CGU", "TSE"}:
         return True
-    return _contains_any(
-        text,
-        (
-            " DIARIO OFICIAL ",
-            " DOE ",
-            " DJE ",
-            " TJAC ",
-            " EXTRATO DO CONTRATO ",
-            " TERMO DE ADESAO ",
-            " PORTARIA ",
-            " HOMOLOGACAO ",
-            " EDITAL ",
-            " RETIFICACAO ",
-            " PNCP ",
-            " CEIS ",
-            " CNEP ",
-        ),
-    )
+    return "documento_primario" in text_hits
 
 
-def _detect_primary_source(text: str, source_groups: set[str]) -> str | None:
-    priority = [
-        "DJE_TJAC",
-        "DOE_AC",
-        "CGU",
-        "PNCP",
-        "TSE",
-        "PORTAL_RIO_BRANCO",
-        "PORTAL_ACRE",
-        "CNPJ_QSA",
-        "DATASUS_CNES",
-    ]
-    for group in priority:
+def _detect_primary_source(text_hits: frozenset[str], source_groups: set[str]) -> str | None:
+    for group in PRIMARY_SOURCE_PRIORITY:
         if group in source_groups:
             return group
-    if " TJAC " in text or " DJE " in text:
-        return "DJE_TJAC"
-    if " DIARIO OFICIAL " in text or " DOE " in text or " DIARIO.AC.GOV.BR " in text:
-        return "DOE_AC"
-    if " CEIS " in text or " CNEP " in text or " CGU " in text:
-        return "CGU"
-    if " PNCP " in text:
-        return "PNCP"
-    if " RIO BRANCO " in text or " CPL " in text:
-        return "PORTAL_RIO_BRANCO"
-    if " ESTADO DO ACRE " in text or " TRANSPARENCIA AC " in text:
-        return "PORTAL_ACRE"
+    for fonte, _ in PRIMARY_SOURCE_FALLBACK:
+        if f"fallback:{fonte}" in text_hits:
+            return fonte
     return None
 
 
-def _detect_source_groups(record: Mapping[str, Any], text: str) -> set[str]:
-    groups: set[str] = set()
+def _detect_source_groups(
+    record: Mapping[str, Any],
+    text_hits: frozenset[str],
+    scan: Callable[[str], frozenset[str]],
+) -> set[str]:
     source_text = _normalize(_json_to_text(record.get("sources")))
     tag_text = _normalize(_json_to_text(record.get("tags")))
-    combined = f"{text} {source_text} {tag_text}"
-
-    if _contains_any(combined, (" TJAC ", " DJE ", " TJAC JUS BR ")):
-        groups.add("DJE_TJAC")
-    if _contains_any(combined, (" DIARIO OFICIAL ", " DOE ", " DIARIO AC GOV BR ", " CPL_PUBLICACAO ", " PUBLICACAO CPL ")):
-        groups.add("DOE_AC")
-    if _contains_any(combined, (" PORTAL TRANSPARENCIA RIO BRANCO ", " RIO BRANCO ", " CPL ", " RB_CONTRATO ", " RB_SUS ")):
-        groups.add("PORTAL_RIO_BRANCO")
-    if _contains_any(combined, (" PORTAL TRANSPARENCIA ACRE ", " PORTAL_TRANSPARENCIA_ACRE ", " ESTADO_AC_", " GOVERNO DO ESTADO DO ACRE ", " TRANSPARENCIA AC ")):
-        groups.add("PORTAL_ACRE")
-    if _contains_any(combined, (" CEIS ", " CNEP ", " CEPIM ", " CEAF ", " CGU ")):
-        groups.add("CGU")
-    if _contains_any(combined, (" PNCP ", " COMPRASNET ")):
-        groups.add("PNCP")
-    if _contains_any(combined, (" QSA ", " CNPJ ", " BRASILAPI ", " RECEITA ")):
-        groups.add("CNPJ_QSA")
-    if _contains_any(combined, (" TSE ", " CANDIDATURA ", " DOACAO ELEITORAL ")):
-        groups.add("TSE")
-    if _contains_any(combined, (" CNES ", " DATASUS ", " SIH ", " SIM ", " SINAN ")):
-        groups.add("DATASUS_CNES")
-    return groups
+    # O texto combinado e f"{text} {source_text} {tag_text}" e text termina em
+    # espaco; como nenhuma palavra tem dois espacos seguidos, nenhuma cruza a
+    # juncao e basta varrer o sufixo e unir aos hits ja calculados de text.
+    hits = text_hits | scan(f" {source_text} {tag_text}")
+    return {group for group, _ in SOURCE_GROUP_PATTERNS if f"fonte:{group}" in hits}
 
 
 def _normalize(text: str) -> str:
     text = _fix_mojibake(text)
     text = text.upper()
-    text = unicodedata.normalize("NFKD", text)
-    text = "".join(ch for ch in text if not unicodedata.combining(ch))
-    text = re.sub(r"[^A-Z0-9]+", " ", text)
-    return re.sub(r"\s+", " ", text).strip()
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    # Cada sequencia nao alfanumerica vira um unico espaco, entao nao sobram
+    # espacos repetidos para colapsar.
+    return _NON_ALNUM_RE.sub(" ", text).strip()
 
 
 def _fix_mojibake(text: str) -> str:
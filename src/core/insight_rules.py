@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from string import Formatter
+from typing import Any, Mapping, Sequence
+
+import duckdb
+
+from src.core.ops_version import mark_tables_written
+
+
+# Regras declarativas de insight: cada regra e uma agregacao SQL mais um
+# conjunto de templates, compilados num unico SELECT que calcula id, severidade,
+# confianca e textos dentro do DuckDB. Uma familia de regras vira um so
+# INSERT ... SELECT (ou a entrada de apply_partition_cdc), sem laco em Python.
+
+INSIGHT_RULE_COLUMNS = [
+    "id",
+    "kind",
+    "severity",
+    "confidence",
+    "exposure_brl",
+    "title",
+    "description_md",
+    "pattern",
+    "sources",
+    "tags",
+    "sample_n",
+    "unit_total",
+    "esfera",
+    "ente",
+    "orgao",
+    "municipio",
+    "uf",
+    "area_tematica",
+    "sus",
+    "valor_referencia",
+    "ano_referencia",
+    "fonte",
+    "created_at",
+]
+
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_NAMED_PARAM = re.compile(r"\$([A-Za-z_][A-Za-z0-9_]*)")
+
+
+@dataclass(frozen=True)
+class InsightRule:
+    """
+    `query` agrega a fonte (parametros nomeados `$nome`); `derived` acrescenta
+    colunas calculadas sobre o resultado; `templates` (formato de str.format,
+    ex. "{total:,.2f}") e `values` (expressoes SQL) preenchem as colunas do insight.
+    """
+
+    kind: str
+    query: str
+    templates: Mapping[str, str] = field(default_factory=dict)
+    values: Mapping[str, str] = field(default_factory=dict)
+    derived: Mapping[str, str] = field(default_factory=dict)
+
+
+def sql_literal(value: Any) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, (list, tuple)):
+        return f"[{', '.join(sql_literal(item) for item in value)}]"
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _format_sql(column: str, spec: str) -> str:
+    if not _IDENTIFIER.fullmatch(column):
+        raise ValueError(f"campo de template invalido: {column!r}")
+    if not spec:
+        return f"CAST({column} AS VARCHAR)"
+    if spec.endswith("%"):
+        # Como no Python: multiplica por 100 e formata como 'f'.
+        return f"format('{{:{spec[:-1]}f}}', {column} * 100) || '%'"
+    return f"format('{{:{spec}}}', {column})"
+
+
+def template_sql(template: str) -> str:
+    """Compila um template str.format numa expressao SQL de texto (NULL vira vazio)."""
+    parts: list[str] = []
+    for literal, column, spec, conversion in Formatter().parse(template):
+        if literal:
+            parts.append(sql_literal(literal))
+        if column is None:
+            continue
+        if conversion:
+            raise ValueError(f"conversao !{conversion} nao suportada em template SQL")
+        parts.append(_format_sql(column, spec or ""))
+    if not parts:
+        return "''"
+    return parts[0] if len(parts) == 1 else f"concat({', '.join(parts)})"
+
+
+def lookup_sql(expr: str, mapping: Mapping[Any, Any], default: Any) -> str:
+    whens = " ".join(f"WHEN {sql_literal(key)} THEN {sql_literal(value)}" for key, value in mapping.items())
+    return f"CASE {expr} {whens} ELSE {sql_literal(default)} END"
+
+
+def case_sql(branches: Sequence[tuple[str, str]], default: str) -> str:
+    whens = " ".join(f"WHEN {condition} THEN {value}" for condition, value in branches)
+    return f"CASE {whens} ELSE {default} END"
+
+
+def severity_for_total_sql(expr: str, *, high: float, critical: float) -> str:
+    return case_sql([(f"{expr} >= {critical!r}", "'CRITICO'"), (f"{expr} >= {high!r}", "'ALTO'")], "'MEDIO'")
+
+
+def confidence_for_count_sql(expr: str, *, base: int = 65, step: int = 3, cap: int = 95) -> str:
+    return f"LEAST({cap}, {base} + {expr} * {step})"
+
+
+def json_list_sql(items: Sequence[str], *, optional: Sequence[tuple[str, str]] = ()) -> str:
+    """Lista JSON de expressoes SQL; cada par (condicao, expressao) de `optional` entra so se a condicao valer."""
+    body = f"[{', '.join(items)}]"
+    if optional:
+        extras = ", ".join(f"CASE WHEN {condition} THEN [{item}] ELSE []::VARCHAR[] END" for condition, item in optional)
+        body = f"list_concat({body}, {extras})"
+    return f"to_json({body})"
+
+
+def compile_insight_rule(rule: InsightRule, defaults: Mapping[str, str] | None = None) -> str:
+    """SELECT com as colunas de INSIGHT_RULE_COLUMNS; `defaults` sao expressoes SQL da familia."""
+    unknown = (set(rule.templates) | set(rule.values)) - set(INSIGHT_RULE_COLUMNS)
+    if unknown:
+        raise ValueError(f"colunas desconhecidas na regra {rule.kind}: {sorted(unknown)}")
+    overlap = set(rule.templates) & set(rule.values)
+    if overlap:
+        raise ValueError(f"coluna com template e valor na regra {rule.kind}: {sorted(overlap)}")
+    defaults = defaults or {}
+
+    expressions = []
+    for column in INSIGHT_RULE_COLUMNS:
+        if column == "kind":
+            expression = sql_literal(rule.kind)
+        elif column in rule.templates:
+            expression = template_sql(rule.templates[column])
+        elif column in rule.values:
+            expression = rule.values[column]
+        else:
+            expression = defaults.get(column, "NULL")
+        expressions.append(f"{expression} AS {column}")
+
+    derived = "".join(f", {expression} AS {name}" for name, expression in rule.derived.items())
+    select_list = ",\n    ".join(expressions)
+    return (
+        f"WITH rule_source AS (\n{rule.query.strip()}\n),\n"
+        f"rule_row AS (SELECT *{derived} FROM rule_source)\n"
+        f"SELECT\n    {select_list}\nFROM rule_row"
+    )
+
+
+def insight_rules_sql(rules: Sequence[InsightRule], defaults: Mapping[str, str] | None = None) -> str:
+    return "\nUNION ALL\n".join(
+        f"SELECT * FROM (\n{compile_insight_rule(rule, defaults)}\n)" for rule in rules
+    )
+
+
+def bind_named_params(sql: str, params: Mapping[str, Any] | None) -> dict[str, Any]:
+    # O DuckDB recusa parametros nomeados que a consulta nao usa.
+    used = set(_NAMED_PARAM.findall(sql))
+    missing = used - set(params or {})
+    if missing:
+        raise ValueError(f"parametros sem valor: {sorted(missing)}")
+    return {name: value for name, value in (params or {}).items() if name in used}
+
+
+def query_insight_rules(
+    con: duckdb.DuckDBPyConnection,
+    rules: Sequence[InsightRule],
+    *,
+    params: Mapping[str, Any] | None = None,
+    defaults: Mapping[str, str] | None = None,
+) -> list[dict[str, Any]]:
+    """Executa as regras e devolve os insights como registros (util para testes)."""
+    sql = insight_rules_sql(rules, defaults)
+    cursor = con.execute(sql, bind_named_params(sql, params))
+    names = [column[0] for column in cursor.description]
+    return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+
+def insert_insight_rules(
+    con: duckdb.DuckDBPyConnection,
+    rules: Sequence[InsightRule],
+    *,
+    params: Mapping[str, Any] | None = None,
+    defaults: Mapping[str, str] | None = None,
+    table: str = "insight",
+) -> int:
+    if not rules:
+        return 0
+    sql = f"INSERT INTO {table} ({', '.join(INSIGHT_RULE_COLUMNS)})\n{insight_rules_sql(rules, defaults)}"
+    row = con.execute(sql, bind_named_params(sql, params)).fetchone()
+    inserted = int(row[0]) if row else 0
+    if inserted:
+        mark_tables_written(con, table)
+    return inserted
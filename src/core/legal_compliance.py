@@ -8,8 +8,29 @@ import re
 
 from datetime import date, datetime
 
+from src.core.corporate_network import fetch_partner_links, fetch_shared_control
+
 # --- LEI 14.133/2021 (Nova Lei de Licitações) ---
-# ... (constantes existentes) ...
+# Art. 75, I (obras e serviços de engenharia) e II (demais bens e serviços).
+THRESHOLD_DISPENSA_OBRAS_ENGENHARIA = 100_000.00
+THRESHOLD_DISPENSA_BENS_SERVICOS = 50_000.00
+
+# Valores atualizados por decreto (art. 182): Decretos 11.317/2022,
+# 11.871/2023 e 12.343/2024. Anos seguintes usam a ultima atualizacao.
+DISPENSA_LIMITS_BY_YEAR = {
+    2023: {"obras": 114_416.65, "bens_servicos": 57_208.33},
+    2024: {"obras": 119_812.02, "bens_servicos": 59_906.02},
+    2025: {"obras": 125_451.15, "bens_servicos": 62_725.59},
+}
+
+
+def dispensa_limit(year: int | None, category: str = "bens_servicos") -> float:
+    """Limite de dispensa por valor (art. 75, I e II) vigente no ano."""
+    if year is not None:
+        known = [y for y in DISPENSA_LIMITS_BY_YEAR if y <= year]
+        if known:
+            return DISPENSA_LIMITS_BY_YEAR[max(known)][category]
+    return THRESHOLD_DISPENSA_OBRAS_ENGENHARIA if category == "obras" else THRESHOLD_DISPENSA_BENS_SERVICOS
 
 def validate_company_seniority(creation_date: date | str, contract_date: date | str) -> dict[str, Any]:
     """
@@ -187,21 +208,29 @@ def calculate_risk_score(metrics: dict[str, Any]) -> dict[str, Any]:
 def validate_shared_control_cluster(cnpj: str, partners: list[str], con: duckdb.DuckDBPyConnection) -> dict[str, Any]:
     """
     Detecta se a empresa faz parte de um cluster de controle compartilhado (Cartel ou ORCRIM).
-    Cruza sócios da empresa com outros CNPJs na base.
+    Só conta vínculos pelos sócios informados. Com a rede societária
+    sincronizada (sync_corporate_network), usa os vínculos já gravados e traz o
+    cluster da empresa; sem ela, cruza os sócios com empresa_socios.
     """
     if not partners:
         return {"in_cluster": False, "cluster_size": 0, "risk_level": "BAIXO"}
-    
-    # Busca outros CNPJs que compartilham os mesmos sócios
-    query = """
-        SELECT DISTINCT cnpj
-        FROM empresa_socios
-        WHERE socio_nome IN (SELECT unnest(?))
-          AND cnpj <> ?
-    """
-    other_cnpjs = con.execute(query, [partners, cnpj]).fetchdf()
-    
-    cluster_size = len(other_cnpjs)
+
+    network = fetch_shared_control(con, [cnpj])
+    if network:
+        node = next(iter(network.values()))
+        linked_cnpjs = fetch_partner_links(con, cnpj, partners)
+    else:
+        # Busca outros CNPJs que compartilham os mesmos sócios
+        query = """
+            SELECT DISTINCT cnpj
+            FROM empresa_socios
+            WHERE socio_nome IN (SELECT unnest(?))
+              AND cnpj <> ?
+        """
+        linked_cnpjs = con.execute(query, [partners, cnpj]).fetchdf()['cnpj'].tolist()
+        node = {}
+
+    cluster_size = len(linked_cnpjs)
     risk = "BAIXO"
     if cluster_size >= 5:
         risk = "CRÍTICO" # Rede vasta de empresas sob o mesmo comando
@@ -211,9 +240,11 @@ def validate_shared_control_cluster(cnpj: str, partners: list[str], con: duckdb.
     return {
         "in_cluster": cluster_size > 0,
         "cluster_size": cluster_size,
-        "linked_cnpjs": other_cnpjs['cnpj'].tolist(),
+        "linked_cnpjs": linked_cnpjs,
         "risk_level": risk,
-        "details": f"Empresa interligada a {cluster_size} outra(s) entidade(s) via QSA."
+        "details": f"Empresa interligada a {cluster_size} outra(s) entidade(s) via QSA.",
+        "cluster_id": node.get("cluster_id"),
+        "network_size": node.get("cluster_size"),
     }
 
 def validate_partner_economic_disparity(declared_wealth: float, contract_value: float) -> dict[str, Any]:
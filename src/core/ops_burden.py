@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 import json
-from typing import Any
+from typing import Any, Iterable
 
 import duckdb
 import pandas as pd
 
+from src.core.ops_context import load_case_frames
 from src.core.ops_legal import legal_anchor_payload
+from src.core.ops_scope import case_scope, case_scope_sql, delete_case_rows
+from src.core.ops_version import mark_tables_written
 
 
 BURDEN_DDL = """
@@ -425,24 +428,28 @@ def _build_saude_societario_burden(case: dict[str, Any], artifacts_df: pd.DataFr
     ]
 
 
-def sync_ops_burden(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
+def sync_ops_burden(con: duckdb.DuckDBPyConnection, case_ids: Iterable[str] | None = None) -> dict[str, int]:
     ensure_ops_burden(con)
-    con.execute("DELETE FROM ops_case_burden_item")
+    case_ids = case_scope(case_ids)
+    delete_case_rows(con, "ops_case_burden_item", case_ids)
+    scope_sql, scope_params = case_scope_sql(case_ids)
 
     try:
-        cases_df = con.execute("SELECT * FROM ops_case_registry ORDER BY case_id").df()
+        cases_df = con.execute(f"SELECT * FROM ops_case_registry WHERE {scope_sql} ORDER BY case_id", scope_params).df()
     except duckdb.Error:
+        mark_tables_written(con, "ops_case_burden_item")
         return {"rows_written": 0, "cases": 0}
     if cases_df.empty:
+        mark_tables_written(con, "ops_case_burden_item")
         return {"rows_written": 0, "cases": 0}
 
-    artifacts_df = con.execute("SELECT * FROM ops_case_artifact").df() if "ops_case_artifact" in set(con.execute("SHOW TABLES").df()["name"].tolist()) else pd.DataFrame()
-    inbox_df = con.execute("SELECT * FROM ops_case_inbox_document").df() if "ops_case_inbox_document" in set(con.execute("SHOW TABLES").df()["name"].tolist()) else pd.DataFrame()
+    artifacts = load_case_frames(con, "ops_case_artifact", case_ids=case_ids)
+    inbox = load_case_frames(con, "ops_case_inbox_document", case_ids=case_ids)
 
     rows: list[dict[str, Any]] = []
     for case in json.loads(cases_df.to_json(orient="records", force_ascii=False)):
-        case_artifacts = artifacts_df[artifacts_df["case_id"] == case["case_id"]].copy() if not artifacts_df.empty else pd.DataFrame()
-        case_inbox = inbox_df[inbox_df["case_id"] == case["case_id"]].copy() if not inbox_df.empty else pd.DataFrame()
+        case_artifacts = artifacts.get(case["case_id"])
+        case_inbox = inbox.get(case["case_id"])
         family = case.get("family")
         if family == "rb_sus_contrato":
             rows.extend(_build_rb_burden(case, case_artifacts, case_inbox))
@@ -475,4 +482,5 @@ def sync_ops_burden(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
             ],
         )
 
+    mark_tables_written(con, "ops_case_burden_item")
     return {"rows_written": len(rows), "cases": int(cases_df["case_id"].nunique())}
@@ -6,6 +6,8 @@ from typing import Any
 
 import duckdb
 
+from src.core.ops_context import CaseRecords, load_case_records
+
 
 ROOT = Path(__file__).resolve().parents[2]
 
@@ -238,62 +240,38 @@ def _row(
     }
 
 
-def _fetch_case(con: duckdb.DuckDBPyConnection, case_id: str) -> dict[str, Any] | None:
-    rows = con.execute(
-        """
-        SELECT case_id, family, classe_achado, estagio_operacional, uso_externo, title
-        FROM ops_case_registry
-        WHERE case_id = ?
-        """,
-        [case_id],
-    ).fetchall()
-    if not rows:
-        return None
-    case_id, family, classe_achado, estagio_operacional, uso_externo, title = rows[0]
+def _load_context(con: duckdb.DuckDBPyConnection) -> dict[str, CaseRecords]:
+    # Cada tabela e lida uma vez, apenas para os casos citados nos benchmarks.
+    case_ids = sorted({str(item["expected"]["case_id"]) for item in BENCHMARKS if "case_id" in item["expected"]})
     return {
-        "case_id": case_id,
-        "family": family,
-        "classe_achado": classe_achado,
-        "estagio_operacional": estagio_operacional,
-        "uso_externo": uso_externo,
-        "title": title,
+        "registry": load_case_records(
+            con,
+            "ops_case_registry",
+            columns="case_id, family, classe_achado, estagio_operacional, uso_externo, title",
+            case_ids=case_ids,
+        ),
+        "gate": load_case_records(con, "ops_case_export_gate", columns="case_id, export_mode, allowed", case_ids=case_ids),
+        "burden": load_case_records(con, "ops_case_burden_item", columns="case_id, item_key, status", case_ids=case_ids),
     }
 
 
-def _gate_allowed(con: duckdb.DuckDBPyConnection, case_id: str, export_mode: str) -> bool | None:
-    row = con.execute(
-        """
-        SELECT allowed
-        FROM ops_case_export_gate
-        WHERE case_id = ? AND export_mode = ?
-        """,
-        [case_id, export_mode],
-    ).fetchone()
-    return None if row is None else bool(row[0])
-
-
-def _has_burden_item(con: duckdb.DuckDBPyConnection, case_id: str, item_key: str) -> bool:
-    count = con.execute(
-        """
-        SELECT COUNT(*)
-        FROM ops_case_burden_item
-        WHERE case_id = ? AND item_key = ?
-        """,
-        [case_id, item_key],
-    ).fetchone()[0]
-    return bool(count)
-
-
-def _burden_status(con: duckdb.DuckDBPyConnection, case_id: str, item_key: str) -> str | None:
-    row = con.execute(
-        """
-        SELECT status
-        FROM ops_case_burden_item
-        WHERE case_id = ? AND item_key = ?
-        """,
-        [case_id, item_key],
-    ).fetchone()
-    return None if row is None else str(row[0])
+def _fetch_case(context: dict[str, CaseRecords], case_id: str) -> dict[str, Any] | None:
+    rows = context["registry"].get(case_id)
+    return dict(rows[0]) if rows else None
+
+
+def _gate_allowed(context: dict[str, CaseRecords], case_id: str, export_mode: str) -> bool | None:
+    row = next((row for row in context["gate"].get(case_id, []) if row["export_mode"] == export_mode), None)
+    return None if row is None else bool(row["allowed"])
+
+
+def _has_burden_item(context: dict[str, CaseRecords], case_id: str, item_key: str) -> bool:
+    return any(row["item_key"] == item_key for row in context["burden"].get(case_id, []))
+
+
+def _burden_status(context: dict[str, CaseRecords], case_id: str, item_key: str) -> str | None:
+    row = next((row for row in context["burden"].get(case_id, []) if row["item_key"] == item_key), None)
+    return None if row is None else str(row["status"])
 
 
 def sync_ops_calibration(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
@@ -302,6 +280,7 @@ def sync_ops_calibration(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
     con.execute("DELETE FROM ops_calibration_result")
 
     tables = set(con.execute("SHOW TABLES").df()["name"].tolist())
+    context = _load_context(con)
     results: list[dict[str, Any]] = []
 
     for item in BENCHMARKS:
@@ -313,7 +292,7 @@ def sync_ops_calibration(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
 
         if expectation_type == "case_fields":
             case_id = str(expected["case_id"])
-            case = _fetch_case(con, case_id) if "ops_case_registry" in tables else None
+            case = _fetch_case(context, case_id) if "ops_case_registry" in tables else None
             if case is None:
                 results.append(
                     _row(
@@ -332,20 +311,20 @@ def sync_ops_calibration(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
                 if key in expected and case.get(key) != expected[key]:
                     mismatches[key] = {"expected": expected[key], "actual": case.get(key)}
             if "noticia_fato_allowed" in expected:
-                actual = _gate_allowed(con, case_id, "NOTICIA_FATO")
+                actual = _gate_allowed(context, case_id, "NOTICIA_FATO")
                 if actual != bool(expected["noticia_fato_allowed"]):
                     mismatches["noticia_fato_allowed"] = {
                         "expected": bool(expected["noticia_fato_allowed"]),
                         "actual": actual,
                     }
             if "pedido_documental_allowed" in expected:
-                actual = _gate_allowed(con, case_id, "PEDIDO_DOCUMENTAL")
+                actual = _gate_allowed(context, case_id, "PEDIDO_DOCUMENTAL")
                 if actual != bool(expected["pedido_documental_allowed"]):
                     mismatches["pedido_documental_allowed"] = {
                         "expected": bool(expected["pedido_documental_allowed"]),
                         "actual": actual,
                     }
-            if "burden_item" in expected and not _has_burden_item(con, case_id, str(expected["burden_item"])):
+            if "burden_item" in expected and not _has_burden_item(context, case_id, str(expected["burden_item"])):
                 mismatches["burden_item"] = {
                     "expected": str(expected["burden_item"]),
                     "actual": "missing",
@@ -377,7 +356,7 @@ def sync_ops_calibration(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
 
         if expectation_type == "case_absent":
             case_id = str(expected["case_id"])
-            case = _fetch_case(con, case_id) if "ops_case_registry" in tables else None
+            case = _fetch_case(context, case_id) if "ops_case_registry" in tables else None
             historical_path = ROOT / str(expected["historical_note"])
             if case is not None:
                 results.append(
@@ -418,7 +397,7 @@ def sync_ops_calibration(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
             case_id = str(expected["case_id"])
             item_key = str(expected["item_key"])
             expected_status = str(expected["status"])
-            actual_status = _burden_status(con, case_id, item_key) if "ops_case_burden_item" in tables else None
+            actual_status = _burden_status(context, case_id, item_key) if "ops_case_burden_item" in tables else None
             status = "PASS" if actual_status == expected_status else "FAIL"
             results.append(
                 _row(
@@ -447,7 +426,7 @@ def sync_ops_calibration(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
             item_keys = [str(v) for v in expected.get("item_keys", [])]
             mismatches: dict[str, Any] = {}
             for item_key in item_keys:
-                actual_status = _burden_status(con, case_id, item_key) if "ops_case_burden_item" in tables else None
+                actual_status = _burden_status(context, case_id, item_key) if "ops_case_burden_item" in tables else None
                 if actual_status != expected_status:
                     mismatches[item_key] = {
                         "expected_status": expected_status,
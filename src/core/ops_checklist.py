@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import json
-from typing import Any
+from typing import Any, Iterable
 
 import duckdb
 
+from src.core.ops_scope import case_scope, case_scope_sql, delete_case_rows
+from src.core.ops_version import mark_tables_written
+
 
 CHECKLIST_DDL = """
 CREATE TABLE IF NOT EXISTS ops_case_checklist (
@@ -58,16 +61,19 @@ def _row(
     }
 
 
-def sync_ops_checklist(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
+def sync_ops_checklist(con: duckdb.DuckDBPyConnection, case_ids: Iterable[str] | None = None) -> dict[str, int]:
     ensure_ops_checklist(con)
-    con.execute("DELETE FROM ops_case_checklist")
+    case_ids = case_scope(case_ids)
+    delete_case_rows(con, "ops_case_checklist", case_ids)
+    scope_sql, scope_params = case_scope_sql(case_ids)
 
     tables = set(con.execute("SHOW TABLES").df()["name"].tolist())
     if "ops_case_burden_item" not in tables:
+        mark_tables_written(con, "ops_case_checklist")
         return {"rows_written": 0, "cases": 0}
 
     burden_rows = con.execute(
-        """
+        f"""
         SELECT
             case_id,
             family,
@@ -76,14 +82,18 @@ def sync_ops_checklist(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
             next_action,
             source_refs_json
         FROM ops_case_burden_item
+        WHERE {scope_sql}
         ORDER BY case_id, status_order, item_key
-        """
+        """,
+        scope_params,
     ).fetchall()
 
     written = 0
-    case_ids: set[str] = set()
+    # Ordinal por caso: o id nao depende de quais outros casos estao no recorte.
+    case_positions: dict[str, int] = {}
     for case_id, family, item_label, status, next_action, source_refs_json in burden_rows:
-        case_ids.add(case_id)
+        position = case_positions.get(case_id, 0)
+        case_positions[case_id] = position + 1
         step_group = {
             "COMPROVADO_DOCUMENTAL": "prova",
             "PENDENTE_DOCUMENTO": "diligencia",
@@ -106,7 +116,7 @@ def sync_ops_checklist(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
             ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
             """,
             [
-                f"{case_id}:{step_group}:{written}",
+                f"{case_id}:{step_group}:{position}",
                 case_id,
                 family,
                 step_group,
@@ -119,4 +129,5 @@ def sync_ops_checklist(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
         )
         written += 1
 
-    return {"rows_written": written, "cases": len(case_ids)}
+    mark_tables_written(con, "ops_case_checklist")
+    return {"rows_written": written, "cases": len(case_positions)}
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+import duckdb
+import pandas as pd
+
+from src.core.ops_scope import case_scope_sql
+
+
+CaseRecords = dict[str, list[dict[str, Any]]]
+
+
+@dataclass(frozen=True)
+class CaseFrames:
+    frames: dict[str, pd.DataFrame]
+    empty: pd.DataFrame
+
+    def get(self, case_id: Any) -> pd.DataFrame:
+        return self.frames.get(str(case_id), self.empty)
+
+
+def partition_by_case(df: pd.DataFrame, column: str = "case_id") -> CaseFrames:
+    # Uma passada de groupby no lugar de um filtro booleano por caso.
+    empty = df.iloc[0:0]
+    if df.empty:
+        return CaseFrames({}, empty)
+    return CaseFrames({str(key): group for key, group in df.groupby(column, sort=False)}, empty)
+
+
+def _select_sql(table: str, columns: str, order_by: str | None, case_ids: list[str] | None) -> tuple[str, list[Any]]:
+    scope_sql, scope_params = case_scope_sql(case_ids)
+    sql = f"SELECT {columns} FROM {table} WHERE {scope_sql}"
+    if order_by:
+        sql += f" ORDER BY {order_by}"
+    return sql, scope_params
+
+
+def load_case_frames(
+    con: duckdb.DuckDBPyConnection,
+    table: str,
+    *,
+    columns: str = "*",
+    order_by: str | None = None,
+    case_ids: list[str] | None = None,
+) -> CaseFrames:
+    """Le a tabela uma vez (recortada por case_ids) e particiona por case_id."""
+    sql, params = _select_sql(table, columns, order_by, case_ids)
+    try:
+        df = con.execute(sql, params).df()
+    except duckdb.CatalogException:
+        return CaseFrames({}, pd.DataFrame())
+    return partition_by_case(df)
+
+
+def load_case_records(
+    con: duckdb.DuckDBPyConnection,
+    table: str,
+    *,
+    columns: str,
+    order_by: str | None = None,
+    case_ids: list[str] | None = None,
+) -> CaseRecords:
+    """Como load_case_frames, mas com registros Python (NULL vira None)."""
+    sql, params = _select_sql(table, columns, order_by, case_ids)
+    try:
+        cursor = con.execute(sql, params)
+    except duckdb.CatalogException:
+        return {}
+    names = [column[0] for column in cursor.description]
+    records: CaseRecords = {}
+    for row in cursor.fetchall():
+        record = dict(zip(names, row))
+        records.setdefault(str(record["case_id"]), []).append(record)
+    return records
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import json
-from typing import Any
+from typing import Any, Iterable
 
 import duckdb
 
+from src.core.ops_scope import case_scope, case_scope_sql, delete_case_rows
+from src.core.ops_version import mark_tables_written
+
 
 CONTRADICTION_DDL = """
 CREATE TABLE IF NOT EXISTS ops_case_contradiction (
@@ -34,16 +37,19 @@ def ensure_ops_contradiction(con: duckdb.DuckDBPyConnection) -> None:
     con.execute(CONTRADICTION_VIEW)
 
 
-def sync_ops_contradiction(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
+def sync_ops_contradiction(con: duckdb.DuckDBPyConnection, case_ids: Iterable[str] | None = None) -> dict[str, int]:
     ensure_ops_contradiction(con)
-    con.execute("DELETE FROM ops_case_contradiction")
+    case_ids = case_scope(case_ids)
+    delete_case_rows(con, "ops_case_contradiction", case_ids)
+    scope_sql, scope_params = case_scope_sql(case_ids)
 
     tables = set(con.execute("SHOW TABLES").df()["name"].tolist())
     if "ops_case_semantic_issue" not in tables:
+        mark_tables_written(con, "ops_case_contradiction")
         return {"rows_written": 0, "cases": 0}
 
     rows = con.execute(
-        """
+        f"""
         SELECT
             case_id,
             comparator,
@@ -56,15 +62,16 @@ def sync_ops_contradiction(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
             rationale,
             source_refs_json
         FROM ops_case_semantic_issue
-        WHERE status = 'DIVERGENTE'
+        WHERE status = 'DIVERGENTE' AND {scope_sql}
         ORDER BY case_id, severity DESC, comparator, field_key
-        """
+        """,
+        scope_params,
     ).fetchall()
 
     written = 0
-    case_ids: set[str] = set()
+    seen_cases: set[str] = set()
     for case_id, comparator, field_key, severity, status, left_value, center_value, right_value, rationale, source_refs_json in rows:
-        case_ids.add(case_id)
+        seen_cases.add(case_id)
         title = f"{comparator} :: {field_key}"
         next_action = "Preservar a contradicao em noticia de fato e, se preciso, solicitar memoria comparativa e processo integral."
         con.execute(
@@ -88,4 +95,5 @@ def sync_ops_contradiction(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
         )
         written += 1
 
-    return {"rows_written": written, "cases": len(case_ids)}
+    mark_tables_written(con, "ops_case_contradiction")
+    return {"rows_written": written, "cases": len(seen_cases)}
@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import json
+import threading
+from io import StringIO
+from pathlib import Path
+from typing import Any
+
+import duckdb
+import pandas as pd
+
+from src.core.ops_fingerprint import file_sha256
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:  # pragma: no cover - caminho sem lxml usa html.parser
+    lxml = None
+
+
+DOCUMENT_CACHE_DDL = """
+CREATE TABLE IF NOT EXISTS ops_document_cache (
+    content_sha256 VARCHAR NOT NULL,
+    suffix VARCHAR NOT NULL,
+    engine_version INTEGER NOT NULL,
+    content_text VARCHAR,
+    labels_json JSON,
+    sections_json JSON,
+    metadata_json JSON,
+    parsed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (content_sha256, suffix)
+)
+"""
+
+# Incrementar quando a extracao mudar: entradas antigas sao reprocessadas.
+DOCUMENT_ENGINE_VERSION = 1
+
+# Secoes de tabela (div com id) guardadas linha a linha para os comparadores.
+DOCUMENT_SECTION_IDS = ("tabItens", "tabPropostasELances")
+
+HTML_SUFFIXES = {".html", ".htm"}
+_SKIP_TEXT_TAGS = {"script", "style", "template"}
+_MEMORY_LIMIT = 512
+
+_lock = threading.Lock()
+_memory: dict[tuple[str, str], dict[str, Any]] = {}
+
+
+def ensure_ops_document_cache(con: duckdb.DuckDBPyConnection) -> None:
+    con.execute(DOCUMENT_CACHE_DDL)
+
+
+def _empty_document(mode: str) -> dict[str, Any]:
+    return {"text": None, "labels": {}, "sections": {}, "metadata": {"mode": mode}}
+
+
+def _lxml_text(node: Any, separator: str) -> str:
+    # Mesmo resultado de BeautifulSoup.get_text(separator, strip=True): ignora
+    # comentarios e conteudo de script/style.
+    parts: list[str] = []
+    for chunk in node.xpath(".//text()"):
+        parent = chunk.getparent()
+        if not chunk.is_tail and (not isinstance(parent.tag, str) or parent.tag in _SKIP_TEXT_TAGS):
+            continue
+        stripped = chunk.strip()
+        if stripped:
+            parts.append(stripped)
+    return separator.join(parts)
+
+
+def _row_cells_lxml(rows: list[Any]) -> list[list[str]]:
+    return [[_lxml_text(cell, " ") for cell in row.iter("td")] for row in rows]
+
+
+def _parse_html_lxml(content: str) -> tuple[str, list[list[str]], dict[str, list[list[str]]]]:
+    parser = lxml.html.HTMLParser(encoding="utf-8")
+    root = lxml.html.document_fromstring(content.encode("utf-8"), parser=parser)
+    sections = {
+        section_id: _row_cells_lxml(root.xpath(f'//div[@id="{section_id}"]//table//tr'))
+        for section_id in DOCUMENT_SECTION_IDS
+    }
+    return _lxml_text(root, "\n"), _row_cells_lxml(root.xpath("//table//tr")), sections
+
+
+def _parse_html_soup(content: str) -> tuple[str, list[list[str]], dict[str, list[list[str]]]]:
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(content, "html.parser")
+
+    def cells(selector: str) -> list[list[str]]:
+        return [[cell.get_text(" ", strip=True) for cell in row.find_all("td")] for row in soup.select(selector)]
+
+    sections = {section_id: cells(f"div#{section_id} table tr") for section_id in DOCUMENT_SECTION_IDS}
+    return soup.get_text("\n", strip=True), cells("table tr"), sections
+
+
+def _label_table(rows: list[list[str]]) -> dict[str, str]:
+    payload: dict[str, str] = {}
+    for cells in rows:
+        if len(cells) != 2:
+            continue
+        left = cells[0].replace(":", "").strip()
+        right = cells[1].strip()
+        if left and right:
+            payload[left] = right
+    return payload
+
+
+def parse_html_document(content: str) -> dict[str, Any]:
+    if lxml is None:
+        text, rows, sections = _parse_html_soup(content)
+    else:
+        try:
+            text, rows, sections = _parse_html_lxml(content)
+        except (ValueError, etree.ParserError):
+            # Documento vazio ou malformado demais para o libxml2.
+            text, rows, sections = _parse_html_soup(content)
+    return {
+        "text": text,
+        "labels": _label_table(rows),
+        "sections": sections,
+        "metadata": {"mode": "html_text"},
+    }
+
+
+def _parse_file(path: Path) -> dict[str, Any]:
+    suffix = path.suffix.lower()
+    if suffix in {".md", ".txt"}:
+        return {**_empty_document("text"), "text": path.read_text(encoding="utf-8", errors="replace")}
+
+    if suffix == ".json":
+        raw = path.read_text(encoding="utf-8", errors="replace")
+        try:
+            text = json.dumps(json.loads(raw), ensure_ascii=False, indent=2, sort_keys=True)
+            return {**_empty_document("json"), "text": text}
+        except json.JSONDecodeError:
+            return {**_empty_document("json_raw"), "text": raw}
+
+    if suffix == ".csv":
+        raw = path.read_text(encoding="utf-8", errors="replace")
+        try:
+            df = pd.read_csv(StringIO(raw))
+            metadata = {"mode": "csv", "rows": str(len(df)), "cols": str(len(df.columns))}
+            return {**_empty_document("csv"), "text": df.to_csv(index=False), "metadata": metadata}
+        except Exception:
+            return {**_empty_document("csv_raw"), "text": raw}
+
+    if suffix in HTML_SUFFIXES:
+        content = path.read_text(encoding="utf-8", errors="replace")
+        try:
+            return parse_html_document(content)
+        except Exception:
+            return {**_empty_document("html_text"), "text": content}
+
+    if suffix == ".pdf":
+        txt_fallback = path.with_suffix(".txt")
+        if txt_fallback.exists():
+            return {**_empty_document("pdf_txt_fallback"), "text": txt_fallback.read_text(encoding="utf-8", errors="replace")}
+        return _empty_document("pdf_without_text")
+
+    return _empty_document("unsupported")
+
+
+def _content_key(path: Path) -> tuple[str, str] | None:
+    suffix = path.suffix.lower()
+    # PDF e lido pelo .txt espelho; a chave acompanha o arquivo realmente lido.
+    source = path.with_suffix(".txt") if suffix == ".pdf" and path.with_suffix(".txt").exists() else path
+    try:
+        return file_sha256(source), suffix
+    except OSError:
+        return None
+
+
+def _remember(key: tuple[str, str], document: dict[str, Any]) -> None:
+    with _lock:
+        if len(_memory) >= _MEMORY_LIMIT:
+            _memory.pop(next(iter(_memory)))
+        _memory[key] = document
+
+
+def _fetch_cached(con: duckdb.DuckDBPyConnection, key: tuple[str, str]) -> dict[str, Any] | None:
+    try:
+        row = con.execute(
+            """
+            SELECT content_text, labels_json, sections_json, metadata_json
+            FROM ops_document_cache
+            WHERE content_sha256 = ? AND suffix = ? AND engine_version = ?
+            """,
+            [*key, DOCUMENT_ENGINE_VERSION],
+        ).fetchone()
+    except duckdb.CatalogException:
+        return None
+    if row is None:
+        return None
+    return {
+        "text": row[0],
+        "labels": json.loads(row[1] or "{}"),
+        "sections": json.loads(row[2] or "{}"),
+        "metadata": json.loads(row[3] or "{}"),
+    }
+
+
+def _store_cached(con: duckdb.DuckDBPyConnection, key: tuple[str, str], document: dict[str, Any]) -> None:
+    ensure_ops_document_cache(con)
+    con.execute(
+        """
+        INSERT OR REPLACE INTO ops_document_cache (
+            content_sha256, suffix, engine_version, content_text, labels_json,
+            sections_json, metadata_json, parsed_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """,
+        [
+            *key,
+            DOCUMENT_ENGINE_VERSION,
+            document["text"],
+            json.dumps(document["labels"], ensure_ascii=False),
+            json.dumps(document["sections"], ensure_ascii=False),
+            json.dumps(document["metadata"], ensure_ascii=False),
+        ],
+    )
+
+
+def load_document(
+    path: Path,
+    con: duckdb.DuckDBPyConnection | None = None,
+    *,
+    persist: bool = True,
+) -> dict[str, Any]:
+    """Texto, tabela de rotulos, secoes e metadados do artefato, extraidos uma
+    vez por hash de conteudo e reaproveitados via memoria e ops_document_cache."""
+    if not path.exists():
+        return _empty_document("missing")
+    key = _content_key(path)
+    if key is None:
+        return _parse_file(path)
+
+    with _lock:
+        document = _memory.get(key)
+    if document is not None:
+        return document
+
+    if con is not None:
+        document = _fetch_cached(con, key)
+    if document is None:
+        document = _parse_file(path)
+        if con is not None and persist:
+            _store_cached(con, key, document)
+    _remember(key, document)
+    return document
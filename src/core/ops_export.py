@@ -6,10 +6,14 @@ import re
 from datetime import datetime
 from difflib import unified_diff
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
 import duckdb
 
+from src.core.ops_fingerprint import file_sha256, store_file_fingerprints
+from src.core.ops_scope import case_scope, case_scope_sql, delete_case_rows
+from src.core.ops_version import mark_tables_written
+
 
 ROOT = Path(__file__).resolve().parents[2]
 OPS_EXPORT_DIR = (
@@ -82,6 +86,23 @@ CREATE TABLE IF NOT EXISTS ops_case_generated_export_diff (
 )
 """
 
+# Indice unico do par: a tabela de diffs so recebe pares novos (append-only).
+GENERATED_EXPORT_DIFF_PAIR_INDEX = """
+CREATE UNIQUE INDEX IF NOT EXISTS idx_ops_case_generated_export_diff_pair
+ON ops_case_generated_export_diff (older_export_id, newer_export_id)
+"""
+
+# Corpo das saidas congeladas enderecado por sha256: versoes identicas sao
+# reconhecidas pelo hash e o texto nao precisa ser relido do disco.
+EXPORT_BODY_DDL = """
+CREATE TABLE IF NOT EXISTS ops_export_body (
+    sha256 VARCHAR PRIMARY KEY,
+    body VARCHAR NOT NULL,
+    size_bytes BIGINT,
+    stored_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
 GENERATED_EXPORT_DIFF_VIEW = """
 CREATE OR REPLACE VIEW v_ops_case_generated_export_diff AS
 SELECT *
@@ -96,7 +117,9 @@ def ensure_ops_export_gate(con: duckdb.DuckDBPyConnection) -> None:
     con.execute(GENERATED_EXPORT_DDL)
     con.execute(GENERATED_EXPORT_VIEW)
     con.execute(GENERATED_EXPORT_DIFF_DDL)
+    con.execute(GENERATED_EXPORT_DIFF_PAIR_INDEX)
     con.execute(GENERATED_EXPORT_DIFF_VIEW)
+    con.execute(EXPORT_BODY_DDL)
 
 
 def _safe_disclaimer() -> str:
@@ -107,11 +130,7 @@ def _safe_disclaimer() -> str:
 
 
 def _sha256_file(path: Path) -> str:
-    digest = hashlib.sha256()
-    with path.open("rb") as handle:
-        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
-            digest.update(chunk)
-    return digest.hexdigest()
+    return file_sha256(path)
 
 
 def _case_slug(case_id: str) -> str:
@@ -122,14 +141,20 @@ def _case_export_dir(case_id: str) -> Path:
     return OPS_EXPORT_DIR / _case_slug(case_id)
 
 
-def build_generated_export_artifacts(con: duckdb.DuckDBPyConnection) -> list[dict[str, Any]]:
+def build_generated_export_artifacts(
+    con: duckdb.DuckDBPyConnection,
+    case_ids: Iterable[str] | None = None,
+) -> list[dict[str, Any]]:
     ensure_ops_export_gate(con)
+    scope_sql, scope_params = case_scope_sql(case_scope(case_ids))
     rows = con.execute(
-        """
+        f"""
         SELECT export_id, case_id, export_mode, path, sha256, size_bytes, actor, created_at
         FROM v_ops_case_generated_export
+        WHERE {scope_sql}
         ORDER BY created_at DESC, export_mode
-        """
+        """,
+        scope_params,
     ).fetchall()
     artifacts: list[dict[str, Any]] = []
     for export_id, case_id, export_mode, path, sha256, size_bytes, actor, created_at in rows:
@@ -159,90 +184,174 @@ def build_generated_export_artifacts(con: duckdb.DuckDBPyConnection) -> list[dic
     return artifacts
 
 
-def sync_ops_generated_export_diff(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
+def _export_abs(path_value: str) -> Path:
+    path = Path(path_value)
+    return path if path.is_absolute() else ROOT / path
+
+
+def _store_export_body(con: duckdb.DuckDBPyConnection, sha256: str, body: str) -> None:
+    con.execute(
+        """
+        INSERT OR IGNORE INTO ops_export_body (sha256, body, size_bytes, stored_at)
+        VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+        """,
+        [sha256, body, len(body.encode("utf-8"))],
+    )
+
+
+def _load_export_bodies(con: duckdb.DuckDBPyConnection, exports: dict[str, str]) -> dict[str, str]:
+    """
+    Texto por sha256; o disco so e lido para saidas anteriores ao store e so
+    vale se o conteudo bater com o sha256 registrado. Sha sem texto confiavel
+    fica fora do resultado.
+    """
+    if not exports:
+        return {}
+    bodies = dict(
+        con.execute(
+            "SELECT sha256, body FROM ops_export_body WHERE sha256 IN (SELECT unnest(?::VARCHAR[]))",
+            [sorted(exports)],
+        ).fetchall()
+    )
+    for sha256, path_value in exports.items():
+        if sha256 in bodies:
+            continue
+        path = _export_abs(path_value)
+        if not sha256 or not path.exists():
+            continue
+        raw = path.read_bytes()
+        if hashlib.sha256(raw).hexdigest() != sha256:
+            continue
+        body = raw.decode("utf-8", errors="replace")
+        bodies[sha256] = body
+        _store_export_body(con, sha256, body)
+    return bodies
+
+
+def sync_ops_generated_export_diff(con: duckdb.DuckDBPyConnection, case_ids: Iterable[str] | None = None) -> dict[str, int]:
     ensure_ops_export_gate(con)
-    con.execute("DELETE FROM ops_case_generated_export_diff")
+    case_ids = case_scope(case_ids)
+    scope_sql, scope_params = case_scope_sql(case_ids)
     rows = con.execute(
-        """
-        SELECT export_id, case_id, export_mode, path, created_at
+        f"""
+        SELECT export_id, case_id, export_mode, path, sha256
         FROM ops_case_generated_export
+        WHERE {scope_sql}
         ORDER BY case_id, export_mode, created_at
-        """
+        """,
+        scope_params,
     ).fetchall()
     grouped: dict[tuple[str, str], list[tuple[Any, ...]]] = {}
     for row in rows:
         grouped.setdefault((str(row[1]), str(row[2])), []).append(row)
 
+    # Saidas congeladas nao mudam: pares ja registrados nao sao recalculados.
+    existing = {
+        (older_id, newer_id)
+        for older_id, newer_id in con.execute(
+            f"SELECT older_export_id, newer_export_id FROM ops_case_generated_export_diff WHERE {scope_sql}",
+            scope_params,
+        ).fetchall()
+    }
+    pending = [
+        (case_id, export_mode, older, newer)
+        for (case_id, export_mode), exports in grouped.items()
+        for older, newer in zip(exports[:-1], exports[1:])
+        if (older[0], newer[0]) not in existing
+    ]
+    bodies = _load_export_bodies(
+        con,
+        {
+            export[4]: export[3]
+            for _, _, older, newer in pending
+            if older[4] != newer[4]
+            for export in (older, newer)
+        },
+    )
+
     written = 0
-    for (case_id, export_mode), exports in grouped.items():
-        if len(exports) < 2:
+    identical = 0
+    skipped = 0
+    for case_id, export_mode, older, newer in pending:
+        older_id, _, _, older_path, older_sha = older
+        newer_id, _, _, newer_path, newer_sha = newer
+        if older_sha and older_sha == newer_sha:
+            diff_lines: list[str] = []
+            identical += 1
+        elif older_sha not in bodies or newer_sha not in bodies:
+            # O par nao e gravado: gravado, nunca seria recalculado. Fica
+            # pendente ate o texto voltar a ser legivel.
+            skipped += 1
             continue
-        for older, newer in zip(exports[:-1], exports[1:]):
-            older_id, _, _, older_path, _ = older
-            newer_id, _, _, newer_path, _ = newer
-            older_file = Path(older_path)
-            newer_file = Path(newer_path)
-            older_abs = older_file if older_file.is_absolute() else ROOT / older_file
-            newer_abs = newer_file if newer_file.is_absolute() else ROOT / newer_file
-            older_text = older_abs.read_text(encoding="utf-8", errors="replace") if older_abs.exists() else ""
-            newer_text = newer_abs.read_text(encoding="utf-8", errors="replace") if newer_abs.exists() else ""
-            older_lines = older_text.splitlines()
-            newer_lines = newer_text.splitlines()
+        else:
             diff_lines = list(
                 unified_diff(
-                    older_lines,
-                    newer_lines,
-                    fromfile=str(older_file),
-                    tofile=str(newer_file),
+                    bodies[older_sha].splitlines(),
+                    bodies[newer_sha].splitlines(),
+                    fromfile=str(older_path),
+                    tofile=str(newer_path),
                     lineterm="",
                 )
             )
-            added_lines = sum(1 for line in diff_lines if line.startswith("+") and not line.startswith("+++"))
-            removed_lines = sum(1 for line in diff_lines if line.startswith("-") and not line.startswith("---"))
-            changed = bool(added_lines or removed_lines)
-            summary = (
-                f"{added_lines} linha(s) adicionadas e {removed_lines} removidas entre versoes congeladas."
-                if changed
-                else "Nenhuma mudanca textual entre as versoes congeladas."
-            )
-            con.execute(
-                """
-                INSERT INTO ops_case_generated_export_diff (
-                    diff_id, case_id, export_mode, older_export_id, newer_export_id,
-                    changed, added_lines, removed_lines, summary, diff_text, updated_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                """,
-                [
-                    f"{case_id}:{export_mode}:{older_id}:{newer_id}",
-                    case_id,
-                    export_mode,
-                    older_id,
-                    newer_id,
-                    changed,
-                    added_lines,
-                    removed_lines,
-                    summary,
-                    "\n".join(diff_lines)[:200000],
-                ],
-            )
-            written += 1
-    return {"rows_written": written, "groups": len(grouped)}
+        added_lines = sum(1 for line in diff_lines if line.startswith("+") and not line.startswith("+++"))
+        removed_lines = sum(1 for line in diff_lines if line.startswith("-") and not line.startswith("---"))
+        changed = bool(added_lines or removed_lines)
+        summary = (
+            f"{added_lines} linha(s) adicionadas e {removed_lines} removidas entre versoes congeladas."
+            if changed
+            else "Nenhuma mudanca textual entre as versoes congeladas."
+        )
+        con.execute(
+            """
+            INSERT INTO ops_case_generated_export_diff (
+                diff_id, case_id, export_mode, older_export_id, newer_export_id,
+                changed, added_lines, removed_lines, summary, diff_text, updated_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            """,
+            [
+                f"{case_id}:{export_mode}:{older_id}:{newer_id}",
+                case_id,
+                export_mode,
+                older_id,
+                newer_id,
+                changed,
+                added_lines,
+                removed_lines,
+                summary,
+                "\n".join(diff_lines)[:200000],
+            ],
+        )
+        written += 1
+    if written:
+        mark_tables_written(con, "ops_case_generated_export_diff")
+    return {
+        "rows_written": written,
+        "groups": len(grouped),
+        "pairs_reused": len(existing),
+        "pairs_identical": identical,
+        "pairs_skipped": skipped,
+    }
 
 
-def sync_ops_export_gate(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
+def sync_ops_export_gate(con: duckdb.DuckDBPyConnection, case_ids: Iterable[str] | None = None) -> dict[str, int]:
     ensure_ops_export_gate(con)
-    con.execute("DELETE FROM ops_case_export_gate")
+    case_ids = case_scope(case_ids)
+    delete_case_rows(con, "ops_case_export_gate", case_ids)
+    scope_sql, scope_params = case_scope_sql(case_ids)
 
     tables = set(con.execute("SHOW TABLES").df()["name"].tolist())
     if "ops_case_registry" not in tables:
+        mark_tables_written(con, "ops_case_export_gate")
         return {"rows_written": 0, "cases": 0}
 
     cases = con.execute(
-        """
+        f"""
         SELECT case_id, family, estagio_operacional
         FROM ops_case_registry
+        WHERE {scope_sql}
         ORDER BY case_id
-        """
+        """,
+        scope_params,
     ).fetchall()
 
     written = 0
@@ -333,6 +442,7 @@ def sync_ops_export_gate(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
             )
             written += 1
 
+    mark_tables_written(con, "ops_case_export_gate")
     return {"rows_written": written, "cases": len(cases)}
 
 
@@ -497,6 +607,7 @@ def freeze_case_external_text(
     file_path = export_dir / filename
     file_path.write_text(content, encoding="utf-8")
     sha256 = _sha256_file(file_path)
+    _store_export_body(con, sha256, content)
     relpath = file_path.relative_to(ROOT)
     export_id = f"{case_id}:{export_mode}:{stamp}"
     label = f"saida_controlada_{export_mode.lower()}_{stamp}"
@@ -518,6 +629,8 @@ def freeze_case_external_text(
             actor,
         ],
     )
+    store_file_fingerprints(con)
+    mark_tables_written(con, "ops_case_generated_export")
     return {
         "rows_written": 1,
         "export_id": export_id,
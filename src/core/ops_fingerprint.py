@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Iterable
+
+import duckdb
+
+
+FINGERPRINT_DDL = """
+CREATE TABLE IF NOT EXISTS ops_file_fingerprint (
+    path VARCHAR PRIMARY KEY,
+    size_bytes BIGINT,
+    mtime_ns BIGINT,
+    sha256 VARCHAR,
+    hashed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+HASH_CHUNK_BYTES = 1024 * 1024
+DEFAULT_HASH_WORKERS = min(8, os.cpu_count() or 1)
+
+# Cache em memoria compartilhado pelos modulos ops: caminho absoluto ->
+# (size_bytes, mtime_ns, sha256). O arquivo so e relido quando tamanho ou mtime
+# mudam; entradas novas ficam pendentes ate store_file_fingerprints.
+_lock = threading.Lock()
+_entries: dict[str, tuple[int, int, str]] = {}
+_dirty: set[str] = set()
+_stats = {"hits": 0, "misses": 0}
+
+
+def ensure_ops_fingerprint(con: duckdb.DuckDBPyConnection) -> None:
+    con.execute(FINGERPRINT_DDL)
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cache_key(path: Path) -> str:
+    return os.path.abspath(path)
+
+
+def _lookup(key: str, stat: os.stat_result) -> str | None:
+    entry = _entries.get(key)
+    if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+        return entry[2]
+    return None
+
+
+def _record(key: str, stat: os.stat_result, sha256: str) -> None:
+    _entries[key] = (stat.st_size, stat.st_mtime_ns, sha256)
+    _dirty.add(key)
+    _stats["misses"] += 1
+
+
+def file_sha256(path: Path) -> str:
+    key = _cache_key(path)
+    stat = path.stat()
+    with _lock:
+        cached = _lookup(key, stat)
+        if cached is not None:
+            _stats["hits"] += 1
+            return cached
+    sha256 = _hash_file(path)
+    with _lock:
+        _record(key, stat, sha256)
+    return sha256
+
+
+def prime_file_fingerprints(paths: Iterable[Path], *, workers: int | None = None) -> int:
+    pending: dict[str, tuple[Path, os.stat_result]] = {}
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        key = _cache_key(path)
+        with _lock:
+            if _lookup(key, stat) is not None:
+                continue
+        pending[key] = (path, stat)
+    if not pending:
+        return 0
+
+    def work(item: tuple[str, tuple[Path, os.stat_result]]) -> None:
+        key, (path, stat) = item
+        try:
+            sha256 = _hash_file(path)
+        except OSError:
+            return
+        with _lock:
+            _record(key, stat, sha256)
+
+    with ThreadPoolExecutor(max_workers=workers or DEFAULT_HASH_WORKERS) as pool:
+        list(pool.map(work, pending.items()))
+    return len(pending)
+
+
+def load_file_fingerprints(con: duckdb.DuckDBPyConnection) -> int:
+    ensure_ops_fingerprint(con)
+    rows = con.execute("SELECT path, size_bytes, mtime_ns, sha256 FROM ops_file_fingerprint").fetchall()
+    with _lock:
+        for path, size_bytes, mtime_ns, sha256 in rows:
+            if path not in _dirty:
+                _entries[path] = (int(size_bytes), int(mtime_ns), sha256)
+    return len(rows)
+
+
+def store_file_fingerprints(con: duckdb.DuckDBPyConnection) -> int:
+    ensure_ops_fingerprint(con)
+    with _lock:
+        rows = [[key, *_entries[key]] for key in _dirty]
+        _dirty.clear()
+    if rows:
+        con.executemany(
+            """
+            INSERT OR REPLACE INTO ops_file_fingerprint (path, size_bytes, mtime_ns, sha256, hashed_at)
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+            """,
+            rows,
+        )
+    return len(rows)
+
+
+def file_fingerprint_stats() -> dict[str, int]:
+    with _lock:
+        return dict(_stats)
+
+
+def fingerprint_stats_since(before: dict[str, int]) -> dict[str, Any]:
+    after = file_fingerprint_stats()
+    hits = after["hits"] - before.get("hits", 0)
+    misses = after["misses"] - before.get("misses", 0)
+    total = hits + misses
+    return {
+        "fingerprint_hits": hits,
+        "fingerprint_misses": misses,
+        "fingerprint_hit_rate": round(hits / total, 4) if total else None,
+    }
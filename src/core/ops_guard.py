@@ -2,10 +2,13 @@ from __future__ import annotations
 
 import json
 import re
-from typing import Any
+from typing import Any, Iterable
 
 import duckdb
 
+from src.core.ops_scope import case_scope, case_scope_sql, delete_case_rows
+from src.core.ops_version import mark_tables_written
+
 
 GUARD_DDL = """
 CREATE TABLE IF NOT EXISTS ops_case_language_guard (
@@ -81,24 +84,30 @@ def _best_snippet(text: str, pattern: str, radius: int = 120) -> str:
     return text[start:end].replace("\n", " ").strip()
 
 
-def sync_ops_language_guard(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
+def sync_ops_language_guard(con: duckdb.DuckDBPyConnection, case_ids: Iterable[str] | None = None) -> dict[str, int]:
     ensure_ops_guard(con)
-    con.execute("DELETE FROM ops_case_language_guard")
+    case_ids = case_scope(case_ids)
+    delete_case_rows(con, "ops_case_language_guard", case_ids)
+    scope_sql, scope_params = case_scope_sql(case_ids)
 
     tables = set(con.execute("SHOW TABLES").df()["name"].tolist())
     if "ops_artifact_text_index" not in tables:
+        mark_tables_written(con, "ops_case_language_guard")
         return {"rows_written": 0, "sources": 0}
 
     rows = con.execute(
-        """
+        f"""
         SELECT case_id, source_type, source_id, label, kind, content_text
         FROM ops_artifact_text_index
         WHERE source_type = 'artifact'
           AND kind IN ('nota', 'dossie')
-        """
+          AND {scope_sql}
+        """,
+        scope_params,
     ).fetchall()
 
     written = 0
+    case_positions: dict[str, int] = {}
     for case_id, source_type, source_id, label, kind, content_text in rows:
         text = str(content_text or "")
         for issue_type, pattern, severity, suggestion in RISK_PATTERNS:
@@ -107,6 +116,8 @@ def sync_ops_language_guard(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
                 continue
             if _has_safe_context(snippet):
                 continue
+            position = case_positions.get(case_id, 0)
+            case_positions[case_id] = position + 1
             con.execute(
                 """
                 INSERT INTO ops_case_language_guard (
@@ -115,7 +126,7 @@ def sync_ops_language_guard(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
                 """,
                 [
-                    f"{case_id}:{source_id}:{issue_type}:{written}",
+                    f"{case_id}:{source_id}:{issue_type}:{position}",
                     case_id,
                     source_type,
                     source_id,
@@ -129,4 +140,5 @@ def sync_ops_language_guard(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
             )
             written += 1
 
+    mark_tables_written(con, "ops_case_language_guard")
     return {"rows_written": written, "sources": len(rows)}
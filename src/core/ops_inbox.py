@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import csv
-import hashlib
 import os
 import subprocess
 from datetime import date, datetime
@@ -10,9 +9,11 @@ from typing import Any
 
 import duckdb
 
+from src.core.ops_fingerprint import file_sha256, load_file_fingerprints, store_file_fingerprints
 from src.core.ops_runtime import begin_pipeline_run, ensure_ops_runtime, finish_pipeline_run
 from src.core.ops_search import ensure_ops_search_index, sync_ops_search_index
 from src.core.ops_timeline import ensure_ops_timeline
+from src.core.ops_version import mark_tables_written
 
 
 ROOT = Path(__file__).resolve().parents[2]
@@ -73,11 +74,7 @@ ORDER BY case_id, destino, eixo, documento_chave
 
 
 def _sha256_file(path: Path) -> str:
-    digest = hashlib.sha256()
-    with path.open("rb") as handle:
-        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
-            digest.update(chunk)
-    return digest.hexdigest()
+    return file_sha256(path)
 
 
 def _write_index_csv(index_csv: Path, rows: list[dict[str, Any]]) -> None:
@@ -113,8 +110,6 @@ def _cedimp_spec() -> dict[str, Any]:
             [".venv/bin/python", "scripts/sync_vinculo_societario_saude_maturidade.py"],
             [".venv/bin/python", "scripts/export_vinculo_societario_saude_respostas.py"],
             [".venv/bin/python", "scripts/validate_cedimp_quality.py"],
-            [".venv/bin/python", "scripts/sync_ops_case_registry.py"],
-            [".venv/bin/python", "scripts/sync_ops_timeline.py"],
         ],
     }
 
@@ -368,11 +363,7 @@ def _rb_case_spec(case_id: str) -> dict[str, Any]:
             "- Anexos recebidos devem ficar em `anexos/`.",
             "- Depois rerode o workflow do caso pela aba `📂 OPERAÇÕES`.",
         ],
-        "workflow_commands": [
-            [".venv/bin/python", "scripts/sync_ops_inbox.py", "--case-id", case_id],
-            [".venv/bin/python", "scripts/sync_ops_case_registry.py"],
-            [".venv/bin/python", "scripts/sync_ops_timeline.py"],
-        ],
+        "workflow_commands": [],
     }
 
 
@@ -394,11 +385,7 @@ def _sesacre_case_spec(case_id: str) -> dict[str, Any]:
             "- Anexos recebidos devem ficar em `anexos/`.",
             "- O workflow deste caso atualiza inbox, registry e timeline.",
         ],
-        "workflow_commands": [
-            [".venv/bin/python", "scripts/sync_ops_inbox.py", "--case-id", case_id],
-            [".venv/bin/python", "scripts/sync_ops_case_registry.py"],
-            [".venv/bin/python", "scripts/sync_ops_timeline.py"],
-        ],
+        "workflow_commands": [],
     }
 
 
@@ -453,6 +440,7 @@ def load_case_inbox_index(case_id: str) -> list[dict[str, Any]]:
 def sync_ops_inbox(con: duckdb.DuckDBPyConnection, case_id: str | None = None) -> dict[str, Any]:
     ensure_ops_runtime(con)
     ensure_ops_inbox(con)
+    load_file_fingerprints(con)
     specs = inbox_specs(con)
     target_case_ids = [case_id] if case_id else list(specs)
     rows_written = 0
@@ -499,7 +487,9 @@ def sync_ops_inbox(con: duckdb.DuckDBPyConnection, case_id: str | None = None) -
             )
             rows_written += 1
 
-    search_stats = sync_ops_search_index(con)
+    store_file_fingerprints(con)
+    search_stats = sync_ops_search_index(con, [case_id] if case_id else None)
+    mark_tables_written(con, "ops_case_inbox_document")
     return {"case_id": case_id, "rows_written": rows_written, "indexed_docs": int(search_stats.get("indexed_docs", 0))}
 
 
@@ -551,9 +541,28 @@ def upload_case_inbox_document(
     }
 
 
+def refresh_ops_case(con: duckdb.DuckDBPyConnection, case_id: str) -> dict[str, Any]:
+    """Atualiza inbox, registry e camada ops derivada apenas para o caso."""
+    from src.core.ops_registry import sync_ops_case_registry
+
+    inbox_stats = sync_ops_inbox(con, case_id=case_id)
+    registry_stats = sync_ops_case_registry(con, case_ids=[case_id])
+    ensure_ops_timeline(con)
+    return {"inbox_rows": int(inbox_stats.get("rows_written", 0)), **registry_stats}
+
+
+def _finish_workflow_run(run_id: str, **kwargs: Any) -> None:
+    con = duckdb.connect(str(ROOT / "data" / "sentinela_analytics.duckdb"))
+    try:
+        ensure_ops_runtime(con)
+        finish_pipeline_run(con, run_id, **kwargs)
+    finally:
+        con.close()
+
+
 def run_case_workflow(case_id: str) -> dict[str, Any]:
     spec = get_case_inbox_spec(case_id)
-    if not spec or not spec.get("workflow_commands"):
+    if not spec:
         raise ValueError("Caso sem workflow operacional configurado.")
 
     con = duckdb.connect(str(ROOT / "data" / "sentinela_analytics.duckdb"))
@@ -571,53 +580,54 @@ def run_case_workflow(case_id: str) -> dict[str, Any]:
     env = os.environ.copy()
     current_pythonpath = env.get("PYTHONPATH", "")
     env["PYTHONPATH"] = str(ROOT) if not current_pythonpath else f"{ROOT}:{current_pythonpath}"
+    # Scripts de dados proprios do caso ainda rodam em subprocesso; a camada ops
+    # e atualizada em processo, recortada ao caso.
+    for command in spec.get("workflow_commands", []):
+        started = datetime.now()
+        result = subprocess.run(
+            command,
+            cwd=str(ROOT),
+            capture_output=True,
+            text=True,
+            check=False,
+            env=env,
+        )
+        steps.append(
+            {
+                "command": command,
+                "returncode": result.returncode,
+                "stdout": result.stdout[-4000:],
+                "stderr": result.stderr[-4000:],
+                "duration_s": round((datetime.now() - started).total_seconds(), 2),
+            }
+        )
+        if result.returncode != 0:
+            error_text = f"Falha em {' '.join(command)} :: {result.stderr[-500:]}"
+            _finish_workflow_run(run_id, status="failed", details={"case_id": case_id, "steps": steps}, error_text=error_text)
+            raise RuntimeError(error_text)
+
+    started = datetime.now()
+    con = duckdb.connect(str(ROOT / "data" / "sentinela_analytics.duckdb"))
     try:
-        for command in spec["workflow_commands"]:
-            started = datetime.now()
-            result = subprocess.run(
-                command,
-                cwd=str(ROOT),
-                capture_output=True,
-                text=True,
-                check=False,
-                env=env,
-            )
-            steps.append(
-                {
-                    "command": command,
-                    "returncode": result.returncode,
-                    "stdout": result.stdout[-4000:],
-                    "stderr": result.stderr[-4000:],
-                    "duration_s": round((datetime.now() - started).total_seconds(), 2),
-                }
-            )
-            if result.returncode != 0:
-                con = duckdb.connect(str(ROOT / "data" / "sentinela_analytics.duckdb"))
-                try:
-                    ensure_ops_runtime(con)
-                    finish_pipeline_run(
-                        con,
-                        run_id,
-                        status="failed",
-                        details={"case_id": case_id, "steps": steps},
-                        error_text=f"Falha em {' '.join(command)} :: {result.stderr[-500:]}",
-                    )
-                finally:
-                    con.close()
-                raise RuntimeError(f"Falha em {' '.join(command)} :: {result.stderr[-500:]}")
-
-        con = duckdb.connect(str(ROOT / "data" / "sentinela_analytics.duckdb"))
-        try:
-            ensure_ops_runtime(con)
-            finish_pipeline_run(
-                con,
-                run_id,
-                status="success",
-                details={"case_id": case_id, "steps": steps},
-                rows_written=len(steps),
-            )
-        finally:
-            con.close()
-        return {"case_id": case_id, "steps": steps, "status": "success"}
-    except Exception:
+        stats = refresh_ops_case(con, case_id)
+    except Exception as exc:
+        con.close()
+        _finish_workflow_run(run_id, status="failed", details={"case_id": case_id, "steps": steps}, error_text=f"Falha em refresh_ops_case :: {exc}")
         raise
+    con.close()
+    steps.append(
+        {
+            "command": ["refresh_ops_case", case_id],
+            "returncode": 0,
+            "stdout": str(stats)[-4000:],
+            "stderr": "",
+            "duration_s": round((datetime.now() - started).total_seconds(), 2),
+        }
+    )
+    _finish_workflow_run(
+        run_id,
+        status="success",
+        details={"case_id": case_id, "steps": steps},
+        rows_written=len(steps),
+    )
+    return {"case_id": case_id, "steps": steps, "status": "success"}
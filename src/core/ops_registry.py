@@ -1,14 +1,23 @@
 from __future__ import annotations
 
-import hashlib
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
 import duckdb
 
+from src.core.ops_fingerprint import (
+    file_fingerprint_stats,
+    file_sha256,
+    fingerprint_stats_since,
+    load_file_fingerprints,
+    prime_file_fingerprints,
+    store_file_fingerprints,
+)
+from src.core.ops_scope import case_scope, case_scope_sql, delete_case_rows, in_case_scope
 from src.core.ops_timeline import ensure_ops_timeline
+from src.core.ops_version import mark_tables_written
 from src.core.ops_search import ensure_ops_search_index, sync_ops_search_index
 from src.core.legal_compliance import (
     validate_cnpj,
@@ -82,11 +91,7 @@ CREATE TABLE IF NOT EXISTS ops_case_artifact (
 
 
 def sha256_file(path: Path) -> str:
-    digest = hashlib.sha256()
-    with path.open("rb") as handle:
-        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
-            digest.update(chunk)
-    return digest.hexdigest()
+    return file_sha256(path)
 
 
 def resolve_path(relpath: str | None) -> Path | None:
@@ -585,18 +590,61 @@ def build_conflict_cases(con: duckdb.DuckDBPyConnection) -> tuple[list[dict[str,
         
     return cases, artifacts
 
-def sync_ops_case_registry(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
+# Prefixo de case_id gerado por cada builder: uma execucao recortada so roda
+# os builders que podem produzir algum dos casos pedidos.
+CASE_BUILDERS = [
+    ("cedimp:", build_cedimp_case),
+    ("rb:contrato:", build_rb_cases),
+    ("sesacre:sancao:", build_sesacre_cases),
+    ("conflict:", build_conflict_cases),
+    ("political:", build_political_risk_cases),
+]
+
+
+def _scoped_builders(case_ids: list[str] | None) -> list[Any]:
+    return [
+        builder
+        for prefix, builder in CASE_BUILDERS
+        if case_ids is None or any(case_id.startswith(prefix) for case_id in case_ids)
+    ]
+
+
+def _previous_artifact_paths(con: duckdb.DuckDBPyConnection, case_ids: list[str] | None = None) -> list[Path]:
+    scope_sql, scope_params = case_scope_sql(case_ids)
+    rows = con.execute(
+        f"""
+        SELECT path FROM ops_case_artifact WHERE exists AND path IS NOT NULL AND {scope_sql}
+        UNION
+        SELECT bundle_path FROM ops_case_registry WHERE bundle_path IS NOT NULL AND {scope_sql}
+        """,
+        [*scope_params, *scope_params],
+    ).fetchall()
+    return [path for (relpath,) in rows if (path := resolve_path(relpath))]
+
+
+def sync_ops_case_registry(con: duckdb.DuckDBPyConnection, case_ids: Iterable[str] | None = None) -> dict[str, Any]:
+    """Reconstroi registry, artefatos e toda a camada ops derivada.
+
+    Com case_ids, so rodam os builders das familias desses casos e apenas as
+    linhas deles sao reescritas em cada tabela; as validacoes globais
+    (rulebook, calibracao, sentinelas) ficam para a proxima execucao completa.
+    """
     ensure_ops_registry(con)
-    con.execute("DELETE FROM ops_case_artifact")
-    con.execute("DELETE FROM ops_case_registry")
+    case_ids = case_scope(case_ids)
+    fingerprint_before = file_fingerprint_stats()
+    load_file_fingerprints(con)
+    # Rehash em paralelo o que mudou desde a ultima execucao; os builders abaixo
+    # passam a encontrar os hashes ja no cache.
+    prime_file_fingerprints(_previous_artifact_paths(con, case_ids))
+    delete_case_rows(con, "ops_case_artifact", case_ids)
+    delete_case_rows(con, "ops_case_registry", case_ids)
 
-    builders = [build_cedimp_case, build_rb_cases, build_sesacre_cases, build_conflict_cases, build_political_risk_cases]
     all_cases: list[dict[str, Any]] = []
     all_artifacts: list[dict[str, Any]] = []
-    for builder in builders:
+    for builder in _scoped_builders(case_ids):
         cases, artifacts = builder(con)
-        all_cases.extend(cases)
-        all_artifacts.extend(artifacts)
+        all_cases.extend(case for case in cases if in_case_scope(case_ids, case["case_id"]))
+        all_artifacts.extend(artifact for artifact in artifacts if in_case_scope(case_ids, artifact["case_id"]))
 
     for case in all_cases:
         con.execute(
@@ -707,11 +755,11 @@ def sync_ops_case_registry(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
     ensure_ops_rulebook(con)
     ensure_ops_sentinel(con)
     ensure_ops_semantic(con)
-    burden_stats = sync_ops_burden(con)
-    semantic_stats = sync_ops_semantic_analysis(con)
-    contradiction_stats = sync_ops_contradiction(con)
-    checklist_stats = sync_ops_checklist(con)
-    generated_artifacts = build_generated_export_artifacts(con)
+    burden_stats = sync_ops_burden(con, case_ids)
+    semantic_stats = sync_ops_semantic_analysis(con, case_ids)
+    contradiction_stats = sync_ops_contradiction(con, case_ids)
+    checklist_stats = sync_ops_checklist(con, case_ids)
+    generated_artifacts = build_generated_export_artifacts(con, case_ids)
     for artifact in generated_artifacts:
         con.execute(
             """
@@ -731,8 +779,9 @@ def sync_ops_case_registry(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
                 artifact["metadata_json"],
             ],
         )
+    scope_sql, scope_params = case_scope_sql(case_ids, "r.case_id")
     con.execute(
-        """
+        f"""
         UPDATE ops_case_registry r
         SET artifact_count = a.total
         FROM (
@@ -740,20 +789,27 @@ def sync_ops_case_registry(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
             FROM ops_case_artifact
             GROUP BY case_id
         ) a
-        WHERE r.case_id = a.case_id
-        """
+        WHERE r.case_id = a.case_id AND {scope_sql}
+        """,
+        scope_params,
     )
     ensure_ops_timeline(con)
     ensure_ops_search_index(con)
-    search_stats = sync_ops_search_index(con)
-    guard_stats = sync_ops_language_guard(con)
-    export_stats = sync_ops_export_gate(con)
-    runbook_stats = sync_ops_runbook(con)
-    export_diff_stats = sync_ops_generated_export_diff(con)
-    rulebook_stats = sync_ops_rulebook(con)
-    calibration_stats = sync_ops_calibration(con)
-    sentinel_stats = sync_ops_sentinel(con)
-
+    search_stats = sync_ops_search_index(con, case_ids)
+    guard_stats = sync_ops_language_guard(con, case_ids)
+    export_stats = sync_ops_export_gate(con, case_ids)
+    runbook_stats = sync_ops_runbook(con, case_ids)
+    export_diff_stats = sync_ops_generated_export_diff(con, case_ids)
+    rulebook_stats: dict[str, Any] = {}
+    calibration_stats: dict[str, Any] = {}
+    sentinel_stats: dict[str, Any] = {}
+    if case_ids is None:
+        rulebook_stats = sync_ops_rulebook(con)
+        calibration_stats = sync_ops_calibration(con)
+        sentinel_stats = sync_ops_sentinel(con)
+    fingerprint_rows = store_file_fingerprints(con)
+
+    mark_tables_written(con, "ops_case_registry", "ops_case_artifact")
     return {
         "cases": len(all_cases),
         "artifacts": len(all_artifacts) + len(generated_artifacts),
@@ -779,4 +835,7 @@ def sync_ops_case_registry(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
         "sentinel_result_rows": int(sentinel_stats.get("result_rows", 0)),
         "sentinel_fail_rows": int(sentinel_stats.get("fail_rows", 0)),
         "sentinel_warn_rows": int(sentinel_stats.get("warn_rows", 0)),
+        "global_passes_skipped": case_ids is not None,
+        "fingerprint_rows_written": fingerprint_rows,
+        **fingerprint_stats_since(fingerprint_before),
     }
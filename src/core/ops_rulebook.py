@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import hashlib
 import json
 import re
 from pathlib import Path
@@ -8,6 +7,7 @@ from typing import Any
 
 import duckdb
 
+from src.core.ops_fingerprint import _hash_file
 from src.core.ops_guard import RISK_PATTERNS, _best_snippet, _has_safe_context
 from src.core.ops_legal import legal_anchor_payload
 
@@ -225,11 +225,9 @@ def _validation_row(
 
 
 def _sha256_file(path: Path) -> str:
-    digest = hashlib.sha256()
-    with path.open("rb") as handle:
-        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
-            digest.update(chunk)
-    return digest.hexdigest()
+    # Checagem de integridade: sempre le o arquivo. O cache por tamanho/mtime
+    # de ops_fingerprint so serve para detectar mudanca, nao adulteracao.
+    return _hash_file(path)
 
 
 def _iter_generated_exports(con: duckdb.DuckDBPyConnection) -> list[tuple[Any, ...]]:
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 import json
-from typing import Any
+from typing import Any, Iterable
 
 import duckdb
 import pandas as pd
 
+from src.core.ops_context import load_case_frames
 from src.core.ops_legal import legal_anchor_payload
+from src.core.ops_scope import case_scope, case_scope_sql, delete_case_rows
+from src.core.ops_version import mark_tables_written
 
 
 RUNBOOK_DDL = """
@@ -84,54 +87,6 @@ def _json_load_list(value: str | None) -> list[str]:
     return [str(raw)]
 
 
-def _artifacts_for_case(con: duckdb.DuckDBPyConnection, case_id: str) -> pd.DataFrame:
-    return con.execute(
-        """
-        SELECT label, kind, path, exists
-        FROM ops_case_artifact
-        WHERE case_id = ?
-        ORDER BY kind, label
-        """,
-        [case_id],
-    ).df()
-
-
-def _burden_for_case(con: duckdb.DuckDBPyConnection, case_id: str) -> pd.DataFrame:
-    return con.execute(
-        """
-        SELECT item_key, item_label, status, next_action, source_refs_json
-        FROM ops_case_burden_item
-        WHERE case_id = ?
-        ORDER BY status_order, item_key
-        """,
-        [case_id],
-    ).df()
-
-
-def _contradictions_for_case(con: duckdb.DuckDBPyConnection, case_id: str) -> pd.DataFrame:
-    return con.execute(
-        """
-        SELECT title, rationale, next_action
-        FROM ops_case_contradiction
-        WHERE case_id = ?
-        ORDER BY severity DESC, title
-        """,
-        [case_id],
-    ).df()
-
-
-def _gate_for_case(con: duckdb.DuckDBPyConnection, case_id: str) -> pd.DataFrame:
-    return con.execute(
-        """
-        SELECT export_mode, allowed, blocking_reason
-        FROM ops_case_export_gate
-        WHERE case_id = ?
-        ORDER BY export_mode
-        """,
-        [case_id],
-    ).df()
-
-
 def _allowed_mode(gate_df: pd.DataFrame) -> str:
     if gate_df.empty:
         return "NOTA_INTERNA"
@@ -327,26 +282,45 @@ def _runbook_steps(case: pd.Series, profile: dict[str, Any], mode: str, dossier_
     return steps
 
 
-def sync_ops_runbook(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
+def sync_ops_runbook(con: duckdb.DuckDBPyConnection, case_ids: Iterable[str] | None = None) -> dict[str, int]:
     ensure_ops_runbook(con)
-    con.execute("DELETE FROM ops_case_runbook_step")
-    con.execute("DELETE FROM ops_case_runbook")
+    case_ids = case_scope(case_ids)
+    delete_case_rows(con, "ops_case_runbook_step", case_ids)
+    delete_case_rows(con, "ops_case_runbook", case_ids)
+    scope_sql, scope_params = case_scope_sql(case_ids)
 
     tables = set(con.execute("SHOW TABLES").df()["name"].tolist())
     required = {"ops_case_registry", "ops_case_export_gate", "ops_case_burden_item", "ops_case_artifact"}
     if not required.issubset(tables):
+        mark_tables_written(con, "ops_case_runbook", "ops_case_runbook_step")
         return {"rows_written": 0, "steps_written": 0, "cases": 0}
 
-    cases_df = con.execute("SELECT * FROM ops_case_registry ORDER BY case_id").df()
+    cases_df = con.execute(f"SELECT * FROM ops_case_registry WHERE {scope_sql} ORDER BY case_id", scope_params).df()
+    artifacts = load_case_frames(
+        con, "ops_case_artifact", columns="case_id, label, kind, path, exists", order_by="case_id, kind, label", case_ids=case_ids
+    )
+    burden = load_case_frames(
+        con,
+        "ops_case_burden_item",
+        columns="case_id, item_key, item_label, status, next_action, source_refs_json",
+        order_by="case_id, status_order, item_key",
+        case_ids=case_ids,
+    )
+    contradictions = load_case_frames(
+        con, "ops_case_contradiction", columns="case_id, title, rationale, next_action", order_by="case_id, severity DESC, title", case_ids=case_ids
+    )
+    gates = load_case_frames(
+        con, "ops_case_export_gate", columns="case_id, export_mode, allowed, blocking_reason", order_by="case_id, export_mode", case_ids=case_ids
+    )
     rows_written = 0
     steps_written = 0
 
     for _, case in cases_df.iterrows():
         case_id = str(case["case_id"])
-        artifacts_df = _artifacts_for_case(con, case_id)
-        burden_df = _burden_for_case(con, case_id)
-        contradiction_df = _contradictions_for_case(con, case_id)
-        gate_df = _gate_for_case(con, case_id)
+        artifacts_df = artifacts.get(case_id)
+        burden_df = burden.get(case_id)
+        contradiction_df = contradictions.get(case_id)
+        gate_df = gates.get(case_id)
 
         mode = _allowed_mode(gate_df)
         profile = _family_profile(case, mode)
@@ -416,4 +390,5 @@ def sync_ops_runbook(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
             )
             steps_written += 1
 
+    mark_tables_written(con, "ops_case_runbook", "ops_case_runbook_step")
     return {"rows_written": rows_written, "steps_written": steps_written, "cases": rows_written}
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import hashlib
 import json
+import threading
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
@@ -13,6 +15,9 @@ import requests
 
 ROOT = Path(__file__).resolve().parents[2]
 SOURCE_CACHE_DIR = ROOT / "data" / "ops_source_cache"
+# Corpos enderecados por sha256: respostas iguais apontam para o mesmo arquivo.
+SOURCE_OBJECT_DIR = SOURCE_CACHE_DIR / "objects"
+DEFAULT_PROBE_WORKERS = 4
 
 PIPELINE_RUN_DDL = """
 CREATE TABLE IF NOT EXISTS ops_pipeline_run (
@@ -211,10 +216,38 @@ def sha256_bytes(payload: bytes) -> str:
     return hashlib.sha256(payload).hexdigest()
 
 
-def _safe_filename(cache_key: str, suffix: str) -> Path:
-    SOURCE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
-    clean = "".join(ch if ch.isalnum() or ch in {"-", "_"} else "_" for ch in cache_key)
-    return SOURCE_CACHE_DIR / f"{clean}{suffix}"
+def store_source_body(body_bytes: bytes, suffix: str) -> tuple[str, Path]:
+    sha256 = sha256_bytes(body_bytes)
+    target = SOURCE_OBJECT_DIR / sha256[:2] / f"{sha256}{suffix}"
+    if not target.exists():
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f"{target.name}.{uuid.uuid4().hex[:8]}.tmp")
+        tmp.write_bytes(body_bytes)
+        tmp.replace(target)
+    return sha256, target
+
+
+def latest_source_cache(con: duckdb.DuckDBPyConnection) -> dict[str, dict[str, Any]]:
+    ensure_ops_runtime(con)
+    cursor = con.execute(
+        """
+        SELECT cache_key, status_code, etag, last_modified, expires_at, response_sha256, body_path
+        FROM v_ops_source_cache_latest
+        """
+    )
+    names = [column[0] for column in cursor.description]
+    return {row[0]: dict(zip(names, row)) for row in cursor.fetchall()}
+
+
+def _conditional_headers(previous: dict[str, Any] | None) -> dict[str, str]:
+    headers: dict[str, str] = {}
+    if not previous or previous.get("status_code") is None or int(previous["status_code"]) >= 400:
+        return headers
+    if previous.get("etag"):
+        headers["If-None-Match"] = str(previous["etag"])
+    if previous.get("last_modified"):
+        headers["If-Modified-Since"] = str(previous["last_modified"])
+    return headers
 
 
 def upsert_source_cache(
@@ -271,40 +304,43 @@ def probe_source(
     *,
     timeout: int = 20,
     session: requests.Session | None = None,
+    previous: dict[str, Any] | None = None,
 ) -> dict[str, Any]:
+    """HEAD (com fallback para GET) condicional ao ultimo registro da fonte:
+    304 reaproveita etag, hash e corpo ja gravados."""
     s = session or requests.Session()
     url = source["resource_url"]
+    conditional = _conditional_headers(previous)
     method_used = "HEAD"
     body_path = None
     response_sha256 = None
-    body_bytes = b""
     error_text = None
     response = None
+    not_modified = False
 
     try:
-        response = s.head(url, allow_redirects=True, timeout=timeout)
+        response = s.head(url, allow_redirects=True, timeout=timeout, headers=conditional)
         if response.status_code >= 400 or response.status_code == 405:
             method_used = "GET"
-            response = s.get(url, allow_redirects=True, timeout=timeout)
+            response = s.get(url, allow_redirects=True, timeout=timeout, headers=conditional)
             content_type = response.headers.get("content-type", "").lower()
-            if "text" in content_type or "json" in content_type or "html" in content_type:
-                body_bytes = response.content
-                response_sha256 = sha256_bytes(body_bytes)
+            if response.status_code != 304 and ("text" in content_type or "json" in content_type or "html" in content_type):
                 suffix = ".json" if "json" in content_type else ".html" if "html" in content_type else ".txt"
-                target = _safe_filename(source["cache_key"], suffix)
-                target.write_bytes(body_bytes)
+                response_sha256, target = store_source_body(response.content, suffix)
                 body_path = str(target.relative_to(ROOT))
+        not_modified = response.status_code == 304
     except Exception as exc:
         error_text = str(exc)
 
     status_code = getattr(response, "status_code", None)
     headers = dict(getattr(response, "headers", {}) or {})
-    if response is not None and method_used == "HEAD":
-        etag = headers.get("ETag") or headers.get("etag")
-        last_modified = headers.get("Last-Modified") or headers.get("last-modified")
-    else:
-        etag = headers.get("ETag") or headers.get("etag")
-        last_modified = headers.get("Last-Modified") or headers.get("last-modified")
+    etag = headers.get("ETag") or headers.get("etag")
+    last_modified = headers.get("Last-Modified") or headers.get("last-modified")
+    if not_modified and previous:
+        etag = etag or previous.get("etag")
+        last_modified = last_modified or previous.get("last_modified")
+        response_sha256 = previous.get("response_sha256")
+        body_path = previous.get("body_path")
 
     return {
         "cache_key": source["cache_key"],
@@ -320,6 +356,7 @@ def probe_source(
         "headers": headers,
         "meta": {
             "ok": error_text is None and status_code is not None and status_code < 500,
+            "not_modified": not_modified,
             "error_text": error_text,
         },
     }
@@ -329,13 +366,39 @@ def refresh_source_cache(
     con: duckdb.DuckDBPyConnection,
     *,
     timeout: int = 20,
+    workers: int = DEFAULT_PROBE_WORKERS,
+    force: bool = False,
+    sources: list[dict[str, Any]] | None = None,
 ) -> dict[str, int]:
     ensure_ops_runtime(con)
-    session = requests.Session()
+    latest = latest_source_cache(con)
+    now = utcnow_naive()
+    pending = []
+    skipped = 0
+    for source in sources if sources is not None else tracked_sources():
+        expires_at = (latest.get(source["cache_key"]) or {}).get("expires_at")
+        if not force and expires_at is not None and expires_at > now:
+            skipped += 1
+            continue
+        pending.append(source)
+
+    # requests.Session nao e thread-safe: uma sessao por thread do pool.
+    local = threading.local()
+
+    def probe(source: dict[str, Any]) -> dict[str, Any]:
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        return probe_source(source, timeout=timeout, session=local.session, previous=latest.get(source["cache_key"]))
+
+    results: list[dict[str, Any]] = []
+    if pending:
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(pending)))) as pool:
+            results = list(pool.map(probe, pending))
+
     inserted = 0
     ok_count = 0
-    for source in tracked_sources():
-        result = probe_source(source, timeout=timeout, session=session)
+    not_modified = 0
+    for result in results:
         upsert_source_cache(
             con,
             cache_key=result["cache_key"],
@@ -354,4 +417,6 @@ def refresh_source_cache(
         inserted += 1
         if result["meta"].get("ok"):
             ok_count += 1
-    return {"sources": inserted, "ok": ok_count}
+        if result["meta"].get("not_modified"):
+            not_modified += 1
+    return {"sources": inserted, "ok": ok_count, "not_modified": not_modified, "skipped_fresh": skipped}
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+import duckdb
+
+
+# Recorte por caso dos sync_ops_*: case_ids=None reconstroi a tabela inteira;
+# uma lista reescreve apenas as linhas desses casos.
+
+
+def case_scope(case_ids: Iterable[str] | None) -> list[str] | None:
+    if case_ids is None:
+        return None
+    if isinstance(case_ids, str):
+        return [case_ids]
+    return sorted({str(case_id) for case_id in case_ids})
+
+
+def case_scope_sql(case_ids: list[str] | None, column: str = "case_id") -> tuple[str, list[Any]]:
+    if case_ids is None:
+        return "TRUE", []
+    return f"{column} IN (SELECT unnest(?::VARCHAR[]))", [case_ids]
+
+
+def in_case_scope(case_ids: list[str] | None, case_id: Any) -> bool:
+    return case_ids is None or str(case_id) in case_ids
+
+
+def delete_case_rows(
+    con: duckdb.DuckDBPyConnection,
+    table: str,
+    case_ids: list[str] | None,
+    column: str = "case_id",
+) -> None:
+    clause, params = case_scope_sql(case_ids, column)
+    con.execute(f"DELETE FROM {table} WHERE {clause}", params)
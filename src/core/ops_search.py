@@ -2,11 +2,14 @@ from __future__ import annotations
 
 import hashlib
 import json
-from io import StringIO
 from pathlib import Path
+from typing import Iterable
 
 import duckdb
-import pandas as pd
+
+from src.core.ops_document import load_document
+from src.core.ops_fingerprint import load_file_fingerprints, store_file_fingerprints
+from src.core.ops_scope import case_scope, case_scope_sql, delete_case_rows
 
 
 ROOT = Path(__file__).resolve().parents[2]
@@ -50,45 +53,9 @@ def _sha256_text(content: str) -> str:
     return hashlib.sha256(content.encode("utf-8", errors="ignore")).hexdigest()
 
 
-def _html_to_text(content: str) -> str:
-    try:
-        from bs4 import BeautifulSoup
-
-        return BeautifulSoup(content, "html.parser").get_text("\n", strip=True)
-    except Exception:
-        return content
-
-
-def _extract_text(path: Path) -> tuple[str | None, dict[str, str]]:
-    suffix = path.suffix.lower()
-    if suffix in {".md", ".txt"}:
-        return path.read_text(encoding="utf-8", errors="replace"), {"mode": "text"}
-
-    if suffix == ".json":
-        raw = path.read_text(encoding="utf-8", errors="replace")
-        try:
-            return json.dumps(json.loads(raw), ensure_ascii=False, indent=2, sort_keys=True), {"mode": "json"}
-        except json.JSONDecodeError:
-            return raw, {"mode": "json_raw"}
-
-    if suffix == ".csv":
-        raw = path.read_text(encoding="utf-8", errors="replace")
-        try:
-            df = pd.read_csv(StringIO(raw))
-            return df.to_csv(index=False), {"mode": "csv", "rows": str(len(df)), "cols": str(len(df.columns))}
-        except Exception:
-            return raw, {"mode": "csv_raw"}
-
-    if suffix in {".html", ".htm"}:
-        return _html_to_text(path.read_text(encoding="utf-8", errors="replace")), {"mode": "html_text"}
-
-    if suffix == ".pdf":
-        txt_fallback = path.with_suffix(".txt")
-        if txt_fallback.exists():
-            return txt_fallback.read_text(encoding="utf-8", errors="replace"), {"mode": "pdf_txt_fallback"}
-        return None, {"mode": "pdf_without_text"}
-
-    return None, {"mode": "unsupported"}
+def _extract_text(path: Path, con: duckdb.DuckDBPyConnection | None = None) -> tuple[str | None, dict[str, str]]:
+    document = load_document(path, con)
+    return document["text"], document["metadata"]
 
 
 def ensure_ops_search_index(con: duckdb.DuckDBPyConnection) -> None:
@@ -97,20 +64,24 @@ def ensure_ops_search_index(con: duckdb.DuckDBPyConnection) -> None:
     con.execute(TEXT_INDEX_VIEW)
 
 
-def sync_ops_search_index(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
+def sync_ops_search_index(con: duckdb.DuckDBPyConnection, case_ids: Iterable[str] | None = None) -> dict[str, int]:
     ensure_ops_search_index(con)
-    con.execute("DELETE FROM ops_artifact_text_index")
+    case_ids = case_scope(case_ids)
+    delete_case_rows(con, "ops_artifact_text_index", case_ids)
+    scope_sql, scope_params = case_scope_sql(case_ids)
+    load_file_fingerprints(con)
 
     candidates: list[dict[str, str]] = []
 
     tables = set(con.execute("SHOW TABLES").df()["name"].tolist())
     if "ops_case_artifact" in tables:
         for row in con.execute(
-            """
+            f"""
             SELECT artifact_id, case_id, label, kind, path
             FROM ops_case_artifact
-            WHERE exists AND path IS NOT NULL
-            """
+            WHERE exists AND path IS NOT NULL AND {scope_sql}
+            """,
+            scope_params,
         ).fetchall():
             candidates.append(
                 {
@@ -127,11 +98,12 @@ def sync_ops_search_index(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
 
     if "ops_case_inbox_document" in tables:
         for row in con.execute(
-            """
+            f"""
             SELECT inbox_doc_id, case_id, documento_chave, categoria_documental, file_path
             FROM ops_case_inbox_document
-            WHERE file_exists AND file_path IS NOT NULL
-            """
+            WHERE file_exists AND file_path IS NOT NULL AND {scope_sql}
+            """,
+            scope_params,
         ).fetchall():
             candidates.append(
                 {
@@ -151,7 +123,7 @@ def sync_ops_search_index(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
         path = _resolve_relpath(item["path"])
         if not path or not path.exists():
             continue
-        content_text, meta = _extract_text(path)
+        content_text, meta = _extract_text(path, con)
         if not content_text:
             continue
         con.execute(
@@ -180,4 +152,5 @@ def sync_ops_search_index(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
         )
         indexed += 1
 
+    store_file_fingerprints(con)
     return {"indexed_docs": indexed, "candidates": len(candidates)}
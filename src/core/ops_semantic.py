@@ -4,10 +4,14 @@ import json
 import re
 import unicodedata
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
 import duckdb
-from bs4 import BeautifulSoup
+
+from src.core.ops_document import HTML_SUFFIXES, load_document
+from src.core.ops_fingerprint import load_file_fingerprints, store_file_fingerprints
+from src.core.ops_scope import case_scope, case_scope_sql, delete_case_rows
+from src.core.ops_version import mark_tables_written
 
 
 ROOT = Path(__file__).resolve().parents[2]
@@ -52,19 +56,19 @@ def _resolve_path(path_value: str | None) -> Path | None:
     return path if path.is_absolute() else ROOT / path
 
 
-def _read_text(path_value: str | None) -> str:
+def _load_document(con: duckdb.DuckDBPyConnection, path_value: str | None) -> dict[str, Any] | None:
+    path = _resolve_path(path_value)
+    if not path or not path.exists():
+        return None
+    return load_document(path, con)
+
+
+def _read_text(con: duckdb.DuckDBPyConnection, path_value: str | None) -> str:
     path = _resolve_path(path_value)
     if not path or not path.exists():
         return ""
-    suffix = path.suffix.lower()
-    if suffix in {".html", ".htm"}:
-        raw = path.read_text(encoding="utf-8", errors="replace")
-        return BeautifulSoup(raw, "html.parser").get_text("\n", strip=True)
-    if suffix == ".pdf":
-        txt = path.with_suffix(".txt")
-        if txt.exists():
-            return txt.read_text(encoding="utf-8", errors="replace")
-        return ""
+    if path.suffix.lower() in HTML_SUFFIXES | {".pdf"}:
+        return load_document(path, con)["text"] or ""
     return path.read_text(encoding="utf-8", errors="replace")
 
 
@@ -101,58 +105,31 @@ def _texts_compatible(left: str | None, right: str | None) -> bool:
     return min_size > 0 and (len(intersection) / min_size) >= 0.8
 
 
-def _extract_label_table(soup: BeautifulSoup) -> dict[str, str]:
-    payload: dict[str, str] = {}
-    for row in soup.select("table tr"):
-        cells = row.find_all("td")
-        if len(cells) != 2:
-            continue
-        left = cells[0].get_text(" ", strip=True).replace(":", "").strip()
-        right = cells[1].get_text(" ", strip=True).strip()
-        if left and right:
-            payload[left] = right
-    return payload
-
-
-def _extract_contract_html(path_value: str | None) -> dict[str, Any]:
-    path = _resolve_path(path_value)
-    if not path or not path.exists():
+def _extract_contract_html(con: duckdb.DuckDBPyConnection, path_value: str | None) -> dict[str, Any]:
+    document = _load_document(con, path_value)
+    if document is None:
         return {}
-    soup = BeautifulSoup(path.read_text(encoding="utf-8", errors="replace"), "html.parser")
-    labels = _extract_label_table(soup)
-    items: list[str] = []
-    for row in soup.select("div#tabItens table tr"):
-        cells = row.find_all("td")
-        if not cells:
-            continue
-        item_name = cells[0].get_text(" ", strip=True)
-        if item_name:
-            items.append(item_name)
+    labels = document["labels"]
+    items = [cells[0] for cells in document["sections"].get("tabItens", []) if cells and cells[0]]
     return {
         "numero_contrato": labels.get("Número do Contrato"),
         "numero_processo": labels.get("Número do Processo"),
         "objeto": labels.get("Objeto"),
         "valor": labels.get("Valor"),
         "itens": items,
-        "text": soup.get_text("\n", strip=True),
+        "text": document["text"] or "",
     }
 
 
-def _extract_licitacao_html(path_value: str | None) -> dict[str, Any]:
-    path = _resolve_path(path_value)
-    if not path or not path.exists():
+def _extract_licitacao_html(con: duckdb.DuckDBPyConnection, path_value: str | None) -> dict[str, Any]:
+    document = _load_document(con, path_value)
+    if document is None:
         return {}
-    raw = path.read_text(encoding="utf-8", errors="replace")
-    soup = BeautifulSoup(raw, "html.parser")
-    labels = _extract_label_table(soup)
-    text = soup.get_text("\n", strip=True)
-    proposal_suppliers: list[str] = []
-    for row in soup.select("div#tabPropostasELances table tr"):
-        cells = row.find_all("td")
-        if len(cells) >= 3:
-            supplier = cells[2].get_text(" ", strip=True)
-            if supplier:
-                proposal_suppliers.append(supplier)
+    labels = document["labels"]
+    text = document["text"] or ""
+    proposal_suppliers = [
+        cells[2] for cells in document["sections"].get("tabPropostasELances", []) if len(cells) >= 3 and cells[2]
+    ]
     return {
         "processo_compra": labels.get("Processo de Compra"),
         "pregao_numero": re.search(r"PREG[AÃ]O ELETR[ÔO]NICO SRP N[ºO]\s*([0-9/.-]+)", text, re.I).group(1)
@@ -165,8 +142,8 @@ def _extract_licitacao_html(path_value: str | None) -> dict[str, Any]:
     }
 
 
-def _extract_publication(path_value: str | None) -> dict[str, Any]:
-    text = _read_text(path_value)
+def _extract_publication(con: duckdb.DuckDBPyConnection, path_value: str | None) -> dict[str, Any]:
+    text = _read_text(con, path_value)
     return {
         "pregao_numero": re.search(r"PREG[AÃ]O ELETR[ÔO]NICO SRP N[ºO]\s*([0-9/.-]+)", text, re.I).group(1)
         if re.search(r"PREG[AÃ]O ELETR[ÔO]NICO SRP N[ºO]\s*([0-9/.-]+)", text, re.I)
@@ -177,8 +154,8 @@ def _extract_publication(path_value: str | None) -> dict[str, Any]:
     }
 
 
-def _extract_dossie_findings(path_value: str | None) -> dict[str, Any]:
-    text = _read_text(path_value)
+def _extract_dossie_findings(con: duckdb.DuckDBPyConnection, path_value: str | None) -> dict[str, Any]:
+    text = _read_text(con, path_value)
     findings: dict[str, Any] = {"text": text}
     match = re.search(
         r"Item `1`: (?P<item>.+?) \| qtd .*? \| propostas `(?P<propostas>True|False)` \| edital `(?P<edital>True|False)`",
@@ -242,15 +219,15 @@ def _artifact_map(con: duckdb.DuckDBPyConnection, case_id: str) -> dict[str, str
     return {str(label): str(path) for label, path in rows}
 
 
-def _build_rb_semantic(case_id: str, artifacts: dict[str, str]) -> list[dict[str, Any]]:
+def _build_rb_semantic(con: duckdb.DuckDBPyConnection, case_id: str, artifacts: dict[str, str]) -> list[dict[str, Any]]:
     if "contrato_detail" not in artifacts or "licitacao_detail" not in artifacts:
         return []
 
-    contract = _extract_contract_html(artifacts.get("contrato_detail"))
-    licitacao = _extract_licitacao_html(artifacts.get("licitacao_detail"))
-    edital = _extract_publication(artifacts.get("cpl_publicacao_1554_pdf") or artifacts.get("cpl_publicacao_1554_html"))
-    retificacao = _extract_publication(artifacts.get("cpl_publicacao_1640_pdf") or artifacts.get("cpl_publicacao_1640_html"))
-    dossie = _extract_dossie_findings(artifacts.get("dossie_rb_sus"))
+    contract = _extract_contract_html(con, artifacts.get("contrato_detail"))
+    licitacao = _extract_licitacao_html(con, artifacts.get("licitacao_detail"))
+    edital = _extract_publication(con, artifacts.get("cpl_publicacao_1554_pdf") or artifacts.get("cpl_publicacao_1554_html"))
+    retificacao = _extract_publication(con, artifacts.get("cpl_publicacao_1640_pdf") or artifacts.get("cpl_publicacao_1640_html"))
+    dossie = _extract_dossie_findings(con, artifacts.get("dossie_rb_sus"))
 
     if not contract or not licitacao:
         return []
@@ -346,26 +323,32 @@ def _build_rb_semantic(case_id: str, artifacts: dict[str, str]) -> list[dict[str
     return issues
 
 
-def sync_ops_semantic_analysis(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
+def sync_ops_semantic_analysis(con: duckdb.DuckDBPyConnection, case_ids: Iterable[str] | None = None) -> dict[str, int]:
     ensure_ops_semantic(con)
-    con.execute("DELETE FROM ops_case_semantic_issue")
+    case_ids = case_scope(case_ids)
+    delete_case_rows(con, "ops_case_semantic_issue", case_ids)
+    scope_sql, scope_params = case_scope_sql(case_ids)
 
     try:
         case_rows = con.execute(
-            """
+            f"""
             SELECT case_id, family
             FROM ops_case_registry
-            WHERE family = 'rb_sus_contrato'
+            WHERE family = 'rb_sus_contrato' AND {scope_sql}
             ORDER BY case_id
-            """
+            """,
+            scope_params,
         ).fetchall()
     except duckdb.Error:
+        mark_tables_written(con, "ops_case_semantic_issue")
         return {"rows_written": 0, "cases": 0}
 
+    load_file_fingerprints(con)
     issues: list[dict[str, Any]] = []
     for case_id, _family in case_rows:
         artifacts = _artifact_map(con, case_id)
-        issues.extend(_build_rb_semantic(case_id, artifacts))
+        issues.extend(_build_rb_semantic(con, case_id, artifacts))
+    store_file_fingerprints(con)
 
     for row in issues:
         con.execute(
@@ -394,4 +377,5 @@ def sync_ops_semantic_analysis(con: duckdb.DuckDBPyConnection) -> dict[str, int]
             ],
         )
 
+    mark_tables_written(con, "ops_case_semantic_issue")
     return {"rows_written": len(issues), "cases": len(case_rows)}
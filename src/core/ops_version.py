@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime
+from typing import Any
+
+import duckdb
+
+
+# Cada grupo logico de tabelas tem duas partes de versao. A primeira vem das
+# execucoes finalizadas em ops_pipeline_run cujo nome comeca com um dos
+# prefixos abaixo (contagem monotonica + ultimo fim). A segunda vem de
+# ops_table_write, o contador de escritas que os scripts de sync incrementam
+# com mark_tables_written na mesma transacao em que gravam as tabelas do grupo.
+DATA_VERSION_GROUPS: dict[str, tuple[str, ...]] = {
+    "ops": (
+        "sync_ops_",
+        "freeze_ops_case_export",
+        "ops_case_workflow",
+    ),
+    "insight": (
+        "sync_insight_classification",
+        "sync_v2",
+        "sync_estado_ac",
+        "sync_rb_despesas",
+        "sync_rb_lotacao",
+    ),
+    "ingest": (
+        "ingest_",
+        "sync_estado_ac",
+        "sync_rb_",
+        "sync_ceis_cnep",
+        "sync_sancoes_",
+        "sync_sesacre_",
+    ),
+}
+# Tabelas de cada grupo: nome terminado em "_" e prefixo, o resto e nome exato.
+# Tabelas derivadas pelos jobs de startup (insight_search_text,
+# insight_classification_state, entity_timeline) ficam de fora de proposito.
+DATA_VERSION_TABLES: dict[str, tuple[str, ...]] = {
+    "ops": ("ops_case_",),
+    "insight": ("insight", "insight_link", "event", "evidence", "evidence_link"),
+    "ingest": (
+        "estado_ac_",
+        "rb_",
+        "federal_",
+        "trace_",
+        "vinculo_",
+        "alerts",
+        "diarias",
+        "edge",
+        "empresa_socios",
+        "empresas_cnpj",
+        "entity",
+        "flags_nepotismo",
+        "obras",
+        "pagamentos",
+        "sancao_intervalo",
+        "sancoes_collapsed",
+    ),
+}
+ALL_GROUPS = "all"
+
+TABLE_WRITE_DDL = """
+CREATE TABLE IF NOT EXISTS ops_table_write (
+    table_name VARCHAR PRIMARY KEY,
+    writes BIGINT NOT NULL,
+    written_at TIMESTAMP NOT NULL
+)
+"""
+
+
+def ensure_table_write(con: duckdb.DuckDBPyConnection) -> None:
+    con.execute(TABLE_WRITE_DDL)
+
+
+def mark_tables_written(con: duckdb.DuckDBPyConnection, *tables: str) -> None:
+    """Incrementa o contador de escrita das tabelas. Chamar na mesma conexao
+    (e transacao, quando houver) da escrita."""
+    if not tables:
+        return
+    ensure_table_write(con)
+    con.execute(
+        """
+        INSERT INTO ops_table_write (table_name, writes, written_at)
+        SELECT DISTINCT unnest(?::VARCHAR[]), 1, CAST(now() AS TIMESTAMP)
+        ON CONFLICT (table_name) DO UPDATE SET
+            writes = ops_table_write.writes + 1,
+            written_at = excluded.written_at
+        """,
+        [list(tables)],
+    )
+
+
+def _group_filter(prefixes: tuple[str, ...]) -> str:
+    clauses = " OR ".join("starts_with(pipeline, ?)" for _ in prefixes)
+    return f"finished_at IS NOT NULL AND ({clauses})"
+
+
+def _data_version_sql() -> tuple[str, list[Any]]:
+    columns = [
+        "COUNT(*) FILTER (WHERE finished_at IS NOT NULL)",
+        "MAX(finished_at)",
+    ]
+    params: list[Any] = []
+    for prefixes in DATA_VERSION_GROUPS.values():
+        condition = _group_filter(prefixes)
+        columns.append(f"COUNT(*) FILTER (WHERE {condition})")
+        columns.append(f"MAX(finished_at) FILTER (WHERE {condition})")
+        params.extend(prefixes)
+        params.extend(prefixes)
+    return f"SELECT {', '.join(columns)} FROM ops_pipeline_run", params
+
+
+def _empty_versions() -> dict[str, dict[str, Any]]:
+    return {
+        group: {"version": 0, "watermark": None}
+        for group in [ALL_GROUPS, *DATA_VERSION_GROUPS]
+    }
+
+
+def _table_matches(table: str, entries: tuple[str, ...]) -> bool:
+    return any(table.startswith(entry) if entry.endswith("_") else table == entry for entry in entries)
+
+
+def table_write_versions(con: duckdb.DuckDBPyConnection) -> dict[str, dict[str, Any]]:
+    """Escritas somadas e ultima escrita das tabelas de cada grupo (e de "all")."""
+    try:
+        rows = con.execute("SELECT table_name, writes, written_at FROM ops_table_write").fetchall()
+    except duckdb.CatalogException:
+        rows = []
+    versions = {group: {"writes": 0, "written_at": None} for group in [ALL_GROUPS, *DATA_VERSION_TABLES]}
+    for table, writes, written_at in rows:
+        groups = [group for group, entries in DATA_VERSION_TABLES.items() if _table_matches(table, entries)]
+        if not groups:
+            continue
+        for group in [ALL_GROUPS, *groups]:
+            entry = versions[group]
+            entry["writes"] += int(writes or 0)
+            if written_at is not None and (entry["written_at"] is None or written_at > entry["written_at"]):
+                entry["written_at"] = written_at
+    return versions
+
+
+def fetch_data_versions(con: duckdb.DuckDBPyConnection) -> dict[str, dict[str, Any]]:
+    """Versao de todos os grupos. So leitura e sem varrer as tabelas de dados:
+    apenas ops_pipeline_run e ops_table_write."""
+    sql, params = _data_version_sql()
+    try:
+        row = con.execute(sql, params).fetchone()
+    except duckdb.CatalogException:
+        versions = _empty_versions()
+    else:
+        versions = {}
+        for index, group in enumerate([ALL_GROUPS, *DATA_VERSION_GROUPS]):
+            count, watermark = row[index * 2], row[index * 2 + 1]
+            versions[group] = {"version": int(count or 0), "watermark": watermark}
+    for group, writes in table_write_versions(con).items():
+        versions[group].update(writes)
+    return versions
+
+
+def _stamp(value: Any) -> int:
+    return int(value.timestamp() * 1000) if isinstance(value, datetime) else 0
+
+
+def data_version_token(versions: dict[str, dict[str, Any]], group: str = ALL_GROUPS) -> str:
+    entry = versions.get(group) or {"version": 0, "watermark": None}
+    return (
+        f"{group}:{entry.get('version', 0)}:{_stamp(entry.get('watermark'))}"
+        f":{entry.get('writes', 0)}:{_stamp(entry.get('written_at'))}"
+    )
+
+
+def data_version_etag(versions: dict[str, dict[str, Any]], *parts: Any) -> str:
+    payload = "|".join([*(data_version_token(versions, group) for group in sorted(versions)), *map(str, parts)])
+    return f'W/"{hashlib.sha256(payload.encode("utf-8")).hexdigest()[:20]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {item.strip() for item in if_none_match.split(",")}
+    if "*" in candidates:
+        return True
+    bare = etag.removeprefix("W/")
+    return any(candidate.removeprefix("W/") == bare for candidate in candidates)
+
+
+def input_version_token(con: duckdb.DuckDBPyConnection, groups: tuple[str, ...]) -> str:
+    """Versao das entradas de um pipeline derivada so das escritas nas tabelas
+    dos grupos (sem as execucoes registradas, que o proprio pipeline altera)."""
+    versions = table_write_versions(con)
+    return "|".join(
+        f"{group}:{versions[group]['writes']}:{_stamp(versions[group]['written_at'])}"
+        for group in sorted(groups)
+        if group in versions
+    )
+
+
+def pipeline_is_current(
+    con: duckdb.DuckDBPyConnection,
+    pipeline: str,
+    groups: tuple[str, ...],
+) -> bool:
+    """True quando as tabelas dos grupos de entrada estao como no ultimo
+    sucesso do pipeline (input_version gravado em details_json). So leitura."""
+    try:
+        row = con.execute(
+            """
+            SELECT json_extract_string(details_json, '$.input_version')
+            FROM ops_pipeline_run
+            WHERE pipeline = ? AND status = 'success'
+            ORDER BY finished_at DESC
+            LIMIT 1
+            """,
+            [pipeline],
+        ).fetchone()
+    except duckdb.CatalogException:
+        return False
+    if row is None or row[0] is None:
+        return False
+    return row[0] == input_version_token(con, groups)
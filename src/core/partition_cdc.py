@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Mapping, Sequence
+
+import duckdb
+
+from src.core.ops_version import mark_tables_written
+
+
+# Carga por particao (ex.: um ano) com captura de mudancas: as linhas recebidas
+# vao para uma tabela temporaria, sao comparadas pela chave natural e pelo
+# conteudo com a particao gravada, e so o que mudou e escrito. Linhas da
+# particao que nao vieram mais sao apagadas. Transacao fica a cargo de quem chama.
+
+
+@dataclass(frozen=True)
+class PartitionChanges:
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.inserted or self.updated or self.deleted)
+
+    @property
+    def rows(self) -> int:
+        """Linhas da particao depois da carga."""
+        return self.inserted + self.updated + self.unchanged
+
+    def __add__(self, other: PartitionChanges) -> PartitionChanges:
+        return PartitionChanges(
+            self.inserted + other.inserted,
+            self.updated + other.updated,
+            self.deleted + other.deleted,
+            self.unchanged + other.unchanged,
+        )
+
+    def describe(self) -> str:
+        return f"+{self.inserted} ~{self.updated} -{self.deleted} ={self.unchanged}"
+
+
+def _count(cursor: duckdb.DuckDBPyConnection) -> int:
+    row = cursor.fetchone()
+    return int(row[0]) if row else 0
+
+
+def apply_partition_cdc(
+    con: duckdb.DuckDBPyConnection,
+    table: str,
+    columns: Sequence[str],
+    rows: Sequence[tuple[Any, ...]] | None = None,
+    *,
+    select_sql: str | None = None,
+    select_params: Mapping[str, Any] | Sequence[Any] | None = None,
+    partition_sql: str,
+    partition_params: Sequence[Any] = (),
+    key: str = "row_id",
+    compare_exclude: Sequence[str] = (),
+    touch_column: str | None = None,
+) -> PartitionChanges:
+    """
+    Sincroniza a particao `partition_sql` de `table` com `rows` (tuplas na ordem
+    de `columns`) ou com o resultado de `select_sql`. Chaves repetidas ficam com
+    a ultima tupla recebida, como em dedupe_payload; no SELECT, sem ordem de
+    origem, com a primeira pela lista de colunas. Chaves ja gravadas fora da
+    particao levantam ValueError antes de qualquer escrita. Colunas em
+    `compare_exclude` nao contam como mudanca e preservam o valor gravado;
+    `touch_column` recebe CURRENT_TIMESTAMP nas linhas atualizadas.
+    """
+    if (rows is None) == (select_sql is None):
+        raise ValueError("informe rows ou select_sql")
+    if key not in columns:
+        raise ValueError(f"chave {key} ausente das colunas de {table}")
+    params = list(partition_params)
+    if rows is not None and not rows:
+        deleted = _count(con.execute(f"DELETE FROM {table} WHERE {partition_sql}", params))
+        if deleted:
+            mark_tables_written(con, table)
+        return PartitionChanges(deleted=deleted)
+
+    stage = f"_cdc_stage_{table}"
+    column_list = ", ".join(columns)
+    compared = [column for column in columns if column != key and column not in compare_exclude]
+    con.execute(f"CREATE OR REPLACE TEMP TABLE {stage} AS SELECT {column_list}, 0::BIGINT AS _cdc_ord FROM {table} LIMIT 0")
+    try:
+        if select_sql is not None:
+            con.execute(
+                f"INSERT INTO {stage} SELECT {column_list}, 0 FROM ({select_sql})",
+                select_params or [],
+            )
+        else:
+            con.executemany(
+                f"INSERT INTO {stage} VALUES ({', '.join('?' for _ in columns)}, ?)",
+                [(*row, ordinal) for ordinal, row in enumerate(rows)],
+            )
+        con.execute(
+            f"""
+            DELETE FROM {stage} WHERE rowid NOT IN (
+                SELECT rowid FROM {stage}
+                QUALIFY ROW_NUMBER() OVER (PARTITION BY {key} ORDER BY _cdc_ord DESC, {column_list}) = 1
+            )
+            """
+        )
+        staged = _count(con.execute(f"SELECT COUNT(*) FROM {stage}"))
+        outside = _count(
+            con.execute(
+                f"""
+                SELECT COUNT(*) FROM {stage}
+                WHERE {key} IN (SELECT {key} FROM {table} WHERE ({partition_sql}) IS NOT TRUE)
+                """,
+                params,
+            )
+        )
+        if outside:
+            raise ValueError(f"{outside} chave(s) de {table} ja gravada(s) fora da particao")
+
+        # Daqui em diante tudo fica restrito as chaves da propria particao.
+        in_partition = f"SELECT {key} FROM {table} WHERE {partition_sql}"
+        deleted = _count(
+            con.execute(
+                f"DELETE FROM {table} WHERE {partition_sql} AND {key} NOT IN (SELECT {key} FROM {stage})",
+                params,
+            )
+        )
+        updated = 0
+        if compared:
+            assignments = [f"{column} = s.{column}" for column in compared]
+            if touch_column:
+                assignments.append(f"{touch_column} = CURRENT_TIMESTAMP")
+            differs = " OR ".join(f"{table}.{column} IS DISTINCT FROM s.{column}" for column in compared)
+            updated = _count(
+                con.execute(
+                    f"""
+                    UPDATE {table} SET {', '.join(assignments)}
+                    FROM {stage} AS s
+                    WHERE {table}.{key} = s.{key}
+                      AND {table}.{key} IN ({in_partition})
+                      AND ({differs})
+                    """,
+                    params,
+                )
+            )
+        inserted = _count(
+            con.execute(
+                f"""
+                INSERT INTO {table} ({column_list})
+                SELECT {column_list} FROM {stage}
+                WHERE {key} NOT IN ({in_partition})
+                """,
+                params,
+            )
+        )
+    finally:
+        con.execute(f"DROP TABLE IF EXISTS {stage}")
+    changes = PartitionChanges(inserted, updated, deleted, staged - inserted - updated)
+    if changes.changed:
+        mark_tables_written(con, table)
+    return changes
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import math
+import unicodedata
+from typing import Any
+
+import duckdb
+import pandas as pd
+
+from src.core.ops_version import mark_tables_written
+
+
+SEARCH_DOC_TABLE = "rb_servidor_search_doc"
+SEARCH_GRAM_TABLE = "rb_servidor_search_gram"
+
+# Similaridade minima (fracao dos trigramas da consulta presentes no documento)
+# para aceitar um candidato. 0.5 tolera um erro de digitacao em nomes curtos.
+MIN_SIMILARITY = 0.5
+
+TEXT_KEY_SQL = "upper(trim(regexp_replace(strip_accents(COALESCE({expr}, '')), '\\s+', ' ', 'g')))"
+
+SEARCH_DOC_INDEX = f"""
+CREATE INDEX IF NOT EXISTS idx_{SEARCH_DOC_TABLE}_matricula ON {SEARCH_DOC_TABLE}(matricula)
+"""
+
+SEARCH_GRAM_INDEX = f"""
+CREATE INDEX IF NOT EXISTS idx_{SEARCH_GRAM_TABLE}_gram ON {SEARCH_GRAM_TABLE}(gram)
+"""
+
+RESULT_COLUMNS = """
+    d.nome,
+    d.cargo,
+    d.ch AS matricula,
+    d.vencimento_base,
+    d.outras_verbas,
+    d.salario_liquido,
+    COALESCE(d.vencimento_base, 0) + COALESCE(d.outras_verbas, 0) AS total_bruto
+"""
+
+
+def normalize_search_text(text: Any) -> str:
+    if text is None:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", str(text))
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(stripped.upper().split())
+
+
+def search_trigrams(text: str) -> set[str]:
+    grams: set[str] = set()
+    for token in normalize_search_text(text).split():
+        padded = f"  {token} "
+        grams.update(padded[index:index + 3] for index in range(len(padded) - 2))
+    return grams
+
+
+def _table_columns(con: duckdb.DuckDBPyConnection, table: str) -> set[str]:
+    rows = con.execute(
+        "SELECT column_name FROM information_schema.columns WHERE table_name = ?",
+        [table],
+    ).fetchall()
+    return {row[0] for row in rows}
+
+
+def _column_or_null(columns: set[str], name: str, sql_type: str) -> str:
+    return name if name in columns else f"NULL::{sql_type}"
+
+
+def refresh_people_search_index(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
+    columns = _table_columns(con, "rb_servidores_mass")
+    if "servidor" not in columns:
+        return {"rows_written": 0, "grams": 0}
+
+    cargo = _column_or_null(columns, "cargo", "VARCHAR")
+    con.execute(
+        f"""
+        CREATE OR REPLACE TABLE {SEARCH_DOC_TABLE} AS
+        WITH base AS (
+            SELECT
+                TRIM(split_part(servidor, '-', 1)) AS matricula,
+                TRIM(split_part(servidor, '-', 2)) AS nome,
+                COALESCE(NULLIF(TRIM({cargo}), ''), 'N/D') AS cargo,
+                {_column_or_null(columns, "ch", "VARCHAR")} AS ch,
+                {_column_or_null(columns, "vencimento_base", "DOUBLE")} AS vencimento_base,
+                {_column_or_null(columns, "outras_verbas", "DOUBLE")} AS outras_verbas,
+                {_column_or_null(columns, "salario_liquido", "DOUBLE")} AS salario_liquido
+            FROM rb_servidores_mass
+            WHERE servidor IS NOT NULL AND servidor <> ''
+        )
+        SELECT
+            CAST(row_number() OVER (ORDER BY salario_liquido DESC NULLS LAST, matricula) AS INTEGER) AS doc_id,
+            *,
+            {TEXT_KEY_SQL.format(expr="nome")} AS nome_key,
+            {TEXT_KEY_SQL.format(expr="cargo")} AS cargo_key
+        FROM base
+        """
+    )
+    # Trigramas por palavra com o mesmo preenchimento de search_trigrams.
+    con.execute(
+        f"""
+        CREATE OR REPLACE TABLE {SEARCH_GRAM_TABLE} AS
+        WITH tokens AS (
+            SELECT DISTINCT doc_id, '  ' || token || ' ' AS padded
+            FROM (
+                SELECT doc_id, unnest(string_split(nome_key || ' ' || matricula || ' ' || cargo_key, ' ')) AS token
+                FROM {SEARCH_DOC_TABLE}
+            )
+            WHERE token <> ''
+        )
+        SELECT DISTINCT substr(padded, pos, 3) AS gram, doc_id
+        FROM (
+            SELECT doc_id, padded, unnest(range(1, length(padded) - 1)) AS pos
+            FROM tokens
+        )
+        ORDER BY gram, doc_id
+        """
+    )
+    con.execute(SEARCH_DOC_INDEX)
+    con.execute(SEARCH_GRAM_INDEX)
+    docs = con.execute(f"SELECT COUNT(*) FROM {SEARCH_DOC_TABLE}").fetchone()[0]
+    grams = con.execute(f"SELECT COUNT(*) FROM {SEARCH_GRAM_TABLE}").fetchone()[0]
+    mark_tables_written(con, SEARCH_DOC_TABLE, SEARCH_GRAM_TABLE)
+    return {"rows_written": int(docs or 0), "grams": int(grams or 0)}
+
+
+def people_search_ready(con: duckdb.DuckDBPyConnection) -> bool:
+    return {"doc_id", "nome_key"} <= _table_columns(con, SEARCH_DOC_TABLE)
+
+
+def search_servidores(
+    con: duckdb.DuckDBPyConnection,
+    query: str,
+    *,
+    limit: int = 100,
+    min_similarity: float = MIN_SIMILARITY,
+    columns: str = RESULT_COLUMNS,
+) -> pd.DataFrame:
+    normalized = normalize_search_text(query)
+    if not normalized:
+        return con.execute(
+            f"SELECT {columns} FROM {SEARCH_DOC_TABLE} d ORDER BY d.doc_id LIMIT ?",
+            [limit],
+        ).df()
+
+    grams = sorted(search_trigrams(normalized))
+    placeholders = ", ".join("?" for _ in grams)
+    # Prefixo exato pesa mais que similaridade; salario desempata.
+    sql = f"""
+        WITH hits AS (
+            SELECT doc_id, COUNT(*) AS matched
+            FROM {SEARCH_GRAM_TABLE}
+            WHERE gram IN ({placeholders})
+            GROUP BY doc_id
+            HAVING COUNT(*) >= ?
+        )
+        SELECT {columns}
+        FROM hits h
+        JOIN {SEARCH_DOC_TABLE} d ON d.doc_id = h.doc_id
+        ORDER BY
+            (d.matricula = ? OR starts_with(d.nome_key, ?)) DESC,
+            h.matched DESC,
+            d.salario_liquido DESC NULLS LAST,
+            d.doc_id
+        LIMIT ?
+    """
+    threshold = max(1, math.ceil(len(grams) * min_similarity))
+    params: list[Any] = [*grams, threshold, normalized, normalized, limit]
+    return con.execute(sql, params).df()
+
+
+def autocomplete_servidores(
+    con: duckdb.DuckDBPyConnection,
+    prefix: str,
+    *,
+    limit: int = 10,
+) -> list[dict[str, Any]]:
+    df = search_servidores(con, prefix, limit=limit, columns="d.nome, d.matricula, d.cargo")
+    return df.to_dict("records")
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Any
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+from src.core.legal_compliance import CNAE_GROUPS
+
+
+# Versao em lote de legal_compliance.calculate_risk_score: as mesmas regras
+# aplicadas a colunas de um DataFrame (uma linha por entidade). O resultado
+# fica em risk_score junto com o hash das entradas; numa nova rodada so as
+# entidades com entradas diferentes sao pontuadas de novo.
+
+RISK_SCORE_TABLE = "risk_score"
+
+# Mesmos defaults de metrics.get(...) na funcao escalar.
+RISK_FEATURES: dict[str, Any] = {
+    "days_old": 999,
+    "front_company_risk": False,
+    "financial_ratio": 0.0,
+    "cnae_compatible": True,
+    "document_valid": True,
+}
+
+DDL_RISK_SCORE = f"""
+CREATE TABLE IF NOT EXISTS {RISK_SCORE_TABLE} (
+    entity_id VARCHAR PRIMARY KEY,
+    score INTEGER,
+    risk_label VARCHAR,
+    flags VARCHAR[],
+    days_old INTEGER,
+    front_company_risk BOOLEAN,
+    financial_ratio DOUBLE,
+    cnae_compatible BOOLEAN,
+    document_valid BOOLEAN,
+    inputs_hash VARCHAR,
+    scored_at TIMESTAMP
+)
+"""
+
+_CNPJ_WEIGHTS_1 = np.array([5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2])
+_CNPJ_WEIGHTS_2 = np.array([6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2])
+
+
+def normalize_features(frame: pd.DataFrame) -> pd.DataFrame:
+    """Completa colunas ausentes e nulos com os defaults da funcao escalar."""
+    out = pd.DataFrame(index=frame.index)
+    for col, default in RISK_FEATURES.items():
+        values = frame[col] if col in frame.columns else pd.Series(default, index=frame.index)
+        values = values.astype(object).where(values.notna(), default)
+        out[col] = values.astype(type(default))
+    return out
+
+
+def score_risk_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Pontua todas as linhas de uma vez. Devolve score, risk_label e flags
+    (lista na mesma ordem da funcao escalar), com o indice de `frame`.
+    """
+    features = normalize_features(frame)
+    days_old = features["days_old"].to_numpy()
+    front = features["front_company_risk"].to_numpy(dtype=bool)
+    ratio = features["financial_ratio"].to_numpy(dtype=float)
+
+    recem_criada = days_old < 30
+    recente = ~recem_criada & (days_old < 180)
+    capital_baixo = ~front & (ratio > 5)
+    cnae_incompativel = ~features["cnae_compatible"].to_numpy(dtype=bool)
+    documento_invalido = ~features["document_valid"].to_numpy(dtype=bool)
+
+    score = (
+        np.where(recem_criada, 40, np.where(recente, 20, 0))
+        + np.where(front, 40, np.where(capital_baixo, 20, 0))
+        + np.where(cnae_incompativel, 40, 0)
+    )
+    score = np.minimum(100, np.where(documento_invalido, 100, score))
+    risk_label = np.select([score >= 80, score >= 50, score >= 25], ["CRÍTICO", "ALTO", "MÉDIO"], "BAIXO")
+
+    # Cada linha cai numa combinacao dos quatro grupos de regras; as listas de
+    # flags saem de uma tabela por combinacao (linhas iguais dividem a lista).
+    senioridade = np.where(recem_criada, 1, np.where(recente, 2, 0))
+    capital = np.where(front, 1, np.where(capital_baixo, 2, 0))
+    combo = senioridade * 12 + capital * 4 + cnae_incompativel * 2 + documento_invalido
+    lookup = np.empty(36, dtype=object)
+    for code in range(36):
+        groups = (
+            ("", "EMPRESA_RECEM_CRIADA_CRITICO", "EMPRESA_RECENTE")[code // 12],
+            ("", "INCAPACIDADE_FINANCEIRA_PROVAVEL", "CAPITAL_SOCIAL_BAIXO_X_CONTRATO")[code // 4 % 3],
+            ("", "CNAE_INCOMPATIVEL")[code // 2 % 2],
+            ("", "DOCUMENTO_INVALIDO_OU_FRAUDULENTO")[code % 2],
+        )
+        lookup[code] = [flag for flag in groups if flag]
+    flags = lookup[combo]
+    return pd.DataFrame({"score": score.astype(int), "risk_label": risk_label, "flags": flags}, index=frame.index)
+
+
+def cnpj_valid(docs: pd.Series) -> pd.Series:
+    """validate_cnpj vetorizado (digitos verificadores do CNPJ)."""
+    digits = docs.fillna("").astype(str).str.replace(r"[^0-9]", "", regex=True)
+    valid = (digits.str.len() == 14) & (digits.str[0:1].str.repeat(14) != digits)
+    result = pd.Series(False, index=docs.index)
+    if not valid.any():
+        return result
+    matrix = np.array([[int(char) for char in doc] for doc in digits[valid]])
+
+    def check_digit(numbers: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        remainder = (numbers * weights).sum(axis=1) % 11
+        return np.where(remainder < 2, 0, 11 - remainder)
+
+    d1 = check_digit(matrix[:, :12], _CNPJ_WEIGHTS_1)
+    d2 = check_digit(np.column_stack([matrix[:, :12], d1]), _CNPJ_WEIGHTS_2)
+    result[valid] = (matrix[:, 12] == d1) & (matrix[:, 13] == d2)
+    return result
+
+
+def company_features(frame: pd.DataFrame, reference_date: date) -> pd.DataFrame:
+    """
+    Metricas da funcao escalar a partir de cnpj, valor, capital_social,
+    data_abertura, cnae_principal e target_sector (setor de CNAE_GROUPS ou
+    nulo), como validate_financial_capacity, validate_company_seniority e
+    validate_cnae_compatibility fariam linha a linha.
+    """
+    valor = pd.to_numeric(frame["valor"], errors="coerce").fillna(0.0).to_numpy(dtype=float)
+    capital = pd.to_numeric(frame["capital_social"], errors="coerce").fillna(0.0).to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(capital > 0, valor / np.where(capital > 0, capital, 1.0), np.inf)
+
+    abertura = pd.to_datetime(frame["data_abertura"].astype(str).str[:10], format="%Y-%m-%d", errors="coerce")
+    days_old = (pd.Timestamp(reference_date) - abertura).dt.days
+
+    cnae = frame["cnae_principal"].fillna("").astype(str).str.replace(r"[^0-9]", "", regex=True)
+    sector = frame["target_sector"].where(frame["target_sector"].isin(list(CNAE_GROUPS)))
+    compatible = pd.Series(True, index=frame.index)
+    for name, group in CNAE_GROUPS.items():
+        mask = sector == name
+        if mask.any():
+            compatible[mask] = cnae[mask].str.startswith(tuple(group["prefixes"]))
+
+    return pd.DataFrame(
+        {
+            "days_old": days_old,
+            "front_company_risk": ratio > 10.0,
+            "financial_ratio": ratio,
+            "cnae_compatible": compatible,
+            "document_valid": cnpj_valid(frame["cnpj"]),
+        },
+        index=frame.index,
+    )
+
+
+def _inputs_hash_sql(alias: str) -> str:
+    parts = ", ".join(f"CAST({alias}.{col} AS VARCHAR)" for col in RISK_FEATURES)
+    return f"sha1(concat_ws('|', {parts}))"
+
+
+def ensure_risk_score(con: duckdb.DuckDBPyConnection) -> None:
+    con.execute(DDL_RISK_SCORE)
+
+
+def refresh_risk_scores(
+    con: duckdb.DuckDBPyConnection,
+    entity_ids: pd.Series,
+    features: pd.DataFrame,
+    *,
+    full: bool = False,
+) -> dict[str, int]:
+    """
+    Grava em risk_score as entidades cujo hash de entradas mudou (todas, com
+    `full`). Devolve quantas foram pontuadas e quantas ficaram como estavam.
+    """
+    ensure_risk_score(con)
+    batch = normalize_features(features)
+    batch.insert(0, "entity_id", entity_ids.astype(str).to_numpy())
+    batch = batch.drop_duplicates("entity_id", keep="last")
+    batch["financial_ratio"] = batch["financial_ratio"].astype(float)
+    con.register("risk_features_batch", batch)
+    try:
+        changed = con.execute(
+            f"""
+            SELECT b.*, {_inputs_hash_sql('b')} AS inputs_hash
+            FROM risk_features_batch b
+            LEFT JOIN {RISK_SCORE_TABLE} r ON r.entity_id = b.entity_id
+            WHERE ? OR r.inputs_hash IS DISTINCT FROM {_inputs_hash_sql('b')}
+            """,
+            [full],
+        ).fetchdf()
+    finally:
+        con.unregister("risk_features_batch")
+
+    if not changed.empty:
+        scored = pd.concat([changed, score_risk_frame(changed)], axis=1)
+        columns = ["entity_id", "score", "risk_label", "flags", *RISK_FEATURES, "inputs_hash"]
+        con.register("risk_scored_batch", scored[columns])
+        try:
+            con.execute(
+                f"""
+                INSERT INTO {RISK_SCORE_TABLE} ({", ".join(columns)}, scored_at)
+                SELECT {", ".join(columns)}, CURRENT_TIMESTAMP FROM risk_scored_batch
+                ON CONFLICT (entity_id) DO UPDATE SET
+                    {", ".join(f"{col} = excluded.{col}" for col in columns[1:])},
+                    scored_at = excluded.scored_at
+                """
+            )
+        finally:
+            con.unregister("risk_scored_batch")
+    return {"scored": len(changed), "unchanged": len(batch) - len(changed)}
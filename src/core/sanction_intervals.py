@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Sequence
+
+import duckdb
+
+from src.core.ops_version import mark_tables_written
+
+
+# Sancoes CEIS/CNEP como intervalos semiabertos [sancao_inicio, sancao_fim)
+# por CNPJ/CPF canonico. A data final publicada e inclusiva, entao o fim do
+# intervalo e o dia seguinte; sem data final o intervalo fica aberto. Eventos
+# (contratos, pagamentos, anos de pagamento) tambem sao intervalos
+# [evento_inicio, evento_fim) e o cruzamento e um unico join por chave com as
+# condicoes de faixa: sai o par com a sobreposicao em dias e a situacao
+# temporal, sem filtragem de datas em Python.
+# sancao_intervalo segue o snapshot mais recente de cada fonte: sancao que sai
+# do snapshot nao e apagada, vira intervalo fechado na data do snapshot com
+# removed_at preenchido (e reabre se voltar). A identidade da sancao e
+# fonte+cnpj+inicio+tipo+orgao: retificacao de fim, multa ou fundamentacao
+# atualiza o mesmo intervalo em vez de abrir outro.
+
+SANCAO_INTERVALO_TABLE = "sancao_intervalo"
+SANCAO_KEY_COLUMNS = ("fonte", "cnpj", "sancao_inicio", "tipo_sancao", "orgao_sancionador")
+# Colunas regravadas quando a mesma sancao volta com outros valores.
+_SANCAO_VALUE_COLUMNS = (
+    "nome_sancionado",
+    "fundamentacao_legal",
+    "multa",
+    "data_inicio_sancao",
+    "data_fim_sancao",
+    "sancao_fim",
+    "fim_aberto",
+)
+INICIO_INDEFINIDO = date(1, 1, 1)
+FIM_ABERTO = date(9999, 12, 31)
+
+DURANTE_SANCAO = "DURANTE_SANCAO"
+# Evento anterior ao inicio da sancao: o falso positivo temporal classico.
+ANTERIOR_A_SANCAO = "ANTERIOR_A_SANCAO"
+POSTERIOR_A_SANCAO = "POSTERIOR_A_SANCAO"
+SEM_DATA_EVENTO = "SEM_DATA_EVENTO"
+
+DDL_SANCAO_INTERVALO = f"""
+CREATE TABLE IF NOT EXISTS {SANCAO_INTERVALO_TABLE} (
+    sancao_id VARCHAR PRIMARY KEY,
+    cnpj VARCHAR,
+    fonte VARCHAR,
+    nome_sancionado VARCHAR,
+    tipo_sancao VARCHAR,
+    orgao_sancionador VARCHAR,
+    fundamentacao_legal VARCHAR,
+    multa DOUBLE,
+    data_inicio_sancao VARCHAR,
+    data_fim_sancao VARCHAR,
+    sancao_inicio DATE,
+    sancao_fim DATE,
+    fim_aberto BOOLEAN,
+    removed_at TIMESTAMP,
+    updated_at TIMESTAMP
+)
+"""
+
+_DIGITS_SQL = "regexp_replace(coalesce(CAST({expr} AS VARCHAR), ''), '[^0-9]', '', 'g')"
+# CNPJ que perdeu zeros a esquerda (planilhas) volta a ter 14 digitos.
+CNPJ_KEY_SQL = (
+    f"CASE WHEN length({_DIGITS_SQL}) BETWEEN 12 AND 13 THEN lpad({_DIGITS_SQL}, 14, '0') "
+    f"ELSE {_DIGITS_SQL} END"
+)
+# Mesmos formatos de sync_ceis_cnep.parse_date; hora e sufixo ISO sao ignorados.
+SANCTION_DATE_SQL = """coalesce(
+    try_strptime(left(trim(CAST({expr} AS VARCHAR)), 10), '%d/%m/%Y'),
+    try_strptime(left(trim(CAST({expr} AS VARCHAR)), 10), '%Y-%m-%d'),
+    try_strptime(left(trim(CAST({expr} AS VARCHAR)), 8), '%Y%m%d'),
+    try_strptime(left(trim(CAST({expr} AS VARCHAR)), 10), '%d-%m-%Y')
+)::DATE"""
+
+_FEDERAL_SOURCE_SQL = """
+SELECT
+    '{fonte}' AS fonte,
+    cnpj,
+    nome AS nome_sancionado,
+    tipo_sancao,
+    orgao_sancionador,
+    fundamentacao_legal,
+    {multa} AS multa,
+    data_inicio_sancao,
+    data_fim_sancao
+FROM {table}
+{snapshot}
+"""
+
+
+def _tables(con: duckdb.DuckDBPyConnection) -> set[str]:
+    return {row[0] for row in con.execute("SHOW TABLES").fetchall()}
+
+
+_FEDERAL_TABLES = {"CEIS": ("federal_ceis", "NULL::DOUBLE"), "CNEP": ("federal_cnep", "TRY_CAST(multa AS DOUBLE)")}
+
+
+def _has_competencia(con: duckdb.DuckDBPyConnection, table: str) -> bool:
+    row = con.execute(
+        "SELECT COUNT(*) FROM information_schema.columns WHERE table_name = ? AND column_name = 'competencia'",
+        [table],
+    ).fetchone()
+    return bool(row and row[0])
+
+
+def federal_snapshots(con: duckdb.DuckDBPyConnection) -> dict[str, date]:
+    """Data do snapshot mais recente (competencia YYYYMMDD) de cada fonte federal carregada."""
+    tables = _tables(con)
+    snapshots: dict[str, date] = {}
+    for fonte, (table, _) in _FEDERAL_TABLES.items():
+        if table not in tables:
+            continue
+        competencia = "max(competencia)" if _has_competencia(con, table) else "NULL"
+        snapshots[fonte] = con.execute(
+            f"SELECT coalesce(try_strptime({competencia}, '%Y%m%d')::DATE, CURRENT_DATE) FROM {table}"
+        ).fetchone()[0]
+    return snapshots
+
+
+def federal_sanctions_sql(con: duckdb.DuckDBPyConnection) -> str | None:
+    """
+    Uniao de federal_ceis e federal_cnep (as que existirem) no formato de fonte
+    de sancao, so com as linhas do snapshot mais recente de cada tabela.
+    """
+    tables = _tables(con)
+    parts = []
+    for fonte, (table, multa) in _FEDERAL_TABLES.items():
+        if table not in tables:
+            continue
+        snapshot = (
+            f"WHERE competencia IS NOT DISTINCT FROM (SELECT max(competencia) FROM {table})"
+            if _has_competencia(con, table)
+            else ""
+        )
+        parts.append(_FEDERAL_SOURCE_SQL.format(fonte=fonte, table=table, multa=multa, snapshot=snapshot))
+    return "UNION ALL".join(parts) or None
+
+
+def sancao_key_sql(columns: Sequence[str]) -> str:
+    parts = ", ".join(f"upper(trim(coalesce(CAST({column} AS VARCHAR), '')))" for column in columns)
+    return f"sha1(concat_ws('|', {parts}))"
+
+
+def sancao_intervals_sql(source_sql: str, key_columns: Sequence[str] | None = None) -> str:
+    """
+    Normaliza uma fonte de sancoes em intervalos. `source_sql` precisa trazer
+    fonte, cnpj, data_inicio_sancao e data_fim_sancao; as demais colunas passam
+    adiante. Sem `key_columns`, linhas identicas na fonte viram um unico
+    intervalo; com elas (colunas da saida), o id vem so dessas colunas e, entre
+    linhas com o mesmo id, fica a de fim mais tardio.
+    """
+    inicio = SANCTION_DATE_SQL.format(expr="src.data_inicio_sancao")
+    fim = SANCTION_DATE_SQL.format(expr="src.data_fim_sancao")
+    sancao_id = sancao_key_sql(key_columns) if key_columns else "sha1(_linha)"
+    return f"""
+    SELECT * EXCLUDE (_linha)
+    FROM (
+        SELECT {sancao_id} AS sancao_id, *
+        FROM (
+            SELECT
+                {CNPJ_KEY_SQL.format(expr='src.cnpj')} AS cnpj,
+                src.* EXCLUDE (cnpj),
+                coalesce({inicio}, DATE '{INICIO_INDEFINIDO}') AS sancao_inicio,
+                CASE
+                    WHEN {fim} IS NULL THEN DATE '{FIM_ABERTO}'
+                    ELSE greatest({fim} + 1, coalesce({inicio}, DATE '{INICIO_INDEFINIDO}') + 1)
+                END AS sancao_fim,
+                {fim} IS NULL AS fim_aberto,
+                CAST(src AS VARCHAR) AS _linha
+            FROM ({source_sql}) AS src
+        )
+    )
+    QUALIFY ROW_NUMBER() OVER (PARTITION BY sancao_id ORDER BY sancao_fim DESC, _linha) = 1
+    """
+
+
+def interval_match_sql(events_sql: str, sanctions_sql: str, *, only_overlaps: bool = False) -> str:
+    """
+    Cruza eventos com intervalos de sancao numa passada. `events_sql` traz cnpj,
+    evento_inicio e evento_fim (exclusivo; NULL vale um dia), `sanctions_sql`
+    e a saida de sancao_intervals_sql ou a tabela sancao_intervalo. Devolve as
+    colunas do evento, as da sancao (menos cnpj), dias_sobreposicao e
+    situacao_temporal. Com `only_overlaps`, so os pares concomitantes.
+    """
+    overlap = "AND e.evento_inicio < s.sancao_fim AND e.evento_fim > s.sancao_inicio" if only_overlaps else ""
+    return f"""
+    WITH eventos AS (
+        SELECT * REPLACE (
+            {CNPJ_KEY_SQL.format(expr='cnpj')} AS cnpj,
+            coalesce(evento_fim, evento_inicio + 1) AS evento_fim
+        )
+        FROM ({events_sql})
+    ),
+    sancoes AS (
+        {sanctions_sql}
+    )
+    SELECT
+        e.*,
+        s.* EXCLUDE (cnpj),
+        greatest(0, date_diff('day', greatest(e.evento_inicio, s.sancao_inicio), least(e.evento_fim, s.sancao_fim))) AS dias_sobreposicao,
+        CASE
+            WHEN e.evento_inicio IS NULL THEN '{SEM_DATA_EVENTO}'
+            WHEN e.evento_fim <= s.sancao_inicio THEN '{ANTERIOR_A_SANCAO}'
+            WHEN e.evento_inicio >= s.sancao_fim THEN '{POSTERIOR_A_SANCAO}'
+            ELSE '{DURANTE_SANCAO}'
+        END AS situacao_temporal
+    FROM eventos e
+    JOIN sancoes s
+      ON e.cnpj = s.cnpj
+     {overlap}
+    WHERE e.cnpj <> ''
+    """
+
+
+def ensure_sancao_intervalo(con: duckdb.DuckDBPyConnection) -> None:
+    con.execute(DDL_SANCAO_INTERVALO)
+    con.execute(f"ALTER TABLE {SANCAO_INTERVALO_TABLE} ADD COLUMN IF NOT EXISTS removed_at TIMESTAMP")
+    con.execute(f"CREATE INDEX IF NOT EXISTS idx_{SANCAO_INTERVALO_TABLE}_cnpj ON {SANCAO_INTERVALO_TABLE}(cnpj)")
+
+
+def _rekey_sancao_intervalo(con: duckdb.DuckDBPyConnection) -> None:
+    # Linhas gravadas com o id antigo (hash da linha inteira) passam para a
+    # identidade estavel; das duplicatas que isso revela fica a aberta mais
+    # recente.
+    key = sancao_key_sql(SANCAO_KEY_COLUMNS)
+    con.execute(
+        f"""
+        DELETE FROM {SANCAO_INTERVALO_TABLE}
+        WHERE sancao_id IN (
+            SELECT sancao_id
+            FROM {SANCAO_INTERVALO_TABLE}
+            QUALIFY ROW_NUMBER() OVER (
+                PARTITION BY {key} ORDER BY removed_at IS NOT NULL, updated_at DESC, sancao_id
+            ) > 1
+        )
+        """
+    )
+    con.execute(f"UPDATE {SANCAO_INTERVALO_TABLE} SET sancao_id = {key} WHERE sancao_id <> {key}")
+
+
+def sync_sancao_intervalo(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
+    """
+    Aplica o snapshot mais recente de federal_ceis/federal_cnep: grava as
+    sancoes novas, atualiza as retificadas, reabre as que voltaram e fecha as
+    que sairam. Devolve o total no snapshot, os gravados/atualizados/reabertos
+    e os fechados.
+    """
+    ensure_sancao_intervalo(con)
+    _rekey_sancao_intervalo(con)
+    source = federal_sanctions_sql(con)
+    if source is None:
+        return {"rows": 0, "upserted": 0, "removed": 0}
+    snapshots = federal_snapshots(con)
+    stage = "_sancao_intervalo_snapshot"
+    con.execute(
+        f"""
+        CREATE OR REPLACE TEMP TABLE {stage} AS
+        SELECT * FROM ({sancao_intervals_sql(source, SANCAO_KEY_COLUMNS)}) WHERE cnpj <> ''
+        """
+    )
+    try:
+        rows = con.execute(f"SELECT COUNT(*) FROM {stage}").fetchone()[0]
+        # Conflito e a mesma sancao: so e regravada se estava fechada por
+        # remocao ou se algum valor mudou.
+        assignments = ",\n                ".join(f"{column} = excluded.{column}" for column in _SANCAO_VALUE_COLUMNS)
+        changed = "\n               OR ".join(
+            f"{SANCAO_INTERVALO_TABLE}.{column} IS DISTINCT FROM excluded.{column}" for column in _SANCAO_VALUE_COLUMNS
+        )
+        upserted = con.execute(
+            f"""
+            INSERT INTO {SANCAO_INTERVALO_TABLE} BY NAME
+            SELECT *, NULL::TIMESTAMP AS removed_at, CURRENT_TIMESTAMP AS updated_at FROM {stage}
+            ON CONFLICT (sancao_id) DO UPDATE SET
+                {assignments},
+                removed_at = NULL,
+                updated_at = excluded.updated_at
+            WHERE {SANCAO_INTERVALO_TABLE}.removed_at IS NOT NULL
+               OR {changed}
+            """
+        ).fetchone()[0]
+        removed = con.execute(
+            f"""
+            UPDATE {SANCAO_INTERVALO_TABLE} AS t SET
+                sancao_fim = greatest(t.sancao_inicio + 1, least(t.sancao_fim, snap.snapshot_data)),
+                fim_aberto = FALSE,
+                removed_at = CURRENT_TIMESTAMP,
+                updated_at = CURRENT_TIMESTAMP
+            FROM (SELECT unnest(?::VARCHAR[]) AS fonte, unnest(?::DATE[]) AS snapshot_data) AS snap
+            WHERE t.fonte = snap.fonte
+              AND t.removed_at IS NULL
+              AND t.sancao_id NOT IN (SELECT sancao_id FROM {stage})
+            """,
+            [list(snapshots), list(snapshots.values())],
+        ).fetchone()[0]
+    finally:
+        con.execute(f"DROP TABLE IF EXISTS {stage}")
+    if upserted or removed:
+        mark_tables_written(con, SANCAO_INTERVALO_TABLE)
+    return {"rows": int(rows or 0), "upserted": int(upserted or 0), "removed": int(removed or 0)}
@@ -20,6 +20,8 @@ import pandas as pd
 from rich.console import Console
 from rich.progress import track
 
+from src.core.ops_version import mark_tables_written
+
 console = Console()
 log = logging.getLogger("sentinela.cnpj")
 
@@ -258,6 +260,7 @@ def run_enrichment(min_value: float = 0):
                     f"[red]⚑ {cnpj}[/red] — {data.get('razao_social', '')}: {'; '.join(flags)}"
                 )
 
+            mark_tables_written(conn, "empresas_cnpj", "empresa_socios")
             time.sleep(0.4)  # respeitar rate limit BrasilAPI
 
     conn.close()
@@ -321,6 +324,7 @@ def run_nepotismo_check():
                 CREATE TABLE IF NOT EXISTS flags_nepotismo AS SELECT * FROM result WHERE 1=0
             """)
             conn.execute("INSERT INTO flags_nepotismo SELECT * FROM result")
+            mark_tables_written(conn, "flags_nepotismo")
             console.print(f"[green]Salvo em flags_nepotismo ({len(result)} registros)[/green]")
         else:
             console.print("[dim]Nenhum match de sobrenome encontrado[/dim]")
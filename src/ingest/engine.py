@@ -33,6 +33,8 @@ from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskPr
 from rich.table import Table
 from rich import print as rprint
 
+from src.core.ops_version import mark_tables_written
+
 from .sources_registry import SOURCES, SOURCE_BY_ID, SOURCES_BY_PRIORITY, CollectMethod, DataSource
 
 console = Console()
@@ -132,6 +134,7 @@ def upsert_df(conn: duckdb.DuckDBPyConnection, df: pd.DataFrame, table: str) ->
 
     if not new_rows.empty:
         conn.execute(f"INSERT INTO {table} SELECT * FROM new_rows")
+        mark_tables_written(conn, table)
 
     return len(new_rows)
 
@@ -5,6 +5,8 @@ import os
 import glob
 from pathlib import Path
 
+from src.core.ops_version import mark_tables_written
+
 DB_PATH = "./data/sentinela_analytics.duckdb"
 DATA_DIR = "./data/federal"
 
@@ -24,6 +26,7 @@ def load_dataset(con, zip_path, table_name):
                     df = df.rename(columns={'cpf_ou_cnpj_do_sancionado': 'cnpj', 'nome_ou_razão_social_do_sancionado': 'nome'})
                 
                 con.execute(f"CREATE OR REPLACE TABLE {table_name} AS SELECT * FROM df")
+                mark_tables_written(con, table_name)
                 print(f"✓ {table_name}: {len(df)} registros carregados.")
     except Exception as e:
         print(f"Erro ao carregar {zip_path}: {e}")
@@ -5,6 +5,8 @@ import glob
 import os
 from pathlib import Path
 
+from src.core.ops_version import mark_tables_written
+
 DB_PATH = "./data/sentinela_analytics.duckdb"
 DATA_DIR = "./data/federal"
 
@@ -38,6 +40,7 @@ def load_local_dataset(con, zip_path, table_name):
                 
                 # Seleciona apenas as colunas necessárias ou todas
                 con.execute(f"CREATE OR REPLACE TABLE {table_name} AS SELECT * FROM df")
+                mark_tables_written(con, table_name)
                 print(f"✓ {table_name}: {len(df)} registros carregados.")
                 return True
     except Exception as e:
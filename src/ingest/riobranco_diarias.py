@@ -1,24 +1,97 @@
+import argparse
+import hashlib
+import json
+import re
 import requests
 from bs4 import BeautifulSoup
 import pandas as pd
 import io
 import logging
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 from jsf_client import JSFClient
-from src.core.analytics_db import AnalyticsDB
+from src.core.analytics_db import DIARIA_COLUMNS, AnalyticsDB
+from src.core.entity_timeline import refresh_entity_timeline
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 log = logging.getLogger("Sentinela.Diarias")
 
+DEFAULT_YEAR_ID = "2873896"
+# Resultado de fetch_and_save por exercicio.
+FETCH_CHANGED = "changed"
+FETCH_UNCHANGED = "unchanged"
+FETCH_FAILED = "failed"
+SECRETARIA_PADRAO = "Prefeitura de Rio Branco"  # CSV não traz unidade gestora explícita às vezes
+
+# Artefatos comuns de ISO-8859-1 mal interpretado; aplicados em ordem (um
+# substituto pode criar o par que o seguinte corrige).
+COLUMN_REPLACEMENTS = (
+    (' ', '_'), ('í', 'i'), ('ã', 'a'), ('ú', 'u'), ('é', 'e'), ('ó', 'o'), ('á', 'a'), ('ç', 'c'),
+    ('a£', 'a'), ('a\xad', 'i'), ('a¡', 'a'), ('aº', 'u'), ('a©', 'e'), ('a³', 'o'), ('ãº', 'u'),
+    ('ã\xad', 'i'), ('ã¡', 'a'), ('ã©', 'e'), ('ã³', 'o'), ('ã±', 'n'),
+)
+_NON_IDENTIFIER = re.compile(r'[^a-z0-9_]')
+
+
+def clean_column_name(name) -> str:
+    c = str(name).strip().lower()
+    for old, new in COLUMN_REPLACEMENTS:
+        c = c.replace(old, new)
+    return _NON_IDENTIFIER.sub('', c)
+
+
+def normalize_diarias_export(content: bytes) -> pd.DataFrame:
+    """CSV exportado pelo portal -> colunas limpas, valor_limpo e datas de saida/retorno."""
+    df = pd.read_csv(io.BytesIO(content), encoding="iso-8859-1")
+    df.columns = [clean_column_name(c) for c in df.columns]
+    # Originais limpas: ['numero', 'data', 'tipo', 'pessoa', 'itinerario', 'motivo', 'meio_de_transporte', 'valor', 'saida', 'retorno', 'empenho']
+    if 'valor' in df.columns:
+        df['valor_limpo'] = df['valor'].astype(str).str.replace('.', '', regex=False).str.replace(',', '.', regex=False).str.extract(r'([\d\.]+)')[0].astype(float)
+    else:
+        df['valor_limpo'] = 0.0
+    # Datas (Formato 26/02/2026)
+    for col in ['saida', 'retorno']:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], format='%d/%m/%Y', errors='coerce')
+    return df
+
+
+def _text_column(df: pd.DataFrame, col: str, default: str) -> pd.Series:
+    # str() elemento a elemento, como no laco original (NaN vira "nan").
+    if col not in df.columns:
+        return pd.Series(default, index=df.index, dtype=object)
+    return df[col].map(str)
+
+
+def diarias_rows(df: pd.DataFrame, capturado_em: datetime | None = None) -> pd.DataFrame:
+    """Linhas da tabela diarias, com o mesmo id (md5 de servidor + saida + valor) da carga linha a linha."""
+    missing = pd.Series(None, index=df.index, dtype=object)
+    saida = df['saida'] if 'saida' in df.columns else missing
+    retorno = df['retorno'] if 'retorno' in df.columns else missing
+    servidor = _text_column(df, 'pessoa', 'Desconhecido')
+    keys = servidor + saida.map(str) + df['valor_limpo'].map(str)
+    return pd.DataFrame({
+        "id": [hashlib.md5(key.encode()).hexdigest() for key in keys],
+        "servidor_nome": servidor,
+        "destino": _text_column(df, 'itinerario', ''),
+        "data_saida": saida,
+        "data_retorno": retorno,
+        "valor": df['valor_limpo'].astype(float),
+        "motivo": _text_column(df, 'motivo', ''),
+        "secretaria": SECRETARIA_PADRAO,
+        "capturado_em": capturado_em or datetime.now(),
+    }, columns=DIARIA_COLUMNS)
+
 class RioBrancoDiariasCrawler:
     BASE_URL = "https://transparencia.riobranco.ac.gov.br/diaria/"
     
-    def __init__(self):
-        self.db = AnalyticsDB()
+    def __init__(self, db=None, data_dir="./data/riobranco/diarias"):
+        self.db = db or AnalyticsDB()
         self.client = JSFClient(self.BASE_URL)
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
 
-    def _sync_state(self, year_id="2873896"):
+    def _sync_state(self, year_id=DEFAULT_YEAR_ID):
         """Sincroniza o estado para o ano desejado."""
         self.client.get()
         log.info(f"Sincronizando Exercício ID: {year_id}")
@@ -58,15 +131,14 @@ class RioBrancoDiariasCrawler:
         if vs:
             self.client._page.viewstate = vs.text
 
-    def fetch_and_save(self, year_id="2873896"):
-        log.info(f"Iniciando captura de Diárias (Exercício ID {year_id})...")
-        
+    def _download_export(self, year_id):
+        """Sincroniza o exercício, pesquisa e baixa o CSV; None se o portal não devolver anexo."""
         self._sync_state(year_id)
         self._search()
 
         # ID do botão CSV para Diárias (validado via script)
         trigger_id = "Formulario:j_idt83:j_idt97"
-        
+
         payload = {
             "Formulario": "Formulario",
             "Formulario:j_idt73:j_idt75": year_id,
@@ -76,79 +148,103 @@ class RioBrancoDiariasCrawler:
         }
 
         r = self.client.download_file(trigger_id, payload)
-        
+
         if "attachment" not in r.headers.get("Content-Disposition", ""):
-            log.error("Falha no download do CSV de Diárias.")
             return None
+        return r.content
 
-        log.info(f"CSV de Diárias recebido ({len(r.content)} bytes).")
-        
-        # Parse CSV
-        df = pd.read_csv(io.BytesIO(r.content), encoding="iso-8859-1")
-        log.info(f"Colunas originais: {df.columns.tolist()}")
-        
-        # Normalização de colunas
-        def clean_col(c):
-            import re
-            c = str(c).strip().lower()
-            # Artefatos comuns de ISO-8859-1 mal interpretado
-            replacements = {
-                ' ': '_', 'í': 'i', 'ã': 'a', 'ú': 'u', 'é': 'e', 'ó': 'o', 'á': 'a', 'ç': 'c',
-                'a£': 'a', 'a\xad': 'i', 'a¡': 'a', 'aº': 'u', 'a©': 'e', 'a³': 'o', 'ãº': 'u',
-                'ã\xad': 'i', 'ã¡': 'a', 'ã©': 'e', 'ã³': 'o', 'ã±': 'n'
-            }
-            for old, new in replacements.items(): c = c.replace(old, new)
-            return re.sub(r'[^a-z0-9_]', '', c)
-
-        df.columns = [clean_col(c) for c in df.columns]
-        log.info(f"Colunas limpas: {df.columns.tolist()}")
-        
-        # Mapeamento de colunas para o banco
-        # Originais limpas: ['numero', 'data', 'tipo', 'pessoa', 'itinerario', 'motivo', 'meio_de_transporte', 'valor', 'saida', 'retorno', 'empenho']
-        col_map = {
-            'pessoa': 'servidor_nome',
-            'itinerario': 'destino',
-            'saida': 'data_saida',
-            'retorno': 'data_retorno'
-        }
-        
-        # Conversão de tipos
-        valor_col = 'valor'
-        if valor_col in df.columns:
-            df['valor_limpo'] = df[valor_col].astype(str).str.replace('.', '', regex=False).str.replace(',', '.', regex=False).str.extract(r'([\d\.]+)')[0].astype(float)
+    # Cache da exportacao por exercicio: o CSV e o hash ficam em disco, sem
+    # ViewState, e um ano cujo CSV nao mudou nao toca o banco.
+    def _export_paths(self, year_id):
+        return self.data_dir / f"diarias_{year_id}.csv", self.data_dir / f"diarias_{year_id}.json"
+
+    def cached_export(self, year_id):
+        csv_path, meta_path = self._export_paths(year_id)
+        if not csv_path.exists() or not meta_path.exists():
+            return None, {}
+        return csv_path.read_bytes(), json.loads(meta_path.read_text(encoding="utf-8"))
+
+    def _store_export(self, year_id, content, meta):
+        csv_path, meta_path = self._export_paths(year_id)
+        csv_path.write_bytes(content)
+        meta_path.write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    def _rows_in_db(self, rows):
+        ids = rows["id"].unique().tolist()
+        found = self.db.conn.execute(
+            "SELECT COUNT(*) FROM diarias WHERE id IN (SELECT unnest(?::VARCHAR[]))", [ids]
+        ).fetchone()[0]
+        return found == len(ids)
+
+    def fetch_and_save(self, year_id=DEFAULT_YEAR_ID, *, force=False, max_age_hours=None):
+        """
+        Baixa (ou reaproveita do cache, se mais novo que `max_age_hours`) a
+        exportação do exercício e grava as diárias num único lote. Devolve
+        (FETCH_CHANGED, DataFrame normalizado), (FETCH_UNCHANGED, None) ou
+        (FETCH_FAILED, None).
+        """
+        log.info(f"Iniciando captura de Diárias (Exercício ID {year_id})...")
+        cached, meta = self.cached_export(year_id)
+        fresh = (
+            cached is not None
+            and max_age_hours is not None
+            and datetime.now() - datetime.fromisoformat(meta["fetched_at"]) < timedelta(hours=max_age_hours)
+        )
+        if fresh and not force:
+            log.info(f"Exportação em cache de {meta['fetched_at']}; portal não consultado.")
+            content = cached
         else:
-            df['valor_limpo'] = 0.0
-        
-        # Datas (Formato 26/02/2026)
-        for col in ['saida', 'retorno']:
-            if col in df.columns:
-                df[col] = pd.to_datetime(df[col], format='%d/%m/%Y', errors='coerce')
-
-        # Persistência
-        count = 0
-        for _, row in df.iterrows():
-            # Gerar um ID único (Hash de servidor + data + valor)
-            import hashlib
-            s_nome = str(row.get('pessoa', 'Desconhecido'))
-            d_saida = str(row.get('saida'))
-            v_val = str(row.get('valor_limpo', 0.0))
-            row_id = hashlib.md5(f"{s_nome}{d_saida}{v_val}".encode()).hexdigest()
-            
-            self.db.upsert_diaria({
-                "id": row_id,
-                "servidor_nome": s_nome,
-                "destino": str(row.get('itinerario', '')),
-                "data_saida": row.get('saida'),
-                "data_retorno": row.get('retorno'),
-                "valor": float(row.get('valor_limpo', 0.0)),
-                "motivo": str(row.get('motivo', '')),
-                "secretaria": "Prefeitura de Rio Branco", # CSV não traz unidade gestora explícita às vezes
-                "capturado_em": datetime.now()
-            })
-            count += 1
-            
-        log.info(f"✅ Sucesso: {count} diárias salvas no DuckDB.")
-        return df
+            content = self._download_export(year_id)
+            if content is None:
+                log.error("Falha no download do CSV de Diárias.")
+                return FETCH_FAILED, None
+            log.info(f"CSV de Diárias recebido ({len(content)} bytes).")
+
+        sha256 = hashlib.sha256(content).hexdigest()
+        df = normalize_diarias_export(content)
+        log.info(f"Colunas limpas: {df.columns.tolist()}")
+        rows = diarias_rows(df)
+        # O hash em disco so diz que o CSV e o da ultima carga; o lote so e
+        # pulado se as linhas dele ainda estao no banco.
+        if not force and meta.get("sha256") == sha256 and self._rows_in_db(rows):
+            if not fresh:
+                self._store_export(year_id, content, {**meta, "fetched_at": datetime.now().isoformat(timespec="seconds")})
+            log.info("Exportação idêntica à última carga; nada a gravar.")
+            return FETCH_UNCHANGED, None
+
+        written = self.db.upsert_diarias(rows)
+        log.info(f"✅ Sucesso: {len(rows)} diárias no lote, {written} inseridas ou atualizadas no DuckDB.")
+
+        self._store_export(year_id, content, {
+            "year_id": year_id,
+            "sha256": sha256,
+            "rows": len(rows),
+            "fetched_at": meta["fetched_at"] if fresh else datetime.now().isoformat(timespec="seconds"),
+        })
+        if written:
+            timeline = refresh_entity_timeline(self.db.conn)
+            log.info(f"Timeline de entidades atualizada: {timeline['rows_written']} eventos.")
+        return FETCH_CHANGED, df
+
+    def refresh_years(self, year_ids, *, force=False, max_age_hours=None):
+        """Atualiza exercício a exercício; devolve {year_id: {"status", "rows"}}."""
+        result = {}
+        for year_id in year_ids:
+            status, df = self.fetch_and_save(year_id, force=force, max_age_hours=max_age_hours)
+            result[year_id] = {"status": status, "rows": 0 if df is None else len(df)}
+        return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Carga incremental das diárias da Prefeitura de Rio Branco.")
+    parser.add_argument("--year-id", action="append", dest="year_ids", help="ID do exercício no portal (repetível)")
+    parser.add_argument("--force", action="store_true", help="Ignora o cache da exportação e regrava o lote")
+    parser.add_argument("--max-age-hours", type=float, help="Reaproveita a exportação em cache mais nova que isso")
+    args = parser.parse_args()
+    result = RioBrancoDiariasCrawler().refresh_years(
+        args.year_ids or [DEFAULT_YEAR_ID], force=args.force, max_age_hours=args.max_age_hours
+    )
+    return 1 if any(item["status"] == FETCH_FAILED for item in result.values()) else 0
 
 if __name__ == "__main__":
-    RioBrancoDiariasCrawler().fetch_and_save()
+    raise SystemExit(main())
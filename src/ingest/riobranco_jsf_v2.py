@@ -34,6 +34,8 @@ import pandas as pd
 from bs4 import BeautifulSoup
 from rich.console import Console
 
+from src.core.ops_version import mark_tables_written
+
 console = Console()
 log = logging.getLogger("sentinela.jsf")
 
@@ -407,6 +409,7 @@ def save_to_db(df: pd.DataFrame, table: str):
     new = df[~df["row_hash"].isin(existing)]
     if not new.empty:
         conn.execute(f"INSERT INTO {table} SELECT * FROM new")
+        mark_tables_written(conn, table)
         console.print(f"[green]✓ {len(new)} novos registros → {table}[/green]")
     else:
         console.print(f"[dim]Sem novos registros em {table}[/dim]")
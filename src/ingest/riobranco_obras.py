@@ -1,28 +1,99 @@
+import hashlib
+import json
 import requests
-from bs4 import BeautifulSoup
 import re
 import logging
+import threading
 from pathlib import Path
 import pandas as pd
+from lxml import etree, html as lxml_html
+from requests.adapters import HTTPAdapter
 from src.core.analytics_db import AnalyticsDB
+from src.ingest.polite_http import HostRateLimiter, fan_out
 
 log = logging.getLogger("Sentinela.Obras")
 
+DEFAULT_WORKERS = 6
+DEFAULT_REQUESTS_PER_SECOND = 8.0
+DEFAULT_BATCH_SIZE = 200
+EMPRESA_LINK_RE = re.compile(r"/ver/(\d+)/")
+# Paginas XHTML do JSF: o lxml recusa texto unicode com declaracao de encoding.
+XML_DECLARATION_RE = re.compile(r"^\s*<\?xml[^>]*\?>")
+
+
+def _parse_valor(text):
+    """Converte 'R$ 170.615,96' para float 170615.96"""
+    try:
+        clean = re.sub(r"[^\d,]", "", text).replace(",", ".")
+        return float(clean)
+    except:
+        return 0.0
+
+
+def _cell_text(cell):
+    # Mesmo resultado de BeautifulSoup.get_text(strip=True).
+    return "".join(part.strip() for part in cell.itertext())
+
+
+def extract_obra_detail(page_html, obra_id):
+    """Campos da pagina /obra/ver/<id>/: so as linhas de tabela com rotulo e valor."""
+    data = {"id": str(obra_id)}
+    if not page_html or not page_html.strip():
+        return data
+    try:
+        tree = lxml_html.fromstring(XML_DECLARATION_RE.sub("", page_html, count=1))
+    except etree.ParserError:
+        return data
+    for row in tree.iter("tr"):
+        cols = row.xpath(".//td")
+        if len(cols) < 2:
+            continue
+        label = _cell_text(cols[0]).lower()
+        value_td = cols[1]
+        if "nome:" in label:
+            data["nome"] = _cell_text(value_td)
+        elif "empresa licitada" in label:
+            links = value_td.xpath(".//a")
+            if links:
+                # Extrai ID da empresa do link '/pessoa/ver/7131/'
+                match = EMPRESA_LINK_RE.search(links[0].get("href") or "")
+                data["empresa_id"] = match.group(1) if match else None
+                data["empresa_nome"] = _cell_text(value_td)
+        elif "custo total:" in label:
+            data["valor_total"] = _parse_valor(_cell_text(value_td))
+        elif "secretaria fiscalizadora:" in label:
+            data["secretaria"] = _cell_text(value_td)
+    return data
+
+
+def obra_fields_sha256(data):
+    # Hash dos campos extraidos, nao dos bytes da pagina: o XHTML do JSF traz
+    # ViewState e ids de sessao que mudam a cada requisicao.
+    return hashlib.sha256(json.dumps(data, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def obra_row(data, page_sha256=None):
+    return {
+        "id": data["id"],
+        "nome": data["nome"],
+        "valor_total": data.get("valor_total", 0.0),
+        "empresa_id": data.get("empresa_id", ""),
+        "empresa_nome": data.get("empresa_nome", "Empresa Desconhecida"),
+        "secretaria": data.get("secretaria", ""),
+        "capturado_em": pd.Timestamp.now(),
+        "page_sha256": page_sha256,
+    }
+
 class RioBrancoObrasParser:
     BASE_URL = "https://transparencia.riobranco.ac.gov.br/obra/ver/"
     
-    def __init__(self):
-        self.db = AnalyticsDB()
+    def __init__(self, db=None):
+        self.db = db or AnalyticsDB()
         self.session = requests.Session()
         self.session.headers.update({"User-Agent": "Sentinela/3.0"})
 
     def _parse_valor(self, text):
-        """Converte 'R$ 170.615,96' para float 170615.96"""
-        try:
-            clean = re.sub(r"[^\d,]", "", text).replace(",", ".")
-            return float(clean)
-        except:
-            return 0.0
+        return _parse_valor(text)
 
     def get_obra_detail(self, obra_id):
         log.info(f"Extraindo detalhes da obra {obra_id}...")
@@ -32,49 +103,97 @@ class RioBrancoObrasParser:
             log.error(f"Falha ao acessar obra {obra_id}")
             return None
 
-        soup = BeautifulSoup(r.text, "html.parser")
-        
-        # O portal de Rio Branco usa tabelas para os detalhes
-        rows = soup.find_all("tr")
-        data = {"id": str(obra_id)}
-        
-        for row in rows:
-            cols = row.find_all("td")
-            if len(cols) < 2: continue
-            
-            label = cols[0].get_text(strip=True).lower()
-            value_td = cols[1]
-            value_text = value_td.get_text(strip=True)
-            
-            if "nome:" in label:
-                data["nome"] = value_text
-            elif "empresa licitada" in label:
-                link = value_td.find("a")
-                if link:
-                    # Extrai ID da empresa do link '/pessoa/ver/7131/'
-                    match = re.search(r"/ver/(\d+)/", link['href'])
-                    data["empresa_id"] = match.group(1) if match else None
-                    data["empresa_nome"] = value_text
-            elif "custo total:" in label:
-                data["valor_total"] = self._parse_valor(value_text)
-            elif "secretaria fiscalizadora:" in label:
-                data["secretaria"] = value_text
+        data = extract_obra_detail(r.text, obra_id)
 
         # Salva no DuckDB
         if "nome" in data:
-            self.db.upsert_obra({
-                "id": data["id"],
-                "nome": data["nome"],
-                "valor_total": data.get("valor_total", 0.0),
-                "empresa_id": data.get("empresa_id", ""),
-                "empresa_nome": data.get("empresa_nome", "Empresa Desconhecida"),
-                "secretaria": data.get("secretaria", ""),
-                "capturado_em": pd.Timestamp.now()
-            })
+            self.db.upsert_obra(obra_row(data, obra_fields_sha256(data)))
             log.info(f"✅ Obra {obra_id} salva: {data['nome']}")
             return data
         return None
 
+
+class RioBrancoObrasHarvester:
+    """
+    Coleta concorrente das paginas de obra: pool limitado com token bucket por
+    host, extracao direcionada e gravacao em lotes. Obras cujos campos extraidos
+    tem o mesmo hash da ultima coleta nao sao regravadas.
+    """
+
+    def __init__(
+        self,
+        db=None,
+        *,
+        workers=DEFAULT_WORKERS,
+        requests_per_second=DEFAULT_REQUESTS_PER_SECOND,
+        batch_size=DEFAULT_BATCH_SIZE,
+        base_url=RioBrancoObrasParser.BASE_URL,
+        timeout=30,
+    ):
+        self.db = db or AnalyticsDB()
+        self.workers = max(1, int(workers))
+        self.batch_size = max(1, int(batch_size))
+        self.base_url = base_url
+        self.timeout = timeout
+        self.limiter = HostRateLimiter(requests_per_second, capacity=self.workers)
+        self._local = threading.local()
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update({"User-Agent": "Sentinela/3.0"})
+            session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+            session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+            self._local.session = session
+        return session
+
+    def _fetch(self, obra_id):
+        url = f"{self.base_url}{obra_id}/"
+        self.limiter.acquire(url)
+        try:
+            r = self._session().get(url, timeout=self.timeout)
+        except requests.RequestException as exc:
+            log.error(f"Falha ao acessar obra {obra_id}: {exc}")
+            return None
+        if r.status_code != 200:
+            log.error(f"Falha ao acessar obra {obra_id}")
+            return None
+        return r
+
+    def _harvest_one(self, item):
+        obra_id, known_hash = item
+        r = self._fetch(obra_id)
+        if r is None:
+            return "failed", None
+        data = extract_obra_detail(r.text, obra_id)
+        if "nome" not in data:
+            return "empty", None
+        page_sha256 = obra_fields_sha256(data)
+        if page_sha256 == known_hash:
+            return "unchanged", None
+        return "saved", obra_row(data, page_sha256)
+
+    def run(self, obra_ids, *, force=False):
+        obra_ids = [str(obra_id) for obra_id in dict.fromkeys(obra_ids)]
+        known = {} if force else self.db.obra_page_hashes()
+        counts = {"saved": 0, "unchanged": 0, "empty": 0, "failed": 0}
+        for start in range(0, len(obra_ids), self.batch_size):
+            chunk = obra_ids[start:start + self.batch_size]
+            results = fan_out(self._harvest_one, [(obra_id, known.get(obra_id)) for obra_id in chunk], workers=self.workers)
+            batch = []
+            for status, row in results:
+                counts[status] += 1
+                if row is not None:
+                    batch.append(row)
+            self.db.upsert_obras(batch)
+            log.info(
+                f"Obras {min(start + len(chunk), len(obra_ids))}/{len(obra_ids)}: "
+                f"{counts['saved']} salvas, {counts['unchanged']} sem mudança, {counts['failed']} falhas"
+            )
+        return counts
+
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
     parser = RioBrancoObrasParser()
@@ -3,7 +3,7 @@ from bs4 import BeautifulSoup
 import re
 import logging
 import xml.etree.ElementTree as ET
-from src.ingest.riobranco_obras import RioBrancoObrasParser
+from src.ingest.riobranco_obras import DEFAULT_WORKERS, RioBrancoObrasHarvester, RioBrancoObrasParser
 from jsf_client import JSFClient
 
 log = logging.getLogger("Sentinela.ObrasList")
@@ -69,13 +69,15 @@ class RioBrancoObrasList:
         log.info(f"Sucesso! {len(ids)} IDs de obras capturados.")
         return list(ids)
 
-    def run_mass_import(self):
+    def run_mass_import(self, *, workers=DEFAULT_WORKERS, force=False):
         ids = self.get_all_obra_ids()
-        count = 0
-        for oid in ids:
-            if self.parser.get_obra_detail(oid):
-                count += 1
-        log.info(f"🚀 Sentinela finalizou: {count} obras reais de Rio Branco agora estão no DuckDB.")
+        harvester = RioBrancoObrasHarvester(self.parser.db, workers=workers)
+        counts = harvester.run(ids, force=force)
+        log.info(
+            f"🚀 Sentinela finalizou: {counts['saved']} obras reais de Rio Branco gravadas no DuckDB "
+            f"({counts['unchanged']} sem mudança desde a última coleta, {counts['failed']} falhas)."
+        )
+        return counts
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
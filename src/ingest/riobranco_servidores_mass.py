@@ -2,9 +2,13 @@ import logging
 import requests
 import pandas as pd
 import io
+from datetime import datetime
 from bs4 import BeautifulSoup
 from src.ingest.riobranco_jsf import extract_viewstate
 from src.core.analytics_db import AnalyticsDB
+from src.core.entity_timeline import refresh_entity_timeline
+from src.core.ops_version import mark_tables_written
+from src.core.people_search import refresh_people_search_index
 from jsf_client import JSFClient
 
 log = logging.getLogger("Sentinela.ServidoresMass")
@@ -112,14 +116,21 @@ class RioBrancoServidoresMass:
         # Adicionar metadados
         df['ano_id'] = year_id
         df['mes_id'] = month_id if month_id else "TODOS"
+        df['capturado_em'] = datetime.now()
 
         # Persistência
         table_name = "rb_servidores_mass"
         self.db.conn.execute(f"DROP TABLE IF EXISTS {table_name}")
         self.db.conn.register("df_temp", df)
         self.db.conn.execute(f"CREATE TABLE {table_name} AS SELECT * FROM df_temp")
+        mark_tables_written(self.db.conn, table_name)
         
         log.info(f"✅ Sucesso: {len(df)} registros salvos na tabela '{table_name}'.")
+
+        timeline = refresh_entity_timeline(self.db.conn)
+        log.info(f"Timeline de entidades atualizada: {timeline['rows_written']} eventos.")
+        search = refresh_people_search_index(self.db.conn)
+        log.info(f"Indice de busca de servidores atualizado: {search['rows_written']} registros.")
         return df
 
 if __name__ == "__main__":
@@ -2,19 +2,24 @@
 haEmet — Conector Portal de Transparência do Acre
 Etapa 2: extração de orgao real do Governo do Acre.
 """
+import hashlib
 import json
 import logging
 import os
 import re
-import time
+import shutil
+import threading
 import unicodedata
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 
 import requests
 from bs4 import BeautifulSoup
 
+from src.ingest.polite_http import HostRateLimiter, fan_out
+
 log = logging.getLogger(__name__)
 
 BASE_URL = "https://transparencia.ac.gov.br"
@@ -141,16 +146,55 @@ def _keyword_matches(text: str, keyword: str) -> bool:
     return keyword in text
 
 
-def resolve_orgao(
+def _keyword_pattern(keyword: str) -> str:
+    if re.fullmatch(r"[A-Z0-9/-]+", keyword):
+        return rf"(?<![A-Z0-9]){re.escape(keyword)}(?![A-Z0-9])"
+    return re.escape(keyword)
+
+
+# Uma unica alternancia com um grupo por orgao, na ordem de ORGAO_KEYWORDS.
+# Em cada posicao o primeiro ramo que casa e o do orgao de menor indice, entao
+# o menor indice entre todas as posicoes e o orgao que o laco original devolve.
+_ORGAO_REGEX = re.compile(
+    "|".join(
+        f"(?P<o{idx}>{'|'.join(_keyword_pattern(keyword) for keyword in keywords if keyword)})"
+        for idx, (_, keywords) in enumerate(_ORGAO_KEYWORDS_NORM)
+    )
+)
+_ORGAO_FALLBACK_RANK = len(_ORGAO_KEYWORDS_NORM)
+
+
+@lru_cache(maxsize=65536)
+def _orgao_rank(text: str) -> int:
+    """Menor indice de ORGAO_KEYWORDS com alguma palavra-chave em `text` (ja normalizado)."""
+    best = _ORGAO_FALLBACK_RANK
+    search = _ORGAO_REGEX.search
+    match = search(text) if text else None
+    while match is not None:
+        best = min(best, int(match.lastgroup[1:]))
+        if best == 0:
+            break
+        match = search(text, match.start() + 1)
+    return best
+
+
+@lru_cache(maxsize=65536)
+def _resolve_orgao_cached(unidade_gestora: str, credor: str, natureza_despesa: str) -> str:
+    rank = min(
+        _orgao_rank(_norm(unidade_gestora)),
+        _orgao_rank(_norm(credor)),
+        _orgao_rank(_norm(natureza_despesa)),
+    )
+    return _ORGAO_KEYWORDS_NORM[rank][0] if rank < _ORGAO_FALLBACK_RANK else "GOVERNO_ACRE"
+
+
+def _resolve_orgao_reference(
     *,
     unidade_gestora: str = "",
     credor: str = "",
     natureza_despesa: str = "",
 ) -> str:
-    """
-    Resolve o orgao canônico do Governo do Acre.
-    Ordem: unidade_gestora > credor > natureza_despesa.
-    """
+    """Laco original palavra a palavra; mantido como gabarito do resolvedor compilado."""
     candidates = [
         _norm(unidade_gestora),
         _norm(credor),
@@ -168,6 +212,47 @@ def resolve_orgao(
     return "GOVERNO_ACRE"
 
 
+def resolve_orgao(
+    *,
+    unidade_gestora: str = "",
+    credor: str = "",
+    natureza_despesa: str = "",
+) -> str:
+    """
+    Resolve o orgao canônico do Governo do Acre.
+    Vale a ordem de ORGAO_KEYWORDS, nao a dos campos: ganha o orgao de menor
+    indice com palavra-chave em qualquer um de unidade_gestora, credor ou
+    natureza_despesa (busca na alternancia compilada _ORGAO_REGEX, com cache
+    por texto e por combinacao dos tres). Sem nenhuma, GOVERNO_ACRE.
+    """
+    return _resolve_orgao_cached(unidade_gestora or "", credor or "", natureza_despesa or "")
+
+
+def _column_values(values: Optional[Iterable], size: Optional[int]) -> list[str]:
+    if values is None:
+        return [""] * (size or 0)
+    out = [value if isinstance(value, str) else "" for value in values]
+    if size is not None and len(out) != size:
+        raise ValueError("colunas de tamanhos diferentes")
+    return out
+
+
+def resolve_orgao_many(
+    unidades_gestoras: Iterable,
+    credores: Optional[Iterable] = None,
+    naturezas_despesa: Optional[Iterable] = None,
+) -> list[str]:
+    """
+    resolve_orgao sobre colunas inteiras (listas ou Series); valores nao textuais
+    (None/NaN) contam como vazios. Cada combinacao distinta e resolvida uma vez.
+    """
+    unidades = _column_values(unidades_gestoras, None)
+    size = len(unidades)
+    triples = list(zip(unidades, _column_values(credores, size), _column_values(naturezas_despesa, size)))
+    resolved = {triple: _resolve_orgao_cached(*triple) for triple in dict.fromkeys(triples)}
+    return [resolved[triple] for triple in triples]
+
+
 @dataclass
 class ApiConfig:
     versao: str
@@ -265,13 +350,25 @@ class TransparenciaAcConnector:
         force: bool = False,
         pagesize: int = 500,
         delay_entre_requests: float = 0.5,
+        max_workers: int = 4,
+        requests_per_second: Optional[float] = None,
+        checkpoint_dir: Optional[str] = None,
+        base_url: str = BASE_URL,
     ):
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self.force = force
         self.pagesize = pagesize
         self.delay = delay_entre_requests
+        self.max_workers = max(1, max_workers)
+        self.base_url = base_url.rstrip("/")
+        self.checkpoint_dir = Path(checkpoint_dir) if checkpoint_dir else None
         self._cfg: Optional[ApiConfig] = None
+        self._cfg_lock = threading.Lock()
+        # O intervalo entre requisicoes vira a taxa do token bucket por host,
+        # compartilhado por todas as threads (paginas, entidades e anos).
+        rate = requests_per_second or (1.0 / delay_entre_requests if delay_entre_requests > 0 else 1000.0)
+        self.limiter = HostRateLimiter(rate, capacity=self.max_workers)
 
         from requests.adapters import HTTPAdapter
         from urllib3.util.retry import Retry
@@ -283,13 +380,27 @@ class TransparenciaAcConnector:
             status_forcelist=[429, 500, 502, 503, 504],
             allowed_methods=["GET"],
         )
-        self.session.mount("https://", HTTPAdapter(max_retries=retry_strategy))
+        adapter = HTTPAdapter(
+            max_retries=retry_strategy,
+            pool_connections=4,
+            pool_maxsize=max(10, self.max_workers * 2),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self.session.headers.update(
             {"User-Agent": "Sentinela/1.0", "Accept": "application/json"}
         )
+        # Token CSRF por pagina, preso ao cookie de sessao compartilhado: todas
+        # as threads reutilizam o mesmo token.
         self._portal_tokens: dict[str, str] = {}
+        self._token_lock = threading.Lock()
 
     def get_config(self) -> ApiConfig:
+        # Anos e endpoints rodam em paralelo: a descoberta acontece uma vez so.
+        with self._cfg_lock:
+            return self._load_config()
+
+    def _load_config(self) -> ApiConfig:
         if self._cfg:
             return self._cfg
 
@@ -352,9 +463,44 @@ class TransparenciaAcConnector:
                         pass
         return None
 
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        self.limiter.acquire(url)
+        return self.session.get(url, **kwargs)
+
+    def _post(self, url: str, **kwargs) -> requests.Response:
+        self.limiter.acquire(url)
+        return self.session.post(url, **kwargs)
+
+    def _checkpoint_path(self, ano: int | str, endpoint: str, payload: dict, page: int) -> Optional[Path]:
+        if self.checkpoint_dir is None:
+            return None
+        key = {k: v for k, v in payload.items() if k not in {"_token", "draw", "start", "page"}}
+        digest = hashlib.sha256(json.dumps(key, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", endpoint).strip("_")
+        return self.checkpoint_dir / str(ano) / slug / f"{digest}_{page:06d}.json"
+
+    def _checkpointed(self, ano: int | str, endpoint: str, payload: dict, page: int, fetch):
+        """Retoma (ano, endpoint, pagina) ja baixados; so respostas validas sao gravadas."""
+        path = self._checkpoint_path(ano, endpoint, payload, page)
+        if path is not None and path.exists():
+            return json.loads(path.read_text(encoding="utf-8"))
+        data = fetch()
+        if path is not None and data is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+            tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+            tmp.replace(path)
+        return data
+
+    def clear_checkpoints(self, ano: Optional[int] = None) -> None:
+        if self.checkpoint_dir is None:
+            return
+        target = self.checkpoint_dir / str(ano) if ano is not None else self.checkpoint_dir
+        shutil.rmtree(target, ignore_errors=True)
+
     def _safe_get(self, url: str, params: dict = None):
         try:
-            response = self.session.get(url, params=params, timeout=30)
+            response = self._get(url, params=params, timeout=30)
             if response.status_code < 500:
                 return response
             return None
@@ -398,25 +544,47 @@ class TransparenciaAcConnector:
         return str(nome).strip(), str(codigo).strip()
 
     def _portal_csrf(self, page: str) -> str:
-        if page in self._portal_tokens and not self.force:
-            return self._portal_tokens[page]
-
-        response = self.session.get(f"{BASE_URL}/{page}", timeout=30)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
-        meta = soup.find("meta", {"name": "csrf-token"})
-        if not meta or not meta.get("content"):
-            raise RuntimeError(f"CSRF não encontrado na página {page}")
-        token = meta["content"]
-        self._portal_tokens[page] = token
-        return token
+        with self._token_lock:
+            if page in self._portal_tokens:
+                return self._portal_tokens[page]
+
+            response = self._get(f"{self.base_url}/{page}", timeout=30)
+            response.raise_for_status()
+            soup = BeautifulSoup(response.text, "html.parser")
+            meta = soup.find("meta", {"name": "csrf-token"})
+            if not meta or not meta.get("content"):
+                raise RuntimeError(f"CSRF não encontrado na página {page}")
+            token = meta["content"]
+            self._portal_tokens[page] = token
+            return token
+
+    def _invalidate_csrf(self, page: str, token: str) -> None:
+        with self._token_lock:
+            if self._portal_tokens.get(page) == token:
+                del self._portal_tokens[page]
+
+    def _portal_post(self, page: str, url: str, payload: dict[str, str]):
+        # 419 = token expirado no Laravel: renova uma vez e repete.
+        for attempt in range(2):
+            token = self._portal_csrf(page)
+            response = self._post(
+                url,
+                data={**payload, "_token": token},
+                headers=self._portal_headers(page),
+                timeout=30,
+            )
+            if response.status_code == 419 and attempt == 0:
+                self._invalidate_csrf(page, token)
+                continue
+            response.raise_for_status()
+            return response.json()
 
     def _portal_headers(self, page: str) -> dict[str, str]:
         token = self._portal_csrf(page)
         return {
             "X-CSRF-TOKEN": token,
             "X-Requested-With": "XMLHttpRequest",
-            "Referer": f"{BASE_URL}/{page}",
+            "Referer": f"{self.base_url}/{page}",
             "Accept": "application/json, text/javascript, */*; q=0.01",
         }
 
@@ -428,56 +596,58 @@ class TransparenciaAcConnector:
         order_dir: str = "desc",
         page_size: int = 500,
     ) -> list[dict]:
-        token = self._portal_csrf(page)
-        headers = self._portal_headers(page)
-        rows: list[dict] = []
-        start = 0
-        records_total = None
-
-        while True:
-            payload = {
-                "_token": token,
-                "draw": "1",
-                "start": str(start),
-                "length": str(page_size),
-                "search[value]": "",
-                "search[regex]": "false",
-                "order[0][column]": "0",
-                "order[0][dir]": order_dir,
-                "columns[0][data]": "",
-                "columns[0][name]": "",
-                "columns[0][searchable]": "true",
-                "columns[0][orderable]": "true",
-                "columns[0][search][value]": "",
-                "columns[0][search][regex]": "false",
-            }
-            payload.update(extra_payload)
-            response = self.session.post(
-                f"{BASE_URL}/{page}/listar",
-                data=payload,
-                headers=headers,
-                timeout=30,
+        ano = extra_payload.get("ano") or "sem_ano"
+        base_payload = {
+            "draw": "1",
+            "length": str(page_size),
+            "search[value]": "",
+            "search[regex]": "false",
+            "order[0][column]": "0",
+            "order[0][dir]": order_dir,
+            "columns[0][data]": "",
+            "columns[0][name]": "",
+            "columns[0][searchable]": "true",
+            "columns[0][orderable]": "true",
+            "columns[0][search][value]": "",
+            "columns[0][search][regex]": "false",
+        }
+        base_payload.update(extra_payload)
+
+        def fetch(start: int) -> dict:
+            return self._checkpointed(
+                ano,
+                f"{page}/listar",
+                base_payload,
+                start,
+                lambda: self._portal_post(page, f"{self.base_url}/{page}/listar", {**base_payload, "start": str(start)}),
             )
-            response.raise_for_status()
-            data = response.json()
 
-            items = data.get("data", [])
-            if records_total is None:
-                try:
-                    records_total = int(data.get("recordsFiltered") or data.get("recordsTotal") or 0)
-                except Exception:
-                    records_total = 0
+        data = fetch(0)
+        items = data.get("data", [])
+        try:
+            records_total = int(data.get("recordsFiltered") or data.get("recordsTotal") or 0)
+        except Exception:
+            records_total = 0
+        if not items:
+            return []
+
+        rows: list[dict] = list(items)
+        start = len(items)
+        if records_total:
+            # recordsTotal conhecido apos a primeira pagina: demais em paralelo.
+            for data in fan_out(fetch, range(start, records_total, len(items)), workers=self.max_workers):
+                items = data.get("data", [])
+                if not items:
+                    break
+                rows.extend(items)
+            return rows
 
+        while True:
+            items = fetch(start).get("data", [])
             if not items:
                 break
-
             rows.extend(items)
             start += len(items)
-            if records_total and start >= records_total:
-                break
-
-            time.sleep(self.delay)
-
         return rows
 
     def _portal_post_json(
@@ -487,18 +657,13 @@ class TransparenciaAcConnector:
         endpoint: str,
         payload: dict[str, str],
     ):
-        token = self._portal_csrf(page)
-        headers = self._portal_headers(page)
-        data = {"_token": token}
-        data.update(payload)
-        response = self.session.post(
-            f"{BASE_URL}/{page}/{endpoint}",
-            data=data,
-            headers=headers,
-            timeout=30,
+        return self._checkpointed(
+            payload.get("ano") or "sem_ano",
+            f"{page}/{endpoint}",
+            payload,
+            0,
+            lambda: self._portal_post(page, f"{self.base_url}/{page}/{endpoint}", payload),
         )
-        response.raise_for_status()
-        return response.json()
 
     def _portal_pagamentos(self, ano: int) -> list[PagamentoRow]:
         items = self._portal_list(
@@ -667,18 +832,23 @@ class TransparenciaAcConnector:
         current_page = 1
 
         while True:
-            response = self.session.get(
-                f"{BASE_URL}/{page}/orgaos",
-                params={
-                    "busca": "",
-                    "ano": str(ano),
-                    "page": str(current_page),
-                },
-                headers={"Accept": "application/json"},
-                timeout=30,
-            )
-            response.raise_for_status()
-            data = response.json()
+            params = {
+                "busca": "",
+                "ano": str(ano),
+                "page": str(current_page),
+            }
+
+            def fetch(params=params) -> dict:
+                response = self._get(
+                    f"{self.base_url}/{page}/orgaos",
+                    params=params,
+                    headers={"Accept": "application/json"},
+                    timeout=30,
+                )
+                response.raise_for_status()
+                return response.json()
+
+            data = self._checkpointed(ano, f"{page}/orgaos", params, current_page, fetch)
             items = data.get("data", [])
             if not items:
                 break
@@ -688,7 +858,6 @@ class TransparenciaAcConnector:
             if current_page >= last_page:
                 break
             current_page += 1
-            time.sleep(self.delay)
 
         return rows
 
@@ -896,6 +1065,27 @@ class TransparenciaAcConnector:
                 return exercicio["id"]
         return None
 
+    def _legacy_pages(self, ano: int, endpoint: str, params: dict, total: int) -> list[list[dict]]:
+        """Paginas da API legada (total conhecido pelo /count) buscadas em paralelo,
+        mantendo a parada na primeira pagina vazia."""
+        cfg = self.get_config()
+
+        def fetch(page: int):
+            def call():
+                response = self._safe_get(cfg.url(endpoint), {**params, "page": page, "pagesize": self.pagesize})
+                return response.json() if response else None
+
+            return self._checkpointed(ano, endpoint, params, page, call)
+
+        pages: list[list[dict]] = []
+        for items in fan_out(fetch, range(1, (total // self.pagesize) + 2), workers=self.max_workers):
+            if items is None:
+                continue
+            if not items:
+                break
+            pages.append(items)
+        return pages
+
     def get_pagamentos(self, ano: int) -> list[PagamentoRow]:
         try:
             cfg = self.get_config()
@@ -923,23 +1113,13 @@ class TransparenciaAcConnector:
             return self._portal_pagamentos(ano)
 
         rows: list[PagamentoRow] = []
-        for page in range(1, (total // self.pagesize) + 2):
-            response = self._safe_get(
-                cfg.url(f"pagamentos/{cfg.codigo}"),
-                {
-                    "exer": id_exercicio,
-                    "inicio": inicio,
-                    "fim": fim,
-                    "page": page,
-                    "pagesize": self.pagesize,
-                },
-            )
-            if not response:
-                continue
-            items = response.json()
-            if not items:
-                break
-
+        pages = self._legacy_pages(
+            ano,
+            f"pagamentos/{cfg.codigo}",
+            {"exer": id_exercicio, "inicio": inicio, "fim": fim},
+            total,
+        )
+        for items in pages:
             for item in items:
                 nome_unidade, codigo_unidade = self._extract_unidade(item)
                 credor = item.get("credor", "").strip()
@@ -965,8 +1145,6 @@ class TransparenciaAcConnector:
                     )
                 )
 
-            time.sleep(self.delay)
-
         return rows or self._portal_pagamentos(ano)
 
     def get_contratos(self, ano: int) -> list[ContratoRow]:
@@ -991,17 +1169,7 @@ class TransparenciaAcConnector:
             return self._portal_contratos(ano)
 
         rows: list[ContratoRow] = []
-        for page in range(1, (total // self.pagesize) + 2):
-            response = self._safe_get(
-                cfg.url(f"contratos/{cfg.codigo}"),
-                {"exer": id_exercicio, "page": page, "pagesize": self.pagesize},
-            )
-            if not response:
-                continue
-            items = response.json()
-            if not items:
-                break
-
+        for items in self._legacy_pages(ano, f"contratos/{cfg.codigo}", {"exer": id_exercicio}, total):
             for item in items:
                 nome_unidade, _ = self._extract_unidade(item)
                 credor = item.get("credor", "").strip()
@@ -1024,8 +1192,6 @@ class TransparenciaAcConnector:
                     )
                 )
 
-            time.sleep(self.delay)
-
         return rows or self._portal_contratos(ano)
 
     def get_licitacoes(self, ano: int) -> list[LicitacaoRow]:
@@ -1043,17 +1209,7 @@ class TransparenciaAcConnector:
             return self._portal_licitacoes(ano)
 
         rows: list[LicitacaoRow] = []
-        for page in range(1, (total // self.pagesize) + 2):
-            response = self._safe_get(
-                cfg.url(f"licitacoes/{cfg.codigo}"),
-                {"page": page, "pagesize": self.pagesize},
-            )
-            if not response:
-                continue
-            items = response.json()
-            if not items:
-                break
-
+        for items in self._legacy_pages(ano, f"licitacoes/{cfg.codigo}", {}, total):
             for item in items:
                 nome_unidade, _ = self._extract_unidade(item)
                 fornecedores = [
@@ -1079,8 +1235,6 @@ class TransparenciaAcConnector:
                     )
                 )
 
-            time.sleep(self.delay)
-
         return rows or self._portal_licitacoes(ano)
 
     def get_fornecedores(self, ano: int) -> list[FornecedorResumoRow]:
@@ -1091,14 +1245,16 @@ class TransparenciaAcConnector:
         ano: int,
         orgao_canonico: str,
     ) -> list[FornecedorResumoRow]:
+        todas = self._portal_orgaos(ano=ano, page="despesas")
         entidades = [
             entidade
-            for entidade in self._portal_orgaos(ano=ano, page="despesas")
-            if resolve_orgao(unidade_gestora=entidade) == orgao_canonico
+            for entidade, orgao in zip(todas, resolve_orgao_many(todas))
+            if orgao == orgao_canonico
         ]
-        rows: list[FornecedorResumoRow] = []
         total = len(entidades)
-        for idx, entidade in enumerate(entidades, start=1):
+
+        def collect(item: tuple[int, str]) -> list[FornecedorResumoRow]:
+            idx, entidade = item
             log.info(
                 "Coletando fornecedores de %s %d/%d (%s)",
                 orgao_canonico,
@@ -1106,15 +1262,14 @@ class TransparenciaAcConnector:
                 total,
                 entidade[:120],
             )
-            rows.extend(
-                self._portal_despesas_fornecedores_por_orgao(
-                    ano=ano,
-                    entidade=entidade,
-                    orgao_canonico=orgao_canonico,
-                )
+            return self._portal_despesas_fornecedores_por_orgao(
+                ano=ano,
+                entidade=entidade,
+                orgao_canonico=orgao_canonico,
             )
-            time.sleep(self.delay)
-        return rows
+
+        batches = fan_out(collect, enumerate(entidades, start=1), workers=self.max_workers)
+        return [row for batch in batches for row in batch]
 
     def get_despesa_detalhes_por_orgao(
         self,
@@ -1122,16 +1277,18 @@ class TransparenciaAcConnector:
         orgao_canonico: str,
         max_entidades: Optional[int] = None,
     ) -> list[FornecedorDetalheRow]:
+        todas = self._portal_orgaos(ano=ano, page="despesas")
         entidades = [
             entidade
-            for entidade in self._portal_orgaos(ano=ano, page="despesas")
-            if resolve_orgao(unidade_gestora=entidade) == orgao_canonico
+            for entidade, orgao in zip(todas, resolve_orgao_many(todas))
+            if orgao == orgao_canonico
         ]
         if max_entidades is not None:
             entidades = entidades[:max_entidades]
-        rows: list[FornecedorDetalheRow] = []
         total = len(entidades)
-        for idx, entidade in enumerate(entidades, start=1):
+
+        def collect(item: tuple[int, str]) -> list[FornecedorDetalheRow]:
+            idx, entidade = item
             log.info(
                 "Coletando despesas detalhadas de %s %d/%d (%s)",
                 orgao_canonico,
@@ -1139,14 +1296,13 @@ class TransparenciaAcConnector:
                 total,
                 entidade[:120],
             )
-            rows.extend(
-                self._portal_despesas_dados_exportacao(
-                    ano=ano,
-                    entidade=entidade,
-                )
+            return self._portal_despesas_dados_exportacao(
+                ano=ano,
+                entidade=entidade,
             )
-            time.sleep(self.delay)
-        return rows
+
+        batches = fan_out(collect, enumerate(entidades, start=1), workers=self.max_workers)
+        return [row for batch in batches for row in batch]
 
     def get_fornecedor_detalhes(
         self,
@@ -1158,11 +1314,12 @@ class TransparenciaAcConnector:
         if max_fornecedores is not None:
             fornecedores = fornecedores[:max_fornecedores]
 
-        rows: list[FornecedorDetalheRow] = []
         total = len(fornecedores)
-        for idx, fornecedor in enumerate(fornecedores, start=1):
+
+        def collect(item: tuple[int, FornecedorResumoRow]) -> list[FornecedorDetalheRow]:
+            idx, fornecedor = item
             if not fornecedor.razao_social:
-                continue
+                return []
             if idx == 1 or idx % 25 == 0 or idx == total:
                 log.info(
                     "Detalhando fornecedores %d/%d (%s)",
@@ -1172,20 +1329,15 @@ class TransparenciaAcConnector:
                 )
             try:
                 if fornecedor.entidade:
-                    rows.extend(
-                        self._portal_despesa_fornecedor_dados_exportacao(
-                            ano=ano,
-                            entidade=fornecedor.entidade,
-                            fornecedor=fornecedor.razao_social,
-                        )
-                    )
-                else:
-                    rows.extend(
-                        self._portal_fornecedor_dados_exportacao(
-                            ano=ano,
-                            fornecedor=fornecedor.razao_social,
-                        )
+                    return self._portal_despesa_fornecedor_dados_exportacao(
+                        ano=ano,
+                        entidade=fornecedor.entidade,
+                        fornecedor=fornecedor.razao_social,
                     )
+                return self._portal_fornecedor_dados_exportacao(
+                    ano=ano,
+                    fornecedor=fornecedor.razao_social,
+                )
             except Exception as exc:
                 log.warning(
                     "Falha ao detalhar fornecedor %s (%d/%d): %s",
@@ -1194,8 +1346,10 @@ class TransparenciaAcConnector:
                     total,
                     exc,
                 )
-            time.sleep(self.delay)
-        return rows
+                return []
+
+        batches = fan_out(collect, enumerate(fornecedores, start=1), workers=self.max_workers)
+        return [row for batch in batches for row in batch]
 
     def run(self, anos=None):
         anos = anos or [2024, 2023]
@@ -1205,10 +1359,19 @@ class TransparenciaAcConnector:
             "licitacoes": [],
             "cnpjs_unicos": set(),
         }
-        for ano in anos:
-            result["pagamentos"].extend(self.get_pagamentos(ano))
-            result["contratos"].extend(self.get_contratos(ano))
-            result["licitacoes"].extend(self.get_licitacoes(ano))
+        # (ano, endpoint) em paralelo; cada endpoint ainda pagina em paralelo e
+        # o token bucket por host limita o total de requisicoes.
+        tasks = [
+            (key, getter, ano)
+            for ano in anos
+            for key, getter in (
+                ("pagamentos", self.get_pagamentos),
+                ("contratos", self.get_contratos),
+                ("licitacoes", self.get_licitacoes),
+            )
+        ]
+        for (key, _, _), rows in zip(tasks, fan_out(lambda task: task[1](task[2]), tasks, workers=self.max_workers)):
+            result[key].extend(rows)
         result["cnpjs_unicos"] = {
             row.cnpjcpf for row in result["pagamentos"] if len(row.cnpjcpf) == 14
         }
@@ -0,0 +1,76 @@
+import duckdb
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app import main
+from src.core.insight_classification import ensure_insight_classification_columns, ensure_insight_search_text
+from src.core.ops_version import mark_tables_written
+
+INSIGHT_DDL = (
+    "CREATE TABLE insight (id VARCHAR PRIMARY KEY, kind VARCHAR, severity VARCHAR, confidence INTEGER,"
+    " exposure_brl DOUBLE, title VARCHAR, description_md VARCHAR, pattern VARCHAR, sources JSON, tags JSON,"
+    " sample_n INTEGER, unit_total DOUBLE, valor_referencia DOUBLE, ano_referencia INTEGER, fonte VARCHAR,"
+    " created_at TIMESTAMP)"
+)
+
+
+def _write(db_path, sql, *tables):
+    con = duckdb.connect(str(db_path))
+    try:
+        con.execute(sql)
+        mark_tables_written(con, *tables)
+    finally:
+        con.close()
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    db_path = tmp_path / "api.duckdb"
+    con = duckdb.connect(str(db_path))
+    con.execute(INSIGHT_DDL)
+    ensure_insight_classification_columns(con)
+    ensure_insight_search_text(con)
+    con.execute(
+        "INSERT INTO insight (id, kind, severity, title, description_md, esfera, orgao, created_at)"
+        " VALUES ('a', 'K', 'ALTO', 'A', 'a', 'estadual', 'SESACRE', TIMESTAMP '2026-01-01 00:00:00')"
+    )
+    con.close()
+    monkeypatch.setattr(main, "DB_PATH", str(db_path))
+    monkeypatch.setattr(main, "DATA_VERSION_CHECK_TTL_SECONDS", 0)
+    main.RESPONSE_CACHE.clear()
+    # Sem o context manager o startup em segundo plano nao roda.
+    return TestClient(main.app), db_path
+
+
+def test_escrita_nos_dados_invalida_etag_e_corpo_em_cache(client):
+    api, db_path = client
+    first = api.get("/meta/facets")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert api.get("/meta/facets", headers={"If-None-Match": etag}).status_code == 304
+
+    # Escrita sem ops_pipeline_run, so com o contador (como fazem os scripts de sync).
+    _write(
+        db_path,
+        "INSERT INTO insight (id, kind, severity, title, description_md, esfera, orgao, created_at)"
+        " VALUES ('b', 'K', 'ALTO', 'B', 'b', 'municipal', 'SEMSA', TIMESTAMP '2026-01-01 00:00:00')",
+        "insight",
+    )
+    second = api.get("/meta/facets", headers={"If-None-Match": etag})
+    assert second.status_code == 200
+    assert second.headers["ETag"] != etag
+    assert {bucket["value"] for bucket in second.json()["esferas"]} == {"estadual", "municipal"}
+    assert {bucket["value"] for bucket in first.json()["esferas"]} == {"estadual"}
+
+
+def test_versoes_sao_lidas_uma_vez_por_janela(client, monkeypatch):
+    api, _ = client
+    calls = []
+    fetch = main.fetch_data_versions
+    monkeypatch.setattr(main, "fetch_data_versions", lambda con: calls.append(1) or fetch(con))
+    monkeypatch.setattr(main, "DATA_VERSION_CHECK_TTL_SECONDS", 60)
+    first = api.get("/meta/facets")
+    etag = first.headers["ETag"]
+    assert api.get("/meta/facets", headers={"If-None-Match": etag}).status_code == 304
+    assert api.get("/meta/facets").status_code == 200
+    assert len(calls) == 1
@@ -0,0 +1,36 @@
+from pathlib import Path
+
+import duckdb
+from fastapi.testclient import TestClient
+
+from backend.app import main
+from src.core.insight_classification import refresh_insight_search_text
+
+V2_CORE_SQL = Path(__file__).resolve().parents[1] / "v2_core.sql"
+
+
+def test_insights_sem_tabela_de_texto_de_busca(tmp_path, monkeypatch):
+    db_path = tmp_path / "v2.duckdb"
+    con = duckdb.connect(str(db_path))
+    con.execute(V2_CORE_SQL.read_text("utf-8"))
+    con.execute(
+        "INSERT INTO insight (id, kind, severity, confidence, title, description_md)"
+        " VALUES ('i1', 'K', 'ALTO', 80, 'Pagamento acima da media', 'Sem orgao no texto')"
+    )
+    # O orgao so aparece na evidencia vinculada.
+    con.execute("INSERT INTO evidence (id, source, source_kind, excerpt) VALUES ('e1', 'SESACRE', 'portal', '{}')")
+    con.execute("INSERT INTO evidence_link (id, evidence_id, insight_id, role) VALUES ('l1', 'e1', 'i1', 'fonte')")
+    con.close()
+    monkeypatch.setattr(main, "DB_PATH", str(db_path))
+    main.RESPONSE_CACHE.clear()
+    api = TestClient(main.app)
+
+    inline = api.get("/insights")
+    assert inline.status_code == 200
+    assert inline.json()[0]["orgao"] == "SESACRE"
+
+    con = duckdb.connect(str(db_path))
+    refresh_insight_search_text(con)
+    con.close()
+    main.RESPONSE_CACHE.clear()
+    assert api.get("/insights").json() == inline.json()
@@ -0,0 +1,92 @@
+import duckdb
+
+from src.core.corporate_network import (
+    CLUSTER_TABLE,
+    NODE_TABLE,
+    connected_components,
+    fetch_shared_control,
+    sync_corporate_network,
+)
+from src.core.legal_compliance import validate_shared_control_cluster
+
+QSA = [
+    ("11.111.111/0001-11", "JOÃO DA SILVA", "***123456**"),
+    ("22222222000122", "Joao da Silva", "***123456**"),
+    ("22222222000122", "MARIA SOUZA", ""),
+    ("33333333000133", "MARIA  SOUZA", ""),
+    # Holding como socia PJ: liga a 44... ao cluster da 33...
+    ("44444444000144", "HOLDING SA", "33.333.333/0001-33"),
+    # Homonimo com outro CPF mascarado nao liga as empresas.
+    ("55555555000155", "JOAO DA SILVA", "***999999**"),
+]
+
+
+def _con(rows):
+    con = duckdb.connect()
+    con.execute(
+        "CREATE TABLE empresa_socios (cnpj VARCHAR, socio_nome VARCHAR, socio_cpf_cnpj VARCHAR,"
+        " qualificacao VARCHAR, data_entrada VARCHAR, capturado_em TIMESTAMP)"
+    )
+    con.executemany("INSERT INTO empresa_socios VALUES (?, ?, ?, 'Sócio', '', NULL)", rows)
+    return con
+
+
+def _snapshot(con):
+    return [
+        con.execute(f"SELECT COLUMNS(c -> c <> 'updated_at') FROM {table} ORDER BY ALL").fetchall()
+        for table in (NODE_TABLE, CLUSTER_TABLE)
+    ]
+
+
+def test_componentes_por_union_find():
+    labels = connected_components([("2", "PF:A"), ("1", "PF:A"), ("3", "PF:B")])
+    assert labels["1"] == labels["2"] == labels["PF:A"] != labels["3"] == labels["PF:B"]
+
+
+def test_rede_agrupa_por_socio_e_holding():
+    con = _con(QSA)
+    sync_corporate_network(con)
+    network = fetch_shared_control(con, ["11111111000111", "44444444000144", "55555555000155"])
+    assert network["11111111000111"]["cluster_id"] == "11111111000111"
+    assert network["44444444000144"]["cluster_id"] == "11111111000111"
+    assert network["11111111000111"]["cluster_size"] == 4
+    assert network["11111111000111"]["linked_cnpjs"] == ["22222222000122"]
+    assert network["44444444000144"]["linked_cnpjs"] == ["33333333000133"]
+    assert network["55555555000155"]["cluster_size"] == 1
+
+
+def test_sincronizacao_incremental_igual_a_completa():
+    con = _con(QSA)
+    sync_corporate_network(con)
+    assert sync_corporate_network(con)["edges_added"] == 0
+
+    # Sai o socio que unia 22... e 33...: o cluster se parte em dois.
+    con.execute("DELETE FROM empresa_socios WHERE cnpj = '33333333000133'")
+    con.execute("INSERT INTO empresa_socios VALUES ('66666666000166', 'HOLDING SA', '44444444000144', 'Sócio', '', NULL)")
+    result = sync_corporate_network(con)
+    assert result["edges_removed"] == 1 and result["edges_added"] == 1
+
+    full = _con(con.execute("SELECT cnpj, socio_nome, socio_cpf_cnpj FROM empresa_socios").fetchall())
+    sync_corporate_network(full, full=True)
+    assert _snapshot(con) == _snapshot(full)
+    assert fetch_shared_control(con, ["44444444000144"])["44444444000144"]["cluster_id"] == "33333333000133"
+
+
+def test_validacao_de_cluster_usa_a_rede():
+    con = _con(QSA)
+    sync_corporate_network(con)
+    result = validate_shared_control_cluster("22222222000122", ["JOÃO DA SILVA", "MARIA SOUZA"], con)
+    assert result["linked_cnpjs"] == ["11111111000111", "33333333000133"]
+    assert result["risk_level"] == "ALTO"
+    assert result["network_size"] == 4
+
+
+def test_validacao_de_cluster_so_conta_os_socios_informados():
+    con = _con(QSA)
+    sync_corporate_network(con)
+    result = validate_shared_control_cluster("22.222.222/0001-22", ["Maria Souza"], con)
+    assert result["linked_cnpjs"] == ["33333333000133"]
+    assert result["risk_level"] == "BAIXO"
+    # Socia PJ: a holding conta como empresa ligada.
+    holding = validate_shared_control_cluster("44444444000144", ["HOLDING SA"], con)
+    assert holding["linked_cnpjs"] == ["33333333000133"]
@@ -0,0 +1,87 @@
+from datetime import date
+
+import duckdb
+
+from src.core.fracionamento import FRACIONAMENTO_TABLE, refresh_fracionamento
+from src.core.legal_compliance import dispensa_limit
+
+CONTRATOS = [
+    ("02/01/2024", "SEMSA", "12.345.678/0001-90", "ALFA LTDA", 30000.0, "material de expediente"),
+    ("20/02/2024", "SEMSA", "12345678000190", "ALFA LTDA", 25000.0, "material de expediente"),
+    ("15/03/2024", "SEMSA", "12345678000190", "ALFA LTDA", 20000.0, "material de expediente"),
+    # Acima do limite: ja exigiria licitacao, nao entra na soma.
+    ("15/03/2024", "SEMSA", "12345678000190", "ALFA LTDA", 70000.0, "material de expediente"),
+    # Obras tem limite proprio.
+    ("10/04/2024", "SEINFRA", "", "Beta Construções", 60000.0, "Obra de reforma"),
+    ("10/05/2024", "SEINFRA", "", "BETA CONSTRUCOES", 60000.0, "obra de reforma"),
+    ("10/06/2024", "SEINFRA", "", "Beta Construções", 60000.0, "obra de reforma"),
+]
+
+
+def _con(rows):
+    con = duckdb.connect()
+    con.execute(
+        "CREATE TABLE rb_contratos (data_lancamento VARCHAR, secretaria VARCHAR, cnpj VARCHAR,"
+        " fornecedor VARCHAR, valor_brl DOUBLE, objeto VARCHAR)"
+    )
+    con.executemany("INSERT INTO rb_contratos VALUES (?, ?, ?, ?, ?, ?)", rows)
+    return con
+
+
+def _janelas(con):
+    return con.execute(
+        f"SELECT COLUMNS(c -> c <> 'updated_at') FROM {FRACIONAMENTO_TABLE} ORDER BY ALL"
+    ).fetchall()
+
+
+def test_limite_de_dispensa_por_ano():
+    assert dispensa_limit(2022) == 50_000.0
+    assert dispensa_limit(2024, "obras") == 119_812.02
+    assert dispensa_limit(2030) == dispensa_limit(2025)
+
+
+def test_janela_movel_acima_do_limite():
+    con = _con(CONTRATOS)
+    refresh_fracionamento(con)
+    rows = con.execute(
+        f"SELECT orgao, fornecedor_key, categoria, janela_dias, n_compras, total_brl, janela_inicio::VARCHAR"
+        f" FROM {FRACIONAMENTO_TABLE} ORDER BY orgao, janela_dias"
+    ).fetchall()
+    assert ("SEMSA", "12345678000190", "bens_servicos", 90, 3, 75000.0, "2024-01-02") in rows
+    # Tres obras de 60 mil em 61 dias: a janela de 90 dias ja passa de 119.812,02.
+    seinfra = [row for row in rows if row[0] == "SEINFRA"]
+    assert {row[3] for row in seinfra} == {90, 180, 365}
+    assert all(row[1] == "NOME:BETA CONSTRUCOES" and row[5] == 180000.0 for row in seinfra)
+
+
+def test_incremental_igual_a_recalculo_completo():
+    con = _con(CONTRATOS)
+    refresh_fracionamento(con)
+    novos = [
+        ("01/07/2024", "SEMSA", "12345678000190", "ALFA LTDA", 40000.0, "material"),
+        ("20/07/2024", "SEMSA", "12345678000190", "ALFA LTDA", 35000.0, "material"),
+    ]
+    con.executemany("INSERT INTO rb_contratos VALUES (?, ?, ?, ?, ?, ?)", novos)
+    result = refresh_fracionamento(con)["rb_contratos"]
+    assert result["emit_from"].isoformat() == "2024-05-01"
+    assert result["data_max"].isoformat() == "2024-07-20"
+
+    full = _con(CONTRATOS + novos)
+    refresh_fracionamento(full, full=True)
+    assert _janelas(con) == _janelas(full)
+
+
+def test_carga_de_ano_anterior_a_marca_dagua():
+    con = _con(CONTRATOS)
+    refresh_fracionamento(con)
+    antigos = [
+        ("05/03/2023", "SEMSA", "12345678000190", "ALFA LTDA", 30000.0, "material"),
+        ("10/04/2023", "SEMSA", "12345678000190", "ALFA LTDA", 30000.0, "material"),
+        ("15/05/2023", "SEMSA", "12345678000190", "ALFA LTDA", 30000.0, "material"),
+    ]
+    con.executemany("INSERT INTO rb_contratos VALUES (?, ?, ?, ?, ?, ?)", antigos)
+    assert refresh_fracionamento(con, since=date(2023, 1, 1))["rb_contratos"]["emit_from"] == date(2023, 1, 1)
+
+    full = _con(CONTRATOS + antigos)
+    refresh_fracionamento(full, full=True)
+    assert _janelas(con) == _janelas(full)
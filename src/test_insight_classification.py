@@ -0,0 +1,32 @@
+import json
+from pathlib import Path
+
+import pandas as pd
+
+from src.core.insight_classification import (
+    classify_insight_frame,
+    classify_insight_record,
+    classify_probative_record,
+)
+
+# Saidas congeladas do classificador anterior ao KeywordClassifier (cadeias de
+# _contains_any), sobre textos no formato gravado pelos scripts de sync.
+GOLDEN = json.loads((Path(__file__).parent / "fixtures" / "insight_classification_golden.json").read_text("utf-8"))
+
+
+def test_classificacao_por_registro_igual_a_congelada():
+    for case in GOLDEN:
+        record, extra_text = case["record"], case["extra_text"]
+        computed = {
+            **classify_insight_record(record, extra_text=extra_text),
+            **classify_probative_record(record, extra_text=extra_text),
+        }
+        assert computed == case["expected"], record["id"]
+
+
+def test_classificacao_em_lote_igual_a_congelada():
+    df = pd.DataFrame([case["record"] for case in GOLDEN])
+    extra_texts = {case["record"]["id"]: case["extra_text"] for case in GOLDEN}
+    computed = classify_insight_frame(df, extra_texts=extra_texts).to_dict("records")
+    for case, row in zip(GOLDEN, computed):
+        assert row == case["expected"], case["record"]["id"]
@@ -0,0 +1,109 @@
+import json
+import sys
+from pathlib import Path
+
+import duckdb
+import pytest
+
+from src.core.insight_rules import (
+    InsightRule,
+    compile_insight_rule,
+    insert_insight_rules,
+    query_insight_rules,
+    severity_for_total_sql,
+    template_sql,
+)
+
+SCRIPTS = Path(__file__).resolve().parents[1] / "scripts"
+
+
+def _fixture_con():
+    con = duckdb.connect()
+    con.execute("CREATE TABLE pagamentos (ano INTEGER, orgao VARCHAR, valor DOUBLE, cnpjcpf VARCHAR)")
+    con.executemany(
+        "INSERT INTO pagamentos VALUES (?, ?, ?, ?)",
+        [
+            (2024, "SESACRE", 40_000_000.0, "1"),
+            (2024, "SESACRE", 15_000_000.5, "2"),
+            (2024, "SEMA", 1_234.5, "3"),
+            (2023, "SEMA", 99.0, "3"),
+        ],
+    )
+    return con
+
+
+RULE = InsightRule(
+    kind="TESTE_PAGAMENTO",
+    query="SELECT orgao, COUNT(*) AS n, SUM(valor) AS total FROM pagamentos WHERE ano = $ano GROUP BY orgao",
+    derived={"ano": "CAST($ano AS INTEGER)"},
+    templates={
+        "id": "TESTE:{ano}:{orgao}",
+        "description_md": "**{orgao}**: {n:,} pagamentos, R$ {total:,.2f} ({total:.1%})",
+    },
+    values={"severity": severity_for_total_sql("total", high=10_000_000, critical=50_000_000), "sample_n": "n"},
+)
+
+
+# ── Templates ─────────────────────────────────────────────────────────────────
+
+def test_template_formata_como_python():
+    con = duckdb.connect()
+    sql = template_sql("R$ {v:,.2f} | {n:,} | {p:.1%} | {s}")
+    row = con.execute(f"SELECT {sql} FROM (SELECT 1234567.125 AS v, 1234567 AS n, 0.4567 AS p, 'x' AS s)").fetchone()
+    assert row[0] == f"R$ {1234567.125:,.2f} | {1234567:,} | {0.4567:.1%} | x"
+
+def test_template_rejeita_conversao():
+    with pytest.raises(ValueError):
+        template_sql("{orgao!r}")
+
+def test_regra_rejeita_coluna_desconhecida():
+    with pytest.raises(ValueError):
+        compile_insight_rule(InsightRule(kind="X", query="SELECT 1", values={"nao_existe": "1"}))
+
+
+# ── Regras sobre tabelas de fixture ──────────────────────────────────────────
+
+def test_regra_agrega_e_preenche_colunas():
+    rows = {row["id"]: row for row in query_insight_rules(_fixture_con(), [RULE], params={"ano": 2024})}
+    assert set(rows) == {"TESTE:2024:SESACRE", "TESTE:2024:SEMA"}
+    sesacre = rows["TESTE:2024:SESACRE"]
+    assert sesacre["kind"] == "TESTE_PAGAMENTO"
+    assert sesacre["severity"] == "CRITICO"
+    assert sesacre["sample_n"] == 2
+    assert sesacre["description_md"] == f"**SESACRE**: 2 pagamentos, R$ {55_000_000.5:,.2f} ({55_000_000.5:.1%})"
+    assert rows["TESTE:2024:SEMA"]["severity"] == "MEDIO"
+
+def test_insert_grava_na_tabela_de_insight():
+    con = _fixture_con()
+    con.execute(
+        "CREATE TABLE insight (id VARCHAR PRIMARY KEY, kind VARCHAR, severity VARCHAR, confidence INTEGER,"
+        " exposure_brl DOUBLE, title VARCHAR, description_md VARCHAR, pattern VARCHAR, sources JSON, tags JSON,"
+        " sample_n INTEGER, unit_total DOUBLE, esfera VARCHAR, ente VARCHAR, orgao VARCHAR, municipio VARCHAR,"
+        " uf VARCHAR, area_tematica VARCHAR, sus BOOLEAN, valor_referencia DOUBLE, ano_referencia INTEGER,"
+        " fonte VARCHAR, created_at TIMESTAMP)"
+    )
+    assert insert_insight_rules(con, [RULE], params={"ano": 2023}, defaults={"uf": "'AC'"}) == 1
+    assert con.execute("SELECT id, uf, sample_n FROM insight").fetchall() == [("TESTE:2023:SEMA", "AC", 1)]
+
+def test_regras_estaduais_sobre_fixture():
+    sys.path.insert(0, str(SCRIPTS))
+    import sync_estado_ac
+
+    con = duckdb.connect()
+    con.execute("CREATE TABLE insight (id VARCHAR PRIMARY KEY)")
+    sync_estado_ac.ensure_tables(con)
+    con.execute(
+        "INSERT INTO estado_ac_fornecedores (row_id, ano, orgao, razao_social, cnpjcpf, total_pago, n_pagamentos)"
+        " VALUES ('a', 2024, 'SESACRE', 'ALFA LTDA', '', 6000000, 3), ('b', 2024, 'SESACRE', 'BETA SA', '2', 1000000, NULL)"
+    )
+    rows = sync_estado_ac.build_insights(con, 2024)
+    assert sorted(row["kind"] for row in rows) == [
+        "ESTADO_AC_CONCENTRACAO_FORNECEDOR_ORGAO_ANO",
+        "ESTADO_AC_FORNECEDOR_ORGAO_ANO",
+        "ESTADO_AC_FORNECEDOR_ORGAO_ANO",
+    ]
+    lider = next(row for row in rows if row["kind"] == "ESTADO_AC_CONCENTRACAO_FORNECEDOR_ORGAO_ANO")
+    assert lider["severity"] == "CRITICO"
+    assert "**85.7%**" in lider["description_md"]
+    assert json.loads(lider["tags"])[:3] == ["estado_ac", "SESACRE", "ano:2024"]
+    assert lider["sus"] is True and lider["area_tematica"] == "saude"
@@ -0,0 +1,35 @@
+import hashlib
+
+import duckdb
+
+from src.core.ops_export import ensure_ops_export_gate, sync_ops_generated_export_diff
+
+
+def _export(con, export_id, path, body, created_at):
+    sha256 = hashlib.sha256(body.encode("utf-8")).hexdigest()
+    con.execute(
+        "INSERT INTO ops_case_generated_export (export_id, case_id, export_mode, path, sha256, size_bytes, label, created_at)"
+        " VALUES (?, 'caso', 'NOTA', ?, ?, ?, ?, ?)",
+        [export_id, str(path), sha256, len(body), export_id, created_at],
+    )
+
+
+def test_par_sem_texto_confiavel_fica_pendente(tmp_path):
+    con = duckdb.connect()
+    ensure_ops_export_gate(con)
+    older = tmp_path / "v1.md"
+    newer = tmp_path / "v2.md"
+    older.write_text("linha 1\n", encoding="utf-8")
+    _export(con, "e1", older, "linha 1\n", "2026-01-01 00:00:00")
+    _export(con, "e2", newer, "linha 1\nlinha 2\n", "2026-01-02 00:00:00")
+
+    # Arquivo ausente e, depois, arquivo com conteudo diferente do sha: nada e gravado.
+    assert sync_ops_generated_export_diff(con)["pairs_skipped"] == 1
+    newer.write_text("adulterado\n", encoding="utf-8")
+    assert sync_ops_generated_export_diff(con)["pairs_skipped"] == 1
+    assert con.execute("SELECT COUNT(*) FROM ops_case_generated_export_diff").fetchone()[0] == 0
+
+    newer.write_text("linha 1\nlinha 2\n", encoding="utf-8")
+    result = sync_ops_generated_export_diff(con)
+    assert result["rows_written"] == 1
+    assert con.execute("SELECT added_lines, removed_lines FROM ops_case_generated_export_diff").fetchone() == (1, 0)
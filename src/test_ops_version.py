@@ -0,0 +1,78 @@
+import duckdb
+
+from src.core.ops_runtime import begin_pipeline_run, ensure_ops_runtime, finish_pipeline_run
+from src.core.ops_version import data_version_token, fetch_data_versions, input_version_token, mark_tables_written
+
+
+def _fixture_con():
+    con = duckdb.connect()
+    ensure_ops_runtime(con)
+    con.execute("CREATE TABLE insight (id VARCHAR PRIMARY KEY, kind VARCHAR, created_at TIMESTAMP)")
+    con.execute("CREATE TABLE estado_ac_pagamentos (id VARCHAR, valor DOUBLE)")
+    return con
+
+
+def _token(con, group):
+    return data_version_token(fetch_data_versions(con), group)
+
+
+def test_escrita_marcada_sem_execucao_registrada_muda_o_token():
+    con = _fixture_con()
+    before = _token(con, "insight")
+    assert _token(con, "insight") == before
+
+    con.execute("UPDATE insight SET kind = 'OUTRO'")
+    mark_tables_written(con, "insight")
+    marked = _token(con, "insight")
+    assert marked != before
+
+    # Cada escrita conta, mesmo no mesmo milissegundo.
+    mark_tables_written(con, "insight")
+    assert _token(con, "insight") != marked
+
+
+def test_grupos_independentes_e_grupo_all():
+    con = _fixture_con()
+    insight = _token(con, "insight")
+    ingest = _token(con, "ingest")
+    everything = _token(con, "all")
+
+    mark_tables_written(con, "estado_ac_pagamentos")
+    assert _token(con, "insight") == insight
+    assert _token(con, "ingest") != ingest
+    assert _token(con, "all") != everything
+
+    # Tabelas fora dos grupos nao mexem em nenhuma versao.
+    ingest = _token(con, "ingest")
+    everything = _token(con, "all")
+    mark_tables_written(con, "tabela_qualquer")
+    assert _token(con, "ingest") == ingest
+    assert _token(con, "all") == everything
+
+
+def test_marca_na_mesma_transacao_da_escrita():
+    con = _fixture_con()
+    before = _token(con, "insight")
+    con.execute("BEGIN")
+    con.execute("INSERT INTO insight VALUES ('a', 'K', NULL)")
+    mark_tables_written(con, "insight")
+    con.execute("ROLLBACK")
+    assert _token(con, "insight") == before
+
+
+def test_execucao_registrada_continua_mudando_o_token():
+    con = _fixture_con()
+    before = _token(con, "insight")
+    run_id = begin_pipeline_run(con, "sync_estado_ac")
+    finish_pipeline_run(con, run_id, status="success")
+    assert _token(con, "insight") != before
+
+
+def test_versao_de_entrada_ignora_execucoes():
+    con = _fixture_con()
+    before = input_version_token(con, ("insight",))
+    run_id = begin_pipeline_run(con, "sync_insight_classification")
+    finish_pipeline_run(con, run_id, status="success")
+    assert input_version_token(con, ("insight",)) == before
+    mark_tables_written(con, "insight")
+    assert input_version_token(con, ("insight",)) != before
@@ -0,0 +1,46 @@
+import duckdb
+import pytest
+
+from src.core.partition_cdc import PartitionChanges, apply_partition_cdc
+
+COLUMNS = ["row_id", "ano", "valor"]
+
+
+def _fixture_con():
+    con = duckdb.connect()
+    con.execute("CREATE TABLE pagamentos (row_id VARCHAR PRIMARY KEY, ano INTEGER, valor DOUBLE, capturado_em TIMESTAMP)")
+    con.execute("INSERT INTO pagamentos VALUES ('a', 2024, 1.0, NULL), ('b', 2024, 2.0, NULL), ('x', 2023, 9.0, NULL)")
+    return con
+
+
+def _sync(con, rows=None, **kwargs):
+    return apply_partition_cdc(
+        con, "pagamentos", COLUMNS, rows, partition_sql="ano = ?", partition_params=[2024], touch_column="capturado_em", **kwargs
+    )
+
+
+def test_carga_so_escreve_o_que_mudou_na_particao():
+    con = _fixture_con()
+    changes = _sync(con, [("a", 2024, 1.0), ("b", 2024, 3.0), ("c", 2024, 4.0)])
+    assert changes == PartitionChanges(inserted=1, updated=1, deleted=0, unchanged=1)
+    assert _sync(con, [("c", 2024, 4.0)]) == PartitionChanges(deleted=2, unchanged=1)
+    assert con.execute("SELECT row_id, valor FROM pagamentos ORDER BY row_id").fetchall() == [("c", 4.0), ("x", 9.0)]
+
+
+def test_chave_repetida_fica_com_a_ultima_linha():
+    con = _fixture_con()
+    _sync(con, [("a", 2024, 5.0), ("a", 2024, 1.0), ("b", 2024, 2.0)])
+    assert con.execute("SELECT valor FROM pagamentos WHERE row_id = 'a'").fetchone()[0] == 1.0
+
+    select_sql = "SELECT * FROM (VALUES ('a', 2024, 7.0), ('a', 2024, 6.0), ('b', 2024, 2.0)) t(row_id, ano, valor)"
+    for _ in range(3):
+        _sync(con, select_sql=select_sql)
+        assert con.execute("SELECT valor FROM pagamentos WHERE row_id = 'a'").fetchone()[0] == 6.0
+
+
+def test_chave_de_outra_particao_nao_e_alterada():
+    con = _fixture_con()
+    with pytest.raises(ValueError, match="fora da particao"):
+        _sync(con, [("a", 2024, 1.0), ("x", 2024, 0.0)])
+    assert con.execute("SELECT ano, valor FROM pagamentos WHERE row_id = 'x'").fetchone() == (2023, 9.0)
+    assert con.execute("SELECT COUNT(*) FROM pagamentos").fetchone()[0] == 3
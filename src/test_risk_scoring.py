@@ -0,0 +1,88 @@
+from datetime import date
+
+import duckdb
+import pandas as pd
+
+from src.core.legal_compliance import (
+    calculate_risk_score,
+    validate_cnae_compatibility,
+    validate_cnpj,
+    validate_company_seniority,
+    validate_financial_capacity,
+)
+from src.core.risk_scoring import (
+    RISK_SCORE_TABLE,
+    company_features,
+    cnpj_valid,
+    refresh_risk_scores,
+    score_risk_frame,
+)
+
+GOLDEN = [
+    {},
+    {"days_old": 29},
+    {"days_old": 30},
+    {"days_old": 179, "financial_ratio": 5.0},
+    {"days_old": 180, "financial_ratio": 5.01},
+    {"days_old": -10, "front_company_risk": True, "financial_ratio": float("inf")},
+    {"front_company_risk": True, "cnae_compatible": False},
+    {"days_old": 10, "front_company_risk": True, "cnae_compatible": False},
+    {"document_valid": False},
+    {"document_valid": False, "days_old": 999, "cnae_compatible": True},
+    {"cnae_compatible": False, "financial_ratio": 7.5},
+]
+
+
+def test_lote_igual_a_funcao_escalar():
+    scored = score_risk_frame(pd.DataFrame(GOLDEN))
+    for metrics, (_, row) in zip(GOLDEN, scored.iterrows()):
+        expected = calculate_risk_score(metrics)
+        assert (row["score"], row["risk_label"], row["flags"]) == (
+            expected["score"],
+            expected["risk_label"],
+            expected["flags"],
+        ), metrics
+
+
+def test_metricas_de_empresa_iguais_as_validacoes():
+    companies = pd.DataFrame(
+        {
+            "cnpj": ["11.222.333/0001-81", "11222333000180", "00000000000000", "123"],
+            "valor": [1_000_000.0, 10_000.0, 50_000.0, 1.0],
+            "capital_social": [50_000.0, 0.0, 20_000.0, 1.0],
+            "data_abertura": ["2026-03-01", "2010-05-20", "2025-10-01T00:00:00", "2024-01-01"],
+            "cnae_principal": ["8610-1/01", "4120-4/00", "6201-5/01", None],
+            "target_sector": ["saude", "saude", None, "ti"],
+        }
+    )
+    features = company_features(companies, date(2026, 3, 14))
+    for idx, company in companies.iterrows():
+        financial = validate_financial_capacity(company["valor"], company["capital_social"])
+        cnae = (
+            validate_cnae_compatibility([company["cnae_principal"] or ""], company["target_sector"])
+            if company["target_sector"]
+            else {"compatible": True}
+        )
+        row = features.loc[idx]
+        assert row["financial_ratio"] == financial["ratio"]
+        assert row["front_company_risk"] == financial["is_front_company_risk"]
+        assert row["days_old"] == validate_company_seniority(company["data_abertura"], "2026-03-14")["days_old"]
+        assert row["cnae_compatible"] == cnae["compatible"]
+        assert row["document_valid"] == validate_cnpj(company["cnpj"])
+    assert cnpj_valid(pd.Series([None, ""])).tolist() == [False, False]
+
+
+def test_reprocessa_so_entradas_alteradas():
+    con = duckdb.connect()
+    ids = pd.Series([f"case:{idx}" for idx in range(len(GOLDEN))])
+    features = pd.DataFrame(GOLDEN)
+    assert refresh_risk_scores(con, ids, features) == {"scored": len(GOLDEN), "unchanged": 0}
+    assert refresh_risk_scores(con, ids, features) == {"scored": 0, "unchanged": len(GOLDEN)}
+
+    features.loc[0, "cnae_compatible"] = False
+    assert refresh_risk_scores(con, ids, features) == {"scored": 1, "unchanged": len(GOLDEN) - 1}
+    assert con.execute(f"SELECT score, flags FROM {RISK_SCORE_TABLE} WHERE entity_id = 'case:0'").fetchone() == (
+        40,
+        ["CNAE_INCOMPATIVEL"],
+    )
+    assert refresh_risk_scores(con, ids, features, full=True)["scored"] == len(GOLDEN)
@@ -0,0 +1,176 @@
+import sys
+from datetime import date
+from pathlib import Path
+
+import duckdb
+
+from src.core.sanction_intervals import (
+    ANTERIOR_A_SANCAO,
+    DURANTE_SANCAO,
+    FIM_ABERTO,
+    POSTERIOR_A_SANCAO,
+    SANCAO_INTERVALO_TABLE,
+    interval_match_sql,
+    sync_sancao_intervalo,
+)
+
+SCRIPTS = Path(__file__).resolve().parents[1] / "scripts"
+
+CNPJ_3895 = "04.567.890/0001-12"
+
+
+def _fixture_con(path=":memory:"):
+    con = duckdb.connect(path)
+    con.execute(
+        "CREATE TABLE federal_ceis (cnpj VARCHAR, nome VARCHAR, tipo_sancao VARCHAR, data_inicio_sancao VARCHAR,"
+        " data_fim_sancao VARCHAR, orgao_sancionador VARCHAR, fundamentacao_legal VARCHAR)"
+    )
+    con.executemany(
+        "INSERT INTO federal_ceis VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            # Sancao publicada depois do contrato 3895: o falso positivo temporal conhecido.
+            (CNPJ_3895, "MEDICA LTDA", "Impedimento", "10/06/2024", "09/06/2026", "SESACRE", "Lei 14.133"),
+            ("4567890000112", "MEDICA LTDA", "Suspensao", "2019-01-01T00:00:00", "20191231", "SEMSA", None),
+            ("11.111.111/0001-11", "SEM PRAZO SA", "Inidoneidade", "01-03-2022", "", "CGU", None),
+        ],
+    )
+    con.execute(
+        "CREATE TABLE rb_contratos (numero_contrato VARCHAR, numero_processo VARCHAR, fornecedor VARCHAR,"
+        " cnpj VARCHAR, ano INTEGER, exercicio VARCHAR, data_lancamento VARCHAR, sus BOOLEAN, capturado_em TIMESTAMP)"
+    )
+    con.executemany(
+        "INSERT INTO rb_contratos VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)",
+        [
+            ("3895", "3044", "MEDICA LTDA", CNPJ_3895, 2023, "2023", "15/03/2023", True),
+            ("4100", "3200", "MEDICA LTDA", CNPJ_3895, 2025, "2025", "02/01/2025", True),
+            ("4200", "3300", "SEM PRAZO SA", "11111111000111", 2024, "2024", "", True),
+        ],
+    )
+    return con
+
+
+def _contract_events():
+    return """
+        SELECT
+            numero_contrato,
+            cnpj,
+            coalesce(try_strptime(nullif(trim(data_lancamento), ''), '%d/%m/%Y')::DATE, make_date(ano, 12, 31)) AS evento_inicio,
+            NULL::DATE AS evento_fim
+        FROM rb_contratos
+    """
+
+
+def test_intervalo_normaliza_formatos_e_fim_exclusivo():
+    con = _fixture_con()
+    assert sync_sancao_intervalo(con) == {"rows": 3, "upserted": 3, "removed": 0}
+    rows = con.execute(
+        f"SELECT cnpj, sancao_inicio, sancao_fim, fim_aberto FROM {SANCAO_INTERVALO_TABLE} ORDER BY cnpj, sancao_inicio"
+    ).fetchall()
+    assert rows == [
+        ("04567890000112", date(2019, 1, 1), date(2020, 1, 1), False),
+        ("04567890000112", date(2024, 6, 10), date(2026, 6, 10), False),
+        ("11111111000111", date(2022, 3, 1), FIM_ABERTO, True),
+    ]
+
+
+def test_contrato_3895_anterior_a_sancao_nao_e_concomitante():
+    con = _fixture_con()
+    sync_sancao_intervalo(con)
+    sql = interval_match_sql(_contract_events(), f"SELECT * FROM {SANCAO_INTERVALO_TABLE}")
+    rows = {
+        (numero, str(inicio)): (situacao, dias)
+        for numero, inicio, situacao, dias in con.execute(
+            f"SELECT numero_contrato, sancao_inicio, situacao_temporal, dias_sobreposicao FROM ({sql})"
+        ).fetchall()
+    }
+    assert rows == {
+        ("3895", "2019-01-01"): (POSTERIOR_A_SANCAO, 0),
+        ("3895", "2024-06-10"): (ANTERIOR_A_SANCAO, 0),
+        ("4100", "2019-01-01"): (POSTERIOR_A_SANCAO, 0),
+        ("4100", "2024-06-10"): (DURANTE_SANCAO, 1),
+        ("4200", "2022-03-01"): (DURANTE_SANCAO, 1),
+    }
+    concomitantes = interval_match_sql(_contract_events(), f"SELECT * FROM {SANCAO_INTERVALO_TABLE}", only_overlaps=True)
+    assert sorted(con.execute(f"SELECT numero_contrato FROM ({concomitantes})").fetchall()) == [("4100",), ("4200",)]
+
+
+def test_validador_de_timeline_conta_o_falso_positivo(tmp_path):
+    sys.path.insert(0, str(SCRIPTS))
+    import validate_sancao_timeline
+
+    db_path = tmp_path / "fixture.duckdb"
+    con = _fixture_con(str(db_path))
+    con.execute(
+        "CREATE TABLE sancoes_collapsed (id VARCHAR, cnpj_cpf VARCHAR, fonte VARCHAR, orgao_ac VARCHAR,"
+        " data_inicio_mais_antiga VARCHAR, data_fim_mais_recente VARCHAR, ativa BOOLEAN)"
+    )
+    con.execute(
+        "INSERT INTO sancoes_collapsed VALUES ('SC_1', '04567890000112', 'CEIS', 'SESACRE', '10/06/2024', '09/06/2026', TRUE)"
+    )
+    con.close()
+
+    result = validate_sancao_timeline.run_validation(str(db_path))
+    assert result == {
+        "total_bruto": 2,
+        "falsos_positivos_temporais": 1,
+        "abrangencia_restrita": 0,
+        "total_valido_apos_filtros": 1,
+    }
+
+
+def test_sancao_fora_do_snapshot_vira_intervalo_fechado():
+    con = duckdb.connect()
+    con.execute(
+        "CREATE TABLE federal_cnep (cnpj VARCHAR, nome VARCHAR, tipo_sancao VARCHAR, data_inicio_sancao VARCHAR,"
+        " data_fim_sancao VARCHAR, multa DOUBLE, fundamentacao_legal VARCHAR, orgao_sancionador VARCHAR, competencia VARCHAR)"
+    )
+    fica = ("22222222000122", "FICA LTDA", "Multa", "01/01/2024", "", 10.0, None, "CGU")
+    sai = ("33333333000133", "SAI LTDA", "Multa", "01/01/2024", "31/12/2030", 20.0, None, "CGU")
+    con.executemany("INSERT INTO federal_cnep VALUES (?, ?, ?, ?, ?, ?, ?, ?, '20250101')", [fica, sai])
+    assert sync_sancao_intervalo(con) == {"rows": 2, "upserted": 2, "removed": 0}
+
+    con.execute("INSERT INTO federal_cnep VALUES (?, ?, ?, ?, ?, ?, ?, ?, '20250601')", fica)
+    assert sync_sancao_intervalo(con) == {"rows": 1, "upserted": 0, "removed": 1}
+    stored = f"SELECT cnpj, sancao_fim, fim_aberto, removed_at IS NOT NULL FROM {SANCAO_INTERVALO_TABLE} ORDER BY cnpj"
+    assert con.execute(stored).fetchall() == [
+        ("22222222000122", FIM_ABERTO, True, False),
+        ("33333333000133", date(2025, 6, 1), False, True),
+    ]
+    # O pagamento anterior a remocao continua concomitante; o posterior nao.
+    events = """
+        SELECT * FROM (VALUES ('33333333000133', DATE '2025-03-01'), ('33333333000133', DATE '2025-07-01'))
+        AS t(cnpj, evento_inicio)
+    """
+    sql = interval_match_sql(f"SELECT *, NULL::DATE AS evento_fim FROM ({events})", f"SELECT * FROM {SANCAO_INTERVALO_TABLE}")
+    assert con.execute(f"SELECT evento_inicio, situacao_temporal FROM ({sql}) ORDER BY 1").fetchall() == [
+        (date(2025, 3, 1), DURANTE_SANCAO),
+        (date(2025, 7, 1), POSTERIOR_A_SANCAO),
+    ]
+
+    con.execute("INSERT INTO federal_cnep VALUES (?, ?, ?, ?, ?, ?, ?, ?, '20250901')", fica)
+    con.execute("INSERT INTO federal_cnep VALUES (?, ?, ?, ?, ?, ?, ?, ?, '20250901')", sai)
+    assert sync_sancao_intervalo(con) == {"rows": 2, "upserted": 1, "removed": 0}
+    assert con.execute(stored).fetchall()[1] == ("33333333000133", date(2031, 1, 1), False, False)
+
+
+def test_retificacao_atualiza_o_mesmo_intervalo():
+    con = duckdb.connect()
+    con.execute(
+        "CREATE TABLE federal_cnep (cnpj VARCHAR, nome VARCHAR, tipo_sancao VARCHAR, data_inicio_sancao VARCHAR,"
+        " data_fim_sancao VARCHAR, multa DOUBLE, fundamentacao_legal VARCHAR, orgao_sancionador VARCHAR, competencia VARCHAR)"
+    )
+    row = ["44444444000144", "RETIFICA LTDA", "Multa", "01/01/2024", "31/12/2026", 10.0, None, "CGU"]
+    con.execute("INSERT INTO federal_cnep VALUES (?, ?, ?, ?, ?, ?, ?, ?, '20250101')", row)
+    sync_sancao_intervalo(con)
+    # Linha gravada com o id antigo (hash da linha inteira) e absorvida.
+    con.execute(f"UPDATE {SANCAO_INTERVALO_TABLE} SET sancao_id = 'hash-antigo'")
+
+    row[4], row[5] = "31/12/2027", 15.0
+    con.execute("INSERT INTO federal_cnep VALUES (?, ?, ?, ?, ?, ?, ?, ?, '20250601')", row)
+    assert sync_sancao_intervalo(con) == {"rows": 1, "upserted": 1, "removed": 0}
+    assert con.execute(
+        f"SELECT sancao_fim, multa, removed_at IS NULL FROM {SANCAO_INTERVALO_TABLE}"
+    ).fetchall() == [(date(2028, 1, 1), 15.0, True)]
+
+    con.execute("INSERT INTO federal_cnep VALUES (?, ?, ?, ?, ?, ?, ?, ?, '20250901')", row)
+    assert sync_sancao_intervalo(con) == {"rows": 1, "upserted": 0, "removed": 0}
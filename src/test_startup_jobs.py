@@ -0,0 +1,57 @@
+import duckdb
+
+from backend.app import main
+from src.core.ops_version import mark_tables_written
+
+INSIGHT_DDL = "CREATE TABLE insight (id VARCHAR PRIMARY KEY, kind VARCHAR, created_at TIMESTAMP)"
+
+
+def _write(db_path, sql, *tables):
+    con = duckdb.connect(str(db_path))
+    try:
+        con.execute(sql)
+        mark_tables_written(con, *tables)
+    finally:
+        con.close()
+
+
+def _tables(db_path):
+    con = duckdb.connect(str(db_path), read_only=True)
+    try:
+        return {row[0] for row in con.execute("SELECT table_name FROM duckdb_tables()").fetchall()}
+    finally:
+        con.close()
+
+
+def test_job_roda_de_novo_apos_escrita_de_sync(tmp_path, monkeypatch):
+    db_path = tmp_path / "startup.duckdb"
+    _write(db_path, INSIGHT_DDL)
+    calls = []
+    monkeypatch.setattr(main, "DB_PATH", str(db_path))
+    monkeypatch.setattr(main, "STARTUP_FORCE", False)
+    monkeypatch.setattr(main, "STARTUP_JOBS", [("job_teste", lambda con: calls.append(1) or {}, ("insight",), None)])
+
+    main._run_startup_jobs()
+    assert len(calls) == 1
+    # A conexao de escrita foi fechada: o arquivo abre read-only no mesmo processo.
+    assert "ops_pipeline_run" in _tables(db_path)
+
+    main._run_startup_jobs()
+    assert len(calls) == 1
+    assert main._startup_state["jobs"]["job_teste"]["status"] == "skipped"
+
+    _write(db_path, "INSERT INTO insight (id, kind) VALUES ('novo', 'K')", "insight")
+    main._run_startup_jobs()
+    assert len(calls) == 2
+
+
+def test_checagem_da_classificacao_so_le(tmp_path):
+    db_path = tmp_path / "check.duckdb"
+    _write(db_path, INSIGHT_DDL)
+    con = duckdb.connect(str(db_path), read_only=True)
+    try:
+        assert main._insight_classification_current(con) is False
+        assert main.pipeline_is_current(con, "sync_insight_classification", ("insight",)) is False
+    finally:
+        con.close()
+    assert _tables(db_path) == {"insight"}
@@ -0,0 +1,38 @@
+import pytest
+
+from src.ingest.transparencia_ac_connector import (
+    _resolve_orgao_reference,
+    resolve_orgao,
+    resolve_orgao_many,
+)
+
+# (unidade_gestora, credor, natureza_despesa, orgao esperado)
+PRECEDENCIA = [
+    # Orgao anterior em ORGAO_KEYWORDS vence mesmo vindo num campo posterior.
+    ("DETRAN", "HOSPITAL DE URGENCIA E EMERGENCIA", "", "SESACRE"),
+    ("POLICIA MILITAR", "", "Fundo Estadual de Educação", "SEE"),
+    # Dentro do mesmo texto vale o indice do orgao, nao a posicao do trecho.
+    ("GOVERNO DO ESTADO - SECRETARIA DE ESTADO DA FAZENDA", "", "", "SEFAZ"),
+    ("SECRETARIA DE ESTADO DE INFRAESTRUTURA - OBRAS E SERVICOS PUBLICOS", "", "", "SEINFRA"),
+    ("SEOP", "DAER", "", "SEINFRA"),
+    ("Secretaria de Estado de Cultura, Esporte e Lazer", "", "", "SECD"),
+    # Siglas so casam como palavra inteira.
+    ("SEOPX LTDA", "", "", "GOVERNO_ACRE"),
+    ("SEOP/AC", "", "", "SEOP"),
+    ("", "", "", "GOVERNO_ACRE"),
+]
+
+
+@pytest.mark.parametrize("unidade_gestora, credor, natureza_despesa, esperado", PRECEDENCIA)
+def test_precedencia_segue_ordem_de_orgao_keywords(unidade_gestora, credor, natureza_despesa, esperado):
+    kwargs = {"unidade_gestora": unidade_gestora, "credor": credor, "natureza_despesa": natureza_despesa}
+    assert resolve_orgao(**kwargs) == esperado
+    # Segunda chamada sai do cache com o mesmo resultado.
+    assert resolve_orgao(**kwargs) == esperado
+    assert _resolve_orgao_reference(**kwargs) == esperado
+
+
+def test_resolucao_em_coluna_igual_a_por_linha():
+    unidades, credores, naturezas, esperados = zip(*PRECEDENCIA)
+    assert resolve_orgao_many(list(unidades), list(credores), list(naturezas)) == list(esperados)
+    assert resolve_orgao_many([None, float("nan")]) == ["GOVERNO_ACRE", "GOVERNO_ACRE"]
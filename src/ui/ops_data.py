@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import functools
+import itertools
 from typing import Any, Callable
 
 import duckdb
 import pandas as pd
+import requests
 import streamlit as st
 
 from src.core.ops_registry import sync_ops_case_registry
@@ -13,7 +16,46 @@ from src.core.ops_runtime import (
     finish_pipeline_run,
     refresh_source_cache,
 )
-from src.ui.ops_shared import DB_PATH, get_rw_db, resolve_artifact_path
+from src.core.ops_version import data_version_token, fetch_data_versions
+from src.ui.ops_shared import API_URL, DB_PATH, get_rw_db, resolve_artifact_path
+
+
+DATA_VERSION_CHECK_TTL_SECONDS = 5
+VERSIONED_CACHE_TTL_SECONDS = 900
+# Loaders que tambem leem tabelas sem versao (ops_artifact_text_index,
+# ops_source_cache, ops_rule_*, ops_calibration_*, execucoes em andamento em
+# ops_pipeline_run) mantem o teto curto de antes.
+UNVERSIONED_READ_TTL_SECONDS = 30
+
+
+@st.cache_data(ttl=DATA_VERSION_CHECK_TTL_SECONDS, show_spinner=False)
+def load_data_versions() -> dict[str, dict[str, Any]]:
+    con = duckdb.connect(str(DB_PATH), read_only=True)
+    try:
+        return fetch_data_versions(con)
+    finally:
+        con.close()
+
+
+def versioned_cache_data(group: str = "ops", *, ttl: int = VERSIONED_CACHE_TTL_SECONDS):
+    """Cacheia o loader pela versao de dados do grupo (execucoes em
+    ops_pipeline_run e contador de escritas das tabelas do grupo)."""
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(func)
+        def cached(*args: Any, data_version: str, **kwargs: Any) -> Any:
+            return func(*args, **kwargs)
+
+        cached = st.cache_data(ttl=ttl, show_spinner=False)(cached)
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            return cached(*args, data_version=data_version_token(load_data_versions(), group), **kwargs)
+
+        wrapper.clear = cached.clear
+        return wrapper
+
+    return decorator
 
 
 def _run_logged_pipeline(
@@ -91,7 +133,7 @@ def freeze_ops_case_export_now(case_id: str, export_mode: str) -> dict[str, Any]
     return _run_logged_pipeline(pipeline, _runner)
 
 
-@st.cache_data(ttl=30, show_spinner=False)
+@versioned_cache_data("ops", ttl=UNVERSIONED_READ_TTL_SECONDS)
 def load_ops_dashboard_data():
     con = duckdb.connect(str(DB_PATH), read_only=True)
     try:
@@ -234,7 +276,7 @@ def load_ops_dashboard_data():
     return summary, cases_df
 
 
-@st.cache_data(ttl=30, show_spinner=False)
+@versioned_cache_data("ops")
 def load_ops_case_artifacts(case_id: str) -> pd.DataFrame:
     con = duckdb.connect(str(DB_PATH), read_only=True)
     try:
@@ -254,7 +296,7 @@ def load_ops_case_artifacts(case_id: str) -> pd.DataFrame:
         con.close()
 
 
-@st.cache_data(ttl=30, show_spinner=False)
+@versioned_cache_data("all", ttl=UNVERSIONED_READ_TTL_SECONDS)
 def load_ops_runtime_data():
     con = duckdb.connect(str(DB_PATH), read_only=True)
     try:
@@ -300,7 +342,7 @@ def load_ops_runtime_data():
     return runs_df, sources_df
 
 
-@st.cache_data(ttl=30, show_spinner=False)
+@versioned_cache_data("ops", ttl=UNVERSIONED_READ_TTL_SECONDS)
 def load_ops_case_timeline(case_id: str) -> pd.DataFrame:
     con = duckdb.connect(str(DB_PATH), read_only=True)
     try:
@@ -329,7 +371,7 @@ def load_ops_case_timeline(case_id: str) -> pd.DataFrame:
         con.close()
 
 
-@st.cache_data(ttl=30, show_spinner=False)
+@versioned_cache_data("ops")
 def load_ops_case_burden(case_id: str) -> pd.DataFrame:
     con = duckdb.connect(str(DB_PATH), read_only=True)
     try:
@@ -356,7 +398,7 @@ def load_ops_case_burden(case_id: str) -> pd.DataFrame:
         con.close()
 
 
-@st.cache_data(ttl=30, show_spinner=False)
+@versioned_cache_data("ops")
 def load_ops_case_semantic(case_id: str) -> pd.DataFrame:
     con = duckdb.connect(str(DB_PATH), read_only=True)
     try:
@@ -388,7 +430,7 @@ def load_ops_case_semantic(case_id: str) -> pd.DataFrame:
         con.close()
 
 
-@st.cache_data(ttl=30, show_spinner=False)
+@versioned_cache_data("ops")
 def load_ops_case_contradictions(case_id: str) -> pd.DataFrame:
     con = duckdb.connect(str(DB_PATH), read_only=True)
     try:
@@ -408,7 +450,7 @@ def load_ops_case_contradictions(case_id: str) -> pd.DataFrame:
         con.close()
 
 
-@st.cache_data(ttl=30, show_spinner=False)
+@versioned_cache_data("ops")
 def load_ops_case_checklist(case_id: str) -> pd.DataFrame:
     con = duckdb.connect(str(DB_PATH), read_only=True)
     try:
@@ -428,7 +470,7 @@ def load_ops_case_checklist(case_id: str) -> pd.DataFrame:
         con.close()
 
 
-@st.cache_data(ttl=30, show_spinner=False)
+@versioned_cache_data("ops")
 def load_ops_case_language_guard(case_id: str) -> pd.DataFrame:
     con = duckdb.connect(str(DB_PATH), read_only=True)
     try:
@@ -448,7 +490,7 @@ def load_ops_case_language_guard(case_id: str) -> pd.DataFrame:
         con.close()
 
 
-@st.cache_data(ttl=30, show_spinner=False)
+@versioned_cache_data("ops")
 def load_ops_case_export_gate(case_id: str) -> pd.DataFrame:
     con = duckdb.connect(str(DB_PATH), read_only=True)
     try:
@@ -468,7 +510,7 @@ def load_ops_case_export_gate(case_id: str) -> pd.DataFrame:
         con.close()
 
 
-@st.cache_data(ttl=30, show_spinner=False)
+@versioned_cache_data("ops")
 def load_ops_case_generated_exports(case_id: str) -> pd.DataFrame:
     con = duckdb.connect(str(DB_PATH), read_only=True)
     try:
@@ -495,7 +537,7 @@ def load_ops_case_generated_exports(case_id: str) -> pd.DataFrame:
         con.close()
 
 
-@st.cache_data(ttl=30, show_spinner=False)
+@versioned_cache_data("ops")
 def load_ops_case_generated_export_diffs(case_id: str) -> pd.DataFrame:
     con = duckdb.connect(str(DB_PATH), read_only=True)
     try:
@@ -524,7 +566,7 @@ def load_ops_case_generated_export_diffs(case_id: str) -> pd.DataFrame:
         con.close()
 
 
-@st.cache_data(ttl=30, show_spinner=False)
+@versioned_cache_data("ops")
 def load_ops_case_runbook(case_id: str) -> pd.DataFrame:
     con = duckdb.connect(str(DB_PATH), read_only=True)
     try:
@@ -557,7 +599,7 @@ def load_ops_case_runbook(case_id: str) -> pd.DataFrame:
         con.close()
 
 
-@st.cache_data(ttl=30, show_spinner=False)
+@versioned_cache_data("ops")
 def load_ops_case_runbook_steps(case_id: str) -> pd.DataFrame:
     con = duckdb.connect(str(DB_PATH), read_only=True)
     try:
@@ -586,7 +628,7 @@ def load_ops_case_runbook_steps(case_id: str) -> pd.DataFrame:
         con.close()
 
 
-@st.cache_data(ttl=30, show_spinner=False)
+@versioned_cache_data("ops")
 def load_ops_inbox_queue() -> pd.DataFrame:
     con = duckdb.connect(str(DB_PATH), read_only=True)
     try:
@@ -622,9 +664,49 @@ def read_text_artifact(path_value: str) -> str:
     return path.read_text(encoding="utf-8", errors="replace")
 
 
+@st.cache_data(ttl=30, show_spinner=False)
+def artifact_api_available() -> bool:
+    try:
+        return requests.get(f"{API_URL}/health", timeout=1).ok
+    except requests.RequestException:
+        return False
+
+
 @st.cache_data(ttl=120, show_spinner=False)
-def read_binary_artifact(path_value: str) -> bytes:
+def _count_artifact_lines(path_value: str, size_bytes: int, mtime_ns: int) -> int:
+    # size/mtime entram na chave: o cache invalida quando o arquivo muda.
+    path = resolve_artifact_path(path_value)
+    if not path or not path.exists():
+        return 0
+    lines = 0
+    last = b""
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            lines += chunk.count(b"\n")
+            last = chunk[-1:]
+    return lines + (1 if last and last != b"\n" else 0)
+
+
+def count_artifact_lines(path_value: str) -> int:
+    path = resolve_artifact_path(path_value)
+    if not path or not path.exists():
+        return 0
+    stat = path.stat()
+    return _count_artifact_lines(path_value, stat.st_size, stat.st_mtime_ns)
+
+
+def read_text_artifact_lines(path_value: str, start: int, count: int) -> str:
+    """Linhas [start, start+count) sem carregar o arquivo inteiro."""
+    path = resolve_artifact_path(path_value)
+    if not path or not path.exists():
+        return ""
+    with path.open(encoding="utf-8", errors="replace") as handle:
+        return "".join(itertools.islice(handle, start, start + count))
+
+
+def read_csv_artifact_page(path_value: str, start: int, count: int) -> pd.DataFrame:
+    """Linhas de dados [start, start+count) do CSV; o cabecalho e sempre lido."""
     path = resolve_artifact_path(path_value)
     if not path or not path.exists():
-        return b""
-    return path.read_bytes()
+        return pd.DataFrame()
+    return pd.read_csv(path, skiprows=lambda idx: 0 < idx <= start, nrows=count)
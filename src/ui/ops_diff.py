@@ -5,20 +5,12 @@ import json
 from io import StringIO
 from pathlib import Path
 
+import duckdb
 import pandas as pd
 import streamlit as st
 
-from src.ui.ops_data import read_text_artifact
-from src.ui.ops_shared import ROOT, resolve_artifact_path
-
-
-def _html_to_text(content: str) -> str:
-    try:
-        from bs4 import BeautifulSoup
-
-        return BeautifulSoup(content, "html.parser").get_text("\n", strip=True)
-    except Exception:
-        return content
+from src.core.ops_document import load_document
+from src.ui.ops_shared import DB_PATH, resolve_artifact_path
 
 
 @st.cache_data(ttl=120, show_spinner=False)
@@ -26,37 +18,11 @@ def artifact_to_diff_text(path_value: str) -> str | None:
     path = resolve_artifact_path(path_value)
     if not path or not path.exists():
         return None
-
-    suffix = path.suffix.lower()
-    if suffix in {".md", ".txt"}:
-        return read_text_artifact(path_value)
-
-    if suffix == ".json":
-        content = read_text_artifact(path_value)
-        try:
-            return json.dumps(json.loads(content), ensure_ascii=False, indent=2, sort_keys=True)
-        except json.JSONDecodeError:
-            return content
-
-    if suffix == ".csv":
-        content = read_text_artifact(path_value)
-        try:
-            df = pd.read_csv(StringIO(content))
-            return df.to_csv(index=False)
-        except Exception:
-            return content
-
-    if suffix in {".html", ".htm"}:
-        return _html_to_text(read_text_artifact(path_value))
-
-    if suffix == ".pdf":
-        txt_fallback = Path(path).with_suffix(".txt")
-        if txt_fallback.exists():
-            rel = str(txt_fallback.relative_to(ROOT))
-            return read_text_artifact(rel)
-        return None
-
-    return None
+    con = duckdb.connect(str(DB_PATH), read_only=True)
+    try:
+        return load_document(path, con, persist=False)["text"]
+    finally:
+        con.close()
 
 
 def render_artifact_diff(artifacts_df: pd.DataFrame) -> None:
@@ -7,11 +7,11 @@ import pandas as pd
 import streamlit as st
 
 from src.core.ops_inbox import get_case_inbox_spec, run_case_workflow, sync_ops_inbox, upload_case_inbox_document
-from src.ui.ops_data import load_ops_inbox_queue
+from src.ui.ops_data import load_ops_inbox_queue, versioned_cache_data
 from src.ui.ops_shared import DB_PATH
 
 
-@st.cache_data(ttl=30, show_spinner=False)
+@versioned_cache_data("ops")
 def load_case_inbox_documents(case_id: str) -> pd.DataFrame:
     con = duckdb.connect(str(DB_PATH), read_only=True)
     try:
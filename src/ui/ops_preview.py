@@ -2,34 +2,97 @@ from __future__ import annotations
 
 import base64
 import json
-from io import StringIO
+from urllib.parse import urlencode
 
-import pandas as pd
 import streamlit as st
 import streamlit.components.v1 as components
 
-from src.ui.ops_data import read_binary_artifact, read_text_artifact
-from src.ui.ops_shared import ROOT, resolve_artifact_path
+from src.ui.ops_data import (
+    artifact_api_available,
+    count_artifact_lines,
+    read_csv_artifact_page,
+    read_text_artifact,
+    read_text_artifact_lines,
+)
+from src.ui.ops_shared import API_URL, ROOT, resolve_artifact_path
 
 
-def render_artifact_preview(path_value: str | None, kind: str | None = None) -> None:
+PREVIEW_PAGE_ROWS = 200
+PREVIEW_PAGE_LINES = 400
+# Abaixo disso o arquivo ainda e exibido inteiro (markdown/json renderizados).
+PREVIEW_INLINE_TEXT_BYTES = 256 * 1024
+# Sem o backend, PDFs pequenos ainda podem ir embutidos em base64.
+PDF_INLINE_MAX_BYTES = 4 * 1024 * 1024
+
+
+def artifact_url(path_value: str) -> str:
+    return f"{API_URL}/ops/artifact?{urlencode({'path': path_value})}"
+
+
+def _page_selector(total: int, page_size: int, key: str) -> int:
+    pages = max(1, -(-total // page_size))
+    if pages == 1:
+        return 0
+    page = st.number_input(f"Página (de {pages})", min_value=1, max_value=pages, value=1, step=1, key=key)
+    return (int(page) - 1) * page_size
+
+
+def _render_text_pages(path_value: str, language: str, key: str) -> None:
+    total = count_artifact_lines(path_value)
+    start = _page_selector(total, PREVIEW_PAGE_LINES, f"{key}:lines")
+    st.caption(f"Linhas {start + 1}-{min(start + PREVIEW_PAGE_LINES, total)} de {total}")
+    st.code(read_text_artifact_lines(path_value, start, PREVIEW_PAGE_LINES), language=language)
+
+
+def _render_pdf(path_value: str, size_bytes: int) -> None:
+    if size_bytes == 0:
+        st.warning("PDF vazio ou indisponível.")
+        return
+    if artifact_api_available():
+        # O navegador busca o PDF direto no backend, por faixas (HTTP Range).
+        components.html(
+            f'<iframe src="{artifact_url(path_value)}" width="100%" height="920" style="border:none;"></iframe>',
+            height=940,
+            scrolling=False,
+        )
+        return
+    if size_bytes > PDF_INLINE_MAX_BYTES:
+        st.info(f"PDF com {size_bytes:,} bytes: inicie o backend (`{API_URL}`) para visualizar sem embutir o arquivo.")
+        return
+    path = resolve_artifact_path(path_value)
+    pdf_b64 = base64.b64encode(path.read_bytes()).decode("ascii")
+    components.html(
+        f'<iframe src="data:application/pdf;base64,{pdf_b64}" width="100%" height="920" style="border:none;"></iframe>',
+        height=940,
+        scrolling=False,
+    )
+
+
+def render_artifact_preview(path_value: str | None, kind: str | None = None, *, key: str = "artifact_preview") -> None:
     path = resolve_artifact_path(path_value)
     if not path_value or not path or not path.exists():
         st.warning("Artefato não localizado no disco.")
         return
 
     suffix = path.suffix.lower()
+    size_bytes = path.stat().st_size
+    inline = size_bytes <= PREVIEW_INLINE_TEXT_BYTES
+    page_key = f"{key}:{path_value}"
     st.caption(f"Preview local: `{path.relative_to(ROOT)}`")
 
     if suffix in {".md", ".txt"}:
-        content = read_text_artifact(path_value)
-        if suffix == ".md":
-            st.markdown(content)
+        if not inline:
+            _render_text_pages(path_value, "markdown" if suffix == ".md" else "text", page_key)
+        elif suffix == ".md":
+            st.markdown(read_text_artifact(path_value))
         else:
-            st.code(content, language="text")
+            st.code(read_text_artifact(path_value), language="text")
         return
 
     if suffix == ".json":
+        if not inline:
+            _render_text_pages(path_value, "json", page_key)
+            return
         content = read_text_artifact(path_value)
         try:
             st.json(json.loads(content))
@@ -38,11 +101,15 @@ def render_artifact_preview(path_value: str | None, kind: str | None = None) ->
         return
 
     if suffix == ".csv":
-        content = read_text_artifact(path_value)
+        total = max(count_artifact_lines(path_value) - 1, 0)
+        start = _page_selector(total, PREVIEW_PAGE_ROWS, f"{page_key}:rows")
         try:
-            st.dataframe(pd.read_csv(StringIO(content)), width='stretch', hide_index=True)
+            page = read_csv_artifact_page(path_value, start, PREVIEW_PAGE_ROWS)
         except Exception:
-            st.code(content[:12000], language="csv")
+            _render_text_pages(path_value, "csv", page_key)
+            return
+        st.caption(f"Linhas {start + 1}-{start + len(page)} de ~{total}")
+        st.dataframe(page, width='stretch', hide_index=True)
         return
 
     if suffix in {".html", ".htm"}:
@@ -51,16 +118,7 @@ def render_artifact_preview(path_value: str | None, kind: str | None = None) ->
         return
 
     if suffix == ".pdf":
-        payload = read_binary_artifact(path_value)
-        if not payload:
-            st.warning("PDF vazio ou indisponível.")
-            return
-        pdf_b64 = base64.b64encode(payload).decode("ascii")
-        components.html(
-            f'<iframe src="data:application/pdf;base64,{pdf_b64}" width="100%" height="920" style="border:none;"></iframe>',
-            height=940,
-            scrolling=False,
-        )
+        _render_pdf(path_value, size_bytes)
         return
 
     st.info(f"Pré-visualização não implementada para `{suffix or kind or 'arquivo'}`.")
@@ -6,6 +6,7 @@ import duckdb
 import pandas as pd
 import streamlit as st
 
+from src.ui.ops_data import UNVERSIONED_READ_TTL_SECONDS, versioned_cache_data
 from src.ui.ops_preview import render_artifact_preview
 from src.ui.ops_shared import DB_PATH
 
@@ -47,7 +48,7 @@ def _highlight(snippet: str, terms: list[str]) -> str:
     return highlighted
 
 
-@st.cache_data(ttl=30, show_spinner=False)
+@versioned_cache_data("ops", ttl=UNVERSIONED_READ_TTL_SECONDS)
 def load_search_index() -> pd.DataFrame:
     con = duckdb.connect(str(DB_PATH), read_only=True)
     try:
@@ -161,4 +162,4 @@ def render_search_tab() -> None:
     )
     selected = results.iloc[int(preview_idx)]
     st.markdown(selected["snippet_md"])
-    render_artifact_preview(str(selected["path"]), str(selected["kind"]))
+    render_artifact_preview(str(selected["path"]), str(selected["kind"]), key="ops_search_preview")
@@ -226,7 +226,11 @@ def render_case_workbench(filtered: pd.DataFrame) -> None:
                         meta2.metric("Tamanho", f"{int(selected_artifact.get('size_bytes') or 0):,} bytes")
                         meta3.metric("Atualizado", str(selected_artifact.get("updated_at") or "N/D"))
                         st.code(str(selected_artifact.get("sha256") or ""), language="text")
-                        render_artifact_preview(str(selected_artifact.get("path") or ""), str(selected_artifact.get("kind") or ""))
+                        render_artifact_preview(
+                            str(selected_artifact.get("path") or ""),
+                            str(selected_artifact.get("kind") or ""),
+                            key="ops_sections_preview_artifact",
+                        )
 
         with timeline_tab:
             render_timeline_tab(timeline_df)
@@ -278,4 +282,4 @@ def render_runtime_tab(runs_df: pd.DataFrame, sources_df: pd.DataFrame) -> None:
                     key="ops_sections_preview_source"
                 )
                 selected_source = preview_sources.iloc[int(selected_source_idx)]
-                render_artifact_preview(str(selected_source.get("body_path") or ""), "source_snapshot")
+                render_artifact_preview(str(selected_source.get("body_path") or ""), "source_snapshot", key="ops_sections_preview_source")
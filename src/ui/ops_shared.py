@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
 import duckdb
@@ -8,6 +9,8 @@ import pandas as pd
 
 ROOT = Path(__file__).resolve().parents[2]
 DB_PATH = ROOT / "data" / "sentinela_analytics.duckdb"
+# Backend FastAPI que serve os artefatos com suporte a Range.
+API_URL = os.environ.get("SENTINELA_API_URL", "http://localhost:8000").rstrip("/")
 
 USO_EXTERNO_LABELS = {
     "APTO_REPRESENTACAO": "APTO_A_NOTICIA_DE_FATO",
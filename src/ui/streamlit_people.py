@@ -3,13 +3,17 @@ from __future__ import annotations
 import duckdb
 import streamlit as st
 
+from src.core.people_search import people_search_ready, search_servidores
+
 
 def render_people_page(db: duckdb.DuckDBPyConnection) -> None:
     st.markdown('<div class="main-header"><h1>Rastreio de Pessoal</h1></div>', unsafe_allow_html=True)
     nome = st.text_input("BUSCAR SERVIDOR", placeholder="Nome ou matrícula...")
 
     try:
-        if nome:
+        if people_search_ready(db):
+            df_res = search_servidores(db, nome, limit=100 if nome else 20)
+        elif nome:
             query = """
                 SELECT
                     TRIM(SPLIT_PART(servidor, '-', 2)) AS nome,
@@ -5,13 +5,15 @@ from pathlib import Path
 import duckdb
 import streamlit as st
 
+from src.ui.ops_data import UNVERSIONED_READ_TTL_SECONDS, versioned_cache_data
+
 
 ROOT = Path(__file__).resolve().parents[2]
 DB_PATH = ROOT / "data" / "sentinela_analytics.duckdb"
 PAGES = ["🏠 CENTRO DE COMANDO", "📂 OPERAÇÕES", "🧪 ALERTAS LEGADOS (QUARENTENA)", "🏛️ AUDITORIA FEDERAL (CGU)", "👥 BUSCA AVANÇADA"]
 
 
-@st.cache_data(ttl=30, show_spinner=False)
+@versioned_cache_data("all", ttl=UNVERSIONED_READ_TTL_SECONDS)
 def load_operational_status() -> dict[str, object]:
     con = duckdb.connect(str(DB_PATH), read_only=True)
     try:
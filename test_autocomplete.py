@@ -1,8 +1,15 @@
 import requests
 from bs4 import BeautifulSoup
 import re
+import sys
+from pathlib import Path
+
+import duckdb
+
+from src.core.people_search import autocomplete_servidores, people_search_ready
 
 BASE_URL = "https://transparencia.riobranco.ac.gov.br/despesa/"
+DB_PATH = Path(__file__).resolve().parent / "data" / "sentinela_analytics.duckdb"
 
 session = requests.Session()
 r = session.get(BASE_URL)
@@ -51,3 +58,18 @@ if "partial-response" in r_ajax.text:
 else:
     print("Falhou a requisição AJAX:")
     print(r_ajax.text[:500])
+
+# Autocomplete local de servidores: mesmo fluxo, servido pelo indice de busca
+# materializado no DuckDB em vez de um round-trip ao portal.
+termo = sys.argv[1] if len(sys.argv) > 1 else ""
+if termo and DB_PATH.exists():
+    con = duckdb.connect(str(DB_PATH), read_only=True)
+    try:
+        if people_search_ready(con):
+            print(f"Autocomplete local para {termo!r}:")
+            for item in autocomplete_servidores(con, termo):
+                print(f"  {item['matricula']} - {item['nome']} ({item['cargo']})")
+        else:
+            print("Indice de busca de servidores ausente. Rode scripts/sync_people_search.py.")
+    finally:
+        con.close()